@@ -10,12 +10,14 @@ This adapter:
 """
 
 import asyncio
+import json
 import os
 import time
 import uuid
-from typing import Dict, List, Optional
+from typing import AsyncIterator, Callable, Dict, List, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Request, BackgroundTasks
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
 from app.api.middleware.message_parser import parse_rapidpro_message
@@ -23,7 +25,10 @@ from app.logger import logger
 # NOTE: Legacy check_admin_permissions removed (ADR-011 migration).
 # Auth is now handled by macro_bridge._verify_access() in rivebot.
 from app.services.channel import resolve_persona, DEFAULT_PERSONA
+from app.services import persona_cache
 from app.hermes.engine import invoke_hermes
+from app.utils import metrics
+from app.utils.ttl_store import TTLStore
 from app.api.middleware.circuit_breaker import can_attempt, record_success, record_failure, status as breaker_status
 
 router = APIRouter(tags=["chat"])
@@ -72,32 +77,32 @@ async def _verify_api_key(raw_request: Request):
 
 # In-memory cache: user_id → preferred persona slug
 # Set when {{persona_switch}} fires, checked before channel default.
-_user_persona: Dict[str, str] = {}
-
-# ── Session file persistence for cross-tier continuity (F-14) ─────────────────
-import json
-from pathlib import Path
+# Idle preferences expire so the map stays bounded.
+_user_persona = TTLStore(
+    "openai.user_persona",
+    ttl=float(os.getenv("USER_PERSONA_TTL", "86400")),
+    maxsize=int(os.getenv("USER_PERSONA_MAX", "10000")),
+    sliding=True,
+)
 
-_sessions_dir = Path(os.getenv(
-    "HERMES_HOME", str(Path.home() / ".hermes")
-)) / "sessions"
+# ── Session journal persistence for cross-tier continuity (F-14) ─────────────
+from app.memory import session_store
 
 
 def _persist_rivebot_turn(session_id: str, user_msg: str, bot_response: str):
-    """Append a RiveBot-handled turn to the Hermes session file.
+    """Append a RiveBot-handled turn to the Hermes session journal.
 
     This ensures Hermes sees RiveBot exchanges in conversation_history
-    on the next turn, maintaining cross-tier continuity.
+    on the next turn, maintaining cross-tier continuity. Append-only —
+    never re-reads or rewrites the existing history.
     """
     if not bot_response:
         return
-    _sessions_dir.mkdir(parents=True, exist_ok=True)
-    session_file = _sessions_dir / f"session_{session_id}.json"
     try:
-        data = json.loads(session_file.read_text()) if session_file.exists() else {"messages": []}
-        data["messages"].append({"role": "user", "content": user_msg})
-        data["messages"].append({"role": "assistant", "content": f"[RiveBot] {bot_response}"})
-        session_file.write_text(json.dumps(data, ensure_ascii=False))
+        session_store.append_messages(session_id, [
+            {"role": "user", "content": user_msg},
+            {"role": "assistant", "content": f"[RiveBot] {bot_response}"},
+        ])
     except Exception as e:
         api_logger.warning(f"Failed to persist RiveBot turn: {e}")
 
@@ -124,6 +129,7 @@ def _openai_response(
     id_prefix: str = "chatcmpl",
 ) -> dict:
     """Build a well-formed OpenAI chat.completion response dict."""
+    metrics.CHAT_RESPONSES.inc(route=id_prefix)
     return {
         "id": f"{id_prefix}-{uuid.uuid4()}",
         "object": "chat.completion",
@@ -152,6 +158,82 @@ def _extract_usage(result: dict) -> tuple[int, int]:
     return usage.get("prompt_tokens", 0), usage.get("completion_tokens", 0)
 
 
+def _sse_chunk(chunk_id: str, model: str, delta: dict, finish_reason: Optional[str] = None) -> str:
+    """One ``chat.completion.chunk`` SSE event."""
+    payload = {
+        "id": chunk_id,
+        "object": "chat.completion.chunk",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+    }
+    return f"data: {json.dumps(payload, ensure_ascii=False)}\n\n"
+
+
+async def _stream_completion(
+    request: OpenAIChatRequest,
+    raw_request: Request,
+    background_tasks: BackgroundTasks,
+) -> AsyncIterator[str]:
+    """Run the normal chat pipeline and emit its reply as OpenAI SSE chunks.
+
+    Hermes text deltas are forwarded as they arrive. Paths that produce a
+    whole reply at once send it as a single content chunk: RiveBot,
+    commands, fallbacks, and Hermes builds without streaming. The headers
+    are already sent by the time the pipeline can fail, so a failure —
+    including Hermes failing after deltas went out — ends the stream with
+    an OpenAI-style error event, a ``finish_reason: "error"`` chunk and
+    ``[DONE]`` instead of an HTTP status.
+    """
+    deltas: asyncio.Queue = asyncio.Queue()
+    task = asyncio.create_task(
+        _chat_completion(request, raw_request, background_tasks, on_delta=deltas.put_nowait)
+    )
+    chunk_id = f"chatcmpl-{uuid.uuid4()}"
+    model = request.model
+    streamed = False
+
+    with metrics.CHAT_REQUEST_SECONDS.time():
+        yield _sse_chunk(chunk_id, model, {"role": "assistant"})
+        try:
+            while not (task.done() and deltas.empty()):
+                getter = asyncio.ensure_future(deltas.get())
+                done, _ = await asyncio.wait({getter, task}, return_when=asyncio.FIRST_COMPLETED)
+                if getter in done:
+                    streamed = True
+                    yield _sse_chunk(chunk_id, model, {"content": getter.result()})
+                else:
+                    getter.cancel()
+
+            response = task.result()
+            if streamed and response["id"].startswith("chatcmpl-noai-"):
+                # Hermes failed after part of the reply went out — the
+                # fallback text can't replace it, so report the failure
+                raise HTTPException(status_code=502, detail="AI service failed mid-reply")
+            if not streamed:
+                content = response["choices"][0]["message"]["content"]
+                yield _sse_chunk(chunk_id, model, {"content": content})
+            yield _sse_chunk(chunk_id, model, {}, finish_reason="stop")
+        except Exception as e:
+            api_logger.error(f"Streaming completion failed for {request.user}: {e}")
+            if isinstance(e, HTTPException):
+                status, message = e.status_code, str(e.detail)
+            else:
+                status, message = 500, "Internal error while generating the reply"
+            error = {"error": {
+                "message": message,
+                "type": "server_error" if status >= 500 else "invalid_request_error",
+                "code": status,
+            }}
+            yield f"data: {json.dumps(error, ensure_ascii=False)}\n\n"
+            yield _sse_chunk(chunk_id, model, {}, finish_reason="error")
+        finally:
+            # Client disconnected mid-stream — let the turn finish and persist
+            if not task.done():
+                task.add_done_callback(lambda t: t.exception())
+        yield "data: [DONE]\n\n"
+
+
 # ── Endpoint ──────────────────────────────────────────────────────────────────
 
 @router.post("/v1/chat/completions", dependencies=[Depends(_verify_api_key)])
@@ -160,14 +242,35 @@ async def openai_chat_completions(
     request: OpenAIChatRequest,
     raw_request: Request,
     background_tasks: BackgroundTasks,
-) -> dict:
-    """OpenAI-compatible chat endpoint consumed by RapidPro's AI LLM config."""
-    api_logger.info(f"Incoming request | model={request.model} | user={request.user}")
-    api_logger.debug(f"Headers: {dict(raw_request.headers)}")
+):
+    """OpenAI-compatible chat endpoint consumed by RapidPro's AI LLM config.
 
+    ``stream=true`` returns ``text/event-stream`` chunks; otherwise a single
+    ``chat.completion`` object.
+    """
     if not request.messages:
         raise HTTPException(status_code=400, detail="No messages provided")
 
+    if request.stream:
+        return StreamingResponse(
+            _stream_completion(request, raw_request, background_tasks),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+    with metrics.CHAT_REQUEST_SECONDS.time():
+        return await _chat_completion(request, raw_request, background_tasks)
+
+
+async def _chat_completion(
+    request: OpenAIChatRequest,
+    raw_request: Request,
+    background_tasks: BackgroundTasks,
+    on_delta: Optional[Callable[[str], None]] = None,
+) -> dict:
+    """Full chat pipeline: parse → auth → RiveBot/commands → Hermes."""
+    api_logger.info(f"Incoming request | model={request.model} | user={request.user}")
+    api_logger.debug(f"Headers: {dict(raw_request.headers)}")
+
     if len(request.messages) > 1:
         api_logger.warning(
             f"Received {len(request.messages)} messages in payload, using last only"
@@ -178,8 +281,9 @@ async def openai_chat_completions(
     # ── 1. Parse RapidPro message prefix ─────────────────────────────────────
     # RapidPro may include attachments in the last message or as a top-level field.
     raw_attachments = request.messages[-1].get("attachments", [])
-    parsed = parse_rapidpro_message(raw_content, user_hint=request.user,
-                                    attachments=raw_attachments)
+    with metrics.CHAT_STAGE_SECONDS.time(stage="parse"):
+        parsed = parse_rapidpro_message(raw_content, user_hint=request.user,
+                                        attachments=raw_attachments)
     api_logger.info(
         f"Parsed | user={parsed.user_id} | channel={parsed.channel_id}"
         f" | content='{parsed.content[:60]}'"
@@ -201,13 +305,14 @@ async def openai_chat_completions(
 
     # ── 1.6 Authorization gate (F-26) ────────────────────────────────────────
     # Check BEFORE RiveBot, commands, or Hermes — blocks all code paths.
-    if _AUTHORIZED_USERS:
-        user_digits = user_id.replace("+", "").split(":")[-1]
-        if user_digits not in _AUTHORIZED_USERS:
-            api_logger.warning(f"Unauthorized user {user_id} — silent drop")
-            return _openai_response(
-                DEFAULT_PERSONA, "", id_prefix="chatcmpl-unauth"
-            )
+    with metrics.CHAT_STAGE_SECONDS.time(stage="authorization"):
+        if _AUTHORIZED_USERS:
+            user_digits = user_id.replace("+", "").split(":")[-1]
+            if user_digits not in _AUTHORIZED_USERS:
+                api_logger.warning(f"Unauthorized user {user_id} — silent drop")
+                return _openai_response(
+                    DEFAULT_PERSONA, "", id_prefix="chatcmpl-unauth"
+                )
 
     # ── 1.5  Attachment handling ─────────────────────────────────────────────
     if parsed.attachments:
@@ -273,6 +378,7 @@ async def openai_chat_completions(
 
     # ── 2. Resolve persona from user preference or channel config ─────────────
     # User preference (from previous persona switch) takes priority
+    _persona_started = time.perf_counter()
     preferred = _user_persona.get(user_id)
     if preferred:
         model_persona, system_prompt_override = await resolve_persona(preferred)
@@ -291,31 +397,23 @@ async def openai_chat_completions(
         # after every service restart (the in-memory cache is volatile).
         if model_persona == DEFAULT_PERSONA:
             try:
-                from app.db import async_session as _as
-                from app.models import Persona
-                from sqlmodel import select as _select
-                async with _as() as session:
-                    result = await session.execute(
-                        _select(Persona).where(Persona.slug == "assistant")
+                assistant_p = await persona_cache.get_persona("assistant")
+                if assistant_p and assistant_p.allowed_urns:
+                    api_logger.debug(
+                        f"Auto-upgrade check: user_id={user_id!r} "
+                        f"urns={sorted(assistant_p.allowed_urns)!r}"
                     )
-                    assistant_p = result.scalar_one_or_none()
-                    if assistant_p and assistant_p.allowed_urns:
-                        urns = assistant_p.allowed_urns
-                        if isinstance(urns, str):
-                            import json as _json
-                            urns = _json.loads(urns)
-                        api_logger.debug(
-                            f"Auto-upgrade check: user_id={user_id!r} urns={urns!r}"
+                    if user_id in assistant_p.allowed_urns:
+                        model_persona = "assistant"
+                        _user_persona[user_id] = "assistant"
+                        api_logger.info(
+                            f"Auto-upgraded {user_id} to assistant (allowed_urns match)"
                         )
-                        if user_id in urns:
-                            model_persona = "assistant"
-                            _user_persona[user_id] = "assistant"
-                            api_logger.info(
-                                f"Auto-upgraded {user_id} to assistant (allowed_urns match)"
-                            )
             except Exception as e:
                 api_logger.warning(f"allowed_urns auto-upgrade check failed: {e}")
 
+    metrics.CHAT_STAGE_SECONDS.observe(time.perf_counter() - _persona_started, stage="persona")
+
     # ── 3. Build persona-scoped thread ID ─────────────────────────────────────
     thread_id = f"whatsapp:{user_id}:{model_persona}"
 
@@ -342,9 +440,10 @@ async def openai_chat_completions(
 
         # F-6: Strip leading punctuation that breaks RiveBot matchers
         clean_message = last_user_message.lstrip('#/')
-        intent_response, rivebot_context = await match_intent(
-            clean_message, model_persona, user_id
-        )
+        with metrics.CHAT_STAGE_SECONDS.time(stage="rivebot_match"):
+            intent_response, rivebot_context = await match_intent(
+                clean_message, model_persona, user_id
+            )
         rivebot_context["urn"] = user_id
         # (noai/silent handling removed — replaced by circuit breaker in §5)
 
@@ -355,26 +454,17 @@ async def openai_chat_completions(
             # ── Permission check (Finding 15) ────────────────────────────────
             # If the target persona has allowed_urns set, verify the user is authorized
             try:
-                from app.db import async_session
-                from app.models import Persona
-                from sqlmodel import select
-
-                async with async_session() as session:
-                    result = await session.execute(
-                        select(Persona).where(Persona.slug == new_slug)
+                target_persona = await persona_cache.get_persona(new_slug)
+                if target_persona and not target_persona.allows(user_id):
+                    api_logger.warning(
+                        f"Persona switch DENIED: {user_id} → {new_slug} "
+                        f"(not in allowed_urns)"
+                    )
+                    return _openai_response(
+                        model_persona,
+                        "⚠️ Ou pa gen aksè nan sèvis sa a.",
+                        id_prefix="chatcmpl-denied",
                     )
-                    target_persona = result.scalar_one_or_none()
-                    if target_persona and target_persona.allowed_urns:
-                        if user_id not in target_persona.allowed_urns:
-                            api_logger.warning(
-                                f"Persona switch DENIED: {user_id} → {new_slug} "
-                                f"(not in allowed_urns)"
-                            )
-                            return _openai_response(
-                                model_persona,
-                                "⚠️ Ou pa gen aksè nan sèvis sa a.",
-                                id_prefix="chatcmpl-denied",
-                            )
             except Exception as e:
                 api_logger.warning(f"Persona permission check failed (allowing): {e}")
 
@@ -482,6 +572,7 @@ async def openai_chat_completions(
             rivebot_context=rivebot_context,
             persona_vars=persona_vars,
             allowed_tools=persona_vars.get("allowed_tools"),
+            on_delta=on_delta,
         )
         final_text = hermes_result.get("final_response", "")
 
@@ -523,23 +614,19 @@ async def openai_chat_completions(
         return _openai_response(model_persona, noai_msg, id_prefix="chatcmpl-noai")
 
     # ── 5.2 Persistence (fire-and-forget — F-08) ─────────────────────────
-    # Palace write runs in background to avoid blocking the HTTP response.
+    # Queued for the bounded background palace writer; never blocks the response.
     if not getattr(final_text, "skip_persistence", False):
-        from app.hooks.palace_writer import persist_turn_to_palace
+        from app.hooks.palace_writer import enqueue_turn
 
-        async def _safe_persist():
-            try:
-                await asyncio.to_thread(
-                    persist_turn_to_palace,
-                    urn=user_id,
-                    persona=model_persona,
-                    user_message=last_user_message,
-                    assistant_response=final_text,
-                )
-            except Exception as e:
-                api_logger.warning(f"Background palace write failed: {e}")
-
-        asyncio.create_task(_safe_persist())
+        try:
+            enqueue_turn(
+                urn=user_id,
+                persona=model_persona,
+                user_message=last_user_message,
+                assistant_response=final_text,
+            )
+        except Exception as e:
+            api_logger.warning(f"Palace enqueue failed: {e}")
 
     # ── 5.5 Advance RiveBot topic using tool metadata (F-23) ──────────────────
     from app.api.middleware.rivebot_client import (
@@ -1,10 +1,13 @@
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 import asyncio
+import time
 
 from fastapi import APIRouter, Header, HTTPException, Request, Depends
 from loguru import logger
+from pydantic import BaseModel, Field
 import os
 
+from app.hermes import executors, tool_cache
 from app.hermes.tools import get_hermes_tools  # Ensures tools are registered
 
 router = APIRouter(tags=["tools"])
@@ -14,6 +17,12 @@ _CRM_TOOLS = {"crm_list_groups", "crm_lookup_contact", "crm_org_info", "crm_crea
 
 INTERNAL_API_KEY = os.getenv("GATEWAY_INTERNAL_KEY", "")
 
+# /v1/tools:batch limits
+_BATCH_MAX = int(os.getenv("TOOLS_BATCH_MAX", "20"))            # invocations per request
+_BATCH_CONCURRENCY = int(os.getenv("TOOLS_BATCH_CONCURRENCY", "8"))  # running at once per request
+_PER_TOOL_LIMIT = int(os.getenv("TOOLS_BATCH_PER_TOOL", "2"))  # same tool at once, across batches
+_tool_slots: Dict[str, asyncio.Semaphore] = {}
+
 async def verify_internal_key(x_api_key: str = Header(None, alias="X-API-Key")):
     """Validate that the caller is an authorized internal service (RiveBot).
 
@@ -72,9 +81,12 @@ async def _invoke_tool(tool_name: str, kwargs: Dict[str, Any], user_id: str,
             pass  # best-effort — don't block the tool call
 
     try:
-        # Hermes handlers are synchronous, we wrap them so they don't block RiveBot requests
+        # Hermes handlers are synchronous; each runs on its class executor
+        # (network/db/cpu) within its deadline so it can't block RiveBot requests
         handler = getattr(tool_entry, "handler")
-        result = await asyncio.to_thread(handler, kwargs if kwargs else {"user_id": user_id})
+        result = await executors.run(tool_name, handler, kwargs if kwargs else {"user_id": user_id})
+    except executors.ToolTimeout as e:
+        raise HTTPException(status_code=504, detail=str(e))
     except Exception as e:
         logger.error(f"[tools] {tool_name} raised {type(e).__name__}: {e}")
         raise HTTPException(status_code=500, detail=f"Tool '{tool_name}' failed: {e}")
@@ -83,6 +95,16 @@ async def _invoke_tool(tool_name: str, kwargs: Dict[str, Any], user_id: str,
 
 
 
+def _header_context(active_pub: Optional[str], active_talk_id: Optional[str],
+                    active_revision: Optional[str]) -> Dict[str, str]:
+    """Build the tool context from RiveBot's X-Active-* headers."""
+    context = {}
+    if active_pub: context["active_pub"] = active_pub
+    if active_talk_id: context["active_talk_id"] = active_talk_id
+    if active_revision: context["active_revision"] = active_revision
+    return context
+
+
 @router.post("/v1/tools/{tool_name}", dependencies=[Depends(verify_internal_key)])
 async def call_tool_post(
     tool_name: str,
@@ -97,10 +119,7 @@ async def call_tool_post(
     Called by RiveBot macro_bridge for tools that need arguments.
     """
     user_id = x_user_id or "rivebot"
-    context = {}
-    if x_active_pub: context["active_pub"] = x_active_pub
-    if x_active_talk_id: context["active_talk_id"] = x_active_talk_id
-    if x_active_revision: context["active_revision"] = x_active_revision
+    context = _header_context(x_active_pub, x_active_talk_id, x_active_revision)
 
     try:
         body = await request.json()
@@ -127,11 +146,108 @@ async def call_tool_get(
     Called by RiveBot macro_bridge for simple status/list tools.
     """
     user_id = x_user_id or "rivebot"
-    context = {}
-    if x_active_pub: context["active_pub"] = x_active_pub
-    if x_active_talk_id: context["active_talk_id"] = x_active_talk_id
-    if x_active_revision: context["active_revision"] = x_active_revision
+    context = _header_context(x_active_pub, x_active_talk_id, x_active_revision)
 
     logger.info(f"[tools] GET {tool_name} | user={user_id} | ctx={context}")
     result = await _invoke_tool(tool_name, {}, user_id, context)
     return {"result": result}
+
+
+# ── Batch invocation ────────────────────────────────────────────────────────
+# Some RiveBot menus need several tool results (schedule + assignments +
+# notifications). One POST /v1/tools:batch replaces N round-trips; the
+# calls run concurrently and come back in request order.
+
+class ToolCall(BaseModel):
+    tool: str
+    args: Dict[str, Any] = Field(default_factory=dict)
+    # Per-item overrides of the X-User-Id / X-Active-* request headers
+    user_id: Optional[str] = None
+    context: Dict[str, str] = Field(default_factory=dict)
+
+
+class ToolBatchRequest(BaseModel):
+    calls: List[ToolCall]
+    # Run in order, one at a time — for calls that depend on each other
+    sequential: bool = False
+
+
+def _tool_slot(tool_name: str) -> asyncio.Semaphore:
+    slot = _tool_slots.get(tool_name)
+    if slot is None:
+        slot = _tool_slots.setdefault(tool_name, asyncio.Semaphore(_PER_TOOL_LIMIT))
+    return slot
+
+
+async def _invoke_batch_item(call: ToolCall, user_id: str, context: Dict[str, str],
+                             batch_slots: asyncio.Semaphore) -> dict:
+    """Run one batch item; failures are reported in the item, never raised."""
+    start = time.perf_counter()
+    item: Dict[str, Any] = {"tool": call.tool}
+    try:
+        # Per-tool slot first: an item queued behind a busy tool must not
+        # hold one of the batch's slots while it waits
+        async with _tool_slot(call.tool), batch_slots:
+            item["result"] = await _invoke_tool(
+                call.tool, dict(call.args), call.user_id or user_id, {**context, **call.context},
+            )
+        item["ok"] = True
+    except HTTPException as e:
+        item.update(ok=False, status=e.status_code, error=str(e.detail))
+    except Exception as e:
+        logger.error(f"[tools] batch item {call.tool} raised {type(e).__name__}: {e}")
+        item.update(ok=False, status=500, error=f"Tool '{call.tool}' failed: {e}")
+    item["elapsed_ms"] = round((time.perf_counter() - start) * 1000, 1)
+    return item
+
+
+@router.post("/v1/tools:batch", dependencies=[Depends(verify_internal_key)])
+async def call_tools_batch(
+    batch: ToolBatchRequest,
+    x_user_id: Optional[str] = Header(None, alias="X-User-Id"),
+    x_active_pub: Optional[str] = Header(None, alias="X-Active-Pub"),
+    x_active_talk_id: Optional[str] = Header(None, alias="X-Active-Talk-Id"),
+    x_active_revision: Optional[str] = Header(None, alias="X-Active-Revision"),
+) -> dict:
+    """
+    Invoke several tools in one request.
+    Results are returned in request order with per-item timings; one
+    failing item does not fail the batch. Independent calls run
+    concurrently (TOOLS_BATCH_CONCURRENCY per request, TOOLS_BATCH_PER_TOOL
+    per tool name) unless `sequential` is set.
+    """
+    if not batch.calls:
+        return {"results": [], "elapsed_ms": 0.0}
+    if len(batch.calls) > _BATCH_MAX:
+        raise HTTPException(status_code=400, detail=f"Batch too large: {len(batch.calls)} > {_BATCH_MAX} calls")
+
+    user_id = x_user_id or "rivebot"
+    context = _header_context(x_active_pub, x_active_talk_id, x_active_revision)
+    logger.info(
+        f"[tools] BATCH {[c.tool for c in batch.calls]} | user={user_id} | "
+        f"ctx={context} | sequential={batch.sequential}"
+    )
+
+    start = time.perf_counter()
+    batch_slots = asyncio.Semaphore(1 if batch.sequential else _BATCH_CONCURRENCY)
+    if batch.sequential:
+        results = [await _invoke_batch_item(c, user_id, context, batch_slots) for c in batch.calls]
+    else:
+        results = await asyncio.gather(
+            *(_invoke_batch_item(c, user_id, context, batch_slots) for c in batch.calls)
+        )
+    return {"results": results, "elapsed_ms": round((time.perf_counter() - start) * 1000, 1)}
+
+
+# ── Tool result cache admin ─────────────────────────────────────────────────
+
+@router.delete("/v1/tools:cache", dependencies=[Depends(verify_internal_key)])
+async def flush_tool_cache(group: Optional[str] = None, tool: Optional[str] = None) -> dict:
+    """
+    Flush cached read-only tool results (app/hermes/tool_cache.py).
+    With no parameters everything is dropped; ?group=organized or
+    ?tool=crm_list_groups narrow it (e.g. after editing data in Organized).
+    """
+    dropped = tool_cache.flush(group=group, tool=tool)
+    logger.info(f"[tools] cache flush group={group} tool={tool} → {dropped} entries")
+    return {"flushed": dropped, "group": group, "tool": tool}
@@ -14,15 +14,32 @@ import app.models  # Register SQLModel tables
 async def lifespan(app: FastAPI):
     from app.hooks.siyuan_tools import _init_notebook_map
     from app.hermes.tools import register_all_tools
+    from app.api.middleware import http_clients
+    from app.utils import http_sessions
     
     # Startup: Initialize DB, then seed default personas
     await init_db()
     await seed_personas()
+
+    # Pooled keep-alive clients for RiveBot / WuzAPI (one per upstream)
+    await http_clients.startup()
     
     # V2 Init: Pre-load SiYuan configuration and register Hermes tools
     _init_notebook_map()
     register_all_tools()
 
+    # Local SiYuan mirror: serves reads while SiYuan is slow or restarting
+    from app.hooks import siyuan_mirror
+    siyuan_mirror.start()
+
+    # TalkPrep background jobs: resume what a restart interrupted
+    from app.hooks import talkprep_jobs
+    talkprep_jobs.start()
+
+    # Broadcasts: resume chunked sends a restart interrupted
+    from app.hooks import broadcasts
+    broadcasts.start()
+
     # V3 Init: Ensure FSRS mastery tables exist in PostgreSQL
     from app.plugins.social.mastery import ensure_tables as ensure_mastery_tables
     ensure_mastery_tables()
@@ -32,7 +49,8 @@ async def lifespan(app: FastAPI):
     async def _cleanup_dumps_loop():
         import os, time
         from app.logger import logger
-        dumps_dir = "/opt/iiab/ai-gateway/data/dumps"
+        from app.config import data_path
+        dumps_dir = data_path("dumps")
         while True:
             try:
                 if os.path.exists(dumps_dir):
@@ -50,7 +68,21 @@ async def lifespan(app: FastAPI):
     
     yield
     cleanup_task.cancel()
-    # Shutdown: Cleanup if needed
+    # Shutdown: stop the background engines first — they still use the
+    # pooled clients below, which get_client() would otherwise rebuild
+    await broadcasts.stop()
+    talkprep_jobs.stop()
+    await asyncio.to_thread(siyuan_mirror.stop)
+    # Flush queued MemPalace turns before the process exits
+    from app.hooks import palace_writer
+    await asyncio.to_thread(palace_writer.shutdown)
+    from app.hermes import executors
+    executors.shutdown()
+    from app.plugins.social import mastery
+    mastery.close_pool()
+    # Close pooled upstream connections last
+    await http_clients.shutdown()
+    http_sessions.close_all()
 
 
 def create_app() -> FastAPI:
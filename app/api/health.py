@@ -9,10 +9,33 @@ import os
 
 import httpx
 from fastapi import APIRouter
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
+
+from app.api.middleware import circuit_breaker
+from app.hermes import agent_pool, executors
+from app.hooks import broadcasts, siyuan_mirror, talkprep_jobs
+from app.utils import http_sessions, metrics, ttl_store
 
 router = APIRouter(tags=["observability"])
 
+# Scrape-time gauges for state owned by modules outside the chat pipeline
+metrics.Gauge(
+    "gateway_breaker_state",
+    "Circuit breaker state (1 for the current state).",
+    lambda: {s.value: int(s.value == circuit_breaker.status()["state"]) for s in circuit_breaker.State},
+    labelnames=("state",),
+)
+metrics.Gauge(
+    "gateway_agent_pool_hit_ratio",
+    "Share of Hermes invocations served by a warm pooled agent.",
+    lambda: agent_pool.stats()["hit_rate"],
+)
+metrics.Gauge(
+    "gateway_state_bytes",
+    "Approximate bytes held by bounded in-process state stores.",
+    lambda: ttl_store.total_bytes(),
+)
+
 _LITELLM_BASE = os.getenv("OPENAI_API_BASE", "http://localhost:4000")
 _LITELLM_KEY = os.getenv("OPENAI_API_KEY", "")
 
@@ -62,5 +85,26 @@ async def health() -> JSONResponse:
             "status": "ok" if is_ok else "degraded",
             "version": version,
             "services": {"litellm": litellm_status, "db": db_status},
+            "state_bytes": ttl_store.total_bytes(),
         },
     )
+
+
+@router.get("/health/state")
+async def health_state() -> dict:
+    """Size and approximate memory of the bounded in-process state stores."""
+    return {
+        "total_bytes": ttl_store.total_bytes(),
+        "stores": ttl_store.stats(),
+        "siyuan_mirror": siyuan_mirror.stats(),
+        "talkprep_jobs": talkprep_jobs.stats(),
+        "broadcasts": broadcasts.stats(),
+        "tool_executors": executors.stats(),
+        "http_sessions": http_sessions.stats(),
+    }
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def prometheus_metrics() -> PlainTextResponse:
+    """Prometheus text exposition of pipeline latencies, counters and gauges."""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
@@ -19,6 +19,7 @@ from enum import Enum
 from typing import Optional
 
 from app.logger import logger
+from app.utils.metrics import BREAKER_TRANSITIONS
 
 _logger = logger.bind(name="CircuitBreaker")
 
@@ -65,6 +66,7 @@ def can_attempt() -> bool:
             elapsed = time.time() - _opened_at
             if elapsed >= COOLDOWN:
                 _state = State.HALF_OPEN
+                BREAKER_TRANSITIONS.inc(from_state="open", to_state="half_open")
                 _logger.info(
                     f"Cooldown expired ({elapsed:.0f}s) — transitioning to HALF_OPEN"
                 )
@@ -87,6 +89,7 @@ def record_success() -> None:
         _failure_timestamps.clear()
         _last_failure_reason = None
         if prev != State.CLOSED:
+            BREAKER_TRANSITIONS.inc(from_state=prev.value, to_state="closed")
             _logger.info(f"AI recovered — circuit {prev.value} → CLOSED")
 
 
@@ -104,6 +107,7 @@ def record_failure(reason: str = "") -> None:
             # Probe failed — reopen
             _state = State.OPEN
             _opened_at = now
+            BREAKER_TRANSITIONS.inc(from_state="half_open", to_state="open")
             _logger.warning(f"Probe failed — circuit HALF_OPEN → OPEN: {reason}")
             return
 
@@ -111,6 +115,7 @@ def record_failure(reason: str = "") -> None:
             if len(_failure_timestamps) >= FAILURE_THRESHOLD:
                 _state = State.OPEN
                 _opened_at = now
+                BREAKER_TRANSITIONS.inc(from_state="closed", to_state="open")
                 _logger.warning(
                     f"Threshold reached ({len(_failure_timestamps)} failures "
                     f"in {FAILURE_WINDOW}s) — circuit CLOSED → OPEN: {reason}"
@@ -0,0 +1,129 @@
+"""
+Shared, long-lived async HTTP clients for upstream services.
+
+One message can make 3–5 calls to RiveBot and WuzAPI (match, set-vars,
+set-topic, reactions). Building an ``httpx.AsyncClient`` per call paid for
+a fresh connection pool and TCP handshake every time. Instead, each
+upstream gets one pooled client with keep-alive, created in the FastAPI
+lifespan (app/api/app.py) and closed on shutdown.
+
+Clients are also created lazily on first use, so scripts and tests that
+never run the lifespan still work. Per-call timeouts are passed at the
+call site — the client default is only a fallback.
+
+Connection pools are bound to the event loop that created them, so
+clients are tracked per loop. The main server loop gets the long-lived
+pool; sync tool threads call run_sync(), whose throwaway loop gets its
+own clients and closes them before the loop goes away.
+
+Tunables (env):
+  HTTP_POOL_MAX_CONNECTIONS   — max open connections per upstream (default 20)
+  HTTP_POOL_MAX_KEEPALIVE     — idle connections kept warm (default 10)
+  HTTP_POOL_KEEPALIVE_EXPIRY  — seconds an idle connection is kept (default 30)
+"""
+
+import asyncio
+import os
+import weakref
+from typing import Awaitable, Dict, Optional, TypeVar
+
+import httpx
+from loguru import logger
+
+_MAX_CONNECTIONS = int(os.getenv("HTTP_POOL_MAX_CONNECTIONS", "20"))
+_MAX_KEEPALIVE = int(os.getenv("HTTP_POOL_MAX_KEEPALIVE", "10"))
+_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_POOL_KEEPALIVE_EXPIRY", "30"))
+
+RIVEBOT = "rivebot"
+WUZAPI = "wuzapi"
+RAPIDPRO = "rapidpro"
+
+T = TypeVar("T")
+
+# {event_loop: {upstream_name: client}} — weak so per-thread loops don't leak
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, httpx.AsyncClient]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _build_client(name: str) -> httpx.AsyncClient:
+    """Create a pooled keep-alive client for one upstream."""
+    limits = httpx.Limits(
+        max_connections=_MAX_CONNECTIONS,
+        max_keepalive_connections=_MAX_KEEPALIVE,
+        keepalive_expiry=_KEEPALIVE_EXPIRY,
+    )
+    logger.debug(f"[http] Creating pooled client '{name}' ({limits})")
+    return httpx.AsyncClient(limits=limits, timeout=httpx.Timeout(15.0))
+
+
+def get_client(name: str) -> httpx.AsyncClient:
+    """Return the shared client for an upstream on the running loop."""
+    loop_clients = _clients.setdefault(asyncio.get_running_loop(), {})
+    client = loop_clients.get(name)
+    if client is None or client.is_closed:
+        client = _build_client(name)
+        loop_clients[name] = client
+    return client
+
+
+def rivebot_client() -> httpx.AsyncClient:
+    """Shared client for RiveBot (match, set-var(s), set-topic)."""
+    return get_client(RIVEBOT)
+
+
+def wuzapi_client() -> httpx.AsyncClient:
+    """Shared client for WuzAPI (reactions, presence, buttons, documents)."""
+    return get_client(WUZAPI)
+
+
+def rapidpro_client() -> httpx.AsyncClient:
+    """Shared client for RapidPro (broadcast flow starts)."""
+    return get_client(RAPIDPRO)
+
+
+async def startup() -> None:
+    """Pre-create all upstream clients. Called from the FastAPI lifespan."""
+    for name in (RIVEBOT, WUZAPI):
+        get_client(name)
+
+
+async def shutdown() -> None:
+    """Close the running loop's clients and their pooled connections."""
+    loop_clients = _clients.pop(asyncio.get_running_loop(), {})
+    for name, client in loop_clients.items():
+        try:
+            await client.aclose()
+        except Exception as e:
+            logger.warning(f"[http] Failed to close client '{name}': {e}")
+
+
+def run_sync(awaitable: Awaitable[T]) -> T:
+    """Run a coroutine from a sync thread on a throwaway loop.
+
+    Clients the coroutine created on that loop are closed before it
+    returns — a plain asyncio.run() would leave their sockets open.
+    """
+    async def _run() -> T:
+        try:
+            return await awaitable
+        finally:
+            await shutdown()
+
+    return asyncio.run(_run())
+
+
+def stats() -> Dict[str, Optional[dict]]:
+    """Pool configuration per upstream, for debug endpoints."""
+    result: Dict[str, Optional[dict]] = {}
+    for loop_clients in list(_clients.values()):
+        for name, client in loop_clients.items():
+            entry = result.setdefault(name, {
+                "clients": 0,
+                "closed": 0,
+                "max_connections": _MAX_CONNECTIONS,
+                "max_keepalive": _MAX_KEEPALIVE,
+            })
+            entry["clients"] += 1
+            entry["closed"] += int(client.is_closed)
+    return result
@@ -2,6 +2,8 @@
 RiveBot HTTP client — called from the AI Gateway to:
   1. Pre-match messages before Hermes Agent (match_intent)
   2. Advance a user's workflow topic when a stage-completing tool runs (set_topic)
+
+All calls share one pooled keep-alive client (see http_clients.py).
 """
 
 import os
@@ -10,6 +12,8 @@ from typing import Optional
 import httpx
 from loguru import logger
 
+from app.api.middleware.http_clients import rivebot_client
+
 RIVEBOT_URL = os.getenv("RIVEBOT_URL", "http://127.0.0.1:8087")
 
 # Tools that complete a workflow stage mapped to the topic they unlock.
@@ -41,20 +45,20 @@ async def match_intent(
                     May contain "silent": True when noai 3rd+ fallback triggers.
     """
     try:
-        async with httpx.AsyncClient(timeout=15.0) as client:
-            resp = await client.post(
-                f"{RIVEBOT_URL}/match",
-                json={"message": message, "persona": persona, "user": user_id},
-            )
-            if resp.status_code == 200:
-                data = resp.json()
-                context = data.get("context", {})
-                # Propagate silence flag from noai escalation
-                if data.get("silent"):
-                    context["silent"] = True
-                if data.get("matched"):
-                    return data.get("response"), context
-                return None, context
+        resp = await rivebot_client().post(
+            f"{RIVEBOT_URL}/match",
+            json={"message": message, "persona": persona, "user": user_id},
+            timeout=15.0,
+        )
+        if resp.status_code == 200:
+            data = resp.json()
+            context = data.get("context", {})
+            # Propagate silence flag from noai escalation
+            if data.get("silent"):
+                context["silent"] = True
+            if data.get("matched"):
+                return data.get("response"), context
+            return None, context
         return None, {}
     except httpx.TimeoutException:
         logger.warning(f"[rivebot] Timeout reaching {RIVEBOT_URL}")
@@ -73,16 +77,16 @@ async def set_var(
     Used to toggle noai mode when AI fails or recovers.
     """
     try:
-        async with httpx.AsyncClient(timeout=1.5) as client:
-            resp = await client.post(
-                f"{RIVEBOT_URL}/set-var",
-                json={"persona": persona, "user": user_id, "var": var, "value": value},
-            )
-            if resp.status_code == 200:
-                _msg = "[rivebot] " + persona + ":" + user_id + " — set " + var + "=" + value
-                logger.opt(depth=0).info(_msg.replace("{", "{{").replace("}", "}}"))
-            else:
-                logger.warning(f"[rivebot] set-var returned {resp.status_code}: {resp.text[:80]}")
+        resp = await rivebot_client().post(
+            f"{RIVEBOT_URL}/set-var",
+            json={"persona": persona, "user": user_id, "var": var, "value": value},
+            timeout=1.5,
+        )
+        if resp.status_code == 200:
+            _msg = "[rivebot] " + persona + ":" + user_id + " — set " + var + "=" + value
+            logger.opt(depth=0).info(_msg.replace("{", "{{").replace("}", "}}"))
+        else:
+            logger.warning(f"[rivebot] set-var returned {resp.status_code}: {resp.text[:80]}")
     except Exception as e:
         logger.warning(f"[rivebot] set-var failed (non-blocking): {e}")
 
@@ -95,17 +99,17 @@ async def set_vars(
     Single HTTP round-trip instead of N sequential /set-var calls.
     """
     try:
-        async with httpx.AsyncClient(timeout=2.0) as client:
-            resp = await client.post(
-                f"{RIVEBOT_URL}/set-vars",
-                json={"persona": persona, "user": user_id, "vars": variables},
-            )
-            if resp.status_code == 200:
-                keys = ", ".join(k + "=" + v for k, v in variables.items())
-                _msg = "[rivebot] " + persona + ":" + user_id + " — set " + keys
-                logger.opt(depth=0).info(_msg.replace("{", "{{").replace("}", "}}"))
-            else:
-                logger.warning(f"[rivebot] set-vars returned {resp.status_code}: {resp.text[:80]}")
+        resp = await rivebot_client().post(
+            f"{RIVEBOT_URL}/set-vars",
+            json={"persona": persona, "user": user_id, "vars": variables},
+            timeout=2.0,
+        )
+        if resp.status_code == 200:
+            keys = ", ".join(k + "=" + v for k, v in variables.items())
+            _msg = "[rivebot] " + persona + ":" + user_id + " — set " + keys
+            logger.opt(depth=0).info(_msg.replace("{", "{{").replace("}", "}}"))
+        else:
+            logger.warning(f"[rivebot] set-vars returned {resp.status_code}: {resp.text[:80]}")
     except Exception as e:
         logger.warning(f"[rivebot] set-vars failed (non-blocking): {e}")
 
@@ -123,17 +127,14 @@ async def advance_topic_if_needed(tool_name: str, persona: str, user_id: str) ->
         return
 
     try:
-        async with httpx.AsyncClient(timeout=1.0) as client:
-            resp = await client.post(
-                f"{RIVEBOT_URL}/set-topic",
-                json={"persona": persona, "user": user_id, "topic": next_topic},
-            )
-            if resp.status_code == 200:
-                logger.info(f"[rivebot] {user_id}: topic → {next_topic} (via {tool_name})")
-            else:
-                logger.warning(f"[rivebot] set-topic returned {resp.status_code}: {resp.text[:80]}")
+        resp = await rivebot_client().post(
+            f"{RIVEBOT_URL}/set-topic",
+            json={"persona": persona, "user": user_id, "topic": next_topic},
+            timeout=1.0,
+        )
+        if resp.status_code == 200:
+            logger.info(f"[rivebot] {user_id}: topic → {next_topic} (via {tool_name})")
+        else:
+            logger.warning(f"[rivebot] set-topic returned {resp.status_code}: {resp.text[:80]}")
     except Exception as e:
         logger.warning(f"[rivebot] set-topic failed (non-blocking): {e}")
-
-
-
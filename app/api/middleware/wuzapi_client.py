@@ -10,11 +10,14 @@ Currently supports:
 - WhatsApp Status text (set_status)
 
 WuzAPI docs: /opt/iiab/wuzapi/API.md
+
+All calls share one pooled keep-alive client (see http_clients.py).
 """
 
 import os
 import logging
-import httpx
+
+from app.api.middleware.http_clients import wuzapi_client
 
 logger = logging.getLogger("ai-gateway.wuzapi")
 
@@ -45,12 +48,12 @@ async def send_reaction(
     payload = {"Phone": phone, "Body": emoji, "Id": message_id}
 
     try:
-        async with httpx.AsyncClient(timeout=5.0) as client:
-            resp = await client.post(
-                url,
-                json=payload,
-                headers={"Authorization": WUZAPI_TOKEN},
-            )
+        resp = await wuzapi_client().post(
+            url,
+            json=payload,
+            headers={"Authorization": WUZAPI_TOKEN},
+            timeout=5.0,
+        )
         if resp.status_code == 200:
             logger.info(f"Reaction {emoji} sent to {phone} on msg {message_id}")
             return True
@@ -79,12 +82,12 @@ async def mark_as_read(phone: str, message_id: str) -> bool:
     payload = {"Id": message_id, "Chat": f"{phone}@s.whatsapp.net"}
 
     try:
-        async with httpx.AsyncClient(timeout=5.0) as client:
-            resp = await client.post(
-                url,
-                json=payload,
-                headers={"Authorization": WUZAPI_TOKEN},
-            )
+        resp = await wuzapi_client().post(
+            url,
+            json=payload,
+            headers={"Authorization": WUZAPI_TOKEN},
+            timeout=5.0,
+        )
         return resp.status_code == 200
     except Exception:
         return False
@@ -114,17 +117,51 @@ async def send_presence(
     payload = {"Phone": phone, "State": state}
 
     try:
-        async with httpx.AsyncClient(timeout=3.0) as client:
-            resp = await client.post(
-                url,
-                json=payload,
-                headers={"Authorization": WUZAPI_TOKEN},
-            )
+        resp = await wuzapi_client().post(
+            url,
+            json=payload,
+            headers={"Authorization": WUZAPI_TOKEN},
+            timeout=3.0,
+        )
         return resp.status_code == 200
     except Exception:
         return False
 
 
+async def send_text(phone: str, body: str) -> bool:
+    """Send a plain text message via WuzAPI.
+
+    Used for replies that arrive after the request that triggered them
+    has returned (e.g. TalkPrep background jobs).
+
+    Args:
+        phone: Recipient phone number (digits only).
+        body: Message text (WhatsApp markdown allowed).
+
+    Returns:
+        True if sent successfully.
+    """
+    if not WUZAPI_TOKEN:
+        logger.warning("WUZAPI_TOKEN not set — cannot send text")
+        return False
+
+    try:
+        resp = await wuzapi_client().post(
+            f"{WUZAPI_URL}/chat/send/text",
+            json={"Phone": phone, "Body": body},
+            headers={"Authorization": WUZAPI_TOKEN},
+            timeout=10.0,
+        )
+        if resp.status_code == 200:
+            logger.info(f"Text message sent to {phone}")
+            return True
+        logger.warning(f"WuzAPI send text failed: {resp.status_code} {resp.text[:200]}")
+        return False
+    except Exception as e:
+        logger.warning(f"WuzAPI send text error: {e}")
+        return False
+
+
 async def send_buttons(
     phone: str,
     content: str,
@@ -174,12 +211,12 @@ async def send_buttons(
     }
 
     try:
-        async with httpx.AsyncClient(timeout=5.0) as client:
-            resp = await client.post(
-                f"{WUZAPI_URL}/chat/send/buttons",
-                json=payload,
-                headers={"Authorization": WUZAPI_TOKEN},
-            )
+        resp = await wuzapi_client().post(
+            f"{WUZAPI_URL}/chat/send/buttons",
+            json=payload,
+            headers={"Authorization": WUZAPI_TOKEN},
+            timeout=5.0,
+        )
         if resp.status_code == 200:
             labels = [b["title"] for b in formatted_buttons]
             logger.info(f"Button message sent to {phone}: {labels}")
@@ -220,12 +257,12 @@ async def send_document(
     }
 
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            resp = await client.post(
-                url,
-                json=payload,
-                headers={"Authorization": WUZAPI_TOKEN},
-            )
+        resp = await wuzapi_client().post(
+            url,
+            json=payload,
+            headers={"Authorization": WUZAPI_TOKEN},
+            timeout=30.0,
+        )
         if resp.status_code == 200:
             logger.info(f"Document {filename} sent to {phone}")
             return True
@@ -258,12 +295,12 @@ async def set_status(
     }
 
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            resp = await client.post(
-                url,
-                json=payload,
-                headers={"Authorization": WUZAPI_TOKEN},
-            )
+        resp = await wuzapi_client().post(
+            url,
+            json=payload,
+            headers={"Authorization": WUZAPI_TOKEN},
+            timeout=10.0,
+        )
         if resp.status_code == 200:
             logger.info(f"WhatsApp status set to: {text}")
             return True
@@ -273,4 +310,3 @@ async def set_status(
     except Exception as e:
         logger.warning(f"WuzAPI set status error: {e}")
         return False
-
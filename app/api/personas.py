@@ -5,6 +5,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db import get_session
 from app.models import Persona, PersonaCreate, PersonaRead, PersonaUpdate
+from app.services import persona_cache
 
 router = APIRouter()
 
@@ -16,6 +17,7 @@ async def create_persona(
     db_persona = Persona.model_validate(persona)
     session.add(db_persona)
     await session.commit()
+    persona_cache.invalidate()
     await session.refresh(db_persona)
     return db_persona
 
@@ -56,6 +58,7 @@ async def update_persona(
         
     session.add(db_persona)
     await session.commit()
+    persona_cache.invalidate()
     await session.refresh(db_persona)
     return db_persona
 
@@ -70,4 +73,5 @@ async def delete_persona(
     
     await session.delete(db_persona)
     await session.commit()
+    persona_cache.invalidate()
     return {"ok": True}
@@ -7,6 +7,15 @@ from typing import Literal, Dict
 
 LLMRole = Literal["default", "summarizer"]
 
+# Writable gateway state (SQLite stores, analytics dumps) lives under one
+# directory so nothing depends on the process working directory.
+DATA_DIR = os.getenv("GATEWAY_DATA_DIR", "/opt/iiab/ai-gateway/data")
+
+
+def data_path(name: str) -> str:
+    """Absolute path of `name` inside DATA_DIR."""
+    return os.path.join(DATA_DIR, name)
+
 
 class LLMConfig(BaseModel):
     model: str = "gemini/gemini-2.5-flash"
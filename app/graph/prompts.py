@@ -7,9 +7,6 @@ first-class objects to support observability, experimentation, and monitoring.
 """
 
 from typing import Optional, Dict, Any
-from sqlmodel import select
-from app.db import async_session
-from app.models import Persona
 
 
 class PersonaPromptRegistry:
@@ -17,8 +14,9 @@ class PersonaPromptRegistry:
     Registry for persona-specific attributes used to construct character cards.
 
     Single source of truth: the Persona DB table (seeded on first boot by
-    app/db/seed.py). The static _FALLBACK dict is used ONLY if the DB is
-    unreachable — it should never be the primary path.
+    app/db/seed.py), read through app.services.persona_cache. The static
+    _FALLBACK dict is used ONLY if the DB is unreachable — it should never
+    be the primary path.
     """
 
     # Last-resort fallback — matches the seed data in seed.py.
@@ -32,31 +30,6 @@ class PersonaPromptRegistry:
         },
     }
 
-    @classmethod
-    def _db_to_dict(cls, p) -> dict:
-        """Convert a Persona DB record to the dict format expected by prompts."""
-        import json
-        tools = p.allowed_tools or []
-        if isinstance(tools, str):
-            try:
-                tools = json.loads(tools)
-            except Exception:
-                tools = []
-        # Parse allowed_urns (may be stored as JSON string in SQLite)
-        urns = p.allowed_urns or []
-        if isinstance(urns, str):
-            try:
-                urns = json.loads(urns)
-            except Exception:
-                urns = []
-        return {
-            "persona_name": p.name,
-            "persona_personality": p.personality,
-            "persona_style": p.style,
-            "allowed_tools": tools,
-            "allowed_urns": urns,
-        }
-
     @classmethod
     def get(cls, persona: str) -> dict:
         """
@@ -68,28 +41,18 @@ class PersonaPromptRegistry:
     @classmethod
     async def get_async(cls, persona: str) -> dict:
         """
-        Primary lookup: DB by slug → DB by id → static fallback.
+        Primary lookup: persona cache by slug → by id → static fallback.
         """
         import os
+        from app.services import persona_cache
+
         base_data = None
 
+        # 1–2. Cached persona (slug match, then ID match)
         try:
-            async with async_session() as session:
-                # 1. Try slug match (primary)
-                result = await session.execute(
-                    select(Persona).where(Persona.slug == persona)
-                )
-                db_persona = result.scalar_one_or_none()
-
-                # 2. Try ID match (for UUID-based lookups from ChannelConfig)
-                if not db_persona:
-                    result = await session.execute(
-                        select(Persona).where(Persona.id == persona)
-                    )
-                    db_persona = result.scalar_one_or_none()
-
-                if db_persona:
-                    base_data = cls._db_to_dict(db_persona)
+            cached = await persona_cache.get_persona(persona)
+            if cached:
+                base_data = cached.prompt_vars()
         except Exception:
             pass  # Fall through to static fallback
 
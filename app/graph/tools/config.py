@@ -19,6 +19,8 @@ from contextlib import contextmanager
 from sqlalchemy import create_engine
 from sqlmodel import Session
 
+from app.services import persona_cache
+
 logger = logging.getLogger(__name__)
 
 # Build sync DB URL from the async one (swap aiosqlite → sqlite, asyncpg → psycopg2)
@@ -147,6 +149,7 @@ def macro_persona(args: dict, **kw) -> str:
             )
             session.add(new_persona)
             session.commit()
+            persona_cache.invalidate()
             return f"✅ Persona `{slug}` created.\nStyle: {style}\nPrompt: {instruction[:50]}..."
 
         elif action == "delete":
@@ -167,6 +170,7 @@ def macro_persona(args: dict, **kw) -> str:
                 return f"🚫 Cannot delete: assigned to channel(s): `{channels}`. Reassign first."
             session.delete(p)
             session.commit()
+            persona_cache.invalidate()
             return f"🗑️ Persona `{p.name}` deleted."
 
     return f"❌ Unknown action: {action}"
@@ -231,6 +235,7 @@ def macro_channel(args: dict, **kw) -> str:
                 session.add(config)
                 msg = f"✅ Assigned channel `{phone}` → Persona `{p.name}`."
             session.commit()
+            persona_cache.invalidate()
             return msg
 
     return f"❌ Unknown action: {action}"
@@ -11,8 +11,20 @@ import os
 
 import requests
 
+from app.utils import http_sessions
+from app.hermes import tool_cache
+from app.utils.ttl_store import TTLStore
+
 logger = logging.getLogger(__name__)
 
+# Organized data changes a few times a week; menus are tapped far more often
+_CACHE_TTL = int(os.getenv("ORGANIZED_CACHE_TTL", "600"))
+_person_names = TTLStore(
+    "organized.person_names",
+    ttl=float(os.getenv("ORGANIZED_NAME_CACHE_TTL", "3600")),
+    maxsize=2000,
+)
+
 
 def query_organized_api(args: dict, **kw) -> str:
     """Query the Organized scheduling backend.
@@ -44,7 +56,7 @@ def query_organized_api(args: dict, **kw) -> str:
     webhook_secret = os.environ.get('ORGANIZED_WEBHOOK_SECRET', '')
 
     try:
-        response = requests.post(
+        response = http_sessions.session(http_sessions.ORGANIZED).post(
             f"{organized_url}/api/v3/webhooks/query",
             headers={
                 'Content-Type': 'application/json',
@@ -57,6 +69,7 @@ def query_organized_api(args: dict, **kw) -> str:
         if response.status_code == 200:
             return json.dumps(response.json(), ensure_ascii=False)
         else:
+            tool_cache.no_store()
             return json.dumps({
                 'error': f'Organized API returned {response.status_code}',
                 'message': response.json().get('message', ''),
@@ -64,8 +77,32 @@ def query_organized_api(args: dict, **kw) -> str:
 
     except requests.RequestException as e:
         logger.error(f"Organized API query failed: {e}")
+        tool_cache.no_store()
         return json.dumps({'error': f'Connection failed: {str(e)}'})
 
+
+def _person_name(user_id: str) -> str:
+    """Resolve the caller's RapidPro contact name ("" when unknown).
+
+    The per-user macros all start with this lookup before their Organized
+    query. Contact names rarely change, so known names are kept for
+    ORGANIZED_NAME_CACHE_TTL and repeat requests make one backend call
+    instead of two.
+    """
+    if not user_id:
+        return ""
+    phone = user_id.split(":")[-1] if ":" in user_id else user_id
+    name = _person_names.get(phone)
+    if name is None:
+        from app.graph.tools.rapidpro import _rp_api
+        contact_data = _rp_api("GET", "contacts.json", params={"urn": f"whatsapp:{phone}"})
+        results = contact_data.get("results", [])
+        name = (results[0].get("name") or "") if results else ""
+        if name:
+            _person_names.set(phone, name)
+    return name
+
+
 # ── RiveBot Macro Wrappers (Layer 2) ──────────────────────────────────────────
 
 def _format_schedule(data: dict) -> str:
@@ -106,27 +143,25 @@ def _format_schedule(data: dict) -> str:
     return "\n".join(lines)
 
 
-def macro_get_schedule(args: dict, **kwargs) -> str:
-    """Get the meeting schedule for the current/specified week."""
+def _week_of(weeks_ahead: int = 0) -> str:
+    """Monday of the current week (or a later one), as Organized's week_of."""
+    from datetime import datetime, timedelta
+    today = datetime.now()
+    monday = today - timedelta(days=today.weekday()) + timedelta(weeks=weeks_ahead)
+    return monday.strftime("%Y/%m/%d")
+
+
+# Cached per week_of so neither answer outlives the Monday rollover
+@tool_cache.cacheable(ttl=_CACHE_TTL, key=("week_of",), group="organized")
+def _current_schedule(args: dict, **kwargs) -> str:
     raw = query_organized_api({"action": "get_schedule"})
     data = json.loads(raw)
     return _format_schedule(data)
 
 
-def macro_get_next_week(args: dict, **kwargs) -> str:
-    """Get next week's meeting schedule.
-
-    Calculates the Monday of next week and queries by week_of.
-    """
-    from datetime import datetime, timedelta
-    today = datetime.now()
-    # Monday of next week: advance to next Monday
-    days_ahead = 7 - today.weekday()  # weekday() 0=Mon, so days to next Mon
-    if days_ahead == 0:
-        days_ahead = 7
-    next_monday = today + timedelta(days=days_ahead)
-    week_of = next_monday.strftime("%Y/%m/%d")
-
+@tool_cache.cacheable(ttl=_CACHE_TTL, key=("week_of",), group="organized")
+def _week_schedule(args: dict, **kwargs) -> str:
+    week_of = args["week_of"]
     raw = query_organized_api({"action": "get_schedule", "week_of": week_of})
     data = json.loads(raw)
     schedules = data.get("schedules", [])
@@ -135,6 +170,20 @@ def macro_get_next_week(args: dict, **kwargs) -> str:
     return _format_schedule(data)
 
 
+def macro_get_schedule(args: dict, **kwargs) -> str:
+    """Get the meeting schedule for the current/specified week."""
+    return _current_schedule({"week_of": _week_of()})
+
+
+def macro_get_next_week(args: dict, **kwargs) -> str:
+    """Get next week's meeting schedule.
+
+    Calculates the Monday of next week and queries by week_of.
+    """
+    return _week_schedule({"week_of": _week_of(weeks_ahead=1)})
+
+
+@tool_cache.cacheable(ttl=_CACHE_TTL, per_user=True, group="organized")
 def macro_get_my_assignments(args: dict, **kwargs) -> str:
     """Get assignments for the current user.
 
@@ -142,32 +191,26 @@ def macro_get_my_assignments(args: dict, **kwargs) -> str:
     via the RapidPro contact record, then queries for their assignments.
     Falls back to prompting for a manual search if resolution fails.
     """
-    user_id = args.get("user_id", "")
-
-    # Try to resolve phone → name via RapidPro contact
-    if user_id:
-        phone = user_id.split(":")[-1] if ":" in user_id else user_id
-        from app.graph.tools.rapidpro import _rp_api
-        contact_data = _rp_api("GET", "contacts.json", params={"urn": f"whatsapp:{phone}"})
-        results = contact_data.get("results", [])
-        if results and results[0].get("name"):
-            name = results[0]["name"]
-            raw = query_organized_api({
-                "action": "get_person_assignments",
-                "person_name": name,
-            })
-            data = json.loads(raw)
-            assignments = data.get("assignments", [])
-            if assignments:
-                lines = [f"👤 *Your assignments ({name}):*\n"]
-                for a in assignments:
-                    lines.append(f"• {a.get('week_of', '?')}: {a.get('type', a.get('assignment_type', '?'))}")
-                return "\n".join(lines)
-            return f"👤 *{name}* — no upcoming assignments."
+    # Resolve phone → name via RapidPro contact
+    name = _person_name(args.get("user_id", ""))
+    if name:
+        raw = query_organized_api({
+            "action": "get_person_assignments",
+            "person_name": name,
+        })
+        data = json.loads(raw)
+        assignments = data.get("assignments", [])
+        if assignments:
+            lines = [f"👤 *Your assignments ({name}):*\n"]
+            for a in assignments:
+                lines.append(f"• {a.get('week_of', '?')}: {a.get('type', a.get('assignment_type', '?'))}")
+            return "\n".join(lines)
+        return f"👤 *{name}* — no upcoming assignments."
 
     return "📅 To see your assignments, type: *search [your name]*"
 
 
+@tool_cache.cacheable(ttl=_CACHE_TTL, key=("query",), group="organized")
 def macro_search_persons(args: dict, **kwargs) -> str:
     """Search for a person by name and show their assignments."""
     query = args.get("query", "").strip()
@@ -261,6 +304,7 @@ EVENT_CATEGORIES = {
 }
 
 
+@tool_cache.cacheable(ttl=_CACHE_TTL, group="organized")
 def macro_get_events(args: dict, **kwargs) -> str:
     """Get upcoming congregation events."""
     raw = query_organized_api({"action": "get_events"})
@@ -278,6 +322,7 @@ def macro_get_events(args: dict, **kwargs) -> str:
     return "\n".join(lines)
 
 
+@tool_cache.cacheable(ttl=_CACHE_TTL, group="organized")
 def macro_get_sources(args: dict, **kwargs) -> str:
     """Get meeting study material for the current week."""
     raw = query_organized_api({"action": "get_sources"})
@@ -298,19 +343,10 @@ def macro_get_sources(args: dict, **kwargs) -> str:
     return "\n".join(lines)
 
 
+@tool_cache.cacheable(ttl=_CACHE_TTL, per_user=True, group="organized")
 def macro_get_field_group(args: dict, **kwargs) -> str:
     """Get the user's field service group."""
-    user_id = args.get("user_id", "")
-    person_name = ""
-
-    # Resolve phone → name
-    if user_id:
-        phone = user_id.split(":")[-1] if ":" in user_id else user_id
-        from app.graph.tools.rapidpro import _rp_api
-        contact_data = _rp_api("GET", "contacts.json", params={"urn": f"whatsapp:{phone}"})
-        results = contact_data.get("results", [])
-        if results and results[0].get("name"):
-            person_name = results[0]["name"]
+    person_name = _person_name(args.get("user_id", ""))
 
     payload = {"action": "get_field_groups"}
     if person_name:
@@ -335,6 +371,7 @@ def macro_get_field_group(args: dict, **kwargs) -> str:
     return "\n".join(lines).strip()
 
 
+@tool_cache.cacheable(ttl=_CACHE_TTL, group="organized")
 def macro_get_attendance(args: dict, **kwargs) -> str:
     """Get meeting attendance summary."""
     raw = query_organized_api({"action": "get_attendance"})
@@ -351,18 +388,10 @@ def macro_get_attendance(args: dict, **kwargs) -> str:
     return "\n".join(lines)
 
 
+@tool_cache.cacheable(ttl=_CACHE_TTL, per_user=True, group="organized")
 def macro_get_field_report(args: dict, **kwargs) -> str:
     """Get the user's field service report."""
-    user_id = args.get("user_id", "")
-    person_name = ""
-
-    if user_id:
-        phone = user_id.split(":")[-1] if ":" in user_id else user_id
-        from app.graph.tools.rapidpro import _rp_api
-        contact_data = _rp_api("GET", "contacts.json", params={"urn": f"whatsapp:{phone}"})
-        results = contact_data.get("results", [])
-        if results and results[0].get("name"):
-            person_name = results[0]["name"]
+    person_name = _person_name(args.get("user_id", ""))
 
     if not person_name:
         return "📋 To see your report, make sure your contact name is set."
@@ -387,6 +416,7 @@ def macro_get_field_report(args: dict, **kwargs) -> str:
     return "\n".join(lines)
 
 
+@tool_cache.cacheable(ttl=_CACHE_TTL, group="organized")
 def macro_get_visiting_speakers(args: dict, **kwargs) -> str:
     """Get visiting speakers and their talk outlines."""
     raw = query_organized_api({"action": "get_visiting_speakers"})
@@ -404,6 +434,7 @@ def macro_get_visiting_speakers(args: dict, **kwargs) -> str:
     return "\n".join(lines)
 
 
+@tool_cache.cacheable(ttl=_CACHE_TTL, group="organized")
 def macro_get_speakers_congregations(args: dict, **kwargs) -> str:
     """Get partner congregations for speaker exchange."""
     raw = query_organized_api({"action": "get_speakers_congregations"})
@@ -423,6 +454,7 @@ def macro_get_speakers_congregations(args: dict, **kwargs) -> str:
     return "\n".join(lines).strip()
 
 
+@tool_cache.cacheable(ttl=_CACHE_TTL, group="organized")
 def macro_get_cong_report(args: dict, **kwargs) -> str:
     """Get congregation field service report aggregate."""
     raw = query_organized_api({"action": "get_cong_report"})
@@ -440,6 +472,7 @@ def macro_get_cong_report(args: dict, **kwargs) -> str:
     return "\n".join(lines)
 
 
+@tool_cache.cacheable(ttl=_CACHE_TTL, group="organized")
 def macro_get_branch_report(args: dict, **kwargs) -> str:
     """Get branch field service report summary."""
     raw = query_organized_api({"action": "get_branch_report"})
@@ -460,6 +493,7 @@ def macro_get_branch_report(args: dict, **kwargs) -> str:
     return "\n".join(lines)
 
 
+@tool_cache.cacheable(ttl=_CACHE_TTL, group="organized")
 def macro_get_delegated_reports(args: dict, **kwargs) -> str:
     """Get delegated field service reports."""
     raw = query_organized_api({"action": "get_delegated_reports"})
@@ -480,6 +514,7 @@ def macro_get_delegated_reports(args: dict, **kwargs) -> str:
     return "\n".join(lines)
 
 
+@tool_cache.cacheable(ttl=_CACHE_TTL, group="organized")
 def macro_get_cong_analysis(args: dict, **kwargs) -> str:
     """Get congregation analysis summary."""
     raw = query_organized_api({"action": "get_cong_analysis"})
@@ -506,6 +541,7 @@ def macro_get_cong_analysis(args: dict, **kwargs) -> str:
     return "\n".join(lines)
 
 
+@tool_cache.cacheable(ttl=_CACHE_TTL, group="organized")
 def macro_get_bible_studies(args: dict, **kwargs) -> str:
     """Get user's bible studies."""
     raw = query_organized_api({"action": "get_bible_studies"})
@@ -520,18 +556,10 @@ def macro_get_bible_studies(args: dict, **kwargs) -> str:
     return "\n".join(lines)
 
 
+@tool_cache.cacheable(ttl=_CACHE_TTL, per_user=True, group="organized")
 def macro_get_notifications(args: dict, **kwargs) -> str:
     """Get user's notifications."""
-    user_id = args.get("user_id", "")
-    person_name = ""
-
-    if user_id:
-        phone = user_id.split(":")[-1] if ":" in user_id else user_id
-        from app.graph.tools.rapidpro import _rp_api
-        contact_data = _rp_api("GET", "contacts.json", params={"urn": f"whatsapp:{phone}"})
-        results = contact_data.get("results", [])
-        if results and results[0].get("name"):
-            person_name = results[0]["name"]
+    person_name = _person_name(args.get("user_id", ""))
 
     payload = {"action": "get_notifications"}
     if person_name:
@@ -11,6 +11,11 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# One TembaClient per (host, token) — it is stateless between calls, so
+# there is no need to rebuild it for every dossier lookup or flow start
+_temba_clients: Dict[tuple, Any] = {}
+
+
 def get_client() -> Optional[Any]:
     """
     Factory to get the RapidPro client with environment variables.
@@ -26,7 +31,10 @@ def get_client() -> Optional[Any]:
         logger.error("temba_client library not installed.")
         return None
 
-    return TembaClient(host, token)
+    client = _temba_clients.get((host, token))
+    if client is None:
+        client = _temba_clients.setdefault((host, token), TembaClient(host, token))
+    return client
 
 def fetch_dossier(args: dict, **kwargs) -> str:
     """
@@ -140,12 +148,12 @@ def send_crm_help(args: dict, **kwargs) -> str:
     footer = "Tap to activate · Type 'exit_ops' to leave"
 
     if phone and os.getenv("WUZAPI_TOKEN"):
+        from app.api.middleware.http_clients import run_sync
         from app.api.middleware.wuzapi_client import send_buttons
-        import asyncio
         import concurrent.futures
 
         def _run_async():
-            return asyncio.run(send_buttons(phone=phone, content=msg, footer=footer, buttons=buttons))
+            return run_sync(send_buttons(phone=phone, content=msg, footer=footer, buttons=buttons))
 
         try:
             with concurrent.futures.ThreadPoolExecutor(max_workers=1) as pool:
@@ -165,28 +173,36 @@ def send_crm_help(args: dict, **kwargs) -> str:
 # These bypass the flow system entirely. Single message in → single message out.
 # Auth is enforced in macro_bridge.py before these are called.
 
-import requests as _requests
+from app.utils import http_sessions
+from app.hermes import tool_cache
 
 
 def _rp_api(method: str, endpoint: str, **kwargs) -> dict:
-    """Call RapidPro API v2. Returns parsed JSON or error dict."""
+    """Call RapidPro API v2. Returns parsed JSON or error dict.
+
+    Goes through the shared keep-alive session (connection reuse, retries
+    with backoff on 429/5xx for GETs — see http_sessions.py).
+    """
     host = os.getenv("RAPIDPRO_HOST", "https://garantie.boutique")
     token = os.getenv("RAPIDPRO_API_TOKEN", "")
     url = f"{host}/api/v2/{endpoint}"
     headers = {"Authorization": f"Token {token}"}
+    session = http_sessions.session(http_sessions.RAPIDPRO)
     try:
         if method == "GET":
-            r = _requests.get(url, headers=headers, params=kwargs.get("params"), timeout=8)
+            r = session.get(url, headers=headers, params=kwargs.get("params"), timeout=8)
         else:
             headers["Content-Type"] = "application/json"
-            r = _requests.post(url, headers=headers, json=kwargs.get("json"), timeout=8)
+            r = session.post(url, headers=headers, json=kwargs.get("json"), timeout=8)
         r.raise_for_status()
         return r.json()
     except Exception as e:
         logger.error(f"[crm_l2] {method} {endpoint} failed: {e}")
+        tool_cache.no_store()
         return {"error": str(e)}
 
 
+@tool_cache.cacheable(ttl=300, group="crm.groups")
 def crm_list_groups(args: dict, **kwargs) -> str:
     """Layer 2: list groups (segments) — instant single-message response.
 
@@ -262,6 +278,7 @@ def crm_lookup_contact(args: dict, **kwargs) -> str:
     return "\n".join(lines)
 
 
+@tool_cache.cacheable(ttl=3600)
 def crm_org_info(args: dict, **kwargs) -> str:
     """Layer 2: show organization info — instant single-message response.
 
@@ -290,6 +307,7 @@ def crm_org_info(args: dict, **kwargs) -> str:
     return "\n".join(lines)
 
 
+@tool_cache.invalidates("crm.groups")
 def crm_create_group(args: dict, **kwargs) -> str:
     """Layer 2: create a segment (RapidPro group).
 
@@ -7,7 +7,8 @@ and macro_bridge.
 Auth tiers:
   T3 (user-self): macro_reset, macro_debug, macro_noai, macro_enableai
   T2 (admin):     macro_noai_global, macro_enableai_global, macro_noai_status,
-                  macro_reload, macro_health, macro_skills, macro_flow
+                  macro_reload, macro_health, macro_skills, macro_flow,
+                  macro_broadcast
 """
 
 import logging
@@ -38,23 +39,19 @@ from app.hermes.engine import get_session_id
 def macro_reset(args: dict, **kw) -> str:
     """Reset the current user's conversation session.
 
-    Deletes the Hermes session file for this user's thread.
+    Deletes the session journal and the Hermes session file for this
+    user's thread.
 
     Returns:
         Confirmation of session reset.
     """
+    from app.memory import session_store
+
     user_id = args.get("user_id", "")
     persona = args.get("persona", "assistant")
     session_id = get_session_id(user_id, persona)
 
-    session_file = _sessions_dir / f"session_{session_id}.json"
-
-    deleted = False
-    if session_file.exists():
-        session_file.unlink()
-        deleted = True
-
-    if deleted:
+    if session_store.delete_session(session_id):
         return "✅ Memory wiped. Conversation history has been reset."
     return "✅ No previous conversation found. Starting fresh."
 
@@ -353,3 +350,92 @@ def macro_flow(args: dict, **kw) -> str:
         return "🛑 Stopped all active flows."
 
     return f"❌ Unknown action: {action}"
+
+
+def _broadcast_audience(target: str) -> list[str]:
+    """URNs for a broadcast target: one phone number, or every known user."""
+    if target.startswith("+") or target.isdigit():
+        return [f"whatsapp:{target.lstrip('+')}"]
+    # Every user RiveBot has seen (they must have chatted at least once)
+    resp = httpx.get(f"{RIVEBOT_URL}/noai-status", timeout=3.0)
+    resp.raise_for_status()
+    known: set[str] = set()
+    for users in resp.json().get("users", {}).values():
+        known.update(users)
+    return sorted(uid if uid.startswith("whatsapp:") else f"whatsapp:{uid}" for uid in known)
+
+
+def macro_broadcast(args: dict, **kw) -> str:
+    """Send and track chunked RapidPro broadcasts (app/hooks/broadcasts.py).
+
+    Actions:
+        send <all|+509xxx> <message>: Start a broadcast; the admin gets a
+            WhatsApp report when it finishes.
+        status [id]: Progress and throughput (latest broadcasts if no id).
+        cancel <id>: Stop a running broadcast; chunks already sent stay sent.
+        retry <id>: Re-queue failed and unconfirmed chunks.
+
+    Returns:
+        Broadcast ID and scope, or progress.
+    """
+    from app.hermes.engine import _current_urn
+    from app.hooks import broadcasts
+
+    action = (args.get("action") or "status").strip().lower()
+    target = (args.get("target") or "").strip()
+    message = (args.get("message") or "").strip()
+    admin = args.get("user_id") or _current_urn.get()
+
+    if action == "status":
+        if target:
+            p = broadcasts.progress(target)
+            return broadcasts.format_progress(p) if p else f"⚠️ No broadcast `{target}`."
+        latest = broadcasts.recent()
+        if not latest:
+            return "📭 No broadcasts yet."
+        return "\n\n".join(broadcasts.format_progress(p) for p in latest)
+
+    if action == "cancel":
+        if not target:
+            return "⚠️ Usage: `broadcast cancel <id>`"
+        if broadcasts.cancel(target):
+            return f"🛑 Broadcast `{target}` cancelled. Chunks already sent stay sent."
+        return f"⚠️ No running broadcast `{target}`."
+
+    if action == "retry":
+        if not target:
+            return "⚠️ Usage: `broadcast retry <id>`"
+        requeued = broadcasts.retry(target)
+        if not requeued:
+            return f"⚠️ Broadcast `{target}` has nothing to retry."
+        return (
+            f"🔁 Re-queued {requeued} chunk(s) of `{target}`. "
+            "Unconfirmed chunks may reach some people twice."
+        )
+
+    if action != "send":
+        return f"❌ Unknown action: {action}"
+    if not target or not message:
+        return "⚠️ Usage: `broadcast send all <message>` or `broadcast send +509xxx <message>`"
+
+    try:
+        urns = _broadcast_audience(target)
+    except Exception as e:
+        return f"❌ Could not fetch users from RiveBot: {e}"
+    if not urns:
+        return (
+            "⚠️ No active users found in RiveBot. "
+            "Users must have chatted at least once. "
+            "Or specify a number: `broadcast send +509xxx <message>`"
+        )
+    try:
+        broadcast_id = broadcasts.submit(admin, message, urns)
+    except broadcasts.BroadcastConfigError as e:
+        return f"❌ Config missing: {e}"
+    except Exception as e:
+        return f"❌ Broadcast failed: {e}"
+    logger.info(f"[broadcast] {admin} → {len(urns)} recipients ({broadcast_id}): {message[:50]}")
+    return (
+        f"📣 Broadcast `{broadcast_id}` to {len(urns)} recipient(s) is sending:\n_{message}_\n\n"
+        f"Track it with `broadcast status {broadcast_id}` — you'll get a report when it finishes."
+    )
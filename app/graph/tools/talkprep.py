@@ -3,12 +3,18 @@ TalkPrep Hermes tools — full 6-stage workflow exposed to the gateway agent.
 
 All blocking I/O is wrapped in asyncio.to_thread() so the async event loop
 is never blocked even when talkmaster calls SQLite or runs LLM chains.
+Section development and evaluation are submitted as background jobs
+(app/hooks/talkprep_jobs.py) and report back over WhatsApp.
 """
 
 import asyncio
 import os
-from typing import Optional
+import threading
+from contextlib import contextmanager
+from typing import NamedTuple, Optional
 
+from app.hermes import tool_cache
+from app.hooks import talkprep_jobs
 from app.logger import setup_logger
 
 logger = setup_logger().bind(name="tool.talkprep")
@@ -16,6 +22,10 @@ logger = setup_logger().bind(name="tool.talkprep")
 # Configurable jwlinker DB path (#8)
 JWLINKER_DB_PATH: Optional[str] = os.getenv("JWLINKER_DB_PATH") or None
 
+# Publication/topic listings only change when a .jwpub is uploaded
+# (upload_jwpub invalidates the group)
+_CATALOG_TTL = int(os.getenv("TALKPREP_CATALOG_CACHE_TTL", "3600"))
+
 
 def _siyuan_doc_url(doc_id: str) -> str:
     """Build a clickable SiYuan URL for a document ID."""
@@ -25,17 +35,109 @@ def _siyuan_doc_url(doc_id: str) -> str:
 
 # ── Helpers ─────────────────────────────────────────────────────────
 
-def _get_talkmaster_session():
-    """Open a talkmaster DB session (sync — call from thread)."""
-    from talkmaster.config import get_settings
-    from talkmaster.database import get_engine, get_session
-    settings = get_settings()
-    engine = get_engine(settings.db_path)
-    return get_session(engine), engine
+# One talkmaster engine per process. Tools used to build an engine and
+# dispose() it on every call, paying engine setup plus a fresh SQLite
+# connection for each status check or gate. The pool is sized for the
+# tool thread pool; WAL lets readers (status, scores) run while a
+# develop/evaluate call holds a write transaction.
+_POOL_SIZE = int(os.getenv("TALKMASTER_POOL_SIZE", "4"))
+_engine = None
+_session_factory = None
+_engine_lock = threading.Lock()
+
+
+def _get_talkmaster_engine():
+    """Return the shared talkmaster engine, creating it on first use."""
+    global _engine, _session_factory
+    if _engine is not None:
+        return _engine
+
+    with _engine_lock:
+        if _engine is None:
+            from sqlalchemy import create_engine, event
+            from sqlalchemy.orm import sessionmaker
+            from talkmaster.config import get_settings
+            from talkmaster.database import get_engine
+
+            # talkmaster's own factory resolves the URL and creates tables;
+            # rebuild on the same URL with pool settings we control.
+            bootstrap = get_engine(get_settings().db_path)
+            url = bootstrap.url
+            bootstrap.dispose()
+
+            is_sqlite = url.get_backend_name() == "sqlite"
+            engine = create_engine(
+                url,
+                pool_size=_POOL_SIZE,
+                max_overflow=_POOL_SIZE,
+                pool_pre_ping=True,
+                connect_args={"check_same_thread": False, "timeout": 10} if is_sqlite else {},
+            )
+            if is_sqlite:
+                @event.listens_for(engine, "connect")
+                def _set_wal(dbapi_conn, connection_record):
+                    cursor = dbapi_conn.cursor()
+                    cursor.execute("PRAGMA journal_mode=WAL")
+                    cursor.execute("PRAGMA synchronous=NORMAL")
+                    cursor.close()
+
+            _session_factory = sessionmaker(bind=engine)
+            _engine = engine
+    return _engine
+
+
+@contextmanager
+def _talkmaster_session():
+    """Yield a session on the shared engine; rolled back on error, always closed."""
+    _get_talkmaster_engine()
+    session = _session_factory()
+    try:
+        yield session
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
 
 
 # ── Stage Gates (deterministic, zero AI) ─────────────────────────────
 
+class _RevisionState(NamedTuple):
+    id: int
+    developed: int
+    evaluations: int
+    rehearsals: int
+
+
+def _revision_state(session, revision_name: str) -> Optional[_RevisionState]:
+    """Revision ID plus developed/evaluation/rehearsal counts in one query.
+
+    Returns None if the revision doesn't exist.
+    """
+    from sqlalchemy import func, select, true
+    from talkmaster.database import Revision, StructureNode, EvaluationScore, RehearsalRecord
+
+    def _count(model, *criteria):
+        return (
+            select(func.count())
+            .select_from(model)
+            .where(model.revision_id == Revision.id, *criteria)
+            .scalar_subquery()
+        )
+
+    row = (
+        session.query(
+            Revision.id,
+            _count(StructureNode, StructureNode.content_is_developed == true()),
+            _count(EvaluationScore),
+            _count(RehearsalRecord),
+        )
+        .filter(Revision.version_name == revision_name)
+        .first()
+    )
+    return _RevisionState(*row) if row else None
+
+
 def _gate_talk_exists(session, talk_id: int) -> str | None:
     """Gate: talk must exist. Return error string or None."""
     from talkmaster.database import Talk
@@ -51,26 +153,23 @@ def _gate_talk_exists(session, talk_id: int) -> str | None:
 def _gate_revision_exists(session, revision_name: str) -> str | None:
     """Gate: revision must exist. Return error string or None."""
     from talkmaster.database import Revision
-    if not session.query(Revision).filter_by(version_name=revision_name).first():
-        return (
-            f"⛔ Revision `{revision_name}` not found.\n"
-            "Create one first: `create_revision <talk_id> <version_name> <audience>`"
-        )
+    if not session.query(Revision.id).filter_by(version_name=revision_name).first():
+        return _revision_missing(revision_name)
     return None
 
 
-def _gate_section_developed(session, revision_name: str) -> str | None:
-    """Gate: at least one section must be developed before evaluation."""
-    from talkmaster.database import Revision, StructureNode
-    rev = session.query(Revision).filter_by(version_name=revision_name).first()
-    if not rev:
-        return _gate_revision_exists(session, revision_name)
-    developed = (
-        session.query(StructureNode)
-        .filter_by(revision_id=rev.id, content_is_developed=True)
-        .count()
+def _revision_missing(revision_name: str) -> str:
+    return (
+        f"⛔ Revision `{revision_name}` not found.\n"
+        "Create one first: `create_revision <talk_id> <version_name> <audience>`"
     )
-    if developed == 0:
+
+
+def _gate_section_developed(state: Optional[_RevisionState], revision_name: str) -> str | None:
+    """Gate: at least one section must be developed before evaluation."""
+    if state is None:
+        return _revision_missing(revision_name)
+    if state.developed == 0:
         return (
             f"⛔ No sections have been developed yet for `{revision_name}`.\n"
             "Develop at least one section before evaluating:\n"
@@ -79,14 +178,11 @@ def _gate_section_developed(session, revision_name: str) -> str | None:
     return None
 
 
-def _gate_evaluation_done(session, revision_name: str) -> str | None:
+def _gate_evaluation_done(state: Optional[_RevisionState], revision_name: str) -> str | None:
     """Gate: evaluation must have been run before rehearsal/export."""
-    from talkmaster.database import Revision, EvaluationScore
-    rev = session.query(Revision).filter_by(version_name=revision_name).first()
-    if not rev:
-        return _gate_revision_exists(session, revision_name)
-    count = session.query(EvaluationScore).filter_by(revision_id=rev.id).count()
-    if count == 0:
+    if state is None:
+        return _revision_missing(revision_name)
+    if state.evaluations == 0:
         return (
             f"⛔ No evaluation scores found for `{revision_name}`.\n"
             "Run evaluation first: `evaluate_talk <revision_name>`"
@@ -94,14 +190,11 @@ def _gate_evaluation_done(session, revision_name: str) -> str | None:
     return None
 
 
-def _gate_rehearsal_done(session, revision_name: str) -> str | None:
+def _gate_rehearsal_done(state: Optional[_RevisionState], revision_name: str) -> str | None:
     """Gate: at least one rehearsal session must exist before export."""
-    from talkmaster.database import Revision, RehearsalRecord
-    rev = session.query(Revision).filter_by(version_name=revision_name).first()
-    if not rev:
-        return _gate_revision_exists(session, revision_name)
-    count = session.query(RehearsalRecord).filter_by(revision_id=rev.id).count()
-    if count == 0:
+    if state is None:
+        return _revision_missing(revision_name)
+    if state.rehearsals == 0:
         return (
             f"⛔ Complete at least one rehearsal session before exporting.\n"
             "Start rehearsal: `rehearsal_cue <revision_name>`"
@@ -127,7 +220,8 @@ def get_talkprep_help(args: dict, **kwargs) -> str:
         "• `create_revision <talk_id> <version_name> <audience>` — create a revision\n"
         "• `select_active_talk <talk_id>` — switch active talk\n\n"
         "*Stage 3 — Development*\n"
-        "• `develop_section <revision> <section_title>` — AI-develop a section\n\n"
+        "• `develop_section <revision> <section_title>` — AI-develop a section\n"
+        "• `develop_section <revision> all` — develop every remaining section\n\n"
         "*Stage 4 — Evaluation*\n"
         "• `evaluate_talk <revision>` — score against the S-38 rubric\n"
         "• `get_evaluation_scores <revision>` — view scores by category\n\n"
@@ -139,6 +233,7 @@ def get_talkprep_help(args: dict, **kwargs) -> str:
         "• `generate_anki_deck <pub_code>` — create Anki flashcards\n"
         "• `push_to_siyuan <pub_code>` — export to SiYuan notebook\n\n"
         "• `talkmaster_status` — view all imported talks\n"
+        "• `job_status` — progress of running development/evaluation jobs\n"
         "• `cost_report` — view LLM token usage for this session\n"
         "• Upload a `.jwpub` file as a WhatsApp attachment to import publications\n"
     )
@@ -152,24 +247,30 @@ def talkmaster_status(args: dict, **kwargs) -> str:
     """
     def _sync():
         from talkmaster.database import Talk, Revision
-        session, engine = _get_talkmaster_session()
-        try:
-            talks = session.query(Talk).all()
-            if not talks:
+        with _talkmaster_session() as session:
+            # Talks and their revision names in one outer-joined query
+            rows = (
+                session.query(Talk, Revision.version_name)
+                .outerjoin(Revision, Revision.talk_id == Talk.id)
+                .order_by(Talk.id, Revision.id)
+                .all()
+            )
+            if not rows:
                 return (
                     "No talks imported yet.\n"
                     "Use `list_publications` to browse available publications,\n"
                     "then `import_talk` to get started."
                 )
+            talks: dict = {}
+            for t, version_name in rows:
+                names = talks.setdefault(t.id, (t, []))[1]
+                if version_name is not None:
+                    names.append(version_name)
             lines = ["*Imported Talks:*"]
-            for t in talks:
-                revs = session.query(Revision).filter_by(talk_id=t.id).all()
-                rev_names = ", ".join(r.version_name for r in revs) or "no revisions"
+            for t, names in talks.values():
+                rev_names = ", ".join(names) or "no revisions"
                 lines.append(f"• [{t.id}] *{t.name}* — {t.theme}\n  Revisions: {rev_names}")
             return "\n".join(lines)
-        finally:
-            session.close()
-            engine.dispose()
 
     try:
         return _sync()
@@ -197,12 +298,16 @@ def select_active_talk(args: dict, **kwargs) -> str:
 
     def _sync():
         from talkmaster.database import Talk, Revision
-        session, engine = _get_talkmaster_session()
-        try:
+        with _talkmaster_session() as session:
             talk = session.query(Talk).filter_by(id=talk_id_int).first()
             if not talk:
                 return f"Talk ID {talk_id_int} not found. Run `talkmaster_status` to see available talks."
-            revs = session.query(Revision).filter_by(talk_id=talk_id_int).all()
+            revs = (
+                session.query(Revision.version_name)
+                .filter_by(talk_id=talk_id_int)
+                .order_by(Revision.id)
+                .all()
+            )
             rev_info = (
                 ", ".join(r.version_name for r in revs)
                 if revs else "none \u2014 create one with `create_revision`"
@@ -215,9 +320,6 @@ def select_active_talk(args: dict, **kwargs) -> str:
                 f"\u2022 Revisions: {rev_info}"
                 f"\n{{{{set:active_talk_id:{talk.id}}}}}"
             )
-        finally:
-            session.close()
-            engine.dispose()
 
     try:
         return _sync()
@@ -228,6 +330,7 @@ def select_active_talk(args: dict, **kwargs) -> str:
 
 # ── Stage 1: Import ──────────────────────────────────────────────────
 
+@tool_cache.cacheable(ttl=_CATALOG_TTL, group="talkprep.catalog")
 def list_publications(args: dict, **kwargs) -> str:
     """List all available JW publications in the jwlinker database.
 
@@ -238,6 +341,7 @@ def list_publications(args: dict, **kwargs) -> str:
         from talkmaster.bridge import list_jwlinker_publications
         pubs = list_jwlinker_publications(JWLINKER_DB_PATH)
         if not pubs:
+            tool_cache.no_store()  # first extraction may come from the jwlinker CLI
             return (
                 "No publications found.\n"
                 "Run `jwlinker extract-jwpub <file>` on the server first."
@@ -249,9 +353,11 @@ def list_publications(args: dict, **kwargs) -> str:
         return _sync()
     except Exception as e:
         logger.error(f"list_publications failed: {e}")
+        tool_cache.no_store()
         return f"Error listing publications: {e}"
 
 
+@tool_cache.cacheable(ttl=_CATALOG_TTL, key=("pub_code", "active_pub"), group="talkprep.catalog")
 def list_topics(args: dict, **kwargs) -> str:
     pub_code = args.get("pub_code")
     active_pub = args.get("active_pub")
@@ -274,6 +380,7 @@ def list_topics(args: dict, **kwargs) -> str:
         from talkmaster.bridge import list_jwlinker_topics
         topics = list_jwlinker_topics(effective_pub, db_path=JWLINKER_DB_PATH)
         if not topics:
+            tool_cache.no_store()
             return f"No topics found for '{effective_pub}'. Check the code with `list_publications`."
         lines = [f"\u2022 *{t['name']}* \u2014 category: {t['category']}" for t in topics[:30]]
         suffix = f"\n_(showing first 30 of {len(topics)})_" if len(topics) > 30 else ""
@@ -286,6 +393,7 @@ def list_topics(args: dict, **kwargs) -> str:
         return _sync()
     except Exception as e:
         logger.error(f"list_topics failed: {e}")
+        tool_cache.no_store()
         return f"Error listing topics: {e}"
 
 
@@ -379,8 +487,7 @@ def create_revision(args: dict, **kwargs) -> str:
 
     def _sync():
         from talkmaster.database import Talk, Revision, AudiencePersona
-        session, engine = _get_talkmaster_session()
-        try:
+        with _talkmaster_session() as session:
             gate = _gate_talk_exists(session, talk_id)
             if gate:
                 return gate
@@ -420,9 +527,6 @@ def create_revision(args: dict, **kwargs) -> str:
                 f"`develop section <section_title>`\n"
                 f"{{{{set:active_revision:{version_name}}}}}"
             )
-        finally:
-            session.close()
-            engine.dispose()
 
     try:
         return _sync()
@@ -431,20 +535,193 @@ def create_revision(args: dict, **kwargs) -> str:
         return f"Error creating revision: {e}"
 
 
+# ── Background Jobs (Stages 3–4) ────────────────────────────────────
+# Section development and rubric evaluation run whole LLM chains; they go
+# through app/hooks/talkprep_jobs.py so the tool call returns at once.
+
+_ALL_SECTIONS = ("", "all", "*")
+
+_JOB_LABELS = {
+    "develop_section": "Section development",
+    "evaluate_talk": "S-38 evaluation",
+}
+
+
+def _undeveloped_sections(session, revision_name: str) -> list[str]:
+    """Titles of the revision's sections that have no developed content yet."""
+    from talkmaster.database import Revision, StructureNode
+
+    rows = (
+        session.query(StructureNode.title)
+        .join(Revision, StructureNode.revision_id == Revision.id)
+        .filter(
+            Revision.version_name == revision_name,
+            StructureNode.content_is_developed.is_(False),
+        )
+        .order_by(StructureNode.id)
+        .all()
+    )
+    return [title for (title,) in rows if title]
+
+
+def _develop_step(params: dict, section_title: str) -> str:
+    from talkmaster.siyuan import generation
+
+    with _talkmaster_session() as session:
+        result = generation.develop_section(
+            version_name=params["revision"],
+            db=session,
+            section_title=section_title,
+        )
+    if not result:
+        raise ValueError("not found \u2014 check the section title")
+    return result[:400] + "\u2026" if len(result) > 400 else result
+
+
+def _summarize_develop(job: dict, steps: list[dict]) -> str:
+    done = [s for s in steps if s["status"] == "done"]
+    if len(steps) == 1:
+        step = steps[0]
+        if done:
+            return f"\u2705 *Section '{step['step']}' developed:*\n\n_{step['result']}_"
+        return f"\u26a0\ufe0f Could not develop '{step['step']}': {step['result']}"
+    lines = [f"\u2705 *Developed {len(done)}/{len(steps)} sections of '{job['revision']}':*"]
+    for step in steps:
+        if step["status"] == "done":
+            lines.append(f"\u2022 {step['step']}")
+        else:
+            lines.append(f"\u2022 \u26a0\ufe0f {step['step']} \u2014 {step['result']}")
+    if done:
+        lines.append("\nNext: `evaluate_talk` to score against the S-38 rubric.")
+    return "\n".join(lines)
+
+
+def _evaluate_step(params: dict, step: str) -> str:
+    from talkmaster.siyuan import generation
+
+    with _talkmaster_session() as session:
+        generation.review_cohesion(version_name=params["revision"], db=session)
+    return "complete"
+
+
+def _summarize_evaluate(job: dict, steps: list[dict]) -> str:
+    step = steps[0]
+    if step["status"] != "done":
+        return f"\u26a0\ufe0f Evaluation of '{job['revision']}' failed: {step['result']}"
+    return (
+        f"\u2705 *Evaluation complete for '{job['revision']}'*\n"
+        f"Use `scores` to view results."
+    )
+
+
+_JOB_KINDS = {
+    "develop_section": (_develop_step, _summarize_develop),
+    "evaluate_talk": (_evaluate_step, _summarize_evaluate),
+}
+for _kind, (_step, _summary) in _JOB_KINDS.items():
+    talkprep_jobs.register(_kind, _step, _summary)
+
+
+def _caller(args: dict) -> str:
+    """The caller's URN: injected by /v1/tools, else the Hermes chat's user."""
+    user_id = args.get("user_id", "")
+    if user_id and user_id != "rivebot":
+        return user_id
+    from app.hermes.engine import _current_urn
+    return _current_urn.get()
+
+
+def _start_job(kind: str, user_id: str, revision_name: str, steps: list[str]) -> str:
+    """Submit a background job and describe it, or run inline without a job store."""
+    run_step, summarize = _JOB_KINDS[kind]
+    params = {"revision": revision_name}
+
+    if not talkprep_jobs.enabled():
+        results = []
+        for seq, step in enumerate(steps):
+            try:
+                results.append({"seq": seq, "step": step, "status": "done", "result": run_step(params, step)})
+            except Exception as e:
+                results.append({"seq": seq, "step": step, "status": "failed", "result": str(e)})
+        return summarize({"kind": kind, "revision": revision_name, "params": params}, results)
+
+    job_id, created = talkprep_jobs.submit(kind, user_id, revision_name, steps, params)
+    if not created:
+        return f"\u23f3 Already working on that \u2014 job `{job_id}`. Check with `job_status {job_id}`."
+    what = (
+        f"Developing {len(steps)} section{'s' if len(steps) != 1 else ''}"
+        if kind == "develop_section" else "Running the S-38 rubric"
+    )
+    return (
+        f"\u23f3 *{what} for '{revision_name}'* (job `{job_id}`).\n"
+        f"I'll message you when it's done \u2014 or check with `job_status {job_id}`."
+    )
+
+
+def _format_job(job: dict) -> str:
+    steps = job["steps"]
+    finished = sum(1 for s in steps if s["status"] in ("done", "failed"))
+    header = (
+        f"*{_JOB_LABELS.get(job['kind'], job['kind'])}* \u2014 '{job['revision']}' "
+        f"(job `{job['id']}`)"
+    )
+    if job["status"] in ("queued", "running"):
+        running = [s["step"] for s in steps if s["status"] == "running"]
+        line = f"\u23f3 {job['status']} \u2014 {finished}/{len(steps)} done"
+        if running and len(steps) > 1:
+            line += f"\n  Working on: {', '.join(running)}"
+        return f"{header}\n{line}"
+    return f"{header}\n{job['summary']}"
+
+
+def job_status(args: dict, **kwargs) -> str:
+    """Report progress of background TalkPrep jobs.
+
+    Args:
+        job_id: Job to show; omit for the caller's latest jobs.
+        user_id: Auto-injected caller URN (Hermes chat user otherwise).
+
+    Returns:
+        Status, step progress and — once finished — the job's result.
+    """
+    job_id = (args.get("job_id") or "").strip().strip("`")
+    user_id = _caller(args)
+
+    if not talkprep_jobs.enabled():
+        return "Background jobs are disabled \u2014 TalkPrep stages run inline."
+    if not user_id:
+        return "\u26a0\ufe0f Can't tell who is asking \u2014 job status is only shown to the job's owner."
+    try:
+        if job_id:
+            job = talkprep_jobs.get(job_id)
+            if job is None or job["user_id"] != user_id:
+                return f"No job `{job_id}` found. Run `job_status` to list your recent jobs."
+            return _format_job(job)
+        jobs = talkprep_jobs.recent(user_id)
+        if not jobs:
+            return "No TalkPrep jobs yet. `develop_section` and `evaluate_talk` start one."
+        return "\n\n".join(_format_job(j) for j in jobs)
+    except Exception as e:
+        logger.error(f"job_status failed: {e}")
+        return f"Error reading job status: {e}"
+
+
 # ── Stage 3: Section Development ────────────────────────────────────
 
 def develop_section(args: dict, **kwargs) -> str:
     section_title = args.get("section_title")
     active_revision = args.get("active_revision")
+    user_id = _caller(args)
 
-    """AI-develop a single section of a talk revision.
+    """AI-develop sections of a talk revision in the background.
 
     Args:
-        section_title: Title of the section to develop (partial match OK).
+        section_title: Title of the section to develop (partial match OK),
+            or "all" for every section not yet developed.
         active_revision: Auto-injected from context (not user-facing).
 
     Returns:
-        Confirmation or status of the developed section.
+        Job ID — the developed sections are sent when the job finishes.
     """
     revision_name = active_revision or ""
     if not revision_name:
@@ -454,25 +731,17 @@ def develop_section(args: dict, **kwargs) -> str:
         )
 
     def _sync():
-        from talkmaster.siyuan import generation
-        session, engine = _get_talkmaster_session()
-        try:
+        with _talkmaster_session() as session:
             gate = _gate_revision_exists(session, revision_name)
             if gate:
                 return gate
-
-            result = generation.develop_section(
-                version_name=revision_name,
-                db=session,
-                section_title=section_title,
-            )
-            if result:
-                preview = result[:400] + "\u2026" if len(result) > 400 else result
-                return f"\u2705 *Section '{section_title}' developed:*\n\n_{preview}_"
-            return f"\u26a0\ufe0f Could not develop '{section_title}'. Check the section title."
-        finally:
-            session.close()
-            engine.dispose()
+            if (section_title or "").strip().lower() in _ALL_SECTIONS:
+                titles = _undeveloped_sections(session, revision_name)
+                if not titles:
+                    return f"\u2705 All sections of '{revision_name}' are already developed."
+            else:
+                titles = [section_title]
+        return _start_job("develop_section", user_id, revision_name, titles)
 
     try:
         return _sync()
@@ -486,6 +755,7 @@ def develop_section(args: dict, **kwargs) -> str:
 def evaluate_talk(args: dict, **kwargs) -> str:
     active_revision = args.get("active_revision")
     revision_name = args.get("revision_name")
+    user_id = _caller(args)
 
     """Evaluate a talk revision against the 53-point S-38 rubric.
 
@@ -494,7 +764,7 @@ def evaluate_talk(args: dict, **kwargs) -> str:
         revision_name: Explicit override (from AI/direct call).
 
     Returns:
-        Trigger confirmation — scores available via get_evaluation_scores.
+        Job ID — scores available via get_evaluation_scores once it finishes.
     """
     rev_name = revision_name or active_revision or ""
     if not rev_name:
@@ -504,26 +774,11 @@ def evaluate_talk(args: dict, **kwargs) -> str:
         )
 
     def _sync():
-        from talkmaster.database import Revision
-        from talkmaster.siyuan import generation
-        session, engine = _get_talkmaster_session()
-        try:
-            gate = _gate_section_developed(session, rev_name)
+        with _talkmaster_session() as session:
+            gate = _gate_section_developed(_revision_state(session, rev_name), rev_name)
             if gate:
                 return gate
-
-            rev = session.query(Revision).filter_by(version_name=rev_name).first()
-            if not rev:
-                return f"Revision '{rev_name}' not found."
-            result = generation.review_cohesion(version_name=rev_name, db=session)
-            return (
-                f"\u2705 *Evaluation started for '{rev_name}'*\n"
-                f"S-38 rubric analysis running\u2026\n"
-                f"Use `scores` to view results."
-            )
-        finally:
-            session.close()
-            engine.dispose()
+        return _start_job("evaluate_talk", user_id, rev_name, ["S-38 rubric"])
 
     try:
         return _sync()
@@ -549,16 +804,19 @@ def get_evaluation_scores(args: dict, **kwargs) -> str:
     if not rev_name:
         return "\u26a0\ufe0f No active revision. Specify a revision name or set one first."
     def _sync():
+        from sqlalchemy.orm import contains_eager
         from talkmaster.database import Revision, EvaluationScore, EvaluationPoint
-        session, engine = _get_talkmaster_session()
-        try:
-            rev = session.query(Revision).filter_by(version_name=rev_name).first()
+        with _talkmaster_session() as session:
+            rev = session.query(Revision.id).filter_by(version_name=rev_name).first()
             if not rev:
                 return f"Revision '{rev_name}' not found."
 
+            # Load each score's rubric point from the same join (no lazy
+            # load per score when grouping by category)
             scores = (
                 session.query(EvaluationScore)
                 .join(EvaluationPoint)
+                .options(contains_eager(EvaluationScore.evaluation_point))
                 .filter(EvaluationScore.revision_id == rev.id)
                 .all()
             )
@@ -594,9 +852,6 @@ def get_evaluation_scores(args: dict, **kwargs) -> str:
                 lines.append("🌟 Excellent! Ready to rehearse.")
 
             return "\n".join(lines)
-        finally:
-            session.close()
-            engine.dispose()
 
     try:
         return _sync()
@@ -627,65 +882,56 @@ def rehearsal_cue(args: dict, **kwargs) -> str:
             "\u2022 `create revision v1 <audience>`"
         )
     def _sync():
-        from talkmaster.database import Revision, RehearsalRecord
+        from talkmaster.database import RehearsalRecord
         from talkmaster.llm import completion
         import datetime
 
-        session, engine = _get_talkmaster_session()
-        try:
+        with _talkmaster_session() as session:
             # ── Stage gate: evaluation must have been done ────────────────
-            gate = _gate_evaluation_done(session, rev_name)
+            # The same query yields the rehearsal count for progression
+            state = _revision_state(session, rev_name)
+            gate = _gate_evaluation_done(state, rev_name)
             if gate:
                 return gate
+        rehearsal_count = state.rehearsals
+
+        prompt = (
+            f"You are a JW public speaking coach. The speaker is doing rehearsal "
+            f"#{rehearsal_count + 1} of their talk revision '{rev_name}'.\n\n"
+            f"Give 5 short, actionable delivery coaching tips covering:\n"
+            f"1. Opening — how to establish eye contact immediately\n"
+            f"2. Pacing — when to slow down for impact\n"
+            f"3. Pausing — where to pause for effect (cite a specific point if possible)\n"
+            f"4. Vocal modulation — how to vary tone\n"
+            f"5. Closing — how to make the conclusion memorable\n\n"
+            f"Be specific, warm, and concise. Each tip max 2 sentences."
+        )
 
-            rev = session.query(Revision).filter_by(version_name=rev_name).first()
-            if not rev:
-                return f"Revision '{rev_name}' not found."
-
-            # Pull rehearsal count for progression
-            rehearsal_count = (
-                session.query(RehearsalRecord)
-                .filter_by(revision_id=rev.id)
-                .count()
-            )
-
-            prompt = (
-                f"You are a JW public speaking coach. The speaker is doing rehearsal "
-                f"#{rehearsal_count + 1} of their talk revision '{rev_name}'.\n\n"
-                f"Give 5 short, actionable delivery coaching tips covering:\n"
-                f"1. Opening — how to establish eye contact immediately\n"
-                f"2. Pacing — when to slow down for impact\n"
-                f"3. Pausing — where to pause for effect (cite a specific point if possible)\n"
-                f"4. Vocal modulation — how to vary tone\n"
-                f"5. Closing — how to make the conclusion memorable\n\n"
-                f"Be specific, warm, and concise. Each tip max 2 sentences."
-            )
-
-            response = completion(
-                model=os.getenv("LLM_MODEL", "custom_ai"),
-                messages=[{"role": "user", "content": prompt}],
-                api_base=os.getenv("OPENAI_API_BASE", "http://localhost:4000"),
-                api_key=os.getenv("OPENAI_API_KEY", ""),
-            )
+        # No session is held across the LLM call — it would pin a pooled
+        # connection for the whole completion
+        response = completion(
+            model=os.getenv("LLM_MODEL", "custom_ai"),
+            messages=[{"role": "user", "content": prompt}],
+            api_base=os.getenv("OPENAI_API_BASE", "http://localhost:4000"),
+            api_key=os.getenv("OPENAI_API_KEY", ""),
+        )
 
-            cues = response.choices[0].message.content
+        cues = response.choices[0].message.content
 
-            # Log rehearsal record
+        # Log rehearsal record
+        with _talkmaster_session() as session:
             record = RehearsalRecord(
-                revision_id=rev.id,
+                revision_id=state.id,
                 rehearsal_date=datetime.datetime.utcnow(),
                 notes=f"AI cues generated (rehearsal #{rehearsal_count + 1})",
             )
             session.add(record)
             session.commit()
 
-            return (
-                f"🎤 *Rehearsal #{rehearsal_count + 1} cues for '{rev_name}':*\n\n"
-                f"{cues}"
-            )
-        finally:
-            session.close()
-            engine.dispose()
+        return (
+            f"🎤 *Rehearsal #{rehearsal_count + 1} cues for '{rev_name}':*\n\n"
+            f"{cues}"
+        )
 
     try:
         return _sync()
@@ -717,10 +963,9 @@ def export_talk_summary(args: dict, **kwargs) -> str:
         )
     def _sync():
         from talkmaster.siyuan import generation
-        session, engine = _get_talkmaster_session()
-        try:
+        with _talkmaster_session() as session:
             # ── Stage gate: must have rehearsed at least once ─────────────
-            gate = _gate_rehearsal_done(session, rev_name)
+            gate = _gate_rehearsal_done(_revision_state(session, rev_name), rev_name)
             if gate:
                 return gate
 
@@ -740,9 +985,6 @@ def export_talk_summary(args: dict, **kwargs) -> str:
                     f"• `push_to_siyuan` — export study materials to SiYuan"
                 )
             return f"\u26a0\ufe0f Could not assemble manuscript for '{rev_name}'."
-        finally:
-            session.close()
-            engine.dispose()
 
     try:
         return _sync()
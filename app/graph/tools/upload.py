@@ -1,22 +1,201 @@
 """
 Gateway tool for processing .jwpub file uploads from WhatsApp.
+
+The attachment is streamed to a private temp directory (never held in
+memory), capped at JWPUB_MAX_BYTES and rejected as soon as the first bytes
+show it isn't a ZIP container. Its SHA-256 is recorded in the JWLinker DB
+(IngestedFiles) so the same publication forwarded again answers from the
+DB instead of being extracted a second time.
+
+Extraction reads the publication's view tree in one query, plans the
+categories and topics in memory and writes them with executemany in a
+single transaction; the result carries per-phase timings.
+
+Tunables (env):
+  JWPUB_MAX_BYTES         — largest accepted download (default 200 MB)
+  JWPUB_DOWNLOAD_TIMEOUT  — seconds per network read (default 30)
 """
 
+import hashlib
 import os
 import re
 import json
 import logging
 import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
 import httpx
 
+from app.hermes import tool_cache
+from app.hermes.executors import check_cancelled
+
 logger = logging.getLogger(__name__)
 
+_MAX_BYTES = int(os.getenv("JWPUB_MAX_BYTES", str(200 * 1024 * 1024)))
+_TIMEOUT = float(os.getenv("JWPUB_DOWNLOAD_TIMEOUT", "30"))
+_CHUNK = 64 * 1024
+_ZIP_MAGIC = b"PK\x03\x04"  # .jwpub is a ZIP archive
+_DEFAULT_CATEGORY = "General"
+
+_INGESTED_SCHEMA = """
+CREATE TABLE IF NOT EXISTS IngestedFiles (
+    sha256 TEXT PRIMARY KEY,
+    publication_id INTEGER NOT NULL,
+    symbol TEXT,
+    topics_saved INTEGER NOT NULL,
+    ingested_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+)
+"""
+
+
+class _RejectedDownload(Exception):
+    """The attachment is not something we will ingest (too big, not a .jwpub)."""
+
+
+def _download(media_url: str, dest: Path) -> str:
+    """Stream media_url into dest and return its SHA-256 hex digest."""
+    digest = hashlib.sha256()
+    size = 0
+    with httpx.Client(timeout=_TIMEOUT, follow_redirects=True) as client:
+        with client.stream("GET", media_url) as resp:
+            resp.raise_for_status()
+            declared = int(resp.headers.get("Content-Length") or 0)
+            if declared > _MAX_BYTES:
+                raise _RejectedDownload(
+                    f"File is too large ({declared // (1024 * 1024)} MB, "
+                    f"limit {_MAX_BYTES // (1024 * 1024)} MB)."
+                )
+            with open(dest, "wb") as out:
+                head = b""
+                for chunk in resp.iter_bytes(_CHUNK):
+                    check_cancelled()  # /v1/tools deadline passed — stop downloading
+                    if len(head) < len(_ZIP_MAGIC):
+                        head += chunk[:len(_ZIP_MAGIC) - len(head)]
+                        if len(head) >= len(_ZIP_MAGIC) and head != _ZIP_MAGIC:
+                            raise _RejectedDownload("Not a .jwpub file (expected a ZIP archive).")
+                    size += len(chunk)
+                    if size > _MAX_BYTES:
+                        raise _RejectedDownload(
+                            f"File is too large (limit {_MAX_BYTES // (1024 * 1024)} MB)."
+                        )
+                    digest.update(chunk)
+                    out.write(chunk)
+    if size < len(_ZIP_MAGIC):
+        raise _RejectedDownload("Not a .jwpub file (empty or truncated download).")
+    return digest.hexdigest()
+
+
+def _already_ingested(cur, sha256: str, pub_code: Optional[str]) -> Optional[dict]:
+    """Result of an earlier import of the same file, if its publication still exists."""
+    cur.execute(
+        "SELECT p.code, p.language, f.symbol, f.topics_saved FROM IngestedFiles f "
+        "JOIN Publications p ON p.id = f.publication_id WHERE f.sha256 = ?",
+        (sha256,),
+    )
+    row = cur.fetchone()
+    if row is None:
+        return None
+    code, language, symbol, topics_saved = row
+    if pub_code and re.sub(r"[^a-z0-9]", "", pub_code.lower()) != code:
+        return None  # same file imported under another code — honour the override
+    return {"code": code, "language_id": language, "symbol": symbol, "topics_saved": topics_saved}
+
+
+def _success(jw_symbol: str, code: str, jw_lang_id: str, topics_saved: int, **extra) -> str:
+    return json.dumps({
+        "status": "success",
+        "symbol": jw_symbol,
+        "code": code,
+        "language_id": jw_lang_id,
+        "topics_saved": topics_saved,
+        "message": f"Publication extracted! You can now `import talk <topic>` or `list topics {code}`.",
+        **extra,
+    })
+
+
+def _plan_import(reader) -> Tuple[List[str], List[Tuple[str, str, int]]]:
+    """
+    Walk the publication's view tree and return (categories, topics).
+
+    The whole PublicationViewItem table is read in one query and walked in
+    memory (it used to be one query per parent plus a COUNT per child).
+    Rules, unchanged from the recursive walk:
+      - a titled node without a document opens a category for its subtree
+      - a titled document node with children opens a category for itself
+        and its subtree
+      - every document node becomes a topic in the innermost category
+    Topics are (category_name, title, document_id) in walk order.
+    """
+    children: Dict[int, List[tuple]] = defaultdict(list)
+    for item_id, parent_id, title, doc_id in reader.execute(
+        "SELECT PublicationViewItemId, ParentPublicationViewItemId, Title, DefaultDocumentId "
+        "FROM PublicationViewItem"
+    ):
+        children[parent_id].append((item_id, title, doc_id))
 
+    categories: List[str] = [_DEFAULT_CATEGORY]
+    topics: List[Tuple[str, str, int]] = []
+    # Same depth-first order as the old recursion; the root items themselves
+    # are containers and are not imported
+    roots = [item_id for item_id, _, _ in children.get(-1, ())]
+    stack = [
+        (child, _DEFAULT_CATEGORY)
+        for root_id in reversed(roots)
+        for child in reversed(children.get(root_id, ()))
+    ]
+    while stack:
+        (item_id, title, doc_id), category = stack.pop()
+        has_children = item_id in children
+        if title and title.strip() and (doc_id is None or has_children):
+            category = title
+            categories.append(title)
+        if doc_id is not None:
+            topics.append((category, title, doc_id))
+        stack.extend((child, category) for child in reversed(children.get(item_id, ())))
+    return categories, topics
+
+
+def _write_import(cur, code: str, language: str, categories: List[str],
+                  topics: List[Tuple[str, str, str]]) -> int:
+    """Upsert the publication, its categories and topics; returns the publication id.
+
+    A constant number of statements regardless of size: categories and
+    topics go through executemany. The caller owns the transaction.
+    """
+    cur.execute(
+        "INSERT OR IGNORE INTO Publications (code, language) VALUES (?, ?)",
+        (code, language),
+    )
+    cur.execute(
+        "SELECT id FROM Publications WHERE code = ? AND language = ?",
+        (code, language),
+    )
+    pub_id = cur.fetchone()[0]
+
+    cur.executemany(
+        "INSERT OR IGNORE INTO Categories (publication_id, name) VALUES (?, ?)",
+        [(pub_id, name) for name in dict.fromkeys(categories)],
+    )
+    cur.execute("SELECT name, id FROM Categories WHERE publication_id = ?", (pub_id,))
+    category_ids = dict(cur.fetchall())
+
+    cur.executemany("""
+        INSERT INTO Topics (category_id, name, content)
+        VALUES (?, ?, ?)
+        ON CONFLICT(category_id, name)
+        DO UPDATE SET content=excluded.content
+    """, [(category_ids[category], title, content) for category, title, content in topics])
+    return pub_id
+
+
+@tool_cache.invalidates("talkprep.catalog")
 def upload_jwpub(args: dict, **kwargs) -> str:
     """Process a .jwpub file from a WhatsApp attachment URL."""
     from jwlinker.core.jwpub import JWPUBReader
     from jwlinker.core.db_manager import DBManager
-    from pathlib import Path
 
     media_url = args.get("media_url", "")
     pub_code = args.get("pub_code")
@@ -24,135 +203,90 @@ def upload_jwpub(args: dict, **kwargs) -> str:
     if not media_url:
         return json.dumps({"error": "Missing media_url"})
 
-    # 1. Download the file
-    logger.info(f"Downloading .jwpub from: {media_url[:80]}...")
-    try:
-        with httpx.Client(timeout=30, follow_redirects=True) as client:
-            resp = client.get(media_url)
-            resp.raise_for_status()
-    except Exception as e:
-        return json.dumps({"error": f"Could not download file: {e}"})
-
-    # Save to temp file
-    tmp = tempfile.NamedTemporaryFile(suffix=".jwpub", delete=False)
-    tmp.write(resp.content)
-    tmp.close()
-    tmp_path = Path(tmp.name)
-
-    try:
-        # 2. Extract with JWPUBReader
-        with JWPUBReader(tmp_path) as reader:
-            pub_meta = reader.execute(
-                "SELECT Symbol, MepsLanguageIndex FROM Publication"
-            )
-            if not pub_meta:
-                return json.dumps({"error": "Invalid .jwpub file: no Publication table found."})
+    # The directory (and the download inside it) is removed when this block
+    # exits — whatever path we leave by
+    with tempfile.TemporaryDirectory(prefix="jwpub-") as tmp_dir:
+        tmp_path = Path(tmp_dir) / "upload.jwpub"
 
-            jw_symbol, jw_lang_id = pub_meta[0]
-            jw_lang_id = str(jw_lang_id)
-            detected_code = re.sub(r"[^a-z0-9]", "", (pub_code or jw_symbol).lower())
+        # 1. Download the file
+        logger.info(f"Downloading .jwpub from: {media_url[:80]}...")
+        try:
+            sha256 = _download(media_url, tmp_path)
+        except _RejectedDownload as e:
+            return json.dumps({"error": str(e)})
+        except Exception as e:
+            return json.dumps({"error": f"Could not download file: {e}"})
 
-            # 3. Save to JWLinker DB
-            db_mgr = DBManager()
-            db_mgr.ensure_schema()
-            conn = db_mgr.get_connection()
+        db_mgr = DBManager()
+        db_mgr.ensure_schema()
+        conn = db_mgr.get_connection()
+        try:
             cur = conn.cursor()
+            cur.execute(_INGESTED_SCHEMA)
 
-            cur.execute(
-                "INSERT OR IGNORE INTO Publications (code, language) VALUES (?, ?)",
-                (detected_code, jw_lang_id),
-            )
-            cur.execute(
-                "SELECT id FROM Publications WHERE code = ? AND language = ?",
-                (detected_code, jw_lang_id),
-            )
-            pub_id = cur.fetchone()[0]
+            # 2. Same bytes already imported → answer from the DB
+            previous = _already_ingested(cur, sha256, pub_code)
+            if previous:
+                logger.info(f"JWPUB {sha256[:12]} already ingested as '{previous['code']}'")
+                return _success(
+                    previous["symbol"], previous["code"], previous["language_id"],
+                    previous["topics_saved"], duplicate=True,
+                    message=(
+                        f"Publication already imported! You can now `import talk <topic>` "
+                        f"or `list topics {previous['code']}`."
+                    ),
+                )
 
-            cur.execute(
-                "INSERT OR IGNORE INTO Categories (publication_id, name) VALUES (?, ?)",
-                (pub_id, "General"),
-            )
-            cur.execute(
-                "SELECT id FROM Categories WHERE publication_id = ? AND name = ?",
-                (pub_id, "General"),
-            )
-            default_cat_id = cur.fetchone()[0]
-
-            topics_saved = 0
-
-            def traverse(parent_id, current_cat_id):
-                nonlocal topics_saved
-                children = reader.execute("""
-                    SELECT PublicationViewItemId, Title, DefaultDocumentId
-                    FROM PublicationViewItem
-                    WHERE ParentPublicationViewItemId = ?
-                """, (parent_id,))
-                for child_id, title, doc_id in children:
-                    child_count = reader.execute(
-                        "SELECT COUNT(*) FROM PublicationViewItem "
-                        "WHERE ParentPublicationViewItemId = ?",
-                        (child_id,),
-                    )[0][0]
-                    next_cat_id = current_cat_id
-                    if doc_id is None:
-                        if title and title.strip():
-                            cur.execute(
-                                "INSERT OR IGNORE INTO Categories "
-                                "(publication_id, name) VALUES (?, ?)",
-                                (pub_id, title),
-                            )
-                            cur.execute(
-                                "SELECT id FROM Categories "
-                                "WHERE publication_id = ? AND name = ?",
-                                (pub_id, title),
-                            )
-                            next_cat_id = cur.fetchone()[0]
-                        traverse(child_id, next_cat_id)
-                    else:
-                        if child_count > 0 and title and title.strip():
-                            cur.execute(
-                                "INSERT OR IGNORE INTO Categories "
-                                "(publication_id, name) VALUES (?, ?)",
-                                (pub_id, title),
-                            )
-                            cur.execute(
-                                "SELECT id FROM Categories "
-                                "WHERE publication_id = ? AND name = ?",
-                                (pub_id, title),
-                            )
-                            next_cat_id = cur.fetchone()[0]
-                        content = reader.get_document_content(doc_id) or ""
-                        cur.execute("""
-                            INSERT INTO Topics (category_id, name, content)
-                            VALUES (?, ?, ?)
-                            ON CONFLICT(category_id, name)
-                            DO UPDATE SET content=excluded.content
-                        """, (next_cat_id, title, content))
-                        topics_saved += 1
-                        if child_count > 0:
-                            traverse(child_id, next_cat_id)
-
-            roots = reader.execute(
-                "SELECT PublicationViewItemId FROM PublicationViewItem "
-                "WHERE ParentPublicationViewItemId = -1"
+            # 3. Extract with JWPUBReader
+            with JWPUBReader(tmp_path) as reader:
+                pub_meta = reader.execute(
+                    "SELECT Symbol, MepsLanguageIndex FROM Publication"
+                )
+                if not pub_meta:
+                    return json.dumps({"error": "Invalid .jwpub file: no Publication table found."})
+
+                jw_symbol, jw_lang_id = pub_meta[0]
+                jw_lang_id = str(jw_lang_id)
+                detected_code = re.sub(r"[^a-z0-9]", "", (pub_code or jw_symbol).lower())
+
+                # 4. Build the category/topic plan from the whole view tree
+                t0 = time.perf_counter()
+                categories, topic_nodes = _plan_import(reader)
+                t1 = time.perf_counter()
+                topics = [
+                    (category, title, reader.get_document_content(doc_id) or "")
+                    for category, title, doc_id in topic_nodes
+                ]
+                t2 = time.perf_counter()
+
+                # 5. Save to JWLinker DB in one transaction
+                try:
+                    pub_id = _write_import(cur, detected_code, jw_lang_id, categories, topics)
+                    topics_saved = len(topics)
+                    cur.execute(
+                        "INSERT OR REPLACE INTO IngestedFiles "
+                        "(sha256, publication_id, symbol, topics_saved) VALUES (?, ?, ?, ?)",
+                        (sha256, pub_id, jw_symbol, topics_saved),
+                    )
+                    conn.commit()
+                except Exception:
+                    conn.rollback()
+                    raise
+                t3 = time.perf_counter()
+
+            timings = {
+                "tree_ms": round((t1 - t0) * 1000, 1),
+                "documents_ms": round((t2 - t1) * 1000, 1),
+                "write_ms": round((t3 - t2) * 1000, 1),
+            }
+            logger.info(
+                f"JWPUB '{detected_code}' imported: {len(categories)} categories, "
+                f"{topics_saved} topics ({timings})"
             )
-            for root in roots:
-                traverse(root[0], default_cat_id)
+            return _success(jw_symbol, detected_code, jw_lang_id, topics_saved, timings_ms=timings)
 
-            conn.commit()
+        except Exception as e:
+            logger.error(f"JWPUB extraction failed: {e}")
+            return json.dumps({"error": f"Extraction failed: {e}"})
+        finally:
             conn.close()
-
-        return json.dumps({
-            "status": "success",
-            "symbol": jw_symbol,
-            "code": detected_code,
-            "language_id": jw_lang_id,
-            "topics_saved": topics_saved,
-            "message": f"Publication extracted! You can now `import talk <topic>` or `list topics {detected_code}`."
-        })
-
-    except Exception as e:
-        logger.error(f"JWPUB extraction failed: {e}")
-        return json.dumps({"error": f"Extraction failed: {e}"})
-    finally:
-        tmp_path.unlink(missing_ok=True)
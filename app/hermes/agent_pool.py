@@ -0,0 +1,147 @@
+"""
+Warm AIAgent pool — reuse agents instead of constructing one per message.
+
+Building an AIAgent loads SOUL.md, skills prompts, toolset schemas and the
+provider client. None of that depends on who is talking, only on the
+(persona, toolsets, model) combination, so idle agents are kept per key
+and handed back out with their per-call state reset:
+
+  - session_id / user_id / ephemeral_system_prompt are overwritten
+  - reset_session_state() then rebinds everything __init__ derived from
+    the session (log path, session DB row, memory/todo stores)
+
+An agent is only ever used by one thread at a time (lease → return).
+Agents that raised during a call are discarded, never re-pooled. An
+agent without a callable reset_session_state() is never pooled at all:
+overwriting the attributes alone would leave the previous session's log
+and stores bound, so such a Hermes build degrades to the old
+construct-per-call behaviour instead of leaking state between users.
+
+Tunables (env):
+  HERMES_AGENT_POOL           — "0" disables pooling (default "1")
+  HERMES_AGENT_POOL_PER_KEY   — idle agents kept per key (default = thread pool size)
+  HERMES_AGENT_POOL_MAX_KEYS  — distinct keys kept before LRU eviction (default 8)
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from typing import Any, Callable, Hashable, Iterator
+
+logger = logging.getLogger(__name__)
+
+_ENABLED = os.getenv("HERMES_AGENT_POOL", "1") != "0"
+_PER_KEY = int(os.getenv(
+    "HERMES_AGENT_POOL_PER_KEY", os.getenv("HERMES_THREAD_POOL_SIZE", "2")
+))
+_MAX_KEYS = int(os.getenv("HERMES_AGENT_POOL_MAX_KEYS", "8"))
+
+# Constructor kwargs that vary per message and must be re-applied on reuse
+PER_CALL_ATTRS = ("session_id", "user_id", "ephemeral_system_prompt")
+
+_lock = threading.Lock()
+_idle: "OrderedDict[Hashable, deque]" = OrderedDict()  # key → idle agents (LRU order)
+_stats = {
+    "hits": 0,
+    "misses": 0,
+    "discarded": 0,
+    "evicted": 0,
+    "construct_seconds": 0.0,
+}
+
+
+def _reusable(agent: Any) -> bool:
+    """An agent can be pooled only if it can rebind itself to a new session."""
+    return (
+        callable(getattr(agent, "reset_session_state", None))
+        and all(hasattr(agent, attr) for attr in PER_CALL_ATTRS)
+    )
+
+
+def _reset(agent: Any, per_call: dict) -> None:
+    """Apply this call's identity, then rebuild the session-bound state."""
+    for attr, value in per_call.items():
+        setattr(agent, attr, value)
+    agent.reset_session_state()
+
+
+def _checkout(key: Hashable):
+    with _lock:
+        idle = _idle.get(key)
+        if idle:
+            _idle.move_to_end(key)
+            _stats["hits"] += 1
+            return idle.pop()
+        return None
+
+
+def _checkin(key: Hashable, agent: Any) -> None:
+    with _lock:
+        idle = _idle.setdefault(key, deque())
+        _idle.move_to_end(key)
+        if len(idle) < _PER_KEY:
+            idle.append(agent)
+        else:
+            _stats["discarded"] += 1
+        while len(_idle) > _MAX_KEYS:
+            _, evicted = _idle.popitem(last=False)
+            _stats["evicted"] += len(evicted)
+
+
+@contextmanager
+def lease(key: Hashable, factory: Callable[[], Any], per_call: dict) -> Iterator[Any]:
+    """Borrow a warm agent for ``key``, constructing one on a miss.
+
+    Args:
+        key: Pool key — everything that shapes the agent except per-call state
+            (persona, toolsets, model, provider).
+        factory: Zero-arg constructor for a fresh agent (full kwargs).
+        per_call: Values for PER_CALL_ATTRS, applied when reusing an agent.
+
+    The agent goes back to the pool only if the block exits cleanly.
+    """
+    agent = _checkout(key) if _ENABLED else None
+    if agent is not None:
+        _reset(agent, per_call)
+    else:
+        start = time.perf_counter()
+        agent = factory()
+        elapsed = time.perf_counter() - start
+        with _lock:
+            _stats["misses"] += 1
+            _stats["construct_seconds"] += elapsed
+        logger.debug("AIAgent constructed for %s in %.0fms", key, elapsed * 1000)
+
+    yield agent
+
+    if _ENABLED and _reusable(agent):
+        _checkin(key, agent)
+
+
+def clear() -> None:
+    """Drop every idle agent (e.g. after a SOUL.md / skills change)."""
+    with _lock:
+        _idle.clear()
+
+
+def stats() -> dict:
+    """Pool hit rate and average construction cost, for /metrics and admin tools."""
+    with _lock:
+        constructed = _stats["misses"]
+        avg_ms = (_stats["construct_seconds"] / constructed * 1000) if constructed else 0.0
+        total = _stats["hits"] + _stats["misses"]
+        return {
+            "enabled": _ENABLED,
+            "keys": len(_idle),
+            "idle_agents": sum(len(q) for q in _idle.values()),
+            "hits": _stats["hits"],
+            "misses": _stats["misses"],
+            "hit_rate": round(_stats["hits"] / total, 3) if total else 0.0,
+            "discarded": _stats["discarded"],
+            "evicted": _stats["evicted"],
+            "avg_construct_ms": round(avg_ms, 1),
+            "construct_ms_saved": round(_stats["hits"] * avg_ms, 1),
+        }
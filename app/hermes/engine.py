@@ -12,25 +12,43 @@ synchronous (blocking network calls to LLM providers). The async
 FastAPI handler offloads each invocation to the pool, freeing the
 event loop for concurrent WhatsApp messages.
 
+Concurrency: HERMES_THREAD_POOL_SIZE workers run agents; calls beyond
+that wait in the admission scheduler. There is no asyncio-native path —
+AIAgent has no async API, so every run holds a thread for its whole LLM
+loop. Those threads are mostly idle on network I/O, so the pool can be
+sized well above the core count; the limit is the memory ceiling (each
+run keeps its transcript and provider client alive).
+
+Streaming: when the installed AIAgent accepts a ``stream_callback``,
+text deltas are forwarded to the caller's ``on_delta`` on the event loop
+(used by the SSE path in app/api/adapters/openai.py).
+
 Burst protection:
   - _in_flight TTL dedup: prevents duplicate processing of the same
     message when WhatsApp retries (common on spotty connectivity)
-  - Queue depth limiting: rejects messages when the thread pool is
-    saturated rather than OOMing with queued work
+  - Admission scheduler (app/hermes/scheduler.py): weighted fair queues
+    per tier/persona, a bounded waiting room and per-message deadlines
+    instead of rejecting as soon as the pool is busy
 """
 
 import asyncio
 import contextvars
+import functools
+import inspect
 import json
 import os
 import time
 import logging
-from concurrent.futures import ThreadPoolExecutor
-from pathlib import Path
-from typing import Optional, Dict, Any
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Optional, Dict, Any
 
 from run_agent import AIAgent
 
+from app.hermes import agent_pool, response_cache, scheduler
+from app.memory import session_store
+from app.utils import metrics
+from app.utils.ttl_store import SlidingWindowCounter, TTLStore
+
 # ── Terminal Command Blocklist (F-25) ────────────────────────────────────────
 try:
     import sys
@@ -56,27 +74,61 @@ except Exception as e:
 
 logger = logging.getLogger(__name__)
 
-# ── Sessions directory (shared with Hermes agent) ───────────────────────────
-_sessions_dir = Path(os.getenv(
-    "HERMES_HOME", str(Path.home() / ".hermes")
-)) / "sessions"
-
 # ── Configuration (from environment, set by Ansible templates) ──────────────
 
 _MAX_WORKERS = int(os.getenv("HERMES_THREAD_POOL_SIZE", "2"))
 _MAX_ITERATIONS = int(os.getenv("HERMES_MAX_ITERATIONS", "15"))
 _DEDUP_TTL = int(os.getenv("HERMES_DEDUP_TTL", "30"))    # seconds
-_MAX_QUEUE_DEPTH = int(os.getenv("HERMES_MAX_QUEUE", "4"))
 _RATE_LIMIT_SECS = float(os.getenv("HERMES_RATE_LIMIT_SECS", "5.0"))
 _GLOBAL_RATE_LIMIT = int(os.getenv("HERMES_GLOBAL_RATE_LIMIT", "10"))  # per 60s
 
-# ── Thread pool ─────────────────────────────────────────────────────────────
+# ── Thread pool + admission ─────────────────────────────────────────────────
+# The scheduler hands out exactly as many run slots as there are workers,
+# so a submitted call never queues inside the executor — all waiting
+# happens in the scheduler, where tiers and deadlines apply.
 
 _pool = ThreadPoolExecutor(
     max_workers=_MAX_WORKERS,
     thread_name_prefix="hermes",
 )
 
+_scheduler = scheduler.AdmissionScheduler(slots=_MAX_WORKERS)
+
+
+metrics.Gauge(
+    "gateway_hermes_running",
+    "Hermes invocations currently holding a run slot.",
+    lambda: _scheduler.running,
+)
+metrics.Gauge(
+    "gateway_hermes_waiting",
+    "Hermes invocations waiting for a run slot, by tier.",
+    lambda: _scheduler.stats()["waiting_by_tier"],
+    labelnames=("tier",),
+)
+metrics.Gauge(
+    "gateway_hermes_waiting_room",
+    "Maximum waiting Hermes invocations (HERMES_WAITING_ROOM).",
+    lambda: _scheduler.waiting_room,
+)
+metrics.Gauge(
+    "gateway_hermes_workers",
+    "Hermes worker threads (HERMES_THREAD_POOL_SIZE).",
+    lambda: _MAX_WORKERS,
+)
+
+
+def _detect_stream_kwarg() -> Optional[str]:
+    """Name of AIAgent's text-delta callback kwarg, if this Hermes build has one."""
+    try:
+        params = inspect.signature(AIAgent.__init__).parameters
+    except (TypeError, ValueError):
+        return None
+    return "stream_callback" if "stream_callback" in params else None
+
+
+_STREAM_KWARG = _detect_stream_kwarg()
+
 # ── Context variable for tenant isolation ────────────────────────────────────
 # Server-side injection prevents prompt-injection attacks that try to
 # switch wing context via crafted messages.
@@ -90,14 +142,15 @@ _current_urn: contextvars.ContextVar[str] = contextvars.ContextVar(
 # {message_hash: (timestamp, future)} — prevents duplicate processing
 _in_flight: Dict[str, tuple] = {}
 
-# Current number of queued/running tasks
-_queue_depth = 0
-
-# Per-URN rate limiting (§11.3): {urn: monotonic_timestamp}
-_last_cognitive: Dict[str, float] = {}
+# Per-URN rate limiting (§11.3): {urn: monotonic_timestamp}, forgotten
+# once the rate-limit window has passed
+_last_cognitive = TTLStore(
+    "engine.last_cognitive", ttl=_RATE_LIMIT_SECS,
+    maxsize=int(os.getenv("HERMES_RATE_LIMIT_MAX_URNS", "10000")),
+)
 
 # Global rate limiting across all users
-_global_request_times: list = []
+_global_requests = SlidingWindowCounter("engine.global_requests", window=60.0)
 
 
 def _message_key(urn: str, message: str) -> str:
@@ -106,9 +159,13 @@ def _message_key(urn: str, message: str) -> str:
 
 
 def _cleanup_expired() -> None:
-    """Remove expired dedup entries (called before each invocation)."""
+    """Remove expired dedup entries (called before each invocation).
+
+    Entries still queued or running are kept: a run may wait for
+    admission longer than the TTL, and its retries must still join it.
+    """
     now = time.monotonic()
-    expired = [k for k, (ts, _) in _in_flight.items() if now - ts > _DEDUP_TTL]
+    expired = [k for k, (ts, f) in _in_flight.items() if now - ts > _DEDUP_TTL and f.done()]
     for k in expired:
         _in_flight.pop(k, None)
 
@@ -243,53 +300,72 @@ _DEFAULT_TOOLSETS = ["mempalace", "memory", "todo"]
 
 
 def _load_session_history(session_id: str, max_messages: int = 20) -> list[dict]:
-    """Load recent conversation history from Hermes session JSON.
+    """Load recent conversation history from the session journal.
 
     Returns a list of message dicts [{role, content}, ...] suitable for
     passing as conversation_history to AIAgent.run_conversation().
     Returns empty list on cold start, missing file, or parse error.
+
+    Only the last max_messages lines of the journal are read — cost is
+    independent of how long the conversation has been going.
     """
-    session_file = _sessions_dir / f"session_{session_id}.json"
-    if not session_file.exists():
+    # One extra message tells us whether the history was truncated
+    messages = session_store.tail_messages(session_id, max_messages + 1)
+    if not messages:
         return []
 
+    # Take last N messages, preserving tool-call groups
+    if len(messages) > max_messages:
+        messages = messages[-max_messages:]
+        # Ensure we don't start with a tool response or assistant
+        # continuation — walk forward to find a user message
+        while messages and messages[0].get("role") != "user":
+            messages = messages[1:]
+
+    # Strip internal-only fields that shouldn't be re-injected
+    cleaned = []
+    for msg in messages:
+        clean = {
+            "role": msg.get("role", "user"),
+            "content": msg.get("content", ""),
+        }
+        # Preserve tool_calls for assistant messages
+        if msg.get("tool_calls"):
+            clean["tool_calls"] = msg["tool_calls"]
+        # Preserve tool metadata for tool messages
+        if msg.get("role") == "tool":
+            if msg.get("tool_call_id"):
+                clean["tool_call_id"] = msg["tool_call_id"]
+            if msg.get("name"):
+                clean["name"] = msg["name"]
+        cleaned.append(clean)
+
+    return cleaned
+
+
+def _journal_turn(session_id: str, message: str, result: dict, history: list) -> None:
+    """Append this turn's messages to the session journal.
+
+    Hermes returns the full transcript (injected history + new turn), so
+    the new messages are the slice after the history we passed in. If the
+    transcript doesn't line up (cold start via chat(), or a Hermes version
+    that trims history), fall back to a plain user/assistant pair.
+    """
+    transcript = [m for m in (result.get("messages") or []) if isinstance(m, dict)]
+    new_messages = transcript[len(history):]
+    if not (
+        new_messages
+        and new_messages[0].get("role") == "user"
+        and new_messages[0].get("content") == message
+    ):
+        new_messages = [
+            {"role": "user", "content": message},
+            {"role": "assistant", "content": result.get("final_response") or ""},
+        ]
     try:
-        data = json.loads(session_file.read_text(encoding="utf-8"))
-        messages = data.get("messages", [])
-        if not messages:
-            return []
-
-        # Take last N messages, preserving tool-call groups
-        if len(messages) > max_messages:
-            messages = messages[-max_messages:]
-            # Ensure we don't start with a tool response or assistant
-            # continuation — walk forward to find a user message
-            while messages and messages[0].get("role") != "user":
-                messages = messages[1:]
-
-        # Strip internal-only fields that shouldn't be re-injected
-        cleaned = []
-        for msg in messages:
-            clean = {
-                "role": msg.get("role", "user"),
-                "content": msg.get("content", ""),
-            }
-            # Preserve tool_calls for assistant messages
-            if msg.get("tool_calls"):
-                clean["tool_calls"] = msg["tool_calls"]
-            # Preserve tool metadata for tool messages
-            if msg.get("role") == "tool":
-                if msg.get("tool_call_id"):
-                    clean["tool_call_id"] = msg["tool_call_id"]
-                if msg.get("name"):
-                    clean["name"] = msg["name"]
-            cleaned.append(clean)
-
-        return cleaned
-
-    except (json.JSONDecodeError, OSError, KeyError) as e:
-        logger.warning("Failed to load session history for %s: %s", session_id, e)
-        return []
+        session_store.append_messages(session_id, new_messages, migrate=False)
+    except OSError as e:
+        logger.warning("Failed to journal turn for %s: %s", session_id, e)
 
 
 def get_session_id(urn: str, persona: str) -> str:
@@ -310,13 +386,15 @@ def _invoke_sync(
     model: Optional[str] = None,
     allowed_tools: Optional[list] = None,
     conversation_history: Optional[list] = None,
+    on_delta: Optional[Callable[[str], None]] = None,
 ) -> dict:
     """
     Synchronous Hermes invocation — runs in the thread pool.
 
-    Creates a fresh AIAgent per call. History is injected via
-    run_conversation(conversation_history=...) so the agent starts
-    each turn with full context despite being ephemeral.
+    Leases a warm AIAgent from agent_pool (constructing one on a miss).
+    History is injected via run_conversation(conversation_history=...)
+    so the agent starts each turn with full context despite being
+    shared across users.
     """
     # Set context var for tenant isolation (used by MemPalace tools)
     _current_urn.set(urn)
@@ -363,8 +441,6 @@ def _invoke_sync(
         agent_kwargs["api_key"] = os.getenv("OPENAI_API_KEY", "")
         agent_kwargs["base_url"] = os.getenv("LITELLM_BASE_URL", "http://localhost:4000/v1")
 
-    agent = AIAgent(**agent_kwargs)
-
     # ── Load and inject history (F-01, F-10, F-11) ───────────────────────
     # conversation_history = RiveBot-bridged exchanges (passed from invoke_hermes)
     # session_history = prior Hermes turns (loaded from session file)
@@ -372,15 +448,133 @@ def _invoke_sync(
     session_history = _load_session_history(session_id)
     history = rivebot_pre + session_history
 
-    if history:
-        result = agent.run_conversation(
-            user_message=message,
-            conversation_history=history,
+    # ── Warm agent from the pool (SOUL.md, schemas, provider client reused) ──
+    pool_key = (persona, tuple(toolsets), _llm_model, _provider)
+    per_call = {attr: agent_kwargs[attr] for attr in agent_pool.PER_CALL_ATTRS}
+    if _STREAM_KWARG:
+        # Always set (None when not streaming) so a pooled agent never
+        # keeps pushing deltas to a previous caller
+        agent_kwargs[_STREAM_KWARG] = per_call[_STREAM_KWARG] = on_delta
+
+    with agent_pool.lease(pool_key, lambda: AIAgent(**agent_kwargs), per_call) as agent:
+        if history:
+            result = agent.run_conversation(
+                user_message=message,
+                conversation_history=history,
+            )
+        else:
+            # Cold start — no history to inject
+            result = {"final_response": agent.chat(message), "messages": []}
+
+    _journal_turn(session_id, message, result, history)
+    return result
+
+
+def _invoke_timed(submitted_at: float, *args) -> dict:
+    """Run _invoke_sync, recording queue wait and execution time."""
+    started = time.perf_counter()
+    metrics.CHAT_STAGE_SECONDS.observe(started - submitted_at, stage="hermes_queue")
+    try:
+        return _invoke_sync(*args)
+    finally:
+        metrics.CHAT_STAGE_SECONDS.observe(time.perf_counter() - started, stage="hermes_exec")
+
+
+async def _run_admitted(
+    dedup_key: str,
+    urn: str,
+    persona: str,
+    message: str,
+    system_prompt: Optional[str],
+    rivebot_context: Optional[dict],
+    persona_vars: Optional[dict],
+    allowed_tools: Optional[list],
+    on_delta: Optional[Callable[[str], None]],
+) -> dict:
+    """Global rate limit → admission → thread pool, for one new agent run."""
+    # ── Global Rate Limit (Phase 4.1) ────────────────────────────────────
+    if not _global_requests.try_acquire(_GLOBAL_RATE_LIMIT):
+        logger.warning(f"Global rate limit hit ({_GLOBAL_RATE_LIMIT}/60s) — dropping {urn}")
+        metrics.HERMES_RATE_LIMITED.inc(scope="global")
+        raise RuntimeError("System is currently experiencing high load. Please try back later.")
+
+    # ── Build system prompt ──────────────────────────────────────────────
+    full_prompt = _build_system_prompt(
+        persona_vars=persona_vars or {},
+        system_prompt_override=system_prompt,
+        rivebot_context=rivebot_context,
+    )
+
+    # ── Bridge RiveBot history into conversation_history (F-22) ──────────
+    rivebot_history = []
+    if rivebot_context and rivebot_context.get("history"):
+        for exchange in rivebot_context["history"]:
+            rivebot_history.append({"role": "user", "content": exchange["user"]})
+            rivebot_history.append({"role": "assistant", "content": exchange["bot"]})
+
+    # ── Hop streamed deltas from the worker thread onto the loop ─────────
+    thread_delta = None
+    if on_delta is not None and _STREAM_KWARG:
+        loop = asyncio.get_running_loop()
+
+        def thread_delta(text: str) -> None:
+            if text:
+                loop.call_soon_threadsafe(on_delta, text)
+
+    # ── Register for dedup before queueing ───────────────────────────────
+    # A WhatsApp retry that arrives while this message waits for admission
+    # (after the per-URN rate limit has lapsed) must join this run, not
+    # start a second one. The entry is dropped when the worker finishes.
+    outcome: Future = Future()
+    entry = (time.monotonic(), outcome)
+    _in_flight[dedup_key] = entry
+
+    def _settle(future: Future) -> None:
+        """Worker done (on the loop): free the slot, publish the result."""
+        _scheduler.release()
+        if _in_flight.get(dedup_key) is entry:
+            _in_flight.pop(dedup_key, None)
+        if future.exception() is not None:
+            outcome.set_exception(future.exception())
+        else:
+            outcome.set_result(future.result())
+
+    # ── Wait for a run slot (weighted fair, deadline-bounded) ────────────
+    tier = scheduler.classify(urn, persona, rivebot_context)
+    try:
+        await _scheduler.acquire(tier, persona)
+    except BaseException as e:
+        if _in_flight.get(dedup_key) is entry:
+            _in_flight.pop(dedup_key, None)
+        if isinstance(e, asyncio.CancelledError):
+            outcome.cancel()
+        else:
+            outcome.set_exception(e)
+        raise
+
+    # ── Submit to thread pool ────────────────────────────────────────────
+    # The slot is held until the worker thread finishes, even if this
+    # coroutine is cancelled first — otherwise the scheduler would admit
+    # more concurrent runs than there are threads.
+    ctx = contextvars.copy_context()
+    loop = asyncio.get_running_loop()
+    try:
+        future = _pool.submit(
+            ctx.run,
+            _invoke_timed,
+            time.perf_counter(),
+            urn, persona, message, full_prompt, None, allowed_tools,
+            rivebot_history if rivebot_history else None,
+            thread_delta,
         )
-        return result
-    else:
-        # Cold start — no history to inject
-        return {"final_response": agent.chat(message), "messages": []}
+    except BaseException as e:  # pool shut down — never ran
+        failed: Future = Future()
+        failed.set_exception(e)
+        _settle(failed)
+        raise
+    future.add_done_callback(lambda f: loop.call_soon_threadsafe(_settle, f))
+
+    return await asyncio.wrap_future(future)
 
 
 async def invoke_hermes(
@@ -391,6 +585,7 @@ async def invoke_hermes(
     rivebot_context: Optional[dict] = None,
     persona_vars: Optional[dict] = None,
     allowed_tools: Optional[list] = None,
+    on_delta: Optional[Callable[[str], None]] = None,
 ) -> dict:
     """
     Async entry point for the V2 engine — called from openai.py.
@@ -403,15 +598,18 @@ async def invoke_hermes(
         rivebot_context: Dict from RiveBot intent matching
         persona_vars: Dict from PersonaPromptRegistry.get_async()
         allowed_tools: Per-persona toolset whitelist (from DB)
+        on_delta: Optional callback for streamed text deltas. Always called
+            on the event loop. It is never called when the Hermes build
+            can't stream, and in that case callers rely on the final result.
 
     Returns:
         dict: Assistant response and metadata
 
     Raises:
-        RuntimeError: If queue is full (burst protection)
+        RuntimeError: On global rate limit (burst protection)
+        scheduler.AdmissionRejected: If no run slot was granted (waiting
+            room full, evicted by a higher tier, or message deadline passed)
     """
-    global _queue_depth
-
     # ── Dedup check ──────────────────────────────────────────────────────
     _cleanup_expired()
     key = _message_key(urn, message)
@@ -419,6 +617,7 @@ async def invoke_hermes(
     if key in _in_flight:
         ts, future = _in_flight[key]
         logger.info(f"Dedup hit for {urn} — reusing in-flight result")
+        metrics.HERMES_DEDUP_HITS.inc()
         if future.done():
             return future.result()
         # Wait for the existing invocation to complete
@@ -426,54 +625,45 @@ async def invoke_hermes(
 
     # ── Per-URN rate limit (§11.3) ────────────────────────────────────────
     now = time.monotonic()
-    if now - _last_cognitive.get(urn, 0) < _RATE_LIMIT_SECS:
+    if urn in _last_cognitive:
         logger.info(f"Rate limit hit for {urn} — throttling")
+        metrics.HERMES_RATE_LIMITED.inc(scope="urn")
         return {"final_response": "Please wait a few seconds before sending another message.", "messages": []}
     _last_cognitive[urn] = now
 
-    # ── Global Rate Limit (Phase 4.1) ────────────────────────────────────
-    _global_request_times[:] = [t for t in _global_request_times if now - t < 60]
-    if len(_global_request_times) >= _GLOBAL_RATE_LIMIT:
-        logger.warning(f"Global rate limit hit ({_GLOBAL_RATE_LIMIT}/60s) — dropping {urn}")
-        raise RuntimeError("System is currently experiencing high load. Please try back later.")
-    _global_request_times.append(now)
-
-    # ── Queue depth check ────────────────────────────────────────────────
-    if _queue_depth >= _MAX_QUEUE_DEPTH:
-        logger.warning(f"Queue full ({_queue_depth}/{_MAX_QUEUE_DEPTH}) — rejecting {urn}")
-        raise RuntimeError("Service busy — please try again in a moment.")
-
-    # ── Build system prompt ──────────────────────────────────────────────
-    full_prompt = _build_system_prompt(
-        persona_vars=persona_vars or {},
-        system_prompt_override=system_prompt,
-        rivebot_context=rivebot_context,
+    # ── Response cache / cross-user coalescing (opt-in, side-effect-free) ──
+    run = functools.partial(
+        _run_admitted, key, urn, persona, message, system_prompt,
+        rivebot_context, persona_vars, allowed_tools, on_delta,
     )
-
-    # ── Bridge RiveBot history into conversation_history (F-22) ──────────
-    rivebot_history = []
-    if rivebot_context and rivebot_context.get("history"):
-        for exchange in rivebot_context["history"]:
-            rivebot_history.append({"role": "user", "content": exchange["user"]})
-            rivebot_history.append({"role": "assistant", "content": exchange["bot"]})
-
-    # ── Submit to thread pool ────────────────────────────────────────────
-    _queue_depth += 1
-    ctx = contextvars.copy_context()
-
-    try:
-        future = _pool.submit(
-            ctx.run,
-            _invoke_sync,
-            urn, persona, message, full_prompt, None, allowed_tools,
-            rivebot_history if rivebot_history else None,
+    if not response_cache.eligible(persona, allowed_tools or _DEFAULT_TOOLSETS):
+        return await run()
+
+    # Same history the agent would be given — replies depend on it
+    history = [
+        {"role": role, "content": exchange[field]}
+        for exchange in (rivebot_context or {}).get("history") or []
+        for role, field in (("user", "user"), ("assistant", "bot"))
+    ]
+    history += await asyncio.to_thread(_load_session_history, get_session_id(urn, persona))
+    context_fp = response_cache.fingerprint(
+        json.dumps([persona_vars or {}, system_prompt or ""], sort_keys=True, default=str),
+        rivebot_context,
+        history,
+    )
+    cache_key = response_cache.make_key(persona, message, context_fp)
+    if cache_key is None:
+        return await run()
+
+    result, shared = await response_cache.get_or_run(cache_key, run)
+    if shared:
+        # No agent run for this user — still record the turn in their journal
+        await asyncio.to_thread(
+            session_store.append_messages,
+            get_session_id(urn, persona),
+            [
+                {"role": "user", "content": message},
+                {"role": "assistant", "content": result["final_response"]},
+            ],
         )
-        _in_flight[key] = (time.monotonic(), future)
-
-        result = await asyncio.wrap_future(future)
-        return result
-
-    finally:
-        _queue_depth -= 1
-        # Clean up dedup entry after completion
-        _in_flight.pop(key, None)
+    return result
@@ -0,0 +1,212 @@
+"""
+Tool executors — bounded thread pools per tool class, with deadlines.
+
+/v1/tools used to run every handler through asyncio.to_thread, i.e. the
+loop's default executor shared with palace writes and every other
+to_thread caller, and without a timeout: one hung SiYuan or Organized call
+pinned a thread for good and quietly shrank capacity for everything else.
+
+Each tool now declares a class when it is registered (app/hermes/tools.py):
+
+  network — HTTP to SiYuan, RapidPro, RiveBot, LLMs (most tools)
+  db      — local SQLite / Postgres work (talkmaster, MemPalace, config)
+  cpu     — pure computation (deck building, mocks)
+
+Classes get separate executors, so a stalled upstream can exhaust only
+the network pool. Every call has a deadline (per tool, TOOL_TIMEOUT by
+default). When it passes the caller gets ToolTimeout at once; a call
+still queued is dropped, and a call already running is asked to stop via
+cooperative cancellation — long handlers poll check_cancelled() between
+units of work (a thread cannot be killed from outside).
+
+Tunables (env):
+  TOOL_POOL_NETWORK  — network-class workers (default 16)
+  TOOL_POOL_DB       — db-class workers (default 8)
+  TOOL_POOL_CPU      — cpu-class workers (default: CPU count, min 2)
+  TOOL_TIMEOUT       — default per-call deadline in seconds (default 30)
+"""
+
+import asyncio
+import contextvars
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from app.utils import metrics
+
+logger = logging.getLogger(__name__)
+
+# ── Configuration ────────────────────────────────────────────────────────────
+
+NETWORK, DB, CPU = "network", "db", "cpu"
+
+_SIZES = {
+    NETWORK: int(os.getenv("TOOL_POOL_NETWORK", "16")),
+    DB: int(os.getenv("TOOL_POOL_DB", "8")),
+    CPU: int(os.getenv("TOOL_POOL_CPU", str(max(2, os.cpu_count() or 2)))),
+}
+_DEFAULT_TIMEOUT = float(os.getenv("TOOL_TIMEOUT", "30"))
+
+# tool name → (class, deadline seconds)
+_specs: Dict[str, Tuple[str, float]] = {}
+
+# ── State ────────────────────────────────────────────────────────────────────
+
+_lock = threading.Lock()            # guards _executors and the counters below
+_executors: Dict[str, ThreadPoolExecutor] = {}
+_submitted = {pool: 0 for pool in _SIZES}   # accepted, not yet finished
+_running = {pool: 0 for pool in _SIZES}     # holding a worker thread
+
+_cancel_event: contextvars.ContextVar[Optional[threading.Event]] = contextvars.ContextVar(
+    "tool_cancel_event", default=None,
+)
+
+_TOOL_SECONDS = metrics.Histogram(
+    "gateway_tool_seconds",
+    "Tool handler run time (excluding queueing) by executor class.",
+    labelnames=("pool",),
+)
+_TOOL_TIMEOUTS = metrics.Counter(
+    "gateway_tool_timeouts",
+    "Tool calls that missed their deadline.",
+    labelnames=("tool",),
+)
+metrics.Gauge(
+    "gateway_tool_executor_busy",
+    "Tool executor threads running a handler (includes handlers past their deadline).",
+    lambda: dict(_running),
+    labelnames=("pool",),
+)
+metrics.Gauge(
+    "gateway_tool_executor_queued",
+    "Tool calls waiting for an executor thread.",
+    lambda: {pool: max(0, _submitted[pool] - _running[pool]) for pool in _SIZES},
+    labelnames=("pool",),
+)
+
+
+class ToolTimeout(TimeoutError):
+    """A tool call missed its deadline."""
+
+
+class ToolCancelled(Exception):
+    """Raised by check_cancelled() once the caller has given up on the call."""
+
+
+# ── Declaration ──────────────────────────────────────────────────────────────
+
+def declare(tool_name: str, pool: str = NETWORK, timeout: Optional[float] = None) -> None:
+    """Record the executor class and deadline for a tool (at registration)."""
+    if pool not in _SIZES:
+        raise ValueError(f"Unknown executor class '{pool}' for tool '{tool_name}'")
+    _specs[tool_name] = (pool, timeout or _DEFAULT_TIMEOUT)
+
+
+def spec(tool_name: str) -> Tuple[str, float]:
+    """(class, deadline) for a tool; undeclared tools run as network calls."""
+    return _specs.get(tool_name, (NETWORK, _DEFAULT_TIMEOUT))
+
+
+def cancelled() -> bool:
+    """True once the current tool call has timed out or been abandoned."""
+    event = _cancel_event.get()
+    return event is not None and event.is_set()
+
+
+def check_cancelled() -> None:
+    """Raise ToolCancelled if the current tool call is no longer wanted.
+
+    A no-op outside run() (e.g. when Hermes calls the handler directly).
+    """
+    if cancelled():
+        raise ToolCancelled("tool call cancelled")
+
+
+# ── Execution ────────────────────────────────────────────────────────────────
+
+def _get_executor(pool: str) -> ThreadPoolExecutor:
+    with _lock:
+        executor = _executors.get(pool)
+        if executor is None:
+            executor = _executors[pool] = ThreadPoolExecutor(
+                max_workers=_SIZES[pool], thread_name_prefix=f"tool-{pool}",
+            )
+        return executor
+
+
+def _call(pool: str, handler: Callable[[dict], Any], args: dict) -> Any:
+    """Worker-side wrapper: saturation accounting and timing."""
+    with _lock:
+        _running[pool] += 1
+    start = time.perf_counter()
+    try:
+        check_cancelled()  # deadline passed while queued
+        return handler(args)
+    finally:
+        _TOOL_SECONDS.observe(time.perf_counter() - start, pool=pool)
+        with _lock:
+            _running[pool] -= 1
+            _submitted[pool] -= 1
+
+
+def _forget(pool: str) -> None:
+    """Uncount a call dropped from the queue before a worker picked it up."""
+    with _lock:
+        _submitted[pool] -= 1
+
+
+async def run(tool_name: str, handler: Callable[[dict], Any], args: dict) -> Any:
+    """
+    Run a synchronous tool handler on its class executor within its deadline.
+
+    Context variables are copied into the worker, as asyncio.to_thread did.
+    Raises ToolTimeout when the deadline passes; the handler's own
+    exceptions propagate unchanged.
+    """
+    pool, timeout = spec(tool_name)
+    event = threading.Event()
+    ctx = contextvars.copy_context()
+    ctx.run(_cancel_event.set, event)
+
+    with _lock:
+        _submitted[pool] += 1
+    try:
+        cf = _get_executor(pool).submit(ctx.run, _call, pool, handler, args)
+    except RuntimeError:
+        _forget(pool)  # executor shut down — never queued
+        raise
+    cf.add_done_callback(lambda f: _forget(pool) if f.cancelled() else None)
+    try:
+        return await asyncio.wait_for(asyncio.wrap_future(cf), timeout)
+    except asyncio.TimeoutError:
+        event.set()
+        _TOOL_TIMEOUTS.inc(tool=tool_name)
+        logger.warning(f"Tool '{tool_name}' missed its {timeout:g}s deadline ({pool} pool)")
+        raise ToolTimeout(f"Tool '{tool_name}' timed out after {timeout:g}s")
+    except asyncio.CancelledError:
+        event.set()  # client went away — let the handler stop early
+        raise
+
+
+def shutdown() -> None:
+    """Drop queued calls and release the executors (FastAPI lifespan shutdown)."""
+    with _lock:
+        executors = list(_executors.values())
+        _executors.clear()
+    for executor in executors:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def stats() -> dict:
+    with _lock:
+        return {
+            pool: {
+                "workers": size,
+                "busy": _running[pool],
+                "queued": max(0, _submitted[pool] - _running[pool]),
+            }
+            for pool, size in _SIZES.items()
+        }
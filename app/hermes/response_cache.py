@@ -0,0 +1,159 @@
+"""
+Opt-in response cache and cross-user coalescing for Hermes.
+
+Many users send the same canned questions that fall through RiveBot ("how
+do I prepare my talk?"). The engine's ``_in_flight`` dedup only collapses
+retries from *one* URN; every other user still pays for a full agent run.
+For personas whose answers don't depend on who is asking, this module:
+
+  - caches final responses keyed by (persona, normalized message, context
+    fingerprint) with a TTL and size cap (app/utils/ttl_store.py), and
+  - coalesces concurrent identical misses onto one in-flight run.
+
+Only side-effect-free configurations are eligible. The persona must be
+listed in HERMES_RESPONSE_CACHE_PERSONAS, and every toolset it may use
+must be listed in HERMES_RESPONSE_CACHE_TOOLSETS. A cache hit skips the
+agent entirely, so any tool that writes (memory, flows, SiYuan edits)
+would silently not run.
+
+The fingerprint covers what legitimately changes the answer: the persona
+prompt and channel override, the RiveBot language and topic, and the
+conversation history the agent would see (RiveBot exchanges plus the
+session journal tail). Without the history, a context-dependent reply
+such as "yes" or "tell me more" would be answered from another user's
+conversation; with it, first messages still share one entry while
+follow-ups only match identical conversations. Per-user fields (name,
+mood) are deliberately excluded — they are why the feature must be opt-in.
+
+Tunables (env):
+  HERMES_RESPONSE_CACHE_PERSONAS  — comma-separated persona slugs (default: none → off)
+  HERMES_RESPONSE_CACHE_TOOLSETS  — toolsets known to be read-only
+  HERMES_RESPONSE_CACHE_TTL       — seconds (default 600)
+  HERMES_RESPONSE_CACHE_MAX       — entries (default 500)
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import re
+import unicodedata
+from typing import Awaitable, Callable, Dict, Iterable, Optional, Tuple
+
+from app.utils import metrics
+from app.utils.ttl_store import TTLStore
+
+
+def _csv(name: str) -> frozenset:
+    return frozenset(p.strip() for p in os.getenv(name, "").split(",") if p.strip())
+
+
+_PERSONAS = _csv("HERMES_RESPONSE_CACHE_PERSONAS")
+_SAFE_TOOLSETS = _csv("HERMES_RESPONSE_CACHE_TOOLSETS")
+
+_cache = TTLStore(
+    "hermes.response_cache",
+    ttl=float(os.getenv("HERMES_RESPONSE_CACHE_TTL", "600")),
+    maxsize=int(os.getenv("HERMES_RESPONSE_CACHE_MAX", "500")),
+)
+_pending: Dict[Tuple[str, str, str], asyncio.Future] = {}
+
+_LOOKUPS = metrics.Counter(
+    "gateway_response_cache_lookups",
+    "Response cache lookups by outcome (hit, coalesced, miss).",
+    labelnames=("result",),
+)
+metrics.Gauge(
+    "gateway_response_cache_hit_ratio",
+    "Share of eligible Hermes calls answered without a new agent run.",
+    lambda: stats()["hit_rate"],
+)
+
+_PUNCT_RE = re.compile(r"[^\w\s]", re.UNICODE)
+_SPACE_RE = re.compile(r"\s+")
+
+
+def normalize(message: str) -> str:
+    """Case-, width- and punctuation-insensitive form of a message."""
+    text = unicodedata.normalize("NFKC", message).casefold()
+    text = _PUNCT_RE.sub(" ", text)
+    return _SPACE_RE.sub(" ", text).strip()
+
+
+def eligible(persona: str, toolsets: Iterable[str]) -> bool:
+    """True if this persona/toolset combination is marked side-effect-free."""
+    return persona in _PERSONAS and set(toolsets) <= _SAFE_TOOLSETS
+
+
+def fingerprint(system_prompt: str, rivebot_context: Optional[dict],
+                history: Iterable[dict] = ()) -> str:
+    """Hash of the context that shapes a persona's answer (not who asked)."""
+    ctx = rivebot_context or {}
+    turns = [[m.get("role", ""), m.get("content") or ""] for m in history]
+    material = json.dumps(
+        [system_prompt, ctx.get("lang", ""), ctx.get("topic", ""), turns],
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(material.encode()).hexdigest()[:16]
+
+
+def make_key(persona: str, message: str, context_fp: str) -> Optional[Tuple[str, str, str]]:
+    normalized = normalize(message)
+    return (persona, normalized, context_fp) if normalized else None
+
+
+async def get_or_run(
+    key: Tuple[str, str, str],
+    run: Callable[[], Awaitable[dict]],
+) -> Tuple[dict, bool]:
+    """Serve ``key`` from cache, an identical in-flight run, or ``run()``.
+
+    Returns (result, shared) — shared is True when no new agent run
+    happened for this caller. Only non-empty final responses are cached.
+    """
+    cached = _cache.get(key)
+    if cached is not None:
+        _LOOKUPS.inc(result="hit")
+        return {"final_response": cached, "messages": []}, True
+
+    pending = _pending.get(key)
+    if pending is not None:
+        text = await asyncio.shield(pending)
+        if text is not None:
+            _LOOKUPS.inc(result="coalesced")
+            return {"final_response": text, "messages": []}, True
+        # Leader failed or was cancelled — errors are per-caller, so run our own
+        return await get_or_run(key, run)
+
+    _LOOKUPS.inc(result="miss")
+    future = asyncio.get_running_loop().create_future()
+    _pending[key] = future
+    text = None
+    try:
+        result = await run()
+        text = result.get("final_response") or ""
+        if text:
+            _cache[key] = text
+        return result, False
+    finally:
+        _pending.pop(key, None)
+        future.set_result(text)
+
+
+def clear() -> None:
+    """Drop every cached response (e.g. after a persona prompt edit)."""
+    _cache.clear()
+
+
+def stats() -> dict:
+    hits = _LOOKUPS.value(result="hit") + _LOOKUPS.value(result="coalesced")
+    total = hits + _LOOKUPS.value(result="miss")
+    return {
+        "enabled_personas": sorted(_PERSONAS),
+        "safe_toolsets": sorted(_SAFE_TOOLSETS),
+        "entries": len(_cache),
+        "hits": _LOOKUPS.value(result="hit"),
+        "coalesced": _LOOKUPS.value(result="coalesced"),
+        "misses": _LOOKUPS.value(result="miss"),
+        "hit_rate": round(hits / total, 3) if total else 0.0,
+    }
@@ -0,0 +1,249 @@
+"""
+Priority-aware admission for Hermes invocations.
+
+The engine used to admit work first-come-first-served and reject anything
+past HERMES_MAX_QUEUE outright. This scheduler sits in front of the worker
+pool instead:
+
+  - Every call is classified into a tier (admin / grading / priority /
+    standard) and queued per (tier, persona).
+  - Queues are served by stride scheduling (weighted fair queuing): each
+    dispatch advances the queue's pass by 1/weight, and the queue with the
+    lowest pass goes next. Heavier tiers get proportionally more slots, but
+    no queue starves, and personas in the same tier take turns.
+  - Waiting is bounded (HERMES_WAITING_ROOM). When the room is full, a
+    newcomer evicts the newest waiter of a lighter tier, or is rejected if
+    there is none.
+  - Each waiter has a deadline (HERMES_MESSAGE_DEADLINE). A WhatsApp reply
+    that arrives minutes late is worthless, so expired waiters are dropped
+    rather than run.
+
+Tunables (env):
+  HERMES_WAITING_ROOM       — max queued (not yet running) calls
+                              (default HERMES_MAX_QUEUE, else 16)
+  HERMES_MESSAGE_DEADLINE   — seconds a call may wait for a slot (default 90)
+  HERMES_TIER_WEIGHTS       — e.g. "admin=8,grading=4,priority=4,standard=1"
+  HERMES_PRIORITY_PERSONAS  — comma-separated persona slugs in the priority tier
+  ADMIN_PHONE               — admin numbers (same variable as app/services/auth.py)
+"""
+
+import asyncio
+import logging
+import os
+import time
+from collections import deque
+from typing import Dict, Optional, Tuple
+
+from app.utils import metrics
+
+logger = logging.getLogger(__name__)
+
+ADMIN, GRADING, PRIORITY, STANDARD = "admin", "grading", "priority", "standard"
+TIERS = (ADMIN, GRADING, PRIORITY, STANDARD)
+
+# HERMES_MAX_QUEUE was the old admitted-call cap; keep honouring it as the room size
+_WAITING_ROOM = int(os.getenv("HERMES_WAITING_ROOM", os.getenv("HERMES_MAX_QUEUE", "16")))
+_DEADLINE = float(os.getenv("HERMES_MESSAGE_DEADLINE", "90"))
+
+
+def _parse_weights(raw: str) -> Dict[str, float]:
+    weights = {ADMIN: 8.0, GRADING: 4.0, PRIORITY: 4.0, STANDARD: 1.0}
+    for entry in raw.split(","):
+        tier, _, value = entry.partition("=")
+        tier = tier.strip()
+        if tier in weights and value.strip():
+            try:
+                weights[tier] = max(float(value), 0.01)
+            except ValueError:
+                logger.warning(f"Ignoring bad HERMES_TIER_WEIGHTS entry: {entry!r}")
+    return weights
+
+
+_WEIGHTS = _parse_weights(os.getenv("HERMES_TIER_WEIGHTS", ""))
+_PRIORITY_PERSONAS = frozenset(
+    p.strip() for p in os.getenv("HERMES_PRIORITY_PERSONAS", "").split(",") if p.strip()
+)
+_ADMIN_DIGITS = frozenset(
+    p.replace("+", "") for p in os.getenv("ADMIN_PHONE", "").replace(" ", "").split(",") if p
+)
+
+
+class AdmissionRejected(RuntimeError):
+    """Raised when a call is refused a slot (waiting room full, evicted or expired)."""
+
+    def __init__(self, message: str, reason: str):
+        super().__init__(message)
+        self.reason = reason
+
+
+def classify(urn: str, persona: str, rivebot_context: Optional[dict] = None) -> str:
+    """Pick the scheduling tier for one message."""
+    if urn and urn.replace("+", "").split(":")[-1] in _ADMIN_DIGITS:
+        return ADMIN
+    if rivebot_context and rivebot_context.get("current_drill"):
+        return GRADING
+    if persona in _PRIORITY_PERSONAS:
+        return PRIORITY
+    return STANDARD
+
+
+class _Waiter:
+    __slots__ = ("future", "key", "enqueued", "deadline")
+
+    def __init__(self, future: asyncio.Future, key: Tuple[str, str], enqueued: float, deadline: float):
+        self.future = future
+        self.key = key
+        self.enqueued = enqueued
+        self.deadline = deadline
+
+
+class AdmissionScheduler:
+    """Weighted fair admission to ``slots`` concurrent Hermes runs.
+
+    Event-loop only: acquire/release must be called from the loop that
+    owns the scheduler (invoke_hermes), never from worker threads.
+    """
+
+    def __init__(
+        self,
+        slots: int,
+        waiting_room: int = _WAITING_ROOM,
+        deadline: float = _DEADLINE,
+        weights: Optional[Dict[str, float]] = None,
+    ):
+        self.slots = slots
+        self.waiting_room = waiting_room
+        self.deadline = deadline
+        self.weights = weights or _WEIGHTS
+        self.running = 0
+        self._queues: Dict[Tuple[str, str], deque] = {}
+        self._pass: Dict[Tuple[str, str], float] = {}
+        self._vtime = 0.0
+        self._waiting = 0
+
+    # ── public API ─────────────────────────────────────────────────────────
+
+    async def acquire(self, tier: str, persona: str) -> None:
+        """Wait for a run slot. Raises AdmissionRejected if none is granted."""
+        now = time.monotonic()
+        if self.running < self.slots and self._waiting == 0:
+            self.running += 1
+            metrics.HERMES_ADMISSION_WAIT.observe(0.0, tier=tier)
+            return
+
+        if self._waiting >= self.waiting_room and not self._evict_lighter_than(tier):
+            self._reject(tier, "busy")
+            raise AdmissionRejected("Service busy — please try again in a moment.", "busy")
+
+        key = (tier, persona)
+        waiter = _Waiter(asyncio.get_running_loop().create_future(), key, now, now + self.deadline)
+        queue = self._queues.get(key)
+        if queue is None:
+            queue = self._queues[key] = deque()
+            self._pass[key] = self._vtime
+        queue.append(waiter)
+        self._waiting += 1
+
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter.future), timeout=self.deadline)
+        except asyncio.TimeoutError:
+            if self._remove(waiter):
+                self._reject(tier, "deadline")
+                raise AdmissionRejected("Message expired while waiting for a slot.", "deadline")
+            # Granted at the same instant the timer fired — fall through and keep it
+        except asyncio.CancelledError:
+            if not self._remove(waiter) and waiter.future.exception() is None:
+                self.release()  # slot was granted but the caller went away
+            raise
+
+        waiter.future.result()  # re-raises eviction / expiry set by the dispatcher
+        metrics.HERMES_ADMISSION_WAIT.observe(time.monotonic() - waiter.enqueued, tier=tier)
+
+    def release(self) -> None:
+        """Return a slot and hand it to the next waiter."""
+        self.running -= 1
+        self._dispatch()
+
+    def stats(self) -> dict:
+        waiting: Dict[str, int] = {t: 0 for t in TIERS}
+        for (tier, _), queue in self._queues.items():
+            waiting[tier] = waiting.get(tier, 0) + len(queue)
+        return {
+            "slots": self.slots,
+            "running": self.running,
+            "waiting": self._waiting,
+            "waiting_room": self.waiting_room,
+            "waiting_by_tier": waiting,
+            "deadline_seconds": self.deadline,
+            "weights": dict(self.weights),
+        }
+
+    # ── internals ──────────────────────────────────────────────────────────
+
+    def _reject(self, tier: str, reason: str) -> None:
+        metrics.HERMES_QUEUE_REJECTED.inc(tier=tier, reason=reason)
+        logger.warning(f"Admission rejected ({reason}) for tier={tier} "
+                       f"running={self.running}/{self.slots} waiting={self._waiting}")
+
+    def _remove(self, waiter: _Waiter) -> bool:
+        """Take a waiter out of its queue. False if it was already dispatched."""
+        queue = self._queues.get(waiter.key)
+        if queue is None:
+            return False
+        try:
+            queue.remove(waiter)
+        except ValueError:
+            return False
+        self._waiting -= 1
+        if not queue:
+            del self._queues[waiter.key]
+            del self._pass[waiter.key]
+        return True
+
+    def _evict_lighter_than(self, tier: str) -> bool:
+        """Make room by dropping the newest waiter of the lightest lighter tier."""
+        weight = self.weights.get(tier, 1.0)
+        victim = None
+        for (q_tier, _), queue in self._queues.items():
+            q_weight = self.weights.get(q_tier, 1.0)
+            if q_weight >= weight:
+                continue
+            candidate = queue[-1]
+            if victim is None or (
+                (q_weight, -candidate.enqueued)
+                < (self.weights.get(victim.key[0], 1.0), -victim.enqueued)
+            ):
+                victim = candidate
+        if victim is None:
+            return False
+        self._remove(victim)
+        self._reject(victim.key[0], "evicted")
+        victim.future.set_exception(
+            AdmissionRejected("Service busy — please try again in a moment.", "evicted")
+        )
+        return True
+
+    def _dispatch(self) -> None:
+        now = time.monotonic()
+        while self.running < self.slots and self._queues:
+            # Lowest pass wins; ties go to the heavier tier
+            key = min(self._pass, key=lambda k: (self._pass[k], -self.weights.get(k[0], 1.0)))
+            queue = self._queues[key]
+            waiter = queue.popleft()
+            self._waiting -= 1
+            self._vtime = self._pass[key]
+            self._pass[key] += 1.0 / self.weights.get(key[0], 1.0)
+            if not queue:
+                del self._queues[key]
+                del self._pass[key]
+
+            if waiter.future.done():
+                continue
+            if now >= waiter.deadline:
+                self._reject(key[0], "deadline")
+                waiter.future.set_exception(
+                    AdmissionRejected("Message expired while waiting for a slot.", "deadline")
+                )
+                continue
+            self.running += 1
+            waiter.future.set_result(None)
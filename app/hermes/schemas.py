@@ -121,6 +121,28 @@ TALKMASTER_STATUS = {
     }
 }
 
+JOB_STATUS = {
+    "name": "job_status",
+    "description": "Report progress of background TalkPrep jobs (section development, evaluation).\n\nArgs:\n    job_id: Job to show; omit for the caller's latest jobs.\n\nReturns:\n    Status, step progress and \u2014 once finished \u2014 the job's result.",
+    "parameters": {
+        "description": "Report progress of background TalkPrep jobs (section development, evaluation).\n\nArgs:\n    job_id: Job to show; omit for the caller's latest jobs.\n\nReturns:\n    Status, step progress and \u2014 once finished \u2014 the job's result.",
+        "properties": {
+            "job_id": {
+                "anyOf": [
+                    {
+                        "type": "string"
+                    },
+                    {
+                        "type": "null"
+                    }
+                ],
+                "default": None
+            }
+        },
+        "type": "object"
+    }
+}
+
 SELECT_ACTIVE_TALK = {
     "name": "select_active_talk",
     "description": "Select a talk as the active context for subsequent operations.\n\nArgs:\n    talk_id: Numeric ID of the talk (from talkmaster_status).\n\nReturns:\n    Confirmation with talk name and available revisions.",
@@ -249,9 +271,9 @@ CREATE_REVISION = {
 
 DEVELOP_SECTION = {
     "name": "develop_section",
-    "description": "AI-develop a single section of a talk revision.\n\nArgs:\n    section_title: Title of the section to develop (partial match OK).\n    active_revision: Infer this from previous tool outputs in memory.\n\nReturns:\n    Confirmation or status of the developed section.",
+    "description": "AI-develop sections of a talk revision in the background.\n\nArgs:\n    section_title: Title of the section to develop (partial match OK), or \"all\" for every section not yet developed.\n    active_revision: Infer this from previous tool outputs in memory.\n\nReturns:\n    Job ID \u2014 the developed sections are sent when the job finishes.",
     "parameters": {
-        "description": "AI-develop a single section of a talk revision.\n\nArgs:\n    section_title: Title of the section to develop (partial match OK).\n    active_revision: Infer this from previous tool outputs in memory.\n\nReturns:\n    Confirmation or status of the developed section.",
+        "description": "AI-develop sections of a talk revision in the background.\n\nArgs:\n    section_title: Title of the section to develop (partial match OK), or \"all\" for every section not yet developed.\n    active_revision: Infer this from previous tool outputs in memory.\n\nReturns:\n    Job ID \u2014 the developed sections are sent when the job finishes.",
         "properties": {
             "section_title": {
                 "type": "string"
@@ -277,9 +299,9 @@ DEVELOP_SECTION = {
 
 EVALUATE_TALK = {
     "name": "evaluate_talk",
-    "description": "Evaluate a talk revision against the 53-point S-38 rubric.\n\nArgs:\n    active_revision: Infer this from previous tool outputs in memory.\n    revision_name: Explicit override (from AI/direct call).\n\nReturns:\n    Trigger confirmation \u2014 scores available via get_evaluation_scores.",
+    "description": "Evaluate a talk revision against the 53-point S-38 rubric.\n\nArgs:\n    active_revision: Infer this from previous tool outputs in memory.\n    revision_name: Explicit override (from AI/direct call).\n\nReturns:\n    Job ID \u2014 scores available via get_evaluation_scores once it finishes.",
     "parameters": {
-        "description": "Evaluate a talk revision against the 53-point S-38 rubric.\n\nArgs:\n    active_revision: Infer this from previous tool outputs in memory.\n    revision_name: Explicit override (from AI/direct call).\n\nReturns:\n    Trigger confirmation \u2014 scores available via get_evaluation_scores.",
+        "description": "Evaluate a talk revision against the 53-point S-38 rubric.\n\nArgs:\n    active_revision: Infer this from previous tool outputs in memory.\n    revision_name: Explicit override (from AI/direct call).\n\nReturns:\n    Job ID \u2014 scores available via get_evaluation_scores once it finishes.",
         "properties": {
             "active_revision": {
                 "anyOf": [
@@ -930,6 +952,13 @@ SIYUAN_LINT = {
                 "type": "string",
                 "description": "Notebook name to lint (e.g., 'Life', 'IIAB')."
             },
+            "full": {
+                "type": "boolean",
+                "description": (
+                    "Recheck every page. By default only pages edited since "
+                    "the last lint are refetched."
+                )
+            },
         },
         "required": ["notebook"],
     },
@@ -1135,6 +1164,23 @@ MACRO_FLOW = {
     },
 }
 
+MACRO_BROADCAST = {
+    "name": "macro_broadcast",
+    "description": (
+        "Admin: send a WhatsApp broadcast to all known users or one number, "
+        "or show status / cancel / retry a broadcast by ID."
+    ),
+    "parameters": {
+        "type": "object",
+        "properties": {
+            "action": {"type": "string", "description": "send, status, cancel, or retry"},
+            "target": {"type": "string", "description": "send: 'all' or a +509... number; otherwise the broadcast ID."},
+            "message": {"type": "string", "description": "Message text (send only)."},
+        },
+        "required": ["action"],
+    },
+}
+
 # ── Config Operations (ADR-011 migration) ────────────────────────────────────
 
 MACRO_PERSONA = {
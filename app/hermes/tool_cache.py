@@ -0,0 +1,176 @@
+"""
+TTL result cache for read-only tools.
+
+Menus people tap repeatedly (segments, org info, publication and topic
+listings, the Organized schedule and reports) hit RapidPro, jwlinker or
+Organized on every call, although the data changes a few times a week.
+Handlers opt in where they are defined:
+
+    @tool_cache.cacheable(ttl=600, key=("pub_code", "active_pub"), group="talkprep.catalog")
+    def list_topics(args, **kw): ...
+
+    @tool_cache.invalidates("talkprep.catalog")
+    def upload_jwpub(args, **kw): ...
+
+The decorator wraps the handler itself, so both the RiveBot path
+(/v1/tools) and the Hermes path (registry handlers) share the cache.
+
+  - key     — argument names that change the answer; per_user=True adds
+              user_id for per-person views (my assignments, my group).
+  - group   — cached tools that go stale together. Tools decorated with
+              invalidates(group) drop the group after they run, and a
+              miss that was in flight during the invalidation is not
+              stored (so it cannot put back a pre-write answer).
+  - Failures are never cached: replies starting with ⚠️, and calls where
+    the handler or a backend helper called no_store().
+
+Admins flush via DELETE /v1/tools:cache (optionally ?group= or ?tool=).
+
+Tunables (env):
+  TOOL_CACHE      — "0" disables caching (default "1")
+  TOOL_CACHE_MAX  — entries kept per tool (default 256)
+"""
+
+import contextvars
+import functools
+import os
+import threading
+from collections import defaultdict
+from typing import Callable, Dict, Iterable, List, Optional
+
+from app.utils import metrics
+from app.utils.ttl_store import TTLStore
+
+_ENABLED = os.getenv("TOOL_CACHE", "1") != "0"
+_MAX = int(os.getenv("TOOL_CACHE_MAX", "256"))
+
+_lock = threading.Lock()                    # guards _generations
+_caches: Dict[str, TTLStore] = {}           # tool name → its store
+_groups: Dict[str, List[str]] = defaultdict(list)   # group → tool names
+_generations: Dict[str, int] = defaultdict(int)     # group → invalidation count
+
+# Set inside a cached call; no_store() flips it
+_store_result: contextvars.ContextVar[Optional[list]] = contextvars.ContextVar(
+    "tool_cache_store_result", default=None,
+)
+
+_LOOKUPS = metrics.Counter(
+    "gateway_tool_cache_lookups",
+    "Read-only tool cache lookups by outcome (hit, miss).",
+    labelnames=("tool", "result"),
+)
+_INVALIDATIONS = metrics.Counter(
+    "gateway_tool_cache_invalidations",
+    "Tool cache group flushes (by a write tool or an admin).",
+    labelnames=("group",),
+)
+
+
+def _norm(value) -> str:
+    return "" if value is None else str(value).strip()
+
+
+def no_store() -> None:
+    """Keep the current tool call's result out of the cache (backend error).
+
+    A no-op outside a cached call.
+    """
+    flag = _store_result.get()
+    if flag is not None:
+        flag[0] = False
+
+
+def cacheable(ttl: float, key: Iterable[str] = (), per_user: bool = False,
+              group: Optional[str] = None) -> Callable:
+    """Cache a read-only tool handler's result for ``ttl`` seconds."""
+    key = tuple(key)
+
+    def decorate(handler: Callable) -> Callable:
+        tool = handler.__name__
+        group_name = group or tool
+        store = TTLStore(f"tools.{tool}", ttl=ttl, maxsize=_MAX)
+        _caches[tool] = store
+        _groups[group_name].append(tool)
+
+        @functools.wraps(handler)
+        def cached(args: dict, **kw) -> str:
+            if not _ENABLED:
+                return handler(args, **kw)
+            cache_key = tuple(_norm(args.get(f)) for f in key)
+            if per_user:
+                cache_key += (_norm(args.get("user_id")),)
+
+            result = store.get(cache_key)
+            if result is not None:
+                _LOOKUPS.inc(tool=tool, result="hit")
+                return result
+            _LOOKUPS.inc(tool=tool, result="miss")
+
+            generation = _generations[group_name]
+            flag = [True]
+            token = _store_result.set(flag)
+            try:
+                result = handler(args, **kw)
+            finally:
+                _store_result.reset(token)
+            if flag[0] and isinstance(result, str) and not result.startswith("⚠️"):
+                with _lock:
+                    if _generations[group_name] == generation:
+                        store.set(cache_key, result)
+            return result
+
+        return cached
+
+    return decorate
+
+
+def invalidates(*groups: str) -> Callable:
+    """Flush ``groups`` after the decorated (mutating) tool runs."""
+    def decorate(handler: Callable) -> Callable:
+        @functools.wraps(handler)
+        def invalidating(args: dict, **kw):
+            try:
+                return handler(args, **kw)
+            finally:
+                for group in groups:
+                    flush(group=group)
+
+        return invalidating
+
+    return decorate
+
+
+def flush(group: Optional[str] = None, tool: Optional[str] = None) -> int:
+    """Drop cached results for a group, one tool, or everything.
+
+    Returns the number of entries dropped.
+    """
+    if tool is not None:
+        names = [tool] if tool in _caches else []
+        groups = [g for g, tools in _groups.items() if tool in tools]
+    elif group is not None:
+        names = list(_groups.get(group, ()))
+        groups = [group]
+    else:
+        names = list(_caches)
+        groups = list(_groups)
+
+    dropped = 0
+    with _lock:
+        for g in groups:
+            _generations[g] += 1
+            _INVALIDATIONS.inc(group=g)
+        for name in names:
+            store = _caches[name]
+            dropped += len(store)
+            store.clear()
+    return dropped
+
+
+def stats() -> Dict[str, dict]:
+    """Per-tool size and hit/miss counts, with each tool's group."""
+    group_of = {tool: group for group, tools in _groups.items() for tool in tools}
+    return {
+        tool: {**store.stats(), "group": group_of[tool]}
+        for tool, store in _caches.items()
+    }
@@ -1,5 +1,7 @@
 import logging
+from typing import Optional
 from tools.registry import registry
+from app.hermes import executors
 from app.hermes.engine import _current_urn
 import app.hermes.schemas as schemas
 from app.graph.tools import rapidpro, mocks, talkprep, forms, upload, system, config
@@ -425,31 +427,49 @@ def _handle_siyuan_lint(args: dict, **kw) -> str:
     """Run wiki quality rules and return a structured report."""
     import json
     from app.hooks.siyuan_tools import siyuan_lint
-    report = siyuan_lint(notebook=args.get("notebook", ""))
+    report = siyuan_lint(
+        notebook=args.get("notebook", ""),
+        full=bool(args.get("full", False)),
+    )
     return json.dumps(report, ensure_ascii=False)
 
 
 def _handle_crm_lookup_enriched(args: dict, **kw) -> str:
     """Layer 2 contact lookup enriched with SiYuan person page data.
 
-    After RapidPro returns contact basics, searches the SiYuan wiki for a
-    matching /people/ page. If no page exists and admin is looking up the
-    contact, auto-creates a stub person page.
+    The RapidPro lookup and a wiki search for the phone number run
+    concurrently; if that finds no /people/ page, the wiki is searched
+    again by the contact's name. If no page exists and admin is looking up
+    the contact, auto-creates a stub person page.
     """
     import json
     from app.graph.tools.rapidpro import crm_lookup_contact
     from app.hooks.siyuan_tools import (
         siyuan_search, siyuan_read_doc, siyuan_upsert_page,
-        siyuan_set_attrs, siyuan_doc_url,
+        siyuan_set_attrs, siyuan_doc_url, siyuan_gather,
     )
 
-    # Step 1: Standard RapidPro lookup
-    rp_result = crm_lookup_contact(args, **kw)
-
-    # Step 2: Try to find a matching SiYuan person page
     phone = args.get("phone", "").strip().lstrip("+").lstrip("0")
     if not phone:
-        return rp_result
+        return crm_lookup_contact(args, **kw)
+
+    def _find_person_page(query: str):
+        for r in siyuan_search(query, limit=3):
+            if "/people/" in r.get("path", ""):
+                return r
+        return None
+
+    def _phone_page():
+        try:
+            return _find_person_page(phone)
+        except Exception:
+            return None
+
+    # Step 1: Standard RapidPro lookup, alongside a wiki search by phone
+    rp_result, phone_page = siyuan_gather(
+        lambda: crm_lookup_contact(args, **kw),
+        _phone_page,
+    )
 
     # Try to parse contact name from RapidPro result
     contact_name = ""
@@ -465,13 +485,9 @@ def _handle_crm_lookup_enriched(args: dict, **kw) -> str:
         wiki_info = ""
         search_query = contact_name if contact_name and contact_name != "_(no name)_" else phone
         if search_query:
-            results = siyuan_search(search_query, limit=3)
-            person_page = None
-            for r in results:
-                hpath = r.get("hpath", "")
-                if "/people/" in hpath:
-                    person_page = r
-                    break
+            person_page = phone_page
+            if person_page is None and search_query != phone:
+                person_page = _find_person_page(search_query)
 
             if person_page:
                 doc_id = person_page.get("id", "")
@@ -538,6 +554,32 @@ def _handle_siyuan_dashboard(args: dict, **kw) -> str:
 # ── Tool registration ───────────────────────────────────────────────────────
 
 _registered = False
+_native_tools: list[str] = []  # names passed to _register, in order
+
+# Executor class per toolset (see app/hermes/executors.py). Tools that
+# differ from their toolset, or need a longer deadline, say so at
+# registration.
+_TOOLSET_POOLS = {
+    "rapidpro": executors.NETWORK,
+    "mocks": executors.CPU,
+    "forms": executors.CPU,
+    "upload": executors.NETWORK,
+    "talkprep": executors.DB,
+    "mempalace": executors.DB,
+    "siyuan": executors.NETWORK,
+    "system": executors.NETWORK,
+    "config": executors.DB,
+    "social": executors.NETWORK,
+}
+
+
+def _register(name: str, toolset: str, schema: dict, handler,
+              pool: Optional[str] = None, timeout: Optional[float] = None) -> None:
+    """Register a tool with Hermes and declare how /v1/tools executes it."""
+    registry.register(name, toolset, schema, handler)
+    executors.declare(name, pool or _TOOLSET_POOLS[toolset], timeout)
+    _native_tools.append(name)
+
 
 def register_all_tools() -> None:
     """Register all V2 native tools globally via hermes_agent."""
@@ -546,117 +588,119 @@ def register_all_tools() -> None:
         return
 
     # RapidPro Tools
-    registry.register("fetch_dossier", "rapidpro", schemas.FETCH_DOSSIER, rapidpro.fetch_dossier)
-    registry.register("start_flow", "rapidpro", schemas.START_FLOW, rapidpro.start_flow)
-    registry.register("start_crm_ops", "rapidpro", schemas.START_CRM_OPS, rapidpro.start_crm_ops)
-    registry.register("send_crm_help", "rapidpro", schemas.SEND_CRM_HELP, rapidpro.send_crm_help)
+    _register("fetch_dossier", "rapidpro", schemas.FETCH_DOSSIER, rapidpro.fetch_dossier)
+    _register("start_flow", "rapidpro", schemas.START_FLOW, rapidpro.start_flow)
+    _register("start_crm_ops", "rapidpro", schemas.START_CRM_OPS, rapidpro.start_crm_ops)
+    _register("send_crm_help", "rapidpro", schemas.SEND_CRM_HELP, rapidpro.send_crm_help)
 
     # CRM Layer 2 Direct Commands (ADR-011 T2)
-    registry.register("crm_list_groups", "rapidpro", schemas.CRM_LIST_GROUPS, rapidpro.crm_list_groups)
-    registry.register("crm_lookup_contact", "rapidpro", schemas.CRM_LOOKUP_CONTACT, _handle_crm_lookup_enriched)
-    registry.register("crm_org_info", "rapidpro", schemas.CRM_ORG_INFO, rapidpro.crm_org_info)
-    registry.register("crm_create_group", "rapidpro", schemas.CRM_CREATE_GROUP, rapidpro.crm_create_group)
+    _register("crm_list_groups", "rapidpro", schemas.CRM_LIST_GROUPS, rapidpro.crm_list_groups)
+    _register("crm_lookup_contact", "rapidpro", schemas.CRM_LOOKUP_CONTACT, _handle_crm_lookup_enriched)
+    _register("crm_org_info", "rapidpro", schemas.CRM_ORG_INFO, rapidpro.crm_org_info)
+    _register("crm_create_group", "rapidpro", schemas.CRM_CREATE_GROUP, rapidpro.crm_create_group)
 
     # Mocks Tools
-    registry.register("check_stock", "mocks", schemas.CHECK_STOCK, mocks.check_stock)
-    registry.register("order_delivery", "mocks", schemas.ORDER_DELIVERY, mocks.order_delivery)
-    registry.register("schedule_viewing", "mocks", schemas.SCHEDULE_VIEWING, mocks.schedule_viewing)
+    _register("check_stock", "mocks", schemas.CHECK_STOCK, mocks.check_stock)
+    _register("order_delivery", "mocks", schemas.ORDER_DELIVERY, mocks.order_delivery)
+    _register("schedule_viewing", "mocks", schemas.SCHEDULE_VIEWING, mocks.schedule_viewing)
 
     # Forms Tools
-    registry.register("submit_form", "forms", schemas.SUBMIT_FORM, forms.submit_form)
+    _register("submit_form", "forms", schemas.SUBMIT_FORM, forms.submit_form)
 
     # Upload Tools
-    registry.register("upload_jwpub", "upload", schemas.UPLOAD_JWPUB, upload.upload_jwpub)
+    _register("upload_jwpub", "upload", schemas.UPLOAD_JWPUB, upload.upload_jwpub, timeout=300)
 
     # TalkPrep Tools
-    registry.register("get_talkprep_help", "talkprep", schemas.GET_TALKPREP_HELP, talkprep.get_talkprep_help)
-    registry.register("talkmaster_status", "talkprep", schemas.TALKMASTER_STATUS, talkprep.talkmaster_status)
-    registry.register("select_active_talk", "talkprep", schemas.SELECT_ACTIVE_TALK, talkprep.select_active_talk)
-    registry.register("list_publications", "talkprep", schemas.LIST_PUBLICATIONS, talkprep.list_publications)
-    registry.register("list_topics", "talkprep", schemas.LIST_TOPICS, talkprep.list_topics)
-    registry.register("import_talk", "talkprep", schemas.IMPORT_TALK, talkprep.import_talk)
-    registry.register("create_revision", "talkprep", schemas.CREATE_REVISION, talkprep.create_revision)
-    registry.register("develop_section", "talkprep", schemas.DEVELOP_SECTION, talkprep.develop_section)
-    registry.register("evaluate_talk", "talkprep", schemas.EVALUATE_TALK, talkprep.evaluate_talk)
-    registry.register("get_evaluation_scores", "talkprep", schemas.GET_EVALUATION_SCORES, talkprep.get_evaluation_scores)
-    registry.register("rehearsal_cue", "talkprep", schemas.REHEARSAL_CUE, talkprep.rehearsal_cue)
-    registry.register("export_talk_summary", "talkprep", schemas.EXPORT_TALK_SUMMARY, talkprep.export_talk_summary)
-    registry.register("cost_report", "talkprep", schemas.COST_REPORT, talkprep.cost_report)
-    registry.register("generate_anki_deck", "talkprep", schemas.GENERATE_ANKI_DECK, talkprep.generate_anki_deck)
-    registry.register("push_to_siyuan", "talkprep", schemas.PUSH_TO_SIYUAN, talkprep.push_to_siyuan)
+    _register("get_talkprep_help", "talkprep", schemas.GET_TALKPREP_HELP, talkprep.get_talkprep_help)
+    _register("talkmaster_status", "talkprep", schemas.TALKMASTER_STATUS, talkprep.talkmaster_status)
+    _register("job_status", "talkprep", schemas.JOB_STATUS, talkprep.job_status)
+    _register("select_active_talk", "talkprep", schemas.SELECT_ACTIVE_TALK, talkprep.select_active_talk)
+    _register("list_publications", "talkprep", schemas.LIST_PUBLICATIONS, talkprep.list_publications)
+    _register("list_topics", "talkprep", schemas.LIST_TOPICS, talkprep.list_topics)
+    _register("import_talk", "talkprep", schemas.IMPORT_TALK, talkprep.import_talk, timeout=60)
+    _register("create_revision", "talkprep", schemas.CREATE_REVISION, talkprep.create_revision)
+    _register("develop_section", "talkprep", schemas.DEVELOP_SECTION, talkprep.develop_section, timeout=600)
+    _register("evaluate_talk", "talkprep", schemas.EVALUATE_TALK, talkprep.evaluate_talk, timeout=600)
+    _register("get_evaluation_scores", "talkprep", schemas.GET_EVALUATION_SCORES, talkprep.get_evaluation_scores)
+    _register("rehearsal_cue", "talkprep", schemas.REHEARSAL_CUE, talkprep.rehearsal_cue, pool=executors.NETWORK, timeout=120)
+    _register("export_talk_summary", "talkprep", schemas.EXPORT_TALK_SUMMARY, talkprep.export_talk_summary)
+    _register("cost_report", "talkprep", schemas.COST_REPORT, talkprep.cost_report)
+    _register("generate_anki_deck", "talkprep", schemas.GENERATE_ANKI_DECK, talkprep.generate_anki_deck, pool=executors.CPU, timeout=120)
+    _register("push_to_siyuan", "talkprep", schemas.PUSH_TO_SIYUAN, talkprep.push_to_siyuan, pool=executors.NETWORK, timeout=60)
 
     # MemPalace Tools
-    registry.register("search_memory", "mempalace", SEARCH_MEMORY_SCHEMA, search_memory)
-    registry.register("store_memory", "mempalace", STORE_MEMORY_SCHEMA, store_memory)
-    registry.register("recall_memory", "mempalace", RECALL_MEMORY_SCHEMA, recall_memory)
-    registry.register("diary_write", "mempalace", DIARY_WRITE_SCHEMA, diary_write)
-    registry.register("diary_read", "mempalace", DIARY_READ_SCHEMA, diary_read)
-    registry.register("kg_query", "mempalace", KG_QUERY_SCHEMA, kg_query)
-    registry.register("kg_add", "mempalace", KG_ADD_SCHEMA, kg_add)
-    registry.register("kg_invalidate", "mempalace", KG_INVALIDATE_SCHEMA, kg_invalidate)
+    _register("search_memory", "mempalace", SEARCH_MEMORY_SCHEMA, search_memory)
+    _register("store_memory", "mempalace", STORE_MEMORY_SCHEMA, store_memory)
+    _register("recall_memory", "mempalace", RECALL_MEMORY_SCHEMA, recall_memory)
+    _register("diary_write", "mempalace", DIARY_WRITE_SCHEMA, diary_write)
+    _register("diary_read", "mempalace", DIARY_READ_SCHEMA, diary_read)
+    _register("kg_query", "mempalace", KG_QUERY_SCHEMA, kg_query)
+    _register("kg_add", "mempalace", KG_ADD_SCHEMA, kg_add)
+    _register("kg_invalidate", "mempalace", KG_INVALIDATE_SCHEMA, kg_invalidate)
 
     # SiYuan Read Tools (close the write-only gap)
-    registry.register("siyuan_search", "siyuan", schemas.SIYUAN_SEARCH, _handle_siyuan_search)
-    registry.register("siyuan_read", "siyuan", schemas.SIYUAN_READ, _handle_siyuan_read)
+    _register("siyuan_search", "siyuan", schemas.SIYUAN_SEARCH, _handle_siyuan_search)
+    _register("siyuan_read", "siyuan", schemas.SIYUAN_READ, _handle_siyuan_read)
 
     # SiYuan Wiki Tools (LLM Wiki pattern — Karpathy's compounding KB)
-    registry.register("siyuan_list_docs", "siyuan", schemas.SIYUAN_LIST_DOCS, _handle_siyuan_list_docs)
-    registry.register("siyuan_create_notebook", "siyuan", schemas.SIYUAN_CREATE_NOTEBOOK, _handle_siyuan_create_notebook)
-    registry.register("siyuan_create_doc", "siyuan", schemas.SIYUAN_CREATE_DOC, _handle_siyuan_create_doc)
-    registry.register("siyuan_update_block", "siyuan", schemas.SIYUAN_UPDATE_BLOCK, _handle_siyuan_update_block)
-    registry.register("siyuan_append_block", "siyuan", schemas.SIYUAN_APPEND_BLOCK, _handle_siyuan_append_block)
-    registry.register("siyuan_set_attrs", "siyuan", schemas.SIYUAN_SET_ATTRS, _handle_siyuan_set_attrs)
-    registry.register("siyuan_get_attrs", "siyuan", schemas.SIYUAN_GET_ATTRS, _handle_siyuan_get_attrs)
-    registry.register("siyuan_sql_query", "siyuan", schemas.SIYUAN_SQL_QUERY, _handle_siyuan_sql_query)
-    registry.register("siyuan_delete_block", "siyuan", schemas.SIYUAN_DELETE_BLOCK, _handle_siyuan_delete_block)
-    registry.register("siyuan_rename_doc", "siyuan", schemas.SIYUAN_RENAME_DOC, _handle_siyuan_rename_doc)
-    registry.register("siyuan_init_wiki", "siyuan", schemas.SIYUAN_INIT_WIKI, _handle_siyuan_init_wiki)
+    _register("siyuan_list_docs", "siyuan", schemas.SIYUAN_LIST_DOCS, _handle_siyuan_list_docs)
+    _register("siyuan_create_notebook", "siyuan", schemas.SIYUAN_CREATE_NOTEBOOK, _handle_siyuan_create_notebook)
+    _register("siyuan_create_doc", "siyuan", schemas.SIYUAN_CREATE_DOC, _handle_siyuan_create_doc)
+    _register("siyuan_update_block", "siyuan", schemas.SIYUAN_UPDATE_BLOCK, _handle_siyuan_update_block)
+    _register("siyuan_append_block", "siyuan", schemas.SIYUAN_APPEND_BLOCK, _handle_siyuan_append_block)
+    _register("siyuan_set_attrs", "siyuan", schemas.SIYUAN_SET_ATTRS, _handle_siyuan_set_attrs)
+    _register("siyuan_get_attrs", "siyuan", schemas.SIYUAN_GET_ATTRS, _handle_siyuan_get_attrs)
+    _register("siyuan_sql_query", "siyuan", schemas.SIYUAN_SQL_QUERY, _handle_siyuan_sql_query)
+    _register("siyuan_delete_block", "siyuan", schemas.SIYUAN_DELETE_BLOCK, _handle_siyuan_delete_block)
+    _register("siyuan_rename_doc", "siyuan", schemas.SIYUAN_RENAME_DOC, _handle_siyuan_rename_doc)
+    _register("siyuan_init_wiki", "siyuan", schemas.SIYUAN_INIT_WIKI, _handle_siyuan_init_wiki, timeout=120)
 
     # SiYuan Wiki Navigation & Maintenance (gap-closing)
-    registry.register("siyuan_get_backlinks", "siyuan", schemas.SIYUAN_GET_BACKLINKS, _handle_siyuan_get_backlinks)
-    registry.register("siyuan_get_children", "siyuan", schemas.SIYUAN_GET_CHILDREN, _handle_siyuan_get_children)
-    registry.register("siyuan_get_hpath", "siyuan", schemas.SIYUAN_GET_HPATH, _handle_siyuan_get_hpath)
-    registry.register("siyuan_remove_doc", "siyuan", schemas.SIYUAN_REMOVE_DOC, _handle_siyuan_remove_doc)
-    registry.register("siyuan_upsert_page", "siyuan", schemas.SIYUAN_UPSERT_PAGE, _handle_siyuan_upsert_page)
-    registry.register("siyuan_lint", "siyuan", schemas.SIYUAN_LINT, _handle_siyuan_lint)
-    registry.register("siyuan_dashboard", "siyuan", schemas.SIYUAN_DASHBOARD, _handle_siyuan_dashboard)
+    _register("siyuan_get_backlinks", "siyuan", schemas.SIYUAN_GET_BACKLINKS, _handle_siyuan_get_backlinks)
+    _register("siyuan_get_children", "siyuan", schemas.SIYUAN_GET_CHILDREN, _handle_siyuan_get_children)
+    _register("siyuan_get_hpath", "siyuan", schemas.SIYUAN_GET_HPATH, _handle_siyuan_get_hpath)
+    _register("siyuan_remove_doc", "siyuan", schemas.SIYUAN_REMOVE_DOC, _handle_siyuan_remove_doc)
+    _register("siyuan_upsert_page", "siyuan", schemas.SIYUAN_UPSERT_PAGE, _handle_siyuan_upsert_page)
+    _register("siyuan_lint", "siyuan", schemas.SIYUAN_LINT, _handle_siyuan_lint, timeout=120)
+    _register("siyuan_dashboard", "siyuan", schemas.SIYUAN_DASHBOARD, _handle_siyuan_dashboard, timeout=60)
 
     # System Operations (ADR-011 migration)
-    registry.register("macro_reset", "system", schemas.MACRO_RESET, system.macro_reset)
-    registry.register("macro_debug", "system", schemas.MACRO_DEBUG, system.macro_debug)
-    registry.register("macro_noai", "system", schemas.MACRO_NOAI, system.macro_noai)
-    registry.register("macro_noai_global", "system", schemas.MACRO_NOAI_GLOBAL, system.macro_noai_global)
-    registry.register("macro_noai_status", "system", schemas.MACRO_NOAI_STATUS, system.macro_noai_status)
-    registry.register("macro_enableai", "system", schemas.MACRO_ENABLEAI, system.macro_enableai)
-    registry.register("macro_enableai_global", "system", schemas.MACRO_ENABLEAI_GLOBAL, system.macro_enableai_global)
-    registry.register("macro_reload", "system", schemas.MACRO_RELOAD, system.macro_reload)
-    registry.register("macro_health", "system", schemas.MACRO_HEALTH, system.macro_health)
-    registry.register("macro_skills", "system", schemas.MACRO_SKILLS, system.macro_skills)
-    registry.register("macro_flow", "system", schemas.MACRO_FLOW, system.macro_flow)
+    _register("macro_reset", "system", schemas.MACRO_RESET, system.macro_reset)
+    _register("macro_debug", "system", schemas.MACRO_DEBUG, system.macro_debug)
+    _register("macro_noai", "system", schemas.MACRO_NOAI, system.macro_noai)
+    _register("macro_noai_global", "system", schemas.MACRO_NOAI_GLOBAL, system.macro_noai_global)
+    _register("macro_noai_status", "system", schemas.MACRO_NOAI_STATUS, system.macro_noai_status)
+    _register("macro_enableai", "system", schemas.MACRO_ENABLEAI, system.macro_enableai)
+    _register("macro_enableai_global", "system", schemas.MACRO_ENABLEAI_GLOBAL, system.macro_enableai_global)
+    _register("macro_reload", "system", schemas.MACRO_RELOAD, system.macro_reload)
+    _register("macro_health", "system", schemas.MACRO_HEALTH, system.macro_health)
+    _register("macro_skills", "system", schemas.MACRO_SKILLS, system.macro_skills)
+    _register("macro_flow", "system", schemas.MACRO_FLOW, system.macro_flow)
+    _register("macro_broadcast", "system", schemas.MACRO_BROADCAST, system.macro_broadcast)
 
     # Config Operations (ADR-011 migration)
-    registry.register("macro_persona", "config", schemas.MACRO_PERSONA, config.macro_persona)
-    registry.register("macro_channel", "config", schemas.MACRO_CHANNEL, config.macro_channel)
-    registry.register("macro_admin", "config", schemas.MACRO_ADMIN, config.macro_admin)
-    registry.register("macro_global", "config", schemas.MACRO_GLOBAL, config.macro_global)
-    registry.register("macro_label", "config", schemas.MACRO_LABEL, config.macro_label)
+    _register("macro_persona", "config", schemas.MACRO_PERSONA, config.macro_persona)
+    _register("macro_channel", "config", schemas.MACRO_CHANNEL, config.macro_channel)
+    _register("macro_admin", "config", schemas.MACRO_ADMIN, config.macro_admin)
+    _register("macro_global", "config", schemas.MACRO_GLOBAL, config.macro_global)
+    _register("macro_label", "config", schemas.MACRO_LABEL, config.macro_label)
 
     # Social-Code Simulation Tools (ADR-014)
-    registry.register("sim_update_mood", "social", social_schemas.SIM_UPDATE_MOOD, social.sim_update_mood)
-    registry.register("sim_update_trust", "social", social_schemas.SIM_UPDATE_TRUST, social.sim_update_trust)
-    registry.register("sim_update_dossier", "social", social_schemas.SIM_UPDATE_DOSSIER, social.sim_update_dossier)
-    registry.register("sim_assess_boredom", "social", social_schemas.SIM_ASSESS_BOREDOM, social.sim_assess_boredom)
-    registry.register("sim_trigger_distraction", "social", social_schemas.SIM_TRIGGER_DISTRACTION, social.sim_trigger_distraction)
-    registry.register("sim_grade_response", "social", social_schemas.SIM_GRADE_RESPONSE, social.sim_grade_response)
-    registry.register("sim_get_scenario", "social", social_schemas.SIM_GET_SCENARIO, social.sim_get_scenario)
-    registry.register("sim_drill_grade", "social", social_schemas.SIM_DRILL_GRADE, social.sim_drill_grade)
-    registry.register("sim_freetext", "social", social_schemas.SIM_FREETEXT, social.sim_freetext)
-    registry.register("sim_set_language", "social", social_schemas.SIM_SET_LANGUAGE, social.sim_set_language)
-    registry.register("sim_session_summary", "social", social_schemas.SIM_SESSION_SUMMARY, social.sim_session_summary)
-    registry.register("sim_toggle_ai", "social", social_schemas.SIM_TOGGLE_AI, social.sim_toggle_ai)
+    _register("sim_update_mood", "social", social_schemas.SIM_UPDATE_MOOD, social.sim_update_mood)
+    _register("sim_update_trust", "social", social_schemas.SIM_UPDATE_TRUST, social.sim_update_trust)
+    _register("sim_update_dossier", "social", social_schemas.SIM_UPDATE_DOSSIER, social.sim_update_dossier)
+    _register("sim_assess_boredom", "social", social_schemas.SIM_ASSESS_BOREDOM, social.sim_assess_boredom)
+    _register("sim_trigger_distraction", "social", social_schemas.SIM_TRIGGER_DISTRACTION, social.sim_trigger_distraction)
+    _register("sim_grade_response", "social", social_schemas.SIM_GRADE_RESPONSE, social.sim_grade_response)
+    _register("sim_get_scenario", "social", social_schemas.SIM_GET_SCENARIO, social.sim_get_scenario, timeout=90)
+    _register("sim_drill_grade", "social", social_schemas.SIM_DRILL_GRADE, social.sim_drill_grade, timeout=90)
+    _register("sim_freetext", "social", social_schemas.SIM_FREETEXT, social.sim_freetext, timeout=90)
+    _register("sim_set_language", "social", social_schemas.SIM_SET_LANGUAGE, social.sim_set_language)
+    _register("sim_session_summary", "social", social_schemas.SIM_SESSION_SUMMARY, social.sim_session_summary)
+    _register("sim_toggle_ai", "social", social_schemas.SIM_TOGGLE_AI, social.sim_toggle_ai)
 
     _registered = True
-    logger.info("Registered 77 native Hermes-compatible tools globally.")
+    logger.info(f"Registered {len(_native_tools)} native Hermes-compatible tools globally.")
 
 def get_hermes_tools() -> dict:
     """Return the global registry dict if anything needs to introspect it."""
@@ -0,0 +1,529 @@
+"""
+Broadcast engine — chunked, rate-limited, resumable RapidPro flow starts.
+
+/broadcast used to send every target URN in one flow_starts.json call.
+RapidPro caps the URNs per start, so large audiences failed all at once
+and a crash mid-send left no record of who had been reached.
+
+Model:
+  - A broadcast's recipients are split into chunks of BROADCAST_CHUNK_SIZE
+    URNs (RapidPro's per-start limit). Broadcasts and chunks are rows in
+    SQLite; a chunk goes pending → sending → sent / failed / unknown.
+  - Chunks are dispatched concurrently (BROADCAST_CONCURRENCY in flight)
+    and paced by one process-wide limiter (BROADCAST_RATE starts per
+    second) shared by all broadcasts, since RapidPro throttles per org.
+  - A flow start is a POST that RapidPro may have acted on even when we
+    never see the answer, so only requests that provably did not arrive
+    are retried: 429 (Retry-After honoured) and connection-phase errors.
+    Read timeouts, dropped connections and 5xx responses mark the chunk
+    unknown — possibly delivered — rather than risk messaging up to a
+    chunk of people twice; other 4xx responses fail it.
+  - On startup, broadcasts still marked running resume with their pending
+    chunks. A chunk that was mid-request during the crash is marked
+    unknown as well, so delivery is at-most-once throughout; retry()
+    re-queues failed and unknown chunks once an admin has checked.
+  - When a broadcast finishes, the admin who started it gets a summary
+    over WhatsApp; the macro_broadcast admin tool (app/graph/tools/system.py)
+    starts, inspects, cancels and re-queues broadcasts.
+
+Dispatch runs on the server event loop captured by start(). submit(),
+retry() and cancel() may also be called from tool executor threads: the
+work is handed to that loop. wait() must be awaited on it.
+
+Tunables (env):
+  BROADCAST_DB           — SQLite path (default $GATEWAY_DATA_DIR/broadcasts.sqlite)
+  BROADCAST_CHUNK_SIZE   — URNs per flow start (default 100, RapidPro's limit)
+  BROADCAST_CONCURRENCY  — chunk requests in flight per broadcast (default 2)
+  BROADCAST_RATE         — flow starts per second, all broadcasts (default 1)
+  BROADCAST_RETRIES      — attempts per chunk (default 3)
+  BROADCAST_RETENTION    — days finished broadcasts are kept (default 30)
+"""
+
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Dict, List, Optional
+
+import httpx
+
+from app.config import data_path
+from app.utils import metrics
+
+logger = logging.getLogger(__name__)
+
+# ── Configuration ────────────────────────────────────────────────────────────
+
+RAPIDPRO_URL = os.getenv("RAPIDPRO_URL", "http://localhost:8000")
+RAPIDPRO_TOKEN = os.getenv("RAPIDPRO_TOKEN", "")
+BROADCAST_FLOW_UUID = os.getenv("RAPIDPRO_BROADCAST_FLOW_UUID", "")
+
+_DB_PATH = os.getenv("BROADCAST_DB", data_path("broadcasts.sqlite"))
+_CHUNK_SIZE = int(os.getenv("BROADCAST_CHUNK_SIZE", "100"))
+_CONCURRENCY = int(os.getenv("BROADCAST_CONCURRENCY", "2"))
+_RATE = float(os.getenv("BROADCAST_RATE", "1"))
+_RETRIES = int(os.getenv("BROADCAST_RETRIES", "3"))
+_RETENTION = float(os.getenv("BROADCAST_RETENTION", "30")) * 86400
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS broadcasts (
+    id TEXT PRIMARY KEY,
+    admin TEXT NOT NULL,
+    message TEXT NOT NULL,
+    flow TEXT NOT NULL,
+    status TEXT NOT NULL,
+    total INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    finished_at REAL
+);
+CREATE INDEX IF NOT EXISTS broadcasts_status ON broadcasts(status);
+CREATE TABLE IF NOT EXISTS broadcast_chunks (
+    broadcast_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    urns TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    sent_at REAL,
+    PRIMARY KEY (broadcast_id, seq)
+);
+"""
+
+_UNSENT = ("pending", "sending")
+_UNCONFIRMED = ("failed", "unknown")
+
+# Raised before the request left this host, so RapidPro cannot have seen it
+_NOT_SENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+# ── State ────────────────────────────────────────────────────────────────────
+
+_lock = threading.Lock()            # guards the connection
+_conn: Optional[sqlite3.Connection] = None
+_loop: Optional[asyncio.AbstractEventLoop] = None   # server loop, set by start()
+_tasks: Dict[str, asyncio.Task] = {}
+_awaited: set = set()               # broadcasts an admin is waiting on inline (no WhatsApp report)
+_next_slot = 0.0                    # monotonic time of the next allowed flow start
+
+_CHUNKS = metrics.Counter(
+    "gateway_broadcast_chunks",
+    "Broadcast chunks by outcome (sent, failed, unknown, retried).",
+    labelnames=("outcome",),
+)
+_URNS_SENT = metrics.Counter(
+    "gateway_broadcast_urns_sent",
+    "Recipients included in successful broadcast flow starts.",
+)
+metrics.Gauge(
+    "gateway_broadcasts_running",
+    "Broadcasts currently dispatching chunks.",
+    lambda: len(_tasks),
+)
+
+
+class BroadcastConfigError(ValueError):
+    """RAPIDPRO_TOKEN or RAPIDPRO_BROADCAST_FLOW_UUID is not set."""
+
+
+def _on_loop() -> bool:
+    try:
+        asyncio.get_running_loop()
+        return True
+    except RuntimeError:
+        return False
+
+
+def _call_on_loop(fn, *args) -> None:
+    """Run ``fn`` on the dispatch loop, from it or from a worker thread."""
+    if _on_loop():
+        fn(*args)
+    elif _loop is not None and not _loop.is_closed():
+        _loop.call_soon_threadsafe(fn, *args)
+    else:
+        raise RuntimeError("Broadcast engine is not running")
+
+
+# ── Storage ──────────────────────────────────────────────────────────────────
+
+def _db() -> sqlite3.Connection:
+    """Shared connection; callers hold _lock."""
+    global _conn
+    if _conn is None:
+        os.makedirs(os.path.dirname(_DB_PATH) or ".", exist_ok=True)
+        conn = sqlite3.connect(_DB_PATH, check_same_thread=False, timeout=10)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(_SCHEMA)
+        _conn = conn
+    return _conn
+
+
+def _set_chunk(broadcast_id: str, seq: int, status: str, error: Optional[str] = None,
+               attempt: bool = False) -> None:
+    with _lock:
+        conn = _db()
+        with conn:
+            conn.execute(
+                "UPDATE broadcast_chunks SET status = ?, error = ?, "
+                "attempts = attempts + ?, sent_at = CASE WHEN ? = 'sent' THEN ? ELSE sent_at END "
+                "WHERE broadcast_id = ? AND seq = ?",
+                (status, error, int(attempt), status, time.time(), broadcast_id, seq),
+            )
+
+
+# ── Submission ───────────────────────────────────────────────────────────────
+
+def submit(admin: str, message: str, urns: List[str]) -> str:
+    """Record a broadcast, split into chunks, and start dispatching it.
+
+    Duplicate URNs are dropped (first occurrence kept). Returns its ID.
+    """
+    if not RAPIDPRO_TOKEN or not BROADCAST_FLOW_UUID:
+        raise BroadcastConfigError("RAPIDPRO_TOKEN and RAPIDPRO_BROADCAST_FLOW_UUID must be set")
+    if not _on_loop() and _loop is None:
+        raise RuntimeError("Broadcast engine is not running")
+    urns = list(dict.fromkeys(urns))
+    chunks = [urns[i:i + _CHUNK_SIZE] for i in range(0, len(urns), _CHUNK_SIZE)]
+    broadcast_id = uuid.uuid4().hex[:8]
+    with _lock:
+        conn = _db()
+        with conn:
+            conn.execute(
+                "INSERT INTO broadcasts (id, admin, message, flow, status, total, created_at) "
+                "VALUES (?, ?, ?, ?, 'running', ?, ?)",
+                (broadcast_id, admin, message, BROADCAST_FLOW_UUID, len(urns), time.time()),
+            )
+            conn.executemany(
+                "INSERT INTO broadcast_chunks (broadcast_id, seq, urns, size, status) "
+                "VALUES (?, ?, ?, ?, 'pending')",
+                [(broadcast_id, seq, json.dumps(chunk), len(chunk)) for seq, chunk in enumerate(chunks)],
+            )
+    logger.info(f"Broadcast {broadcast_id}: {len(urns)} recipients in {len(chunks)} chunks")
+    _call_on_loop(_launch, broadcast_id)
+    return broadcast_id
+
+
+def _launch(broadcast_id: str) -> None:
+    task = asyncio.get_running_loop().create_task(_run(broadcast_id))
+    _tasks[broadcast_id] = task
+    task.add_done_callback(lambda _: _tasks.pop(broadcast_id, None))
+
+
+# ── Dispatch ─────────────────────────────────────────────────────────────────
+
+def _client() -> httpx.AsyncClient:
+    from app.api.middleware.http_clients import rapidpro_client
+    return rapidpro_client()
+
+
+async def _pace() -> None:
+    """Wait for the next flow-start slot (BROADCAST_RATE across all broadcasts)."""
+    global _next_slot
+    if _RATE <= 0:
+        return
+    now = time.monotonic()
+    slot = max(now, _next_slot)
+    _next_slot = slot + 1.0 / _RATE   # claimed before awaiting — one loop, no race
+    if slot > now:
+        await asyncio.sleep(slot - now)
+
+
+async def _send_chunk(broadcast_id: str, seq: int, urns: List[str], message: str, flow: str) -> bool:
+    """Start the flow for one chunk, retrying only requests RapidPro never acted on."""
+    error = ""
+    for attempt in range(1, _RETRIES + 1):
+        await _pace()
+        _set_chunk(broadcast_id, seq, "sending", attempt=True)
+        delay = float(2 ** attempt)
+        try:
+            resp = await _client().post(
+                f"{RAPIDPRO_URL}/api/v2/flow_starts.json",
+                headers={"Authorization": f"Token {RAPIDPRO_TOKEN}"},
+                json={"flow": flow, "urns": urns, "extra": {"message": message}},
+                timeout=15.0,
+            )
+        except _NOT_SENT_ERRORS as e:
+            error = f"{type(e).__name__}: {e}"
+        except httpx.HTTPError as e:
+            return _unknown(broadcast_id, seq, f"{type(e).__name__}: {e}")
+        else:
+            if resp.status_code < 300:
+                _set_chunk(broadcast_id, seq, "sent")
+                _CHUNKS.inc(outcome="sent")
+                _URNS_SENT.inc(len(urns))
+                return True
+            error = f"RapidPro {resp.status_code}: {resp.text[:200]}"
+            if resp.status_code >= 500:
+                return _unknown(broadcast_id, seq, error)
+            if resp.status_code != 429:
+                break  # bad request / auth — retrying won't help
+            retry_after = resp.headers.get("Retry-After", "")
+            if retry_after.isdigit():
+                delay = float(retry_after)
+        if attempt < _RETRIES:
+            _CHUNKS.inc(outcome="retried")
+            logger.warning(f"Broadcast {broadcast_id} chunk {seq}: {error} — retrying in {delay:g}s")
+            await asyncio.sleep(delay)
+    logger.error(f"Broadcast {broadcast_id} chunk {seq} failed: {error}")
+    _set_chunk(broadcast_id, seq, "failed", error=error)
+    _CHUNKS.inc(outcome="failed")
+    return False
+
+
+def _unknown(broadcast_id: str, seq: int, error: str) -> bool:
+    """The flow start may have gone through — record it, don't resend it."""
+    logger.error(f"Broadcast {broadcast_id} chunk {seq} outcome unknown (not retried): {error}")
+    _set_chunk(broadcast_id, seq, "unknown", error=error)
+    _CHUNKS.inc(outcome="unknown")
+    return False
+
+
+async def _run(broadcast_id: str) -> None:
+    with _lock:
+        conn = _db()
+        row = conn.execute(
+            "SELECT admin, message, flow FROM broadcasts WHERE id = ?", (broadcast_id,),
+        ).fetchone()
+        chunks = [
+            (r["seq"], json.loads(r["urns"]))
+            for r in conn.execute(
+                "SELECT seq, urns FROM broadcast_chunks WHERE broadcast_id = ? AND status = 'pending' "
+                "ORDER BY seq",
+                (broadcast_id,),
+            )
+        ]
+    slots = asyncio.Semaphore(_CONCURRENCY)
+
+    async def dispatch(seq: int, urns: List[str]) -> None:
+        async with slots:
+            await _send_chunk(broadcast_id, seq, urns, row["message"], row["flow"])
+
+    await asyncio.gather(*(dispatch(seq, urns) for seq, urns in chunks))
+    status = _finish(broadcast_id)
+    if status != "cancelled" and broadcast_id not in _awaited:
+        await _notify(row["admin"], format_progress(progress(broadcast_id)))
+
+
+def _finish(broadcast_id: str) -> str:
+    """Close the broadcast from its chunk outcomes; returns the final status."""
+    with _lock:
+        conn = _db()
+        current = conn.execute("SELECT status FROM broadcasts WHERE id = ?", (broadcast_id,)).fetchone()[0]
+        if current == "cancelled":
+            return current
+        counts = dict(conn.execute(
+            "SELECT status, COUNT(*) FROM broadcast_chunks WHERE broadcast_id = ? GROUP BY status",
+            (broadcast_id,),
+        ).fetchall())
+        if not any(counts.get(s) for s in _UNCONFIRMED):
+            status = "done"
+        else:
+            status = "partial" if counts.get("sent") else "failed"
+        with conn:
+            conn.execute(
+                "UPDATE broadcasts SET status = ?, finished_at = ? WHERE id = ?",
+                (status, time.time(), broadcast_id),
+            )
+    logger.info(f"Broadcast {broadcast_id} {status}: {counts}")
+    return status
+
+
+async def _notify(admin: str, text: str) -> None:
+    """Send the final report to the admin's WhatsApp (best effort)."""
+    phone = admin.split(":")[-1].lstrip("+") if admin else ""
+    if not phone.isdigit():
+        return
+    from app.api.middleware.wuzapi_client import send_text
+    try:
+        await send_text(phone, text)
+    except Exception as e:
+        logger.warning(f"Broadcast report to {phone} failed: {e}")
+
+
+# ── Control & reads ──────────────────────────────────────────────────────────
+
+async def wait(broadcast_id: str, timeout: float) -> bool:
+    """Wait up to ``timeout`` seconds for a broadcast; True if it finished.
+
+    A broadcast that finishes while awaited is reported by the caller, so
+    no WhatsApp report is sent for it.
+    """
+    task = _tasks.get(broadcast_id)
+    if task is None:
+        return True
+    _awaited.add(broadcast_id)
+    try:
+        done, _ = await asyncio.wait({task}, timeout=timeout)
+    finally:
+        _awaited.discard(broadcast_id)
+    return bool(done)
+
+
+def cancel(broadcast_id: str) -> bool:
+    """Stop a running broadcast; chunks already sent stay sent."""
+    with _lock:
+        conn = _db()
+        with conn:
+            updated = conn.execute(
+                "UPDATE broadcasts SET status = 'cancelled', finished_at = ? "
+                "WHERE id = ? AND status = 'running'",
+                (time.time(), broadcast_id),
+            ).rowcount
+            conn.execute(
+                f"UPDATE broadcast_chunks SET status = 'cancelled' "
+                f"WHERE broadcast_id = ? AND status IN {_UNSENT}",
+                (broadcast_id,),
+            )
+    task = _tasks.get(broadcast_id)
+    if task is not None:
+        _call_on_loop(task.cancel)
+    return bool(updated)
+
+
+def retry(broadcast_id: str) -> int:
+    """Re-queue a finished broadcast's failed and unknown chunks.
+
+    Unknown chunks may already have been delivered, so this is an admin
+    decision, never automatic. Returns the number of chunks re-queued.
+    """
+    if not _on_loop() and _loop is None:
+        raise RuntimeError("Broadcast engine is not running")
+    with _lock:
+        conn = _db()
+        with conn:
+            requeued = conn.execute(
+                f"UPDATE broadcast_chunks SET status = 'pending', error = NULL "
+                f"WHERE broadcast_id = ? AND status IN {_UNCONFIRMED} AND broadcast_id IN "
+                f"(SELECT id FROM broadcasts WHERE status IN ('partial', 'failed'))",
+                (broadcast_id,),
+            ).rowcount
+            if requeued:
+                conn.execute(
+                    "UPDATE broadcasts SET status = 'running', finished_at = NULL WHERE id = ?",
+                    (broadcast_id,),
+                )
+    if requeued:
+        logger.info(f"Broadcast {broadcast_id}: {requeued} chunks re-queued")
+        _call_on_loop(_launch, broadcast_id)
+    return requeued
+
+
+def progress(broadcast_id: str) -> Optional[dict]:
+    """Counts, elapsed time and throughput for one broadcast, or None."""
+    with _lock:
+        conn = _db()
+        row = conn.execute("SELECT * FROM broadcasts WHERE id = ?", (broadcast_id,)).fetchone()
+        if row is None:
+            return None
+        urns = dict(conn.execute(
+            "SELECT status, SUM(size) FROM broadcast_chunks WHERE broadcast_id = ? GROUP BY status",
+            (broadcast_id,),
+        ).fetchall())
+        chunks = conn.execute(
+            "SELECT COUNT(*), SUM(status = 'sent') FROM broadcast_chunks WHERE broadcast_id = ?",
+            (broadcast_id,),
+        ).fetchone()
+    elapsed = (row["finished_at"] or time.time()) - row["created_at"]
+    sent = urns.get("sent", 0)
+    remaining = sum(urns.get(s, 0) for s in _UNSENT)
+    per_minute = sent / elapsed * 60 if elapsed > 0 else 0.0
+    return {
+        "id": broadcast_id,
+        "status": row["status"],
+        "admin": row["admin"],
+        "message": row["message"],
+        "total": row["total"],
+        "sent": sent,
+        "failed": urns.get("failed", 0),
+        "unknown": urns.get("unknown", 0),
+        "remaining": remaining,
+        "chunks": chunks[0],
+        "chunks_sent": chunks[1] or 0,
+        "elapsed_s": round(elapsed, 1),
+        "per_minute": round(per_minute, 1),
+        "eta_s": round(remaining / per_minute * 60) if row["status"] == "running" and per_minute else None,
+    }
+
+
+def format_progress(p: dict) -> str:
+    """WhatsApp-friendly progress line(s) for one broadcast."""
+    icon = {"running": "⏳", "done": "✅", "partial": "⚠️", "failed": "❌", "cancelled": "🛑"}.get(p["status"], "•")
+    lines = [
+        f"{icon} *Broadcast {p['id']}* — {p['status']}",
+        f"📨 {p['sent']}/{p['total']} sent ({p['chunks_sent']}/{p['chunks']} chunks)"
+        + (f", {p['failed']} failed" if p["failed"] else "")
+        + (f", {p['unknown']} unconfirmed" if p["unknown"] else ""),
+        f"⚡ {p['per_minute']:g}/min over {p['elapsed_s']:g}s"
+        + (f" — ~{p['eta_s']}s left" if p["eta_s"] is not None else ""),
+    ]
+    return "\n".join(lines)
+
+
+def recent(limit: int = 5) -> List[dict]:
+    """Progress of the latest broadcasts, newest first."""
+    with _lock:
+        ids = [
+            r[0] for r in _db().execute(
+                "SELECT id FROM broadcasts ORDER BY created_at DESC LIMIT ?", (limit,),
+            )
+        ]
+    return [progress(broadcast_id) for broadcast_id in ids]
+
+
+# ── Lifecycle ────────────────────────────────────────────────────────────────
+
+def start() -> None:
+    """Prune old broadcasts and resume running ones (FastAPI lifespan startup)."""
+    global _loop
+    _loop = asyncio.get_running_loop()
+    cutoff = time.time() - _RETENTION
+    with _lock:
+        conn = _db()
+        with conn:
+            conn.execute(
+                "DELETE FROM broadcast_chunks WHERE broadcast_id IN "
+                "(SELECT id FROM broadcasts WHERE status != 'running' AND finished_at < ?)",
+                (cutoff,),
+            )
+            conn.execute(
+                "DELETE FROM broadcasts WHERE status != 'running' AND finished_at < ?", (cutoff,),
+            )
+            # Mid-request when the process died — RapidPro may have started them
+            conn.execute(
+                "UPDATE broadcast_chunks SET status = 'unknown', error = 'interrupted mid-request' "
+                "WHERE status = 'sending'"
+            )
+        running = [r[0] for r in conn.execute(
+            "SELECT id FROM broadcasts WHERE status = 'running' ORDER BY created_at"
+        )]
+    for broadcast_id in running:
+        if broadcast_id not in _tasks:
+            logger.info(f"Resuming broadcast {broadcast_id}")
+            _launch(broadcast_id)
+
+
+async def stop() -> None:
+    """Stop dispatching (FastAPI lifespan shutdown); unsent chunks resume on start().
+
+    Waits for the cancelled tasks to unwind, so no chunk request is still
+    using the RapidPro client when the lifespan closes it.
+    """
+    tasks = list(_tasks.values())
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def stats() -> dict:
+    if _conn is None and not os.path.exists(_DB_PATH):
+        return {"running": 0, "broadcasts": {}}
+    with _lock:
+        broadcasts = dict(_db().execute(
+            "SELECT status, COUNT(*) FROM broadcasts GROUP BY status"
+        ).fetchall())
+    return {"running": len(_tasks), "broadcasts": broadcasts}
@@ -3,25 +3,66 @@ Palace Writer — persists conversation turns to MemPalace after each
 Hermes invocation.
 
 Design rationale:
-  - Runs AFTER the response is sent (fire-and-forget via asyncio.to_thread)
+  - Runs AFTER the response is sent: the chat path only enqueues
+    (enqueue_turn) and one dedicated "palace-writer" thread drains a
+    bounded queue in batches, so bursts can't flood the default thread
+    pool or hammer the SQLite/Chroma store with parallel writers
   - Uses tenacity retry for SQLite maintenance lockouts (VACUUM cron
     runs monthly and briefly locks the DB)
-  - Deduplicates by content hash to prevent re-storing on WhatsApp retries
+  - Deduplicates by exact content hash first (cheap, in-memory), and only
+    then by vector similarity (tool_check_duplicate) for near-duplicates
+  - A full queue sheds load by policy (drop the oldest or the newest turn)
+    and counts every drop in /metrics instead of queueing without bound
   - Scopes writes to per-user wings for tenant isolation
+
+Tunables (env):
+  PALACE_QUEUE_MAX        — queued turns before shedding (default 256)
+  PALACE_QUEUE_POLICY     — "drop_oldest" (default) or "drop_newest"
+  PALACE_BATCH_SIZE       — turns written per flush (default 16)
+  PALACE_FLUSH_INTERVAL   — seconds to wait for a batch to fill (default 0.5)
+  PALACE_DEDUP_TTL        — seconds an exact hash is remembered (default 3600)
 """
 
 import hashlib
 import logging
 import os
+import queue
+import threading
+import time
+from dataclasses import dataclass
 from typing import Optional
 
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
 
+from app.utils import metrics
+from app.utils.ttl_store import TTLStore
+
 logger = logging.getLogger(__name__)
 
 # ── Configuration ────────────────────────────────────────────────────────────
 
 _PALACE_ENABLED = os.getenv("MEMPALACE_PALACE_PATH", "")  # Empty = disabled
+_QUEUE_MAX = int(os.getenv("PALACE_QUEUE_MAX", "256"))
+_POLICY = os.getenv("PALACE_QUEUE_POLICY", "drop_oldest")
+_BATCH_SIZE = int(os.getenv("PALACE_BATCH_SIZE", "16"))
+_FLUSH_INTERVAL = float(os.getenv("PALACE_FLUSH_INTERVAL", "0.5"))
+
+# ── Metrics ──────────────────────────────────────────────────────────────────
+
+_TURNS = metrics.Counter(
+    "gateway_palace_turns",
+    "Palace writer turns by outcome (queued, written, dup_exact, dup_similar, dropped, failed).",
+    labelnames=("outcome",),
+)
+_FLUSH_SECONDS = metrics.Histogram(
+    "gateway_palace_flush_seconds",
+    "Time to write one batch of turns to MemPalace.",
+)
+metrics.Gauge(
+    "gateway_palace_queue_depth",
+    "Turns waiting for the palace writer.",
+    lambda: _queue.qsize(),
+)
 
 
 # ── Content dedup ────────────────────────────────────────────────────────────
@@ -31,6 +72,39 @@ def _content_hash(content: str) -> str:
     return hashlib.sha256(content.encode("utf-8")).hexdigest()[:16]
 
 
+# Recently accepted hashes — catches WhatsApp retries without a vector search
+_recent_hashes = TTLStore(
+    "palace.recent_hashes",
+    ttl=float(os.getenv("PALACE_DEDUP_TTL", "3600")),
+    maxsize=4096,
+)
+
+
+@dataclass(frozen=True)
+class _Turn:
+    urn: str
+    wing: str
+    room: str
+    content: str
+    content_id: str
+
+
+def _build_turn(urn: str, persona: str, user_message: str, assistant_response: str) -> _Turn:
+    # Per-user wing for tenant isolation (server-side, not user-controllable)
+    phone = urn.split(":")[-1].lstrip("+")
+    wing = f"wing_{phone}"
+    room = "general"  # Flat room — persona stored as content tag, not partition key
+
+    # Build the turn content (verbatim, per MemPalace design — no summarization)
+    # Persona tag is embedded in content for grep-ability and search filtering
+    content = (
+        f"[persona:{persona}]\n"
+        f"[User] {user_message}\n"
+        f"[{persona}] {assistant_response}"
+    )
+    return _Turn(urn, wing, room, content, _content_hash(content))
+
+
 # ── Retry wrapper for SQLite lockouts ────────────────────────────────────────
 
 @retry(
@@ -55,7 +129,38 @@ def _store_with_retry(
     )
 
 
-# ── Main entry point ────────────────────────────────────────────────────────
+# ── Single-turn write ───────────────────────────────────────────────────────
+
+def _write_turn(turn: _Turn) -> None:
+    """Similarity dedup + store for one turn. Never raises."""
+    try:
+        from mempalace.mcp_server import tool_check_duplicate
+        is_dup = tool_check_duplicate(content=turn.content, threshold=0.95)
+        if is_dup and isinstance(is_dup, dict) and is_dup.get("is_duplicate"):
+            logger.debug(f"Dedup hit ({turn.content_id}) — skipping palace write for {turn.urn}")
+            _TURNS.inc(outcome="dup_similar")
+            return
+    except Exception as e:
+        # Dedup check is best-effort — proceed with store on failure
+        logger.debug(f"Dedup check failed (proceeding): {e}")
+
+    started = time.perf_counter()
+    try:
+        _store_with_retry(
+            content=turn.content,
+            wing=turn.wing,
+            room=turn.room,
+        )
+        _TURNS.inc(outcome="written")
+        logger.debug(f"Palace write OK: {turn.wing}/{turn.room} ({turn.content_id})")
+    except Exception as e:
+        # Never crash on persistence failure — the response is already sent
+        _TURNS.inc(outcome="failed")
+        _recent_hashes.pop(turn.content_id)  # let a retry of this turn try again
+        logger.error(f"Palace write FAILED for {turn.urn}: {e}")
+    finally:
+        metrics.CHAT_STAGE_SECONDS.observe(time.perf_counter() - started, stage="palace_write")
+
 
 def persist_turn_to_palace(
     urn: str,
@@ -65,11 +170,10 @@ def persist_turn_to_palace(
     skip_persistence: bool = False,
 ) -> None:
     """
-    Persist a conversation turn to MemPalace.
+    Persist a conversation turn to MemPalace synchronously.
 
-    Called from a thread (via asyncio.to_thread) after the response
-    has been sent to the user. This means persistence failures
-    don't block the user experience.
+    The chat path uses enqueue_turn() instead; this stays for scripts
+    and callers that need the write done before they continue.
 
     Args:
         urn: WhatsApp URN (e.g. "whatsapp:+50937...")
@@ -81,38 +185,150 @@ def persist_turn_to_palace(
     if not _PALACE_ENABLED or skip_persistence:
         return
 
-    # Per-user wing for tenant isolation (server-side, not user-controllable)
-    phone = urn.split(":")[-1].lstrip("+")
-    wing = f"wing_{phone}"
-    room = "general"  # Flat room — persona stored as content tag, not partition key
+    turn = _build_turn(urn, persona, user_message, assistant_response)
+    if turn.content_id in _recent_hashes:
+        _TURNS.inc(outcome="dup_exact")
+        return
+    _recent_hashes[turn.content_id] = True
+    _write_turn(turn)
 
-    # Build the turn content (verbatim, per MemPalace design — no summarization)
-    # Persona tag is embedded in content for grep-ability and search filtering
-    content = (
-        f"[persona:{persona}]\n"
-        f"[User] {user_message}\n"
-        f"[{persona}] {assistant_response}"
-    )
 
-    # Dedup check — prevent re-storing on WhatsApp message retries
-    content_id = _content_hash(content)
+# ── Queued writer ───────────────────────────────────────────────────────────
+
+_queue: "queue.Queue" = queue.Queue(maxsize=_QUEUE_MAX)
+_STOP = object()
+_worker: Optional[threading.Thread] = None
+_worker_lock = threading.Lock()
+
+
+def _ensure_worker() -> None:
+    global _worker
+    with _worker_lock:
+        if _worker is None or not _worker.is_alive():
+            _worker = threading.Thread(target=_run_worker, name="palace-writer", daemon=True)
+            _worker.start()
+
+
+def _put_stop() -> None:
+    """Queue _STOP even when the queue is full — it must never be shed."""
+    with _queue.mutex:
+        _queue._put(_STOP)
+        _queue.unfinished_tasks += 1
+        _queue.not_empty.notify()
+
+
+def _drop(turn: _Turn) -> None:
+    _TURNS.inc(outcome="dropped")
+    _recent_hashes.pop(turn.content_id)
+    logger.warning(f"Palace queue full ({_QUEUE_MAX}) — dropped turn for {turn.urn}")
+
+
+def enqueue_turn(
+    urn: str,
+    persona: str,
+    user_message: str,
+    assistant_response: str,
+) -> bool:
+    """Queue a turn for the background writer. Returns False if not queued.
+
+    Safe to call from the event loop — never blocks. Exact duplicates are
+    discarded here; near-duplicates are caught by the writer.
+    """
+    if not _PALACE_ENABLED:
+        return False
+
+    turn = _build_turn(urn, persona, user_message, assistant_response)
+    if turn.content_id in _recent_hashes:
+        _TURNS.inc(outcome="dup_exact")
+        return False
+    _recent_hashes[turn.content_id] = True
+
+    _ensure_worker()
     try:
-        from mempalace.mcp_server import tool_check_duplicate
-        is_dup = tool_check_duplicate(content=content, threshold=0.95)
-        if is_dup and isinstance(is_dup, dict) and is_dup.get("is_duplicate"):
-            logger.debug(f"Dedup hit ({content_id}) — skipping palace write for {urn}")
+        _queue.put_nowait(turn)
+    except queue.Full:
+        if _POLICY == "drop_newest":
+            _drop(turn)
+            return False
+        try:
+            oldest = _queue.get_nowait()
+            if oldest is _STOP:
+                # Shutting down: keep the sentinel, behind what's still queued
+                _put_stop()
+                _drop(turn)
+                return False
+            _drop(oldest)
+            _queue.put_nowait(turn)
+        except (queue.Empty, queue.Full):
+            _drop(turn)
+            return False
+
+    _TURNS.inc(outcome="queued")
+    return True
+
+
+def _flush(batch: list) -> None:
+    with _FLUSH_SECONDS.time():
+        seen = set()
+        for turn in batch:
+            if turn.content_id in seen:
+                _TURNS.inc(outcome="dup_exact")
+                continue
+            seen.add(turn.content_id)
+            _write_turn(turn)
+
+
+def _run_worker() -> None:
+    """Drain the queue in batches of up to _BATCH_SIZE until _STOP."""
+    while True:
+        first = _queue.get()
+        if first is _STOP:
+            return
+        batch = [first]
+        deadline = time.monotonic() + _FLUSH_INTERVAL
+        stop = False
+        while len(batch) < _BATCH_SIZE:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = _queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is _STOP:
+                stop = True
+                break
+            batch.append(item)
+        _flush(batch)
+        if stop:
             return
-    except Exception as e:
-        # Dedup check is best-effort — proceed with store on failure
-        logger.debug(f"Dedup check failed (proceeding): {e}")
 
-    try:
-        _store_with_retry(
-            content=content,
-            wing=wing,
-            room=room,
-        )
-        logger.debug(f"Palace write OK: {wing}/{room} ({content_id})")
-    except Exception as e:
-        # Never crash on persistence failure — the response is already sent
-        logger.error(f"Palace write FAILED for {urn}: {e}")
+
+def shutdown(timeout: float = 10.0) -> None:
+    """Flush queued turns and stop the writer (FastAPI lifespan shutdown)."""
+    global _worker
+    with _worker_lock:
+        worker = _worker
+        _worker = None
+    if worker is None or not worker.is_alive():
+        return
+    _put_stop()
+    worker.join(timeout)
+    if worker.is_alive():
+        logger.warning(f"Palace writer did not drain within {timeout}s")
+
+
+def stats() -> dict:
+    """Queue depth and per-outcome counts, for admin/debug tools."""
+    return {
+        "enabled": bool(_PALACE_ENABLED),
+        "queue_depth": _queue.qsize(),
+        "queue_max": _QUEUE_MAX,
+        "policy": _POLICY,
+        "batch_size": _BATCH_SIZE,
+        "worker_alive": bool(_worker and _worker.is_alive()),
+        **{
+            outcome: _TURNS.value(outcome=outcome)
+            for outcome in ("queued", "written", "dup_exact", "dup_similar", "dropped", "failed")
+        },
+    }
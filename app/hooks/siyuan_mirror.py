@@ -0,0 +1,422 @@
+"""
+Local SQLite mirror of SiYuan's blocks, attributes and refs tables.
+
+Read tools (search, SQL, backlinks, lint) and the dashboards used to make
+an HTTP round-trip to SiYuan for every question, and siyuan_search pulled
+every matching block before filtering by notebook client-side. The mirror
+keeps a gateway-side copy with an FTS5 index over block content so those
+reads answer locally in milliseconds — and keep answering while SiYuan is
+restarting.
+
+Sync model:
+  - Tables use SiYuan's own column names, so the SQL the dashboards, lint
+    and the agent's siyuan_sql_query write runs unchanged against either.
+  - Each sync compares document `updated` stamps (one row per doc) plus
+    the set of roots with any block newer than the last watermark, then
+    replaces those documents wholesale (blocks, attrs and refs by
+    root_id). Documents gone from SiYuan are dropped.
+  - A "siyuan-mirror" thread syncs every SIYUAN_MIRROR_INTERVAL seconds.
+    Mutating helpers in siyuan_tools call mark_dirty() so edits made
+    through the gateway are re-mirrored within about a second.
+  - Readers only use the mirror once one full sync has completed
+    (ready()); until then siyuan_tools falls back to HTTP.
+
+Tunables (env):
+  SIYUAN_MIRROR_DB        — SQLite path (default $GATEWAY_DATA_DIR/siyuan_mirror.sqlite, "" disables)
+  SIYUAN_MIRROR_INTERVAL  — seconds between incremental syncs (default 60)
+"""
+
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+
+from app.config import data_path
+from app.utils import metrics
+
+logger = logging.getLogger(__name__)
+
+# ── Configuration ────────────────────────────────────────────────────────────
+
+_DB_PATH = os.getenv("SIYUAN_MIRROR_DB", data_path("siyuan_mirror.sqlite"))
+_INTERVAL = float(os.getenv("SIYUAN_MIRROR_INTERVAL", "60"))
+_DIRTY_DEBOUNCE = 0.5  # seconds — lets SiYuan commit its own SQL queue first
+_ROOT_CHUNK = 100
+
+_BLOCK_COLS = (
+    "id", "parent_id", "root_id", "hash", "box", "path", "hpath", "name",
+    "alias", "memo", "tag", "content", "fcontent", "markdown", "length",
+    "type", "subtype", "ial", "sort", "created", "updated",
+)
+_ATTR_COLS = ("id", "name", "value", "type", "block_id", "root_id", "box", "path")
+_REF_COLS = (
+    "id", "def_block_id", "def_block_parent_id", "def_block_root_id",
+    "def_block_path", "block_id", "root_id", "box", "path", "content",
+    "markdown", "type",
+)
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS blocks ({", ".join(c + (" TEXT PRIMARY KEY" if c == "id" else "") for c in _BLOCK_COLS)});
+CREATE INDEX IF NOT EXISTS blocks_root ON blocks(root_id);
+CREATE INDEX IF NOT EXISTS blocks_box_type ON blocks(box, type);
+CREATE TABLE IF NOT EXISTS attributes ({", ".join(_ATTR_COLS)});
+CREATE INDEX IF NOT EXISTS attributes_block ON attributes(block_id, name);
+CREATE INDEX IF NOT EXISTS attributes_root ON attributes(root_id);
+CREATE TABLE IF NOT EXISTS refs ({", ".join(_REF_COLS)});
+CREATE INDEX IF NOT EXISTS refs_def_root ON refs(def_block_root_id);
+CREATE INDEX IF NOT EXISTS refs_root ON refs(root_id);
+CREATE TABLE IF NOT EXISTS mirror_meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE VIRTUAL TABLE IF NOT EXISTS blocks_fts USING fts5(
+    content, content='blocks', content_rowid='rowid',
+    tokenize='unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS blocks_ai AFTER INSERT ON blocks BEGIN
+    INSERT INTO blocks_fts(rowid, content) VALUES (new.rowid, new.content);
+END;
+CREATE TRIGGER IF NOT EXISTS blocks_ad AFTER DELETE ON blocks BEGIN
+    INSERT INTO blocks_fts(blocks_fts, rowid, content) VALUES ('delete', old.rowid, old.content);
+END;
+CREATE TRIGGER IF NOT EXISTS blocks_au AFTER UPDATE ON blocks BEGIN
+    INSERT INTO blocks_fts(blocks_fts, rowid, content) VALUES ('delete', old.rowid, old.content);
+    INSERT INTO blocks_fts(rowid, content) VALUES (new.rowid, new.content);
+END;
+"""
+
+# ── State ────────────────────────────────────────────────────────────────────
+
+_write_lock = threading.Lock()      # one writer: the sync thread or sync_now()
+_writer: Optional[sqlite3.Connection] = None
+_readers = threading.local()
+_dirty: set = set()
+_dirty_lock = threading.Lock()
+_wake = threading.Event()
+_stop = threading.Event()
+_worker: Optional[threading.Thread] = None
+_worker_lock = threading.Lock()
+
+_SYNCS = metrics.Counter(
+    "gateway_siyuan_mirror_syncs",
+    "SiYuan mirror sync passes by outcome (ok, failed).",
+    labelnames=("outcome",),
+)
+_SYNC_SECONDS = metrics.Histogram(
+    "gateway_siyuan_mirror_sync_seconds",
+    "Time to run one incremental SiYuan mirror sync.",
+)
+metrics.Gauge(
+    "gateway_siyuan_mirror_age_seconds",
+    "Seconds since the SiYuan mirror last completed a sync.",
+    lambda: stats()["age_seconds"],
+)
+
+
+# ── Connections ──────────────────────────────────────────────────────────────
+
+def _open_writer() -> sqlite3.Connection:
+    global _writer
+    if _writer is None:
+        os.makedirs(os.path.dirname(_DB_PATH) or ".", exist_ok=True)
+        conn = sqlite3.connect(_DB_PATH, check_same_thread=False, timeout=10)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        # REPLACE must fire the delete trigger or blocks_fts drifts
+        conn.execute("PRAGMA recursive_triggers=ON")
+        conn.executescript(_SCHEMA)
+        _writer = conn
+    return _writer
+
+
+def _reader() -> sqlite3.Connection:
+    """Per-thread read-only connection (WAL lets readers run during a sync)."""
+    conn = getattr(_readers, "conn", None)
+    if conn is None or getattr(_readers, "path", None) != _DB_PATH:
+        with _write_lock:
+            _open_writer()  # make sure the schema exists
+        conn = sqlite3.connect(_DB_PATH, check_same_thread=False, timeout=10)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA query_only=ON")
+        _readers.conn, _readers.path = conn, _DB_PATH
+    return conn
+
+
+def _meta(conn: sqlite3.Connection, key: str) -> Optional[str]:
+    row = conn.execute("SELECT value FROM mirror_meta WHERE key = ?", (key,)).fetchone()
+    return row[0] if row else None
+
+
+def enabled() -> bool:
+    return bool(_DB_PATH)
+
+
+def ready() -> bool:
+    """True once a full sync has completed (possibly in a previous run)."""
+    if not enabled() or not os.path.exists(_DB_PATH):
+        return False
+    try:
+        return _meta(_reader(), "synced_at") is not None
+    except sqlite3.Error:
+        return False
+
+
+# ── Sync ─────────────────────────────────────────────────────────────────────
+
+def _in(ids: Iterable[str]) -> str:
+    return "(" + ", ".join(f"'{i}'" for i in ids) + ")"
+
+
+def _replace_roots(conn: sqlite3.Connection, roots: List[str], remote) -> Optional[str]:
+    """Re-mirror the given documents. Returns the newest block `updated` seen."""
+    from app.hooks.siyuan_tools import siyuan_gather
+
+    newest = ""
+    for i in range(0, len(roots), _ROOT_CHUNK):
+        chunk = roots[i:i + _ROOT_CHUNK]
+        scope = _in(chunk)
+        blocks, attrs, refs = siyuan_gather(*(
+            (lambda t=table: remote(f"SELECT * FROM {t} WHERE root_id IN {scope} ORDER BY id"))
+            for table in ("blocks", "attributes", "refs")
+        ))
+        if blocks is None or attrs is None or refs is None:
+            raise RuntimeError("SiYuan query failed during mirror sync")
+
+        with conn:
+            for table in ("blocks", "attributes", "refs"):
+                conn.execute(f"DELETE FROM {table} WHERE root_id IN {scope}")
+            for table, cols, rows in (
+                ("blocks", _BLOCK_COLS, blocks),
+                ("attributes", _ATTR_COLS, attrs),
+                ("refs", _REF_COLS, refs),
+            ):
+                conn.executemany(
+                    f"INSERT OR REPLACE INTO {table} ({', '.join(cols)}) "
+                    f"VALUES ({', '.join('?' * len(cols))})",
+                    [tuple(row.get(c) for c in cols) for row in rows],
+                )
+        newest = max([newest] + [b.get("updated") or "" for b in blocks])
+    return newest
+
+
+def _drop_roots(conn: sqlite3.Connection, roots: List[str]) -> None:
+    for i in range(0, len(roots), _ROOT_CHUNK):
+        scope = _in(roots[i:i + _ROOT_CHUNK])
+        with conn:
+            for table in ("blocks", "attributes", "refs"):
+                conn.execute(f"DELETE FROM {table} WHERE root_id IN {scope}")
+
+
+def sync_now(roots: Optional[Iterable[str]] = None) -> Dict[str, int]:
+    """
+    Run one sync pass against SiYuan (blocking).
+
+    With ``roots`` only those documents are re-mirrored (write-through);
+    otherwise an incremental pass over every notebook runs.
+
+    Returns counts of documents refreshed and removed.
+    """
+    from app.hooks.siyuan_tools import _siyuan_request, _sql_all
+
+    if not enabled():
+        return {"refreshed": 0, "removed": 0}
+
+    with _write_lock, _SYNC_SECONDS.time():
+        conn = _open_writer()
+        try:
+            # Make SiYuan commit queued index writes before we read them
+            _siyuan_request("sqlite/flushTransaction", {})
+            watermark = _meta(conn, "watermark") or ""
+            removed: List[str] = []
+
+            if roots is not None:
+                changed = sorted(set(roots))
+            else:
+                remote_docs = _sql_all(
+                    "SELECT id, updated FROM blocks WHERE type = 'd' ORDER BY id"
+                )
+                touched = _sql_all(
+                    f"SELECT DISTINCT root_id FROM blocks "
+                    f"WHERE updated > '{watermark}' ORDER BY root_id"
+                ) if watermark else []
+                if remote_docs is None or touched is None:
+                    raise RuntimeError("SiYuan query failed during mirror sync")
+
+                local_docs = dict(conn.execute(
+                    "SELECT id, updated FROM blocks WHERE type = 'd'"
+                ).fetchall())
+                remote_map = {d["id"]: d.get("updated") for d in remote_docs}
+                changed_set = {
+                    doc_id for doc_id, updated in remote_map.items()
+                    if local_docs.get(doc_id) != updated
+                }
+                changed_set.update(
+                    r["root_id"] for r in touched if r.get("root_id") in remote_map
+                )
+                changed = sorted(changed_set)
+                removed = sorted(set(local_docs) - set(remote_map))
+
+            newest = _replace_roots(conn, changed, _sql_all) if changed else ""
+            if removed:
+                _drop_roots(conn, removed)
+
+            with conn:
+                # Only a full pass may advance the watermark: a write-through
+                # of one doc says nothing about edits elsewhere
+                if roots is None and newest > watermark:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO mirror_meta VALUES ('watermark', ?)", (newest,),
+                    )
+                if roots is None:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO mirror_meta VALUES ('synced_at', ?)",
+                        (str(time.time()),),
+                    )
+        except Exception:
+            _SYNCS.inc(outcome="failed")
+            raise
+
+    _SYNCS.inc(outcome="ok")
+    if changed or removed:
+        logger.info(f"SiYuan mirror: refreshed {len(changed)} docs, removed {len(removed)}")
+    return {"refreshed": len(changed), "removed": len(removed)}
+
+
+def mark_dirty(block_id: Optional[str]) -> None:
+    """Queue the document containing ``block_id`` for a write-through sync."""
+    if not block_id or not enabled() or _worker is None:
+        return
+    with _dirty_lock:
+        _dirty.add(block_id)
+    _wake.set()
+
+
+def _root_of(block_ids: Iterable[str]) -> List[str]:
+    """
+    Resolve block IDs to their document root IDs (docs resolve to themselves).
+
+    The mirror is asked first so deleted blocks still map to the page that
+    held them; only unknown (new) blocks cost a SiYuan query.
+    """
+    from app.hooks.siyuan_tools import _sql_all
+
+    ids = sorted(set(block_ids))
+    roots = {}
+    for i in range(0, len(ids), _ROOT_CHUNK):
+        scope = _in(ids[i:i + _ROOT_CHUNK])
+        for row in query(f"SELECT id, root_id FROM blocks WHERE id IN {scope}"):
+            roots[row["id"]] = row["root_id"]
+    missing = [i for i in ids if i not in roots]
+    for i in range(0, len(missing), _ROOT_CHUNK):
+        rows = _sql_all(
+            f"SELECT id, root_id FROM blocks WHERE id IN {_in(missing[i:i + _ROOT_CHUNK])} ORDER BY id"
+        ) or []
+        for row in rows:
+            roots[row["id"]] = row.get("root_id")
+    return sorted({r for r in roots.values() if r})
+
+
+def _run_worker() -> None:
+    next_full = 0.0
+    while not _stop.is_set():
+        _wake.wait(max(0.0, next_full - time.monotonic()))
+        if _stop.is_set():
+            break
+        if _wake.is_set():
+            _wake.clear()
+            time.sleep(_DIRTY_DEBOUNCE)
+        with _dirty_lock:
+            dirty = list(_dirty)
+            _dirty.clear()
+        try:
+            if time.monotonic() >= next_full:
+                sync_now()
+                next_full = time.monotonic() + _INTERVAL
+            elif dirty:
+                sync_now(_root_of(dirty))
+        except Exception as e:
+            # SiYuan down or restarting — readers keep serving the last copy
+            logger.warning(f"SiYuan mirror sync failed: {e}")
+            next_full = time.monotonic() + _INTERVAL
+
+
+def start() -> None:
+    """Start the background sync thread (FastAPI lifespan startup)."""
+    global _worker
+    if not enabled():
+        logger.info("SiYuan mirror disabled (no SIYUAN_MIRROR_DB)")
+        return
+    with _worker_lock:
+        if _worker is None or not _worker.is_alive():
+            _stop.clear()
+            _worker = threading.Thread(target=_run_worker, name="siyuan-mirror", daemon=True)
+            _worker.start()
+
+
+def stop(timeout: float = 5.0) -> None:
+    """Stop the sync thread (FastAPI lifespan shutdown)."""
+    global _worker
+    with _worker_lock:
+        worker, _worker = _worker, None
+    if worker is None:
+        return
+    _stop.set()
+    _wake.set()
+    worker.join(timeout)
+
+
+# ── Reads ────────────────────────────────────────────────────────────────────
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def search(query: str, box: Optional[str] = None, limit: int = 5) -> List[dict]:
+    """
+    Full-text search over mirrored block content, best match first.
+
+    Every word must match (as a prefix), mirroring SiYuan's keyword search.
+    """
+    tokens = _TOKEN_RE.findall(query)
+    if not tokens:
+        return []
+    match = " ".join(f'"{t}"*' for t in tokens)
+    sql = (
+        "SELECT b.id, b.content, b.hpath, b.box FROM blocks_fts f "
+        "JOIN blocks b ON b.rowid = f.rowid WHERE blocks_fts MATCH ?"
+    )
+    params: list = [match]
+    if box:
+        sql += " AND b.box = ?"
+        params.append(box)
+    sql += " ORDER BY f.rank LIMIT ?"
+    params.append(limit)
+    return [dict(row) for row in _reader().execute(sql, params)]
+
+
+def query(sql: str, params: Iterable = ()) -> List[dict]:
+    """Run a SELECT against the mirror (the connection is query-only)."""
+    return [dict(row) for row in _reader().execute(sql, tuple(params))]
+
+
+def root_id(block_id: str) -> Optional[str]:
+    """Document root of a block from the mirror alone (None if unknown)."""
+    if not ready():
+        return None
+    row = _reader().execute("SELECT root_id FROM blocks WHERE id = ?", (block_id,)).fetchone()
+    return row[0] if row else None
+
+
+def stats() -> dict:
+    if not ready():
+        return {"enabled": enabled(), "ready": False, "age_seconds": -1}
+    conn = _reader()
+    synced_at = _meta(conn, "synced_at")
+    return {
+        "enabled": True,
+        "ready": True,
+        "age_seconds": round(time.time() - float(synced_at), 1),
+        "watermark": _meta(conn, "watermark"),
+        "blocks": conn.execute("SELECT COUNT(*) FROM blocks").fetchone()[0],
+        "documents": conn.execute("SELECT COUNT(*) FROM blocks WHERE type = 'd'").fetchone()[0],
+        "dirty": len(_dirty),
+    }
@@ -13,10 +13,16 @@ All requests go to the local SiYuan instance via HTTP API.
 
 import logging
 import os
-from typing import Optional, Dict, Any
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 import httpx
 
+from app.hooks import siyuan_mirror
+from app.utils import metrics
+from app.utils.ttl_store import TTLStore
+
 logger = logging.getLogger(__name__)
 
 # ── Configuration ────────────────────────────────────────────────────────────
@@ -30,12 +36,43 @@ _SIYUAN_WEB_URL = os.getenv("SIYUAN_WEB_URL", "http://box.lan/siyuan")
 # Notebook ID cache: {notebook_name: notebook_id}
 _notebook_map: Dict[str, str] = {}
 
+# Read-through caches for the agent's hot reads (Index/Schema/person pages
+# are re-read many times per conversation). LRU within the size cap, with
+# an absolute TTL as the backstop for edits made in the SiYuan UI; every
+# mutating helper below invalidates what it touched via _invalidate().
+_READ_CACHE_TTL = float(os.getenv("SIYUAN_READ_CACHE_TTL", "300"))
+_READ_CACHE_MAX = int(os.getenv("SIYUAN_READ_CACHE_MAX", "256"))
+
+_doc_cache = TTLStore("siyuan.docs", ttl=_READ_CACHE_TTL, maxsize=_READ_CACHE_MAX, lru=True)
+_attr_cache = TTLStore("siyuan.attrs", ttl=_READ_CACHE_TTL, maxsize=_READ_CACHE_MAX * 4, lru=True)
+_hpath_cache = TTLStore("siyuan.hpaths", ttl=_READ_CACHE_TTL, maxsize=_READ_CACHE_MAX * 4, lru=True)
+_listing_cache = TTLStore("siyuan.listings", ttl=_READ_CACHE_TTL, maxsize=_READ_CACHE_MAX, lru=True)
+_READ_CACHES = (_doc_cache, _attr_cache, _hpath_cache, _listing_cache)
+metrics.Gauge(
+    "gateway_siyuan_read_cache_hit_ratio",
+    "Share of SiYuan reads served from the read-through cache.",
+    lambda: {name: s["hit_rate"] for name, s in siyuan_cache_stats().items()},
+    labelnames=("cache",),
+)
+
 # Persistent HTTP client with session cookie for SiYuan auth.
 # SiYuan 3.6.x uses session-based auth: login via /api/system/loginAuth
 # with the access auth code, then use the session cookie for all requests.
 # Header-based "Authorization: Token <code>" is NOT supported.
+#
+# Tools run in asyncio.to_thread workers and Hermes pool threads at the
+# same time, so the client is created and (re-)authenticated under a lock.
+# httpx.Client itself is safe to share; its pool bounds open connections.
+_POOL_SIZE = int(os.getenv("SIYUAN_POOL_SIZE", "8"))
+_FANOUT_WORKERS = int(os.getenv("SIYUAN_FANOUT_WORKERS", "4"))
+
 _client: Optional[httpx.Client] = None
+_client_lock = threading.Lock()
 _auth_ok: bool = False
+_auth_epoch: int = 0  # bumped on every successful login
+
+_fanout_pool: Optional[ThreadPoolExecutor] = None
+_in_fanout = threading.local()
 
 
 def siyuan_doc_url(block_id: str) -> str:
@@ -47,29 +84,65 @@ def siyuan_doc_url(block_id: str) -> str:
     return f"{_SIYUAN_WEB_URL}/stage/#blocks/{block_id}"
 
 
-def _get_client() -> httpx.Client:
-    """Return a persistent httpx.Client, authenticating on first use."""
-    global _client, _auth_ok
+def _login(client: httpx.Client) -> None:
+    """Log in with the access auth code. Caller holds _client_lock."""
+    global _auth_ok, _auth_epoch
+    try:
+        resp = client.post(
+            f"{_SIYUAN_URL}/api/system/loginAuth",
+            json={"authCode": _SIYUAN_AUTH_CODE},
+        )
+        data = resp.json()
+        if data.get("code") == 0:
+            _auth_ok = True
+            _auth_epoch += 1
+            logger.info("SiYuan session auth OK")
+        else:
+            logger.warning(f"SiYuan login failed: {data.get('msg')}")
+    except Exception as e:
+        logger.error(f"SiYuan login error: {e}")
 
-    if _client is None:
-        _client = httpx.Client(timeout=10)
 
-    if not _auth_ok and _SIYUAN_AUTH_CODE:
-        try:
-            resp = _client.post(
-                f"{_SIYUAN_URL}/api/system/loginAuth",
-                json={"authCode": _SIYUAN_AUTH_CODE},
+def _get_client() -> httpx.Client:
+    """Return the shared pooled httpx.Client, authenticating on first use."""
+    global _client
+
+    client = _client
+    if client is not None and (_auth_ok or not _SIYUAN_AUTH_CODE):
+        return client
+
+    with _client_lock:
+        if _client is None:
+            _client = httpx.Client(
+                timeout=10,
+                limits=httpx.Limits(
+                    max_connections=_POOL_SIZE,
+                    max_keepalive_connections=_POOL_SIZE,
+                ),
             )
-            data = resp.json()
-            if data.get("code") == 0:
-                _auth_ok = True
-                logger.info("SiYuan session auth OK")
-            else:
-                logger.warning(f"SiYuan login failed: {data.get('msg')}")
-        except Exception as e:
-            logger.error(f"SiYuan login error: {e}")
+        if not _auth_ok and _SIYUAN_AUTH_CODE:
+            _login(_client)
+        return _client
+
+
+def _relogin(seen_epoch: int) -> None:
+    """Re-authenticate after a session expiry, once per expiry across threads."""
+    global _auth_ok
+    with _client_lock:
+        if _auth_epoch != seen_epoch or _client is None:
+            return  # another thread already logged in again
+        _auth_ok = False
+        _login(_client)
 
-    return _client
+
+def _is_auth_failure(resp: httpx.Response) -> bool:
+    if resp.status_code == 401:
+        return True
+    try:
+        data = resp.json()
+    except ValueError:
+        return False
+    return data.get("code") == -1 and "auth" in str(data.get("msg", "")).lower()
 
 
 # ── HTTP client ──────────────────────────────────────────────────────────────
@@ -79,13 +152,21 @@ def _siyuan_request(endpoint: str, payload: dict) -> dict:
     Make a synchronous POST request to SiYuan's HTTP API.
 
     SiYuan's API is JSON-RPC-style: POST to /api/<endpoint> with a JSON body.
-    Auth is via session cookie obtained from /api/system/loginAuth.
+    Auth is via session cookie obtained from /api/system/loginAuth; an
+    expired session (SiYuan restart) triggers one re-login and retry.
     """
     url = f"{_SIYUAN_URL}/api/{endpoint}"
-    client = _get_client()
 
     try:
-        resp = client.post(url, json=payload)
+        for attempt in range(2):
+            client = _get_client()
+            epoch = _auth_epoch
+            resp = client.post(url, json=payload)
+            if attempt == 0 and _SIYUAN_AUTH_CODE and _is_auth_failure(resp):
+                logger.info(f"SiYuan session expired — re-authenticating ({endpoint})")
+                _relogin(epoch)
+                continue
+            break
         resp.raise_for_status()
         data = resp.json()
         if data.get("code") != 0:
@@ -96,6 +177,101 @@ def _siyuan_request(endpoint: str, payload: dict) -> dict:
         return {"code": -1, "msg": str(e), "data": None}
 
 
+def siyuan_gather(*calls: Callable[[], Any]) -> List[Any]:
+    """
+    Run independent SiYuan calls concurrently and return results in order.
+
+    Each call is a zero-argument callable (use functools.partial or a
+    lambda). Calls made from inside a fan-out worker run inline, so nested
+    fan-outs can't deadlock the bounded pool. An exception in any call is
+    re-raised after all calls finish.
+    """
+    global _fanout_pool
+
+    if len(calls) <= 1 or getattr(_in_fanout, "active", False):
+        return [call() for call in calls]
+
+    if _fanout_pool is None:
+        with _client_lock:
+            if _fanout_pool is None:
+                _fanout_pool = ThreadPoolExecutor(
+                    max_workers=_FANOUT_WORKERS, thread_name_prefix="siyuan-fanout",
+                )
+
+    def _run(call):
+        _in_fanout.active = True
+        try:
+            return call()
+        finally:
+            _in_fanout.active = False
+
+    futures = [_fanout_pool.submit(_run, call) for call in calls]
+    wait(futures)
+    return [f.result() for f in futures]
+
+
+def siyuan_request_many(requests: List[Tuple[str, dict]]) -> List[dict]:
+    """Fan out independent (endpoint, payload) requests; results in order."""
+    return siyuan_gather(*(
+        (lambda e=endpoint, p=payload: _siyuan_request(e, p))
+        for endpoint, payload in requests
+    ))
+
+
+# ── Read cache ───────────────────────────────────────────────────────────────
+
+def _invalidate(
+    block_id: Optional[str],
+    is_doc: bool = False,
+    tree: bool = False,
+    export: bool = True,
+) -> None:
+    """
+    Drop cached reads affected by a write to ``block_id``.
+
+    Args:
+        block_id: Block (or document) that was written.
+        is_doc: ``block_id`` is known to be a document root.
+        tree: The document tree changed (create/rename/remove), so cached
+            listings and hpaths of descendants are stale too.
+        export: The write may change markdown exports (False for attrs).
+    """
+    if block_id:
+        _attr_cache.pop(block_id)
+        _hpath_cache.pop(block_id)
+        if export and is_doc:
+            _doc_cache.pop(block_id)
+        elif export:
+            # A child edit changes its document's export; without the mirror
+            # to resolve the root, drop every cached export rather than guess
+            root = siyuan_mirror.root_id(block_id)
+            if root:
+                _doc_cache.pop(root)
+            else:
+                _doc_cache.clear()
+        siyuan_mirror.mark_dirty(block_id)
+    if tree:
+        _hpath_cache.clear()
+        _listing_cache.clear()
+
+
+def siyuan_cache_clear() -> None:
+    """Drop every cached SiYuan read (e.g. after bulk edits in the UI)."""
+    for cache in _READ_CACHES:
+        cache.clear()
+
+
+def siyuan_cache_stats() -> Dict[str, dict]:
+    """Hit/miss/size stats for each read cache."""
+    stats = {}
+    for cache in _READ_CACHES:
+        s = cache.stats()
+        lookups = s["hits"] + s["misses"]
+        s["hit_rate"] = round(s["hits"] / lookups, 3) if lookups else 0.0
+        stats[cache.name] = s
+    return stats
+
+
 # ── Notebook resolution ─────────────────────────────────────────────────────
 
 def _init_notebook_map() -> None:
@@ -152,19 +328,14 @@ def siyuan_upsert_page(
         logger.warning(f"Notebook '{notebook}' not found — skipping upsert")
         return None
 
-    # Check if page exists
-    result = _siyuan_request("filetree/getHPathByPath", {
-        "notebook": nb_id,
-        "path": path + ".sy",
-    })
+    # Check if page exists and fetch its block ID in one concurrent hop
+    result, search_result = siyuan_request_many([
+        ("filetree/getHPathByPath", {"notebook": nb_id, "path": path + ".sy"}),
+        ("filetree/getIDsByHPath", {"notebook": nb_id, "path": path}),
+    ])
 
     if result.get("code") == 0 and result.get("data"):
         # Page exists — update content
-        # First, get the page's block ID
-        search_result = _siyuan_request("filetree/getIDsByHPath", {
-            "notebook": nb_id,
-            "path": path,
-        })
         block_ids = search_result.get("data", [])
         if block_ids:
             block_id = block_ids[0]
@@ -174,6 +345,7 @@ def siyuan_upsert_page(
                 "data": markdown,
             })
             logger.debug(f"SiYuan: updated page {notebook}{path}")
+            _invalidate(block_id, is_doc=True)
             return block_id
 
     # Page doesn't exist — create it
@@ -186,6 +358,7 @@ def siyuan_upsert_page(
     page_id = result.get("data")
     if page_id:
         logger.debug(f"SiYuan: created page {notebook}{path} → {page_id}")
+        _invalidate(page_id, is_doc=True, tree=True)
     return page_id
 
 
@@ -235,6 +408,7 @@ def siyuan_append_block(
     if block_data and isinstance(block_data, list) and block_data:
         block_id = block_data[0].get("doOperations", [{}])[0].get("id")
         logger.debug(f"SiYuan: appended block to {notebook}{path} → {block_id}")
+        _invalidate(parent_id, is_doc=True)
         return block_id
 
     return None
@@ -254,6 +428,21 @@ def siyuan_search(query: str, notebook: str = None, limit: int = 5) -> list:
     Returns:
         List of result dicts with id, content preview, and path
     """
+    if siyuan_mirror.ready():
+        box = get_notebook_id(notebook) if notebook else None
+        try:
+            return [
+                {
+                    "id": b["id"],
+                    "content": _preview(b["content"] or ""),
+                    "path": b["hpath"] or "",
+                    "notebook": b["box"] or "",
+                }
+                for b in siyuan_mirror.search(query, box=box, limit=limit)
+            ]
+        except Exception as e:
+            logger.warning(f"SiYuan mirror search failed, using HTTP: {e}")
+
     payload = {"query": query}
 
     result = _siyuan_request("search/fullTextSearchBlock", payload)
@@ -268,12 +457,9 @@ def siyuan_search(query: str, notebook: str = None, limit: int = 5) -> list:
     # Return top N results, truncated
     results = []
     for b in blocks[:limit]:
-        content = b.get("content", "")
-        if len(content) > 500:
-            content = content[:500] + "..."
         results.append({
             "id": b.get("id", ""),
-            "content": content,
+            "content": _preview(b.get("content", "")),
             "path": b.get("hPath", b.get("path", "")),
             "notebook": b.get("box", ""),
         })
@@ -281,6 +467,10 @@ def siyuan_search(query: str, notebook: str = None, limit: int = 5) -> list:
     return results
 
 
+def _preview(content: str) -> str:
+    return content[:500] + "..." if len(content) > 500 else content
+
+
 def siyuan_read_doc(doc_id: str) -> Optional[str]:
     """
     Read a SiYuan document's markdown content by block ID.
@@ -294,6 +484,10 @@ def siyuan_read_doc(doc_id: str) -> Optional[str]:
     Returns:
         Markdown content string, or None if not found
     """
+    cached = _doc_cache.get(doc_id)
+    if cached is not None:
+        return cached
+
     result = _siyuan_request("export/exportMdContent", {"id": doc_id})
 
     if result.get("code") != 0:
@@ -306,6 +500,7 @@ def siyuan_read_doc(doc_id: str) -> Optional[str]:
     if len(content) > 8000:
         content = content[:8000] + "\n\n...(truncated — document exceeds 8000 chars)"
 
+    _doc_cache[doc_id] = content
     return content
 
 
@@ -326,12 +521,16 @@ def siyuan_list_docs(notebook: str, path: str = "/") -> list:
     if not nb_id:
         return []
 
+    cached = _listing_cache.get((nb_id, path))
+    if cached is not None:
+        return [dict(d) for d in cached]
+
     result = _siyuan_request("filetree/listDocsByPath", {
         "notebook": nb_id,
         "path": path,
     })
     files = (result.get("data") or {}).get("files", [])
-    return [
+    docs = [
         {
             "id": f.get("id", ""),
             "name": f.get("name", "").replace(".sy", ""),
@@ -339,6 +538,9 @@ def siyuan_list_docs(notebook: str, path: str = "/") -> list:
         }
         for f in files
     ]
+    if result.get("code") == 0:
+        _listing_cache[(nb_id, path)] = docs
+    return [dict(d) for d in docs]
 
 
 def siyuan_create_notebook(name: str) -> Optional[str]:
@@ -388,6 +590,7 @@ def siyuan_create_doc(notebook: str, path: str, markdown: str) -> Optional[str]:
     doc_id = result.get("data")
     if doc_id:
         logger.debug(f"SiYuan: created doc {notebook}{path} → {doc_id}")
+        _invalidate(doc_id, is_doc=True, tree=True)
     return doc_id
 
 
@@ -410,6 +613,7 @@ def siyuan_update_block(block_id: str, markdown: str) -> bool:
     ok = result.get("code") == 0
     if ok:
         logger.debug(f"SiYuan: updated block {block_id}")
+        _invalidate(block_id)
     return ok
 
 
@@ -440,6 +644,7 @@ def siyuan_set_attrs(block_id: str, attrs: Dict[str, str]) -> bool:
     ok = result.get("code") == 0
     if ok:
         logger.debug(f"SiYuan: set {len(prefixed)} attrs on {block_id}")
+        _invalidate(block_id, export=False)
     return ok
 
 
@@ -453,8 +658,26 @@ def siyuan_get_attrs(block_id: str) -> Dict[str, str]:
     Returns:
         Dict of attribute key→value pairs
     """
+    cached = _attr_cache.get(block_id)
+    if cached is not None:
+        return dict(cached)
+
     result = _siyuan_request("attr/getBlockAttrs", {"id": block_id})
-    return result.get("data") or {}
+    attrs = result.get("data") or {}
+    if result.get("code") == 0:
+        _attr_cache[block_id] = attrs
+    return dict(attrs)
+
+
+def _mirror_query(sql: str) -> Optional[list]:
+    """Answer a SELECT from the local mirror, or None to fall back to HTTP."""
+    if not siyuan_mirror.ready():
+        return None
+    try:
+        return siyuan_mirror.query(sql)
+    except Exception as e:
+        logger.debug(f"SiYuan mirror query failed, using HTTP: {e}")
+        return None
 
 
 def siyuan_sql_query(sql: str) -> list:
@@ -483,10 +706,12 @@ def siyuan_sql_query(sql: str) -> list:
         logger.warning(f"SiYuan SQL rejected (dangerous keyword): {sql[:80]}")
         return [{"error": "Statement contains disallowed keywords."}]
 
-    result = _siyuan_request("query/sql", {"stmt": sql})
-    data = result.get("data")
+    data = _mirror_query(sql)
     if data is None:
-        return [{"error": result.get("msg", "Query failed")}]
+        result = _siyuan_request("query/sql", {"stmt": sql})
+        data = result.get("data")
+        if data is None:
+            return [{"error": result.get("msg", "Query failed")}]
 
     # Truncate large result sets
     if isinstance(data, list) and len(data) > 50:
@@ -510,6 +735,7 @@ def siyuan_delete_block(block_id: str) -> bool:
     ok = result.get("code") == 0
     if ok:
         logger.debug(f"SiYuan: deleted block {block_id}")
+        _invalidate(block_id)
     return ok
 
 
@@ -531,6 +757,7 @@ def siyuan_rename_doc(doc_id: str, title: str) -> bool:
     ok = result.get("code") == 0
     if ok:
         logger.debug(f"SiYuan: renamed doc {doc_id} → '{title}'")
+        _invalidate(doc_id, is_doc=True, tree=True)
     return ok
 
 
@@ -556,8 +783,9 @@ def siyuan_get_backlinks(doc_id: str) -> list:
         f"WHERE r.def_block_root_id = '{doc_id}' "
         f"LIMIT 50"
     )
-    result = _siyuan_request("query/sql", {"stmt": sql})
-    data = result.get("data")
+    data = _mirror_query(sql)
+    if data is None:
+        data = _siyuan_request("query/sql", {"stmt": sql}).get("data")
     if not data:
         return []
 
@@ -614,10 +842,17 @@ def siyuan_get_hpath(block_id: str) -> Optional[str]:
     Returns:
         Human-readable path string, or None if not found
     """
+    cached = _hpath_cache.get(block_id)
+    if cached is not None:
+        return cached
+
     result = _siyuan_request("filetree/getHPathByID", {"id": block_id})
     if result.get("code") != 0:
         return None
-    return result.get("data")
+    hpath = result.get("data")
+    if hpath:
+        _hpath_cache[block_id] = hpath
+    return hpath
 
 
 def siyuan_remove_doc(doc_id: str) -> bool:
@@ -636,152 +871,198 @@ def siyuan_remove_doc(doc_id: str) -> bool:
     ok = result.get("code") == 0
     if ok:
         logger.info(f"SiYuan: removed document {doc_id}")
+        _invalidate(doc_id, is_doc=True, tree=True)
     return ok
 
 
-def siyuan_lint(notebook: str) -> Dict[str, Any]:
+# ── Wiki lint ────────────────────────────────────────────────────────────────
+#
+# The lint engine is set-based: a handful of bulk SQL queries against the
+# blocks/attributes/refs tables replace the old per-document attrs, backlinks,
+# export and ref-count round-trips (≈4 HTTP calls per page). All rules are
+# then evaluated in memory.
+#
+# Per-document facts (doc attrs, body length) are cached per notebook keyed
+# by the document's `updated` timestamp, so a re-lint only refetches pages
+# edited since the last run. Link counts, the Index text and the global
+# rules are cheap aggregates and are recomputed on every run, since another
+# page gaining a link does not touch the target's timestamp.
+
+_SQL_PAGE_SIZE = 1000
+_SQL_IN_CHUNK = 200
+
+# Container block types whose `content` repeats their children's text
+_CONTAINER_TYPES = "('d', 'l', 'i', 'b', 's')"
+
+_LINT_ATTRS = ("custom-type", "custom-tags", "custom-created", "custom-updated")
+
+# Skip meta and directory-level docs for per-document rules
+_LINT_SKIP_TITLES = {"Schema", "Index", "Log"}
+_LINT_SKIP_HPATH_PREFIXES = ("/raw/",)
+_LINT_DIR_STUBS = {
+    "entities", "concepts", "syntheses", "summaries", "journal",
+    "people", "circles", "habits", "goals", "queries",
+    "raw", "articles", "papers", "transcripts",
+}
+
+# Cross-link minimum thresholds (from Schema)
+_LINT_MIN_LINKS = {
+    "entity": 2, "person": 1, "concept": 1, "synthesis": 3,
+    "overview": 5, "summary": 1, "habit": 1, "goal": 2,
+    "query": 1, "journal": 0, "raw": 0,
+}
+
+# {notebook_id: {doc_id: (updated, facts)}}
+_lint_cache: Dict[str, Dict[str, tuple]] = {}
+_lint_cache_lock = threading.Lock()
+
+
+def _sql_all(sql: str) -> Optional[list]:
     """
-    Run 10 wiki quality rules against a SiYuan notebook.
+    Run an internal SELECT and return every row, paging with LIMIT/OFFSET.
 
-    Returns a structured lint report with errors, warnings, and info items.
+    Unlike siyuan_sql_query (the agent-facing tool) there is no 50-row cap,
+    and the explicit LIMIT overrides SiYuan's default search limit. The
+    statement must carry its own ORDER BY so pages are stable.
 
-    Args:
-        notebook: Notebook name (resolved to ID internally)
-
-    Returns:
-        Dict with errors, warnings, info lists, and a summary string.
+    Returns None if any page fails.
     """
-    from datetime import date, timedelta
+    rows: list = []
+    offset = 0
+    while True:
+        result = _siyuan_request(
+            "query/sql",
+            {"stmt": f"{sql} LIMIT {_SQL_PAGE_SIZE} OFFSET {offset}"},
+        )
+        if result.get("code") != 0:
+            return None
+        page = result.get("data") or []
+        rows.extend(page)
+        if len(page) < _SQL_PAGE_SIZE:
+            return rows
+        offset += _SQL_PAGE_SIZE
 
-    nb_id = get_notebook_id(notebook)
-    if not nb_id:
-        return {"error": f"Notebook '{notebook}' not found"}
 
-    errors = []
-    warnings = []
-    info = []
+def _read_all(sql: str) -> Optional[list]:
+    """Every row of an internal SELECT, from the local mirror when it is ready."""
+    rows = _mirror_query(sql)
+    return rows if rows is not None else _sql_all(sql)
 
-    today = date.today()
-    stale_cutoff = (today - timedelta(days=90)).isoformat()
 
-    # ── Rule 2: broken-ref (error) ─────────────────────────────────────
-    broken_refs = siyuan_sql_query(
-        f"SELECT r.block_id, r.def_block_id FROM refs r "
-        f"LEFT JOIN blocks b ON r.def_block_id = b.id "
-        f"WHERE r.box = '{nb_id}' AND b.id IS NULL"
-    )
-    for ref in broken_refs:
-        errors.append({
-            "rule": "broken-ref",
-            "block_id": ref.get("block_id", ""),
-            "detail": f"Reference to deleted block {ref.get('def_block_id', '?')}",
-        })
+def _sql_in(ids) -> str:
+    return "(" + ", ".join(f"'{i}'" for i in ids) + ")"
 
-    # ── Rule 4: duplicate-title (error) ────────────────────────────────
-    dupe_rows = siyuan_sql_query(
-        f"SELECT content, COUNT(*) as cnt FROM blocks "
-        f"WHERE type='d' AND box='{nb_id}' "
-        f"GROUP BY LOWER(content) HAVING cnt > 1"
-    )
-    for row in dupe_rows:
-        errors.append({
-            "rule": "duplicate-title",
-            "detail": f'"{row.get("content", "?")}" appears {row.get("cnt", "?")} times',
-        })
 
-    # ── Rule 6: low-confidence (warning) ───────────────────────────────
-    low_conf = siyuan_sql_query(
-        f"SELECT b.id, b.content, a.value FROM blocks b "
-        f"JOIN attributes a ON b.id = a.block_id "
-        f"WHERE a.name = 'custom-confidence' AND CAST(a.value AS REAL) < 0.5 "
-        f"AND b.box = '{nb_id}'"
-    )
-    for row in low_conf:
-        warnings.append({
-            "rule": "low-confidence",
-            "block_id": row.get("id", ""),
-            "detail": f'"{row.get("content", "?")}" has confidence {row.get("value", "?")}',
-        })
+def _lint_fetch_facts(nb_id: str, doc_ids: Optional[list] = None) -> Optional[Dict[str, dict]]:
+    """
+    Fetch lint facts (required attrs + body length) for a notebook's docs.
 
-    # ── Rule 7: contradicted-page (warning) ────────────────────────────
-    contradicted = siyuan_sql_query(
-        f"SELECT b.id, b.content, a.value FROM blocks b "
-        f"JOIN attributes a ON b.id = a.block_id "
-        f"WHERE a.name = 'custom-contradicted-by' AND a.value != '' "
-        f"AND b.box = '{nb_id}'"
+    With ``doc_ids`` only those documents are fetched (incremental mode),
+    otherwise every document in the notebook.
+    """
+    if doc_ids is None:
+        scopes = [f"box = '{nb_id}'"]
+    else:
+        scopes = [
+            f"root_id IN {_sql_in(doc_ids[i:i + _SQL_IN_CHUNK])}"
+            for i in range(0, len(doc_ids), _SQL_IN_CHUNK)
+        ]
+
+    pivot = ", ".join(
+        f"MAX(CASE WHEN a.name = '{name}' THEN a.value END) AS \"{name}\""
+        for name in _LINT_ATTRS
     )
-    for row in contradicted:
-        warnings.append({
-            "rule": "contradicted-page",
-            "block_id": row.get("id", ""),
-            "detail": f'"{row.get("content", "?")}" contradicted by {row.get("value", "?")}',
-        })
-
-    # ── Rules 1,3,5,8,9,10: iterate documents ─────────────────────────
-    all_docs = siyuan_sql_query(
-        f"SELECT id, content, hpath FROM blocks "
-        f"WHERE type='d' AND box='{nb_id}' ORDER BY hpath"
+    facts: Dict[str, dict] = {}
+    for scope in scopes:
+        attr_rows = _read_all(
+            f"SELECT b.id, {pivot} FROM blocks b "
+            f"LEFT JOIN attributes a ON a.block_id = b.id "
+            f"AND a.name IN {_sql_in(_LINT_ATTRS)} "
+            f"WHERE b.type = 'd' AND b.{scope} "
+            f"GROUP BY b.id ORDER BY b.id"
+        )
+        body_rows = _read_all(
+            f"SELECT root_id, SUM(LENGTH(TRIM(content))) AS body_len FROM blocks "
+            f"WHERE type NOT IN {_CONTAINER_TYPES} AND {scope} "
+            f"GROUP BY root_id ORDER BY root_id"
+        )
+        if attr_rows is None or body_rows is None:
+            return None
+
+        for row in attr_rows:
+            facts[row["id"]] = {
+                "attrs": {name: row.get(name) or "" for name in _LINT_ATTRS},
+                "body_len": 0,
+            }
+        for row in body_rows:
+            if row.get("root_id") in facts:
+                facts[row["root_id"]]["body_len"] = int(row.get("body_len") or 0)
+    return facts
+
+
+def _lint_link_counts(nb_id: str) -> Optional[Dict[str, tuple]]:
+    """Return {doc_id: (inbound, outbound)} ref counts for a notebook's docs."""
+    rows = _read_all(
+        f"SELECT id, SUM(inbound) AS inbound, SUM(outbound) AS outbound FROM ("
+        f"SELECT def_block_root_id AS id, 1 AS inbound, 0 AS outbound FROM refs "
+        f"UNION ALL "
+        f"SELECT root_id AS id, 0 AS inbound, 1 AS outbound FROM refs WHERE box = '{nb_id}'"
+        f") WHERE id IN (SELECT id FROM blocks WHERE type = 'd' AND box = '{nb_id}') "
+        f"GROUP BY id ORDER BY id"
     )
+    if rows is None:
+        return None
+    return {
+        row["id"]: (int(row.get("inbound") or 0), int(row.get("outbound") or 0))
+        for row in rows
+    }
 
-    # Skip meta and directory-level docs for certain rules
-    skip_titles = {"Schema", "Index", "Log"}
-    skip_hpath_prefixes = ("/raw/",)
 
-    # Cross-link minimum thresholds (from Schema)
-    min_links = {
-        "entity": 2, "person": 1, "concept": 1, "synthesis": 3,
-        "overview": 5, "summary": 1, "habit": 1, "goal": 2,
-        "query": 1, "journal": 0, "raw": 0,
-    }
+def _lint_evaluate(
+    docs: list,
+    facts: Dict[str, dict],
+    links: Dict[str, tuple],
+    index_content: str,
+    today,
+) -> tuple:
+    """
+    Evaluate the per-document rules (1, 3, 5, 8, 9, 10) in memory.
 
-    # Build index content set for Rule 10
-    index_doc = None
-    for doc in all_docs:
-        if doc.get("content") == "Index":
-            index_doc = doc
-            break
-    index_content = ""
-    if index_doc:
-        index_md = siyuan_read_doc(index_doc["id"])
-        if index_md:
-            index_content = index_md
+    Returns (warnings, info) lists.
+    """
+    from datetime import timedelta
 
-    for doc in all_docs:
+    stale_cutoff = (today - timedelta(days=90)).isoformat()
+    warnings = []
+    info = []
+
+    for doc in docs:
         doc_id = doc.get("id", "")
         title = doc.get("content", "")
         hpath = doc.get("hpath", "")
-        attrs = None  # Reset per-doc to prevent leaking between iterations
-
-        # Skip Schema, Index, Log, and raw/ docs for orphan/attr checks
-        is_meta = title in skip_titles
-        is_raw = any(hpath.startswith(p) for p in skip_hpath_prefixes)
-        is_dir_stub = hpath.count("/") == 1 and title.lower() in (
-            "entities", "concepts", "syntheses", "summaries", "journal",
-            "people", "circles", "habits", "goals", "queries",
-            "raw", "articles", "papers", "transcripts",
-        )
 
+        is_meta = title in _LINT_SKIP_TITLES
+        is_raw = any(hpath.startswith(p) for p in _LINT_SKIP_HPATH_PREFIXES)
+        is_dir_stub = hpath.count("/") == 1 and title.lower() in _LINT_DIR_STUBS
         if is_meta or is_dir_stub:
             continue
 
-        # Fetch attrs once for non-raw docs (used by rules 3, 8, 9)
-        if not is_raw:
-            attrs = siyuan_get_attrs(doc_id)
+        doc_facts = facts.get(doc_id) or {"attrs": {}, "body_len": 0}
+        # Attr-based rules (3, 8, 9) don't apply to raw/ sources
+        attrs = None if is_raw else doc_facts["attrs"]
+        inbound, outbound = links.get(doc_id, (0, 0))
 
         # Rule 1: orphan-page
-        if not is_raw:
-            backlinks = siyuan_get_backlinks(doc_id)
-            if len(backlinks) == 0:
-                warnings.append({
-                    "rule": "orphan-page",
-                    "block_id": doc_id,
-                    "detail": f'"{title}" has 0 inbound links',
-                })
+        if not is_raw and inbound == 0:
+            warnings.append({
+                "rule": "orphan-page",
+                "block_id": doc_id,
+                "detail": f'"{title}" has 0 inbound links',
+            })
 
         # Rule 3: missing-attrs
         if attrs is not None:
-            required = ["custom-type", "custom-tags", "custom-created", "custom-updated"]
-            missing = [k for k in required if k not in attrs or not attrs[k]]
+            missing = [k for k in _LINT_ATTRS if not attrs.get(k)]
             if missing:
                 warnings.append({
                     "rule": "missing-attrs",
@@ -790,12 +1071,12 @@ def siyuan_lint(notebook: str) -> Dict[str, Any]:
                 })
 
         # Rule 5: empty-page
-        body = siyuan_read_doc(doc_id)
-        if body and len(body.strip()) < 50:
+        body_len = doc_facts["body_len"]
+        if body_len < 50:
             warnings.append({
                 "rule": "empty-page",
                 "block_id": doc_id,
-                "detail": f'"{title}" body is only {len(body.strip())} chars',
+                "detail": f'"{title}" body is only {body_len} chars',
             })
 
         # Rule 8: stale-page
@@ -811,42 +1092,166 @@ def siyuan_lint(notebook: str) -> Dict[str, Any]:
         # Rule 9: cross-link-minimum
         if attrs is not None:
             page_type = attrs.get("custom-type", "")
-            if page_type in min_links:
-                required_links = min_links[page_type]
-                if required_links > 0:
-                    ref_count_rows = siyuan_sql_query(
-                        f"SELECT COUNT(*) as cnt FROM refs "
-                        f"WHERE block_id = '{doc_id}' OR def_block_id = '{doc_id}'"
-                    )
-                    actual = ref_count_rows[0].get("cnt", 0) if ref_count_rows else 0
-                    if actual < required_links:
-                        warnings.append({
-                            "rule": "cross-link-minimum",
-                            "block_id": doc_id,
-                            "detail": f'"{title}" ({page_type}) has {actual} links, needs {required_links}',
-                        })
+            required_links = _LINT_MIN_LINKS.get(page_type, 0)
+            actual = inbound + outbound
+            if required_links > 0 and actual < required_links:
+                warnings.append({
+                    "rule": "cross-link-minimum",
+                    "block_id": doc_id,
+                    "detail": f'"{title}" ({page_type}) has {actual} links, needs {required_links}',
+                })
 
         # Rule 10: index-completeness
-        if not is_meta and not is_dir_stub and index_content:
-            if doc_id not in index_content and title not in index_content:
-                info.append({
-                    "rule": "index-completeness",
-                    "block_id": doc_id,
-                    "detail": f'"{title}" not listed in Index',
+        if index_content and doc_id not in index_content and title not in index_content:
+            info.append({
+                "rule": "index-completeness",
+                "block_id": doc_id,
+                "detail": f'"{title}" not listed in Index',
+            })
+
+    return warnings, info
+
+
+def siyuan_lint(notebook: str, full: bool = False) -> Dict[str, Any]:
+    """
+    Run 10 wiki quality rules against a SiYuan notebook.
+
+    Returns a structured lint report with errors, warnings, and info items.
+    Only documents whose `updated` timestamp changed since the previous run
+    have their attrs and body refetched, unless ``full`` is set.
+
+    Args:
+        notebook: Notebook name (resolved to ID internally)
+        full: Ignore cached per-document facts and refetch everything
+
+    Returns:
+        Dict with errors, warnings, info lists, and a summary string.
+    """
+    from datetime import date
+
+    nb_id = get_notebook_id(notebook)
+    if not nb_id:
+        return {"error": f"Notebook '{notebook}' not found"}
+
+    today = date.today()
+    errors = []
+    warnings = []
+
+    all_docs = _read_all(
+        f"SELECT id, content, hpath, updated FROM blocks "
+        f"WHERE type = 'd' AND box = '{nb_id}' ORDER BY hpath, id"
+    )
+    if all_docs is None:
+        return {"error": f"SiYuan query failed while linting '{notebook}'"}
+
+    # ── Per-document facts: reuse cache entries whose `updated` matches ─
+    with _lint_cache_lock:
+        cached = {} if full else dict(_lint_cache.get(nb_id, {}))
+    changed = [
+        doc["id"] for doc in all_docs
+        if doc["id"] not in cached or cached[doc["id"]][0] != doc.get("updated")
+    ]
+    if changed:
+        fresh = _lint_fetch_facts(
+            nb_id, None if len(changed) == len(all_docs) else changed,
+        )
+        if fresh is None:
+            return {"error": f"SiYuan query failed while linting '{notebook}'"}
+    else:
+        fresh = {}
+
+    entries = {}
+    for doc in all_docs:
+        doc_id = doc["id"]
+        if doc_id in fresh:
+            entries[doc_id] = (doc.get("updated"), fresh[doc_id])
+        elif doc_id in cached:
+            entries[doc_id] = cached[doc_id]
+    with _lint_cache_lock:
+        _lint_cache[nb_id] = entries  # also drops deleted docs
+    facts = {doc_id: entry[1] for doc_id, entry in entries.items()}
+
+    links, broken_refs, flagged = siyuan_gather(
+        lambda: _lint_link_counts(nb_id),
+        lambda: _read_all(
+            f"SELECT r.block_id, r.def_block_id FROM refs r "
+            f"LEFT JOIN blocks b ON r.def_block_id = b.id "
+            f"WHERE r.box = '{nb_id}' AND b.id IS NULL ORDER BY r.block_id"
+        ),
+        lambda: _read_all(
+            f"SELECT b.id, b.content, a.name, a.value FROM blocks b "
+            f"JOIN attributes a ON b.id = a.block_id "
+            f"WHERE b.box = '{nb_id}' AND ("
+            f"(a.name = 'custom-confidence' AND CAST(a.value AS REAL) < 0.5) OR "
+            f"(a.name = 'custom-contradicted-by' AND a.value != '')"
+            f") ORDER BY b.id"
+        ),
+    )
+    if links is None or broken_refs is None or flagged is None:
+        return {"error": f"SiYuan query failed while linting '{notebook}'"}
+
+    # ── Rule 2: broken-ref (error) ─────────────────────────────────────
+    for ref in broken_refs:
+        errors.append({
+            "rule": "broken-ref",
+            "block_id": ref.get("block_id", ""),
+            "detail": f"Reference to deleted block {ref.get('def_block_id', '?')}",
+        })
+
+    # ── Rule 4: duplicate-title (error) ────────────────────────────────
+    titles: Dict[str, list] = {}
+    for doc in all_docs:
+        titles.setdefault((doc.get("content") or "").lower(), []).append(doc)
+    for same in titles.values():
+        if len(same) > 1:
+            errors.append({
+                "rule": "duplicate-title",
+                "detail": f'"{same[0].get("content", "?")}" appears {len(same)} times',
+            })
+
+    # ── Rules 6, 7: low-confidence / contradicted-page (warning) ───────
+    for name, rule, verb in (
+        ("custom-confidence", "low-confidence", "has confidence"),
+        ("custom-contradicted-by", "contradicted-page", "contradicted by"),
+    ):
+        for row in flagged:
+            if row.get("name") == name:
+                warnings.append({
+                    "rule": rule,
+                    "block_id": row.get("id", ""),
+                    "detail": f'"{row.get("content", "?")}" {verb} {row.get("value", "?")}',
                 })
 
+    # ── Rule 10 input: Index text, refs carry both target id and title ──
+    index_content = ""
+    index_doc = next((d for d in all_docs if d.get("content") == "Index"), None)
+    if index_doc:
+        index_rows = _read_all(
+            f"SELECT markdown FROM blocks WHERE root_id = '{index_doc['id']}' "
+            f"AND type NOT IN {_CONTAINER_TYPES} ORDER BY id"
+        )
+        index_content = "\n".join(r.get("markdown") or "" for r in index_rows or [])
+
+    # ── Rules 1, 3, 5, 8, 9, 10: per-document, in memory ───────────────
+    doc_warnings, info = _lint_evaluate(all_docs, facts, links, index_content, today)
+    warnings.extend(doc_warnings)
+
     summary = (
         f"## Lint Report — {today.isoformat()}\n"
         f"Errors: {len(errors)} | Warnings: {len(warnings)} | Info: {len(info)}"
     )
 
-    logger.info(f"SiYuan lint: {notebook} → {len(errors)}E {len(warnings)}W {len(info)}I")
+    logger.info(
+        f"SiYuan lint: {notebook} → {len(errors)}E {len(warnings)}W {len(info)}I "
+        f"({len(changed)}/{len(all_docs)} docs refetched)"
+    )
     return {
         "errors": errors,
         "warnings": warnings,
         "info": info,
         "summary": summary,
         "total": len(errors) + len(warnings) + len(info),
+        "rechecked": len(changed),
     }
 
 
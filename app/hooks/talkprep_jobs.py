@@ -0,0 +1,371 @@
+"""
+TalkPrep background jobs — long generation stages run off the request path.
+
+develop_section and evaluate_talk run whole talkmaster LLM chains, often
+for minutes. Inside a tool call they held a Hermes pool worker (or a
+/v1/tools thread) for the whole chain and timed out RapidPro webhooks.
+The tools now check their stage gate, submit a job and return its ID at
+once; the chains run here.
+
+Model:
+  - A job is a list of named steps: one per section to develop, or a
+    single evaluation step. Steps from every job share one bounded
+    executor, so the sections of a revision develop in parallel while the
+    gateway never runs more than TALKPREP_JOB_WORKERS chains at once.
+  - Jobs and steps are rows in SQLite. On startup unfinished jobs are
+    rescheduled and only steps not yet done run again, so a restart
+    mid-revision resumes instead of losing or repeating work.
+  - Whichever step finishes a job last writes the summary and sends it to
+    the user over WuzAPI; job_status reads progress at any time.
+  - Step handlers are registered per kind by the tool module (talkprep.py),
+    which keeps talkmaster imports out of this one.
+
+Tunables (env):
+  TALKPREP_JOBS_DB        — SQLite path (default $GATEWAY_DATA_DIR/talkprep_jobs.sqlite, "" runs stages inline)
+  TALKPREP_JOB_WORKERS    — steps run concurrently across all jobs (default 3)
+  TALKPREP_JOB_RETENTION  — days finished jobs are kept (default 7)
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+from app.config import data_path
+from app.utils import metrics
+
+logger = logging.getLogger(__name__)
+
+# ── Configuration ────────────────────────────────────────────────────────────
+
+_DB_PATH = os.getenv("TALKPREP_JOBS_DB", data_path("talkprep_jobs.sqlite"))
+_WORKERS = int(os.getenv("TALKPREP_JOB_WORKERS", "3"))
+_RETENTION = float(os.getenv("TALKPREP_JOB_RETENTION", "7")) * 86400
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    revision TEXT NOT NULL,
+    params TEXT NOT NULL DEFAULT '{}',
+    status TEXT NOT NULL,
+    summary TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_user ON jobs(user_id, created_at);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs(status);
+CREATE TABLE IF NOT EXISTS job_steps (
+    job_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    step TEXT NOT NULL,
+    status TEXT NOT NULL,
+    result TEXT,
+    PRIMARY KEY (job_id, seq)
+);
+"""
+
+_ACTIVE = ("queued", "running")
+
+# kind → (run_step(params, step) -> str, summarize(job, steps) -> str)
+StepHandler = Callable[[dict, str], str]
+Summarizer = Callable[[dict, List[dict]], str]
+_handlers: Dict[str, Tuple[StepHandler, Summarizer]] = {}
+
+# ── State ────────────────────────────────────────────────────────────────────
+
+_lock = threading.Lock()            # guards the connection and job transitions
+_conn: Optional[sqlite3.Connection] = None
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+_JOBS = metrics.Counter(
+    "gateway_talkprep_jobs",
+    "TalkPrep background jobs by outcome (submitted, resumed, done, failed).",
+    labelnames=("outcome",),
+)
+_STEP_SECONDS = metrics.Histogram(
+    "gateway_talkprep_job_step_seconds",
+    "Time to run one TalkPrep job step (one section or one evaluation).",
+)
+metrics.Gauge(
+    "gateway_talkprep_job_steps_pending",
+    "TalkPrep job steps waiting for or holding a worker.",
+    lambda: stats()["steps_pending"],
+)
+
+
+def enabled() -> bool:
+    return bool(_DB_PATH)
+
+
+def register(kind: str, run_step: StepHandler, summarize: Summarizer) -> None:
+    """Register the step handler and summary formatter for a job kind."""
+    _handlers[kind] = (run_step, summarize)
+
+
+# ── Storage ──────────────────────────────────────────────────────────────────
+
+def _db() -> sqlite3.Connection:
+    """Shared connection; callers hold _lock."""
+    global _conn
+    if _conn is None:
+        os.makedirs(os.path.dirname(_DB_PATH) or ".", exist_ok=True)
+        conn = sqlite3.connect(_DB_PATH, check_same_thread=False, timeout=10)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(_SCHEMA)
+        _conn = conn
+    return _conn
+
+
+def _job_row(conn: sqlite3.Connection, job_id: str) -> Optional[dict]:
+    row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+    if row is None:
+        return None
+    job = dict(row)
+    job["params"] = json.loads(job["params"])
+    return job
+
+
+def _step_rows(conn: sqlite3.Connection, job_id: str) -> List[dict]:
+    return [
+        dict(r) for r in conn.execute(
+            "SELECT seq, step, status, result FROM job_steps WHERE job_id = ? ORDER BY seq",
+            (job_id,),
+        )
+    ]
+
+
+# ── Scheduling ───────────────────────────────────────────────────────────────
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=_WORKERS, thread_name_prefix="talkprep-job",
+                )
+    return _executor
+
+
+def submit(
+    kind: str,
+    user_id: str,
+    revision: str,
+    steps: List[str],
+    params: Optional[dict] = None,
+) -> Tuple[str, bool]:
+    """
+    Queue a job and return (job_id, created).
+
+    An identical job (same kind, user, revision and steps) that is still
+    running is returned instead of starting the same chains twice —
+    WhatsApp retries and impatient re-sends are common.
+    """
+    if kind not in _handlers:
+        raise ValueError(f"No handler registered for job kind '{kind}'")
+    now = time.time()
+    with _lock:
+        conn = _db()
+        for row in conn.execute(
+            f"SELECT id FROM jobs WHERE kind = ? AND user_id = ? AND revision = ? "
+            f"AND status IN {_ACTIVE}",
+            (kind, user_id, revision),
+        ).fetchall():
+            if [s["step"] for s in _step_rows(conn, row["id"])] == steps:
+                return row["id"], False
+
+        job_id = uuid.uuid4().hex[:8]
+        with conn:
+            conn.execute(
+                "INSERT INTO jobs (id, kind, user_id, revision, params, status, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, 'queued', ?, ?)",
+                (job_id, kind, user_id, revision, json.dumps(params or {}), now, now),
+            )
+            conn.executemany(
+                "INSERT INTO job_steps (job_id, seq, step, status) VALUES (?, ?, ?, 'pending')",
+                [(job_id, seq, step) for seq, step in enumerate(steps)],
+            )
+    _JOBS.inc(outcome="submitted")
+    _schedule(job_id)
+    return job_id, True
+
+
+def _schedule(job_id: str) -> None:
+    """Hand every step not yet done to the shared executor."""
+    with _lock:
+        seqs = [
+            r[0] for r in _db().execute(
+                "SELECT seq FROM job_steps WHERE job_id = ? AND status IN ('pending', 'running') "
+                "ORDER BY seq",
+                (job_id,),
+            )
+        ]
+    executor = _get_executor()
+    for seq in seqs:
+        executor.submit(_run_step, job_id, seq)
+
+
+def _run_step(job_id: str, seq: int) -> None:
+    with _lock:
+        conn = _db()
+        job = _job_row(conn, job_id)
+        row = conn.execute(
+            "SELECT step, status FROM job_steps WHERE job_id = ? AND seq = ?", (job_id, seq),
+        ).fetchone()
+        if job is None or row is None or row["status"] in ("done", "failed"):
+            return
+        with conn:
+            conn.execute(
+                "UPDATE job_steps SET status = 'running' WHERE job_id = ? AND seq = ?", (job_id, seq),
+            )
+            conn.execute(
+                "UPDATE jobs SET status = 'running', updated_at = ? WHERE id = ?", (time.time(), job_id),
+            )
+
+    run_step, _ = _handlers[job["kind"]]
+    start = time.perf_counter()
+    try:
+        result, status = run_step(job["params"], row["step"]), "done"
+    except Exception as e:
+        logger.warning(f"TalkPrep job {job_id} step '{row['step']}' failed: {e}")
+        result, status = str(e), "failed"
+    _STEP_SECONDS.observe(time.perf_counter() - start)
+
+    with _lock:
+        conn = _db()
+        with conn:
+            conn.execute(
+                "UPDATE job_steps SET status = ?, result = ? WHERE job_id = ? AND seq = ?",
+                (status, result, job_id, seq),
+            )
+        remaining = conn.execute(
+            "SELECT COUNT(*) FROM job_steps WHERE job_id = ? AND status NOT IN ('done', 'failed')",
+            (job_id,),
+        ).fetchone()[0]
+        if remaining:
+            return
+        # Last step out closes the job — exactly once, under the lock
+        steps = _step_rows(conn, job_id)
+        _, summarize = _handlers[job["kind"]]
+        summary = summarize(job, steps)
+        final = "done" if any(s["status"] == "done" for s in steps) else "failed"
+        with conn:
+            conn.execute(
+                "UPDATE jobs SET status = ?, summary = ?, updated_at = ? WHERE id = ?",
+                (final, summary, time.time(), job_id),
+            )
+    _JOBS.inc(outcome=final)
+    _notify(job["user_id"], summary)
+
+
+def _notify(user_id: str, text: str) -> None:
+    """Send the job summary to the user's WhatsApp (best effort)."""
+    phone = user_id.split(":")[-1].lstrip("+") if user_id else ""
+    if not phone.isdigit():
+        return  # rivebot, api callers — they poll job_status
+    from app.api.middleware.http_clients import run_sync
+    from app.api.middleware.wuzapi_client import send_text
+    try:
+        run_sync(send_text(phone, text))
+    except Exception as e:
+        logger.warning(f"TalkPrep job notification to {phone} failed: {e}")
+
+
+# ── Reads ────────────────────────────────────────────────────────────────────
+
+def get(job_id: str) -> Optional[dict]:
+    """Job row plus its steps, or None if unknown."""
+    with _lock:
+        conn = _db()
+        job = _job_row(conn, job_id)
+        if job is not None:
+            job["steps"] = _step_rows(conn, job_id)
+    return job
+
+
+def recent(user_id: str, limit: int = 5) -> List[dict]:
+    """A user's latest jobs, newest first, with their steps."""
+    with _lock:
+        conn = _db()
+        ids = [
+            r[0] for r in conn.execute(
+                "SELECT id FROM jobs WHERE user_id = ? ORDER BY created_at DESC LIMIT ?",
+                (user_id, limit),
+            )
+        ]
+        jobs = []
+        for job_id in ids:
+            job = _job_row(conn, job_id)
+            job["steps"] = _step_rows(conn, job_id)
+            jobs.append(job)
+    return jobs
+
+
+# ── Lifecycle ────────────────────────────────────────────────────────────────
+
+def start() -> None:
+    """Prune old jobs and resume unfinished ones (FastAPI lifespan startup)."""
+    if not enabled():
+        logger.info("TalkPrep jobs disabled (no TALKPREP_JOBS_DB) — stages run inline")
+        return
+    with _lock:
+        conn = _db()
+        with conn:
+            conn.execute(
+                "DELETE FROM job_steps WHERE job_id IN "
+                "(SELECT id FROM jobs WHERE status NOT IN ('queued', 'running') AND updated_at < ?)",
+                (time.time() - _RETENTION,),
+            )
+            conn.execute(
+                "DELETE FROM jobs WHERE status NOT IN ('queued', 'running') AND updated_at < ?",
+                (time.time() - _RETENTION,),
+            )
+        unfinished = [
+            (r["id"], r["kind"])
+            for r in conn.execute(f"SELECT id, kind FROM jobs WHERE status IN {_ACTIVE} ORDER BY created_at")
+        ]
+    for job_id, kind in unfinished:
+        if kind not in _handlers:
+            logger.warning(f"TalkPrep job {job_id}: no handler for kind '{kind}', left queued")
+            continue
+        logger.info(f"Resuming TalkPrep job {job_id} ({kind})")
+        _JOBS.inc(outcome="resumed")
+        _schedule(job_id)
+
+
+def stop() -> None:
+    """
+    Stop taking new steps (FastAPI lifespan shutdown).
+
+    Queued steps are cancelled and steps still running are abandoned; both
+    stay unfinished in SQLite and run again on the next start().
+    """
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def stats() -> dict:
+    if not enabled():
+        return {"enabled": False, "steps_pending": 0}
+    if _conn is None and not os.path.exists(_DB_PATH):
+        return {"enabled": True, "workers": _WORKERS, "jobs": {}, "steps_pending": 0}
+    with _lock:
+        conn = _db()
+        jobs = dict(conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall())
+        pending = conn.execute(
+            "SELECT COUNT(*) FROM job_steps WHERE status IN ('pending', 'running')"
+        ).fetchone()[0]
+    return {"enabled": True, "workers": _WORKERS, "jobs": jobs, "steps_pending": pending}
@@ -0,0 +1,231 @@
+"""
+Append-only session journal — replaces whole-file JSON rewrites.
+
+Each conversation thread gets a ``session_<id>.jsonl`` file in the Hermes
+sessions directory, one message dict per line. Writers only ever append,
+so a RiveBot turn costs one small write instead of a full read/re-serialize
+of ``session_<id>.json``. Readers seek from the end of the file and parse
+only the last N lines, so loading history is O(N) regardless of how long
+the user has been talking to us.
+
+Layout:
+  - session_<id>.json   — legacy format, still written by Hermes itself.
+                          Read once to seed the journal (lazy migration).
+  - session_<id>.jsonl  — journal, source of truth for conversation history.
+
+Compaction: when a journal grows past HERMES_SESSION_JOURNAL_MAX_KB it is
+atomically rewritten (tmp file + os.replace) keeping only the last
+HERMES_SESSION_JOURNAL_KEEP messages. This bounds disk usage on eMMC
+edge boxes without ever blocking a reader on a half-written file.
+"""
+
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+# ── Configuration ────────────────────────────────────────────────────────────
+
+_sessions_dir = Path(os.getenv(
+    "HERMES_HOME", str(Path.home() / ".hermes")
+)) / "sessions"
+
+_COMPACT_KEEP = int(os.getenv("HERMES_SESSION_JOURNAL_KEEP", "200"))  # messages
+_MAX_BYTES = int(os.getenv("HERMES_SESSION_JOURNAL_MAX_KB", "256")) * 1024
+_BLOCK_SIZE = 8192  # bytes read per backwards seek
+
+# Serializes appends/compactions across the event loop and Hermes pool
+# threads. Journal writes are tiny, so one process-wide lock is enough.
+_lock = threading.Lock()
+
+
+def journal_path(session_id: str) -> Path:
+    """Path of the append-only journal for a session."""
+    return _sessions_dir / f"session_{session_id}.jsonl"
+
+
+def legacy_path(session_id: str) -> Path:
+    """Path of the legacy whole-file JSON session (written by Hermes)."""
+    return _sessions_dir / f"session_{session_id}.json"
+
+
+# ── Low-level helpers ────────────────────────────────────────────────────────
+
+def _read_tail_lines(path: Path, n: int) -> list[bytes]:
+    """Return the last ``n`` complete lines of ``path`` without reading it all."""
+    if n <= 0:
+        return []
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        pos = f.tell()
+        buf = b""
+        # Need n complete lines plus the (possibly partial) leading one
+        while pos > 0 and buf.count(b"\n") <= n:
+            step = min(_BLOCK_SIZE, pos)
+            pos -= step
+            f.seek(pos)
+            buf = f.read(step) + buf
+
+    lines = buf.splitlines()
+    if pos > 0 and lines:
+        lines = lines[1:]  # first line is cut mid-way by the seek
+    return [line for line in lines if line.strip()][-n:]
+
+
+def _parse_lines(lines: Iterable[bytes]) -> list[dict]:
+    """Decode journal lines, skipping any torn/corrupt entries."""
+    messages = []
+    for line in lines:
+        try:
+            msg = json.loads(line)
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            continue  # torn write from a crash — drop it, keep the rest
+        if isinstance(msg, dict):
+            messages.append(msg)
+    return messages
+
+
+def _write_atomic(path: Path, messages: list[dict]) -> None:
+    """Rewrite a journal in one shot (tmp file + rename)."""
+    tmp = path.with_suffix(".jsonl.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        for msg in messages:
+            f.write(json.dumps(msg, ensure_ascii=False) + "\n")
+    os.replace(tmp, path)
+
+
+# ── Migration ────────────────────────────────────────────────────────────────
+
+def migrate_legacy(session_id: str) -> bool:
+    """Seed the journal from a legacy ``session_<id>.json`` file.
+
+    No-op if the journal already exists. Only the last _COMPACT_KEEP
+    messages are carried over — older ones were never loaded anyway.
+
+    Returns:
+        True if a journal was created from legacy data.
+    """
+    journal = journal_path(session_id)
+    legacy = legacy_path(session_id)
+    if journal.exists() or not legacy.exists():
+        return False
+
+    with _lock:
+        if journal.exists():
+            return False
+        try:
+            data = json.loads(legacy.read_text(encoding="utf-8"))
+            messages = data.get("messages", []) if isinstance(data, dict) else []
+        except (json.JSONDecodeError, OSError) as e:
+            logger.warning("Legacy session %s unreadable, starting fresh: %s", session_id, e)
+            return False
+        messages = [m for m in messages if isinstance(m, dict)][-_COMPACT_KEEP:]
+        _sessions_dir.mkdir(parents=True, exist_ok=True)
+        _write_atomic(journal, messages)
+
+    logger.info("Migrated session %s to journal (%d messages)", session_id, len(messages))
+    return True
+
+
+def migrate_all() -> int:
+    """Migrate every legacy session file that has no journal yet.
+
+    Returns:
+        Number of sessions migrated.
+    """
+    if not _sessions_dir.exists():
+        return 0
+    count = 0
+    for legacy in _sessions_dir.glob("session_*.json"):
+        session_id = legacy.stem[len("session_"):]
+        if migrate_legacy(session_id):
+            count += 1
+    return count
+
+
+# ── Public API ───────────────────────────────────────────────────────────────
+
+def append_messages(session_id: str, messages: list[dict], migrate: bool = True) -> None:
+    """Append messages to a session journal, compacting if it grew too large.
+
+    Args:
+        session_id: Canonical session ID (see engine.get_session_id).
+        messages: Message dicts to append, in order.
+        migrate: Seed from the legacy JSON file first. Pass False when the
+            caller already read the session this turn — Hermes has since
+            rewritten the legacy file with the turn being appended, so
+            seeding from it again would duplicate that turn.
+    """
+    if not messages:
+        return
+    if migrate:
+        migrate_legacy(session_id)
+
+    payload = "".join(json.dumps(m, ensure_ascii=False) + "\n" for m in messages)
+    journal = journal_path(session_id)
+
+    with _lock:
+        _sessions_dir.mkdir(parents=True, exist_ok=True)
+        with open(journal, "a", encoding="utf-8") as f:
+            f.write(payload)
+            size = f.tell()
+        if size > _MAX_BYTES:
+            _compact_locked(journal)
+
+
+def tail_messages(session_id: str, n: int) -> list[dict]:
+    """Return the last ``n`` messages of a session without parsing the rest.
+
+    Returns an empty list on cold start or unreadable journal.
+    """
+    migrate_legacy(session_id)
+    journal = journal_path(session_id)
+    if not journal.exists():
+        return []
+    try:
+        return _parse_lines(_read_tail_lines(journal, n))
+    except OSError as e:
+        logger.warning("Failed to read session journal %s: %s", session_id, e)
+        return []
+
+
+def _compact_locked(journal: Path, keep: Optional[int] = None) -> int:
+    """Compact a journal in place. Caller must hold _lock."""
+    messages = _parse_lines(_read_tail_lines(journal, keep or _COMPACT_KEEP))
+    _write_atomic(journal, messages)
+    logger.debug("Compacted %s to %d messages", journal.name, len(messages))
+    return len(messages)
+
+
+def compact(session_id: str, keep: Optional[int] = None) -> int:
+    """Rewrite a session journal keeping only its last ``keep`` messages.
+
+    Defaults to HERMES_SESSION_JOURNAL_KEEP when ``keep`` is not given.
+
+    Returns:
+        Number of messages retained.
+    """
+    journal = journal_path(session_id)
+    with _lock:
+        if not journal.exists():
+            return 0
+        return _compact_locked(journal, keep)
+
+
+def delete_session(session_id: str) -> bool:
+    """Remove both the journal and the legacy file for a session.
+
+    Returns:
+        True if anything was deleted.
+    """
+    deleted = False
+    with _lock:
+        for path in (journal_path(session_id), legacy_path(session_id)):
+            if path.exists():
+                path.unlink()
+                deleted = True
+    return deleted
@@ -3,6 +3,8 @@
 Replaces the HTTP proxy stub with 7 tools that Hermes calls during
 social skills training. State is persisted via RiveBot user variables,
 ensuring per-user isolation (verified: RiveScript scopes vars by user_id).
+Each tool call reads the user's sim_* variables in one batched request and
+writes its changes back in one /set-vars call (_SimState).
 
 Architecture:
   - When AI is available: Hermes calls these tools during its agent loop
@@ -12,11 +14,13 @@ Architecture:
 import json
 import logging
 import os
+import threading
 from typing import Any, Dict
 
 import httpx
 
 from app.plugins import register_tool
+from app.utils.ttl_store import TTLStore
 from app.plugins.social.offline import (
     analyze_response_offline,
     compute_trust_delta,
@@ -28,11 +32,6 @@ from app.plugins.social.scenarios import (
     get_scenario,
     load_scenarios,
 )
-from app.plugins.social.mastery import (
-    record_drill,
-    get_session_stats,
-    FSRS_LABELS,
-)
 
 logger = logging.getLogger(__name__)
 
@@ -48,10 +47,12 @@ def _hermes_chat(prompt: str, urn: str = "system:social-code") -> str | None:
 
     Uses AIAgent.chat() in minimal mode — same LLM config as the full
     agent but without the tool loop, history, or session overhead.
-    Returns the text response, or None on failure.
+    The agent is leased from the warm pool, so repeated grading calls
+    skip construction. Returns the text response, or None on failure.
     """
     try:
         from run_agent import AIAgent
+        from app.hermes import agent_pool
 
         _provider = os.getenv("HERMES_PROVIDER", "")
         _gemini_key = os.getenv("GEMINI_API_KEY", "")
@@ -79,8 +80,10 @@ def _hermes_chat(prompt: str, urn: str = "system:social-code") -> str | None:
             agent_kwargs["api_key"] = os.getenv("OPENAI_API_KEY", "")
             agent_kwargs["base_url"] = os.getenv("LITELLM_BASE_URL", "http://localhost:4000/v1")
 
-        agent = AIAgent(**agent_kwargs)
-        result = agent.chat("Generate.")
+        pool_key = ("social-code:oneshot", (), _llm_model, _provider)
+        per_call = {attr: agent_kwargs[attr] for attr in agent_pool.PER_CALL_ATTRS}
+        with agent_pool.lease(pool_key, lambda: AIAgent(**agent_kwargs), per_call) as agent:
+            result = agent.chat("Generate.")
         return result.strip() if result else None
 
     except Exception as e:
@@ -91,10 +94,37 @@ def _hermes_chat(prompt: str, urn: str = "system:social-code") -> str | None:
 #  RiveBot State Persistence Helpers
 # ════════════════════════════════════════════════════════════════════════════
 
-# In-process state cache — fallback when RiveBot is down.
-# Keyed by (urn, var), pruned on write. Ensures scenario context
-# survives from sim_get_scenario to sim_drill_grade within one process.
-_local_state_cache: dict[tuple[str, str], str] = {}
+# In-process state cache — write-back layer under RiveBot.
+# Keyed by (urn, var), bounded and TTL-evicted. Every write lands here
+# first and every successful RiveBot read refreshes it, so scenario context
+# survives from sim_get_scenario to sim_drill_grade within one process
+# even while RiveBot is down.
+_local_state_cache = TTLStore(
+    "social.sim_state", ttl=float(os.getenv("SIM_STATE_TTL", "7200")), maxsize=5000,
+)
+
+_PERSONA = "social-code"
+
+# Tools run in worker threads, so this is a sync client; one keep-alive
+# pool replaces a fresh connection per /get-var and /set-var call
+_http: httpx.Client | None = None
+_http_lock = threading.Lock()
+# Batch /get-vars is opt-in: stock RiveBot only serves /get-var. Still
+# flips off on a 404/405 so a misconfigured flag costs one request.
+_batch_get_supported = os.getenv("RIVEBOT_GET_VARS", "0") == "1"
+
+
+def _rivebot_http() -> httpx.Client:
+    global _http
+    if _http is None:
+        with _http_lock:
+            if _http is None:
+                _http = httpx.Client(
+                    base_url=RIVEBOT_URL,
+                    timeout=2.0,
+                    limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+                )
+    return _http
 
 
 def _get_urn(args: dict = None, **kw) -> str:
@@ -122,51 +152,115 @@ def _get_urn(args: dict = None, **kw) -> str:
     return "user"
 
 
-def _set_sim_var(urn: str, var: str, value: str) -> bool:
-    """Persist a simulation variable in RiveBot + local cache."""
-    _local_state_cache[(urn, var)] = str(value)
-    try:
-        httpx.post(
-            f"{RIVEBOT_URL}/set-var",
-            json={
-                "persona": "social-code",
-                "user": urn,
-                "var": f"sim_{var}",
-                "value": str(value),
-            },
-            timeout=2.0,
-        )
-        return True
-    except Exception as e:
-        logger.debug("RiveBot set failed for %s/%s, using local cache: %s", urn, var, e)
-        return False
+def _fetch_rivebot_vars(urn: str, names: list[str]) -> Dict[str, str]:
+    """Read RiveBot user variables.
 
+    Uses one /get-vars round-trip when RIVEBOT_GET_VARS is on and more
+    than one variable is wanted; otherwise one /get-var per variable on
+    the same pooled connection. Unset variables are left out. Raises if
+    RiveBot can't be reached.
+    """
+    global _batch_get_supported
+    client = _rivebot_http()
+    if _batch_get_supported and len(names) > 1:
+        resp = client.post("/get-vars", json={"persona": _PERSONA, "user": urn, "vars": names})
+        if resp.status_code in (404, 405):
+            logger.info("RiveBot has no /get-vars — reading variables one by one")
+            _batch_get_supported = False
+        else:
+            resp.raise_for_status()
+            found = resp.json().get("vars", {}) or {}
+            return {k: str(v) for k, v in found.items() if v not in (None, "", "undefined")}
+
+    found = {}
+    for name in names:
+        resp = client.get("/get-var", params={"persona": _PERSONA, "user": urn, "var": name})
+        value = resp.json().get("value", "")
+        if value not in (None, "", "undefined"):
+            found[name] = str(value)
+    return found
+
+
+class _SimState:
+    """One tool call's view of a user's simulation variables.
+
+    Reads are lazy: nothing is fetched until the first get()/raw(), which
+    loads the declared `reads` (sim_<var>) and `extra` raw vars (e.g. lang)
+    together; an undeclared var is fetched on its own when first asked
+    for. Write-only tools therefore never read. set() is buffered until
+    flush(), which sends all changes in a single /set-vars call. Used as a
+    context manager so the flush happens when the tool returns — or raises.
+
+    Reads prefer RiveBot and fall back to _local_state_cache; writes go to
+    the cache immediately, so a failed flush still leaves the fallback
+    current.
+    """
 
-def _get_sim_var(urn: str, var: str, default: str = "") -> str:
-    """Read a simulation variable — RiveBot first, local cache fallback."""
-    val = _get_rivebot_var(urn, f"sim_{var}", "")
-    if val and val != "undefined":
-        return val
-    # Fallback to local process cache
-    return _local_state_cache.get((urn, var), default)
+    def __init__(self, urn: str, reads: tuple = (), extra: tuple = ()):
+        self.urn = urn
+        self._pending: Dict[str, str] = {}
+        self._remote: Dict[str, str] = {}
+        self._wanted = [f"sim_{v}" for v in reads] + list(extra)
+        self._loaded: set = set()
+
+    def _load(self, name: str) -> None:
+        if name in self._loaded:
+            return
+        names = [n for n in self._wanted if n not in self._loaded]
+        if name not in names:
+            names.append(name)
+        self._loaded.update(names)
+        try:
+            found = _fetch_rivebot_vars(self.urn, names)
+        except Exception as e:
+            logger.debug("RiveBot read failed for %s, using local cache: %s", self.urn, e)
+            return
+        self._remote.update(found)
+        for key, value in found.items():
+            if key.startswith("sim_"):
+                _local_state_cache[(self.urn, key[4:])] = value
+
+    def get(self, var: str, default: str = "") -> str:
+        """A sim_<var> value — pending write, RiveBot, then local cache."""
+        name = f"sim_{var}"
+        if name in self._pending:
+            return self._pending[name]
+        self._load(name)
+        if name in self._remote:
+            return self._remote[name]
+        return _local_state_cache.get((self.urn, var), default)
+
+    def raw(self, name: str, default: str = "") -> str:
+        """An unprefixed RiveBot variable, e.g. lang (no cache fallback)."""
+        self._load(name)
+        return self._remote.get(name, default)
+
+    def set(self, var: str, value) -> None:
+        value = str(value)
+        _local_state_cache[(self.urn, var)] = value
+        self._pending[f"sim_{var}"] = value
+
+    def flush(self) -> bool:
+        if not self._pending:
+            return True
+        pending, self._pending = self._pending, {}
+        self._remote.update(pending)
+        self._loaded.update(pending)
+        try:
+            resp = _rivebot_http().post(
+                "/set-vars", json={"persona": _PERSONA, "user": self.urn, "vars": pending},
+            )
+            resp.raise_for_status()
+            return True
+        except Exception as e:
+            logger.debug("RiveBot set-vars failed for %s, kept in local cache: %s", self.urn, e)
+            return False
 
+    def __enter__(self) -> "_SimState":
+        return self
 
-def _get_rivebot_var(urn: str, var: str, default: str = "") -> str:
-    """Read any RiveBot user variable (no prefix manipulation)."""
-    try:
-        resp = httpx.get(
-            f"{RIVEBOT_URL}/get-var",
-            params={
-                "persona": "social-code",
-                "user": urn,
-                "var": var,
-            },
-            timeout=2.0,
-        )
-        val = resp.json().get("value", default)
-        return val if val != "undefined" else default
-    except Exception:
-        return default
+    def __exit__(self, *exc) -> None:
+        self.flush()
 
 
 # ════════════════════════════════════════════════════════════════════════════
@@ -186,8 +280,9 @@ def sim_update_mood(args: dict, **kw) -> str:
     internal = args.get("internal_thought", "")
     reason = args.get("reason", "")
 
-    _set_sim_var(urn, "mood", new_mood)
-    _set_sim_var(urn, "monologue", internal[:200])
+    with _SimState(urn) as state:
+        state.set("mood", new_mood)
+        state.set("monologue", internal[:200])
 
     logger.info("[social] %s mood → %s (%s)", urn, new_mood, reason)
     return f"Mood updated to: {new_mood}"
@@ -204,9 +299,10 @@ def sim_update_trust(args: dict, **kw) -> str:
     change = int(args.get("trust_change", 0))
     reason = args.get("reason", "")
 
-    current = int(_get_sim_var(urn, "trust", "20"))
-    new_trust = max(0, min(100, current + change))
-    _set_sim_var(urn, "trust", str(new_trust))
+    with _SimState(urn) as state:
+        current = int(state.get("trust", "20"))
+        new_trust = max(0, min(100, current + change))
+        state.set("trust", new_trust)
 
     direction = "gained" if change > 0 else "lost"
     logger.info("[social] %s trust %s %d → %d (%s)", urn, direction, current, new_trust, reason)
@@ -225,14 +321,15 @@ def sim_update_dossier(args: dict, **kw) -> str:
     value = args.get("value", "")
 
     # Dossier is stored as a JSON string in RiveBot
-    raw = _get_sim_var(urn, "dossier", "{}")
-    try:
-        dossier = json.loads(raw)
-    except (json.JSONDecodeError, TypeError):
-        dossier = {}
+    with _SimState(urn) as state:
+        raw = state.get("dossier", "{}")
+        try:
+            dossier = json.loads(raw)
+        except (json.JSONDecodeError, TypeError):
+            dossier = {}
 
-    dossier[key] = value
-    _set_sim_var(urn, "dossier", json.dumps(dossier, ensure_ascii=False))
+        dossier[key] = value
+        state.set("dossier", json.dumps(dossier, ensure_ascii=False))
 
     logger.info("[social] %s dossier: %s = %s", urn, key, value)
     return f"Dossier updated: {key} = {value}"
@@ -249,7 +346,8 @@ def sim_assess_boredom(args: dict, **kw) -> str:
     level = max(0, min(10, int(args.get("boredom_level", 0))))
     reason = args.get("reason", "")
 
-    _set_sim_var(urn, "boredom", str(level))
+    with _SimState(urn) as state:
+        state.set("boredom", level)
 
     status = "fascinated" if level < 3 else "engaged" if level < 6 else "bored" if level < 9 else "leaving"
     logger.info("[social] %s boredom %d (%s) — %s", urn, level, status, reason)
@@ -267,8 +365,9 @@ def sim_trigger_distraction(args: dict, **kw) -> str:
     level = max(0, min(10, int(args.get("distraction_level", 0))))
     source = args.get("source", "unknown")
 
-    _set_sim_var(urn, "distraction", str(level))
-    _set_sim_var(urn, "distraction_src", source[:100])
+    with _SimState(urn) as state:
+        state.set("distraction", level)
+        state.set("distraction_src", source[:100])
 
     logger.info("[social] %s distraction: %s (level %d)", urn, source, level)
     return f"Distraction triggered: {source} (Level {level})"
@@ -316,51 +415,51 @@ def sim_get_scenario(args: dict, **kw) -> str:
     urn = _get_urn(args)
     difficulty = int(args.get("difficulty", 1))
 
-    # Get language and AI mode from RiveBot context
-    lang = _get_rivebot_var(urn, "lang", "en")
-    if not lang or lang == "undefined":
-        lang = "en"
-    ai_enabled = _get_sim_var(urn, "ai_grading", "off").lower() == "on"
-
-    # When AI is on, 30% chance of an AI-generated scenario for variety
-    import random as _random
-    use_ai_scenario = ai_enabled and _random.random() < 0.3
-
-    if use_ai_scenario:
-        ai_scenario = _generate_scenario_ai(difficulty, lang)
-        if ai_scenario:
-            _set_sim_var(urn, "current_context", ai_scenario["context"][:200])
-            _set_sim_var(urn, "current_cue", ai_scenario["cue"][:200])
-            _set_sim_var(urn, "current_persona", ai_scenario["target_persona"])
-            _set_sim_var(urn, "difficulty", str(difficulty))
-
-            import json as _json
-            ideal_links = ai_scenario.get("ideal_links", [])
-            if ideal_links:
-                _set_sim_var(urn, "ideal_links", _json.dumps(ideal_links)[:500])
-            else:
-                _set_sim_var(urn, "ideal_links", "")
-
-            return format_scenario_whatsapp(ai_scenario)
-
-    # Default: golden set
-    scenario = get_scenario(difficulty=difficulty, lang=lang)
-    if not scenario:
-        return "No scenarios available at this difficulty level."
-
-    # Store current scenario context for grading reference
-    _set_sim_var(urn, "current_context", scenario["context"][:200])
-    _set_sim_var(urn, "current_cue", scenario["cue"][:200])
-    _set_sim_var(urn, "current_persona", scenario["target_persona"])
-    _set_sim_var(urn, "difficulty", str(difficulty))
-
-    # Store golden ideal_links for use during grading
-    import json as _json
-    ideal_links = scenario.get("ideal_links", [])
-    if ideal_links:
-        _set_sim_var(urn, "ideal_links", _json.dumps(ideal_links)[:500])
-
-    return format_scenario_whatsapp(scenario)
+    # Scenario writes go out in one /set-vars on exit
+    with _SimState(urn, reads=("ai_grading",), extra=("lang",)) as state:
+        # Get language and AI mode from RiveBot context
+        lang = state.raw("lang", "en")
+        ai_enabled = state.get("ai_grading", "off").lower() == "on"
+
+        # When AI is on, 30% chance of an AI-generated scenario for variety
+        import random as _random
+        use_ai_scenario = ai_enabled and _random.random() < 0.3
+
+        if use_ai_scenario:
+            ai_scenario = _generate_scenario_ai(difficulty, lang)
+            if ai_scenario:
+                state.set("current_context", ai_scenario["context"][:200])
+                state.set("current_cue", ai_scenario["cue"][:200])
+                state.set("current_persona", ai_scenario["target_persona"])
+                state.set("difficulty", difficulty)
+
+                import json as _json
+                ideal_links = ai_scenario.get("ideal_links", [])
+                if ideal_links:
+                    state.set("ideal_links", _json.dumps(ideal_links)[:500])
+                else:
+                    state.set("ideal_links", "")
+
+                return format_scenario_whatsapp(ai_scenario)
+
+        # Default: golden set
+        scenario = get_scenario(difficulty=difficulty, lang=lang)
+        if not scenario:
+            return "No scenarios available at this difficulty level."
+
+        # Store current scenario context for grading reference
+        state.set("current_context", scenario["context"][:200])
+        state.set("current_cue", scenario["cue"][:200])
+        state.set("current_persona", scenario["target_persona"])
+        state.set("difficulty", difficulty)
+
+        # Store golden ideal_links for use during grading
+        import json as _json
+        ideal_links = scenario.get("ideal_links", [])
+        if ideal_links:
+            state.set("ideal_links", _json.dumps(ideal_links)[:500])
+
+        return format_scenario_whatsapp(scenario)
 
 
 # ════════════════════════════════════════════════════════════════════════════
@@ -549,17 +648,23 @@ def sim_drill_grade(args: dict, **kw) -> str:
     if not user_input:
         return "⚠️ No response received."
 
-    # ── Read current state from RiveBot ──
-    context = _get_sim_var(urn, "current_context", "a social situation")
-    current_mood = _get_sim_var(urn, "mood", "Neutral")
-    current_trust = int(_get_sim_var(urn, "trust", "20"))
-    current_boredom = int(_get_sim_var(urn, "boredom", "0"))
-    lang = _get_rivebot_var(urn, "lang", "en") or "en"
-    ai_enabled = _get_sim_var(urn, "ai_grading", "off").lower() == "on"
+    # ── Read current state from RiveBot (loaded together on first get) ──
+    state = _SimState(
+        urn,
+        reads=("current_context", "mood", "trust", "boredom", "ai_grading",
+               "ideal_links", "current_cue", "app", "difficulty"),
+        extra=("lang",),
+    )
+    context = state.get("current_context", "a social situation")
+    current_mood = state.get("mood", "Neutral")
+    current_trust = int(state.get("trust", "20"))
+    current_boredom = int(state.get("boredom", "0"))
+    lang = state.raw("lang", "en")
+    ai_enabled = state.get("ai_grading", "off").lower() == "on"
 
     # ── Read golden ideal_links from state ──
     import json as _json
-    ideal_links_raw = _get_sim_var(urn, "ideal_links", "")
+    ideal_links_raw = state.get("ideal_links", "")
     golden_ideal = None
     golden_explanation = None
     golden_angle = None
@@ -613,9 +718,11 @@ def sim_drill_grade(args: dict, **kw) -> str:
     word_count = len(user_input.split())
     new_boredom = max(0, min(10, current_boredom + (1 if word_count < 4 else -1)))
 
-    _set_sim_var(urn, "mood", new_mood)
-    _set_sim_var(urn, "trust", str(new_trust))
-    _set_sim_var(urn, "boredom", str(new_boredom))
+    state.set("mood", new_mood)
+    state.set("trust", new_trust)
+    state.set("boredom", new_boredom)
+    # One /set-vars now, before any slow LLM grading below
+    state.flush()
 
     # ══════════════════════════════════════════════════════════════════════
     #  AI MODE — LLM-graded numeric scores + FSRS
@@ -625,10 +732,11 @@ def sim_drill_grade(args: dict, **kw) -> str:
             context, user_input, golden_ideal, golden_angle, lang
         )
 
-        # FSRS tracking with AI-calibrated scores
-        scenario_key = _get_sim_var(urn, "current_cue", "")[:80] or "unknown"
-        app_slug = _get_sim_var(urn, "app", "")
-        difficulty = int(_get_sim_var(urn, "difficulty", "1"))
+        # FSRS tracking with AI-calibrated scores (mastery needs fsrs — imported on use)
+        from app.plugins.social.mastery import record_drill
+        scenario_key = state.get("current_cue", "")[:80] or "unknown"
+        app_slug = state.get("app", "")
+        difficulty = int(state.get("difficulty", "1"))
         fsrs_result = record_drill(
             user_urn=urn, scenario_key=scenario_key, app_slug=app_slug,
             difficulty=difficulty, skill=skill, warmth=warmth, lang=lang,
@@ -719,9 +827,9 @@ def sim_freetext(args: dict, **kw) -> str:
 
     # 1. Try RiveBot first (deterministic match)
     try:
-        resp = httpx.post(
-            f"{RIVEBOT_URL}/reply",
-            json={"persona": "social-code", "user": urn, "message": user_input},
+        resp = _rivebot_http().post(
+            "/reply",
+            json={"persona": _PERSONA, "user": urn, "message": user_input},
             timeout=3.0,
         )
         rivebot_reply = resp.json().get("reply", "").strip()
@@ -771,10 +879,9 @@ def sim_set_language(args: dict, **kw) -> str:
 
     # Persist in RiveBot state
     try:
-        httpx.post(
-            f"{RIVEBOT_URL}/set-var",
-            json={"persona": "social-code", "user": urn, "var": "lang", "value": lang},
-            timeout=2.0,
+        _rivebot_http().post(
+            "/set-var",
+            json={"persona": _PERSONA, "user": urn, "var": "lang", "value": lang},
         )
     except Exception as e:
         logger.warning("[sim_set_language] Failed: %s", e)
@@ -793,10 +900,10 @@ def sim_toggle_ai(args: dict, **kw) -> str:
     urn = _get_urn(args)
 
     # Read current state and toggle
-    current = _get_sim_var(urn, "ai_grading", "off").lower()
-    new_state = "off" if current == "on" else "on"
-
-    _set_sim_var(urn, "ai_grading", new_state)
+    with _SimState(urn) as state:
+        current = state.get("ai_grading", "off").lower()
+        new_state = "off" if current == "on" else "on"
+        state.set("ai_grading", new_state)
 
     if new_state == "on":
         return (
@@ -825,6 +932,7 @@ def sim_toggle_ai(args: dict, **kw) -> str:
 )
 def sim_session_summary(args: dict, **kw) -> str:
     """Aggregate session stats from the drill history database."""
+    from app.plugins.social.mastery import get_session_stats
     urn = _get_urn(args)
     stats = get_session_stats(urn, since_minutes=120)
 
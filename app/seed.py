@@ -9,6 +9,7 @@ from sqlmodel import select
 import os
 from app.db import async_session
 from app.models import Persona
+from app.services import persona_cache
 from app.logger import logger
 
 seed_logger = logger.bind(name="PersonaSeed")
@@ -143,6 +144,7 @@ async def seed_personas() -> None:
 
         if inserted:
             await session.commit()
+            persona_cache.invalidate()
             seed_logger.info(f"Persona seeding complete: {inserted} updates")
         else:
             seed_logger.info("Persona seeding: all personas already exist and are up to date")
@@ -5,12 +5,12 @@ Resolution order:
   1. ChannelConfig DB table (phone → persona_id)
   2. Persona slug direct match (e.g., "konex-support")
   3. DEFAULT_PERSONA environment variable
+
+Steps 1–2 read from app.services.persona_cache, not the DB directly.
 """
 
 import os
-from sqlmodel import select
-from app.db import get_session
-from app.models import ChannelConfig, Persona
+from app.services import persona_cache
 from app.logger import logger
 
 api_logger = logger.bind(name="ChannelService")
@@ -23,42 +23,35 @@ async def resolve_persona(channel_or_slug: str) -> tuple[str, str | None]:
     Resolve the configured Persona slug and optional System Prompt Override
     for a given channel phone number or persona slug.
 
+    Served from the in-process persona cache — no DB round-trip unless
+    an admin write invalidated the snapshot.
+
     Returns:
         (persona_slug, system_prompt_override)
     """
     try:
-        async for session in get_session():
-            # 1. Try ChannelConfig match (phone → persona)
-            result = await session.exec(
-                select(ChannelConfig).where(
-                    ChannelConfig.channel_phone == channel_or_slug
-                )
-            )
-            channel_config = result.first()
+        snap = await persona_cache.get_snapshot()
 
-            if channel_config:
-                # Found config — resolve the mapped persona
-                persona = await session.get(Persona, channel_config.persona_id)
-                if persona:
-                    api_logger.info(
-                        f"Channel '{channel_or_slug}' → Persona '{persona.slug}'"
-                    )
-                    return persona.slug, channel_config.system_prompt_override
-                else:
-                    api_logger.warning(
-                        f"Channel '{channel_or_slug}' maps to missing "
-                        f"persona_id '{channel_config.persona_id}'"
-                    )
-
-            # 2. Try Persona slug direct match
-            result = await session.exec(
-                select(Persona).where(Persona.slug == channel_or_slug)
-            )
-            persona = result.first()
+        # 1. Try ChannelConfig match (phone → persona)
+        channel_config = snap.channels.get(channel_or_slug)
+        if channel_config:
+            # Found config — resolve the mapped persona
+            persona = snap.by_id.get(channel_config.persona_id)
             if persona:
-                return persona.slug, None
+                api_logger.info(
+                    f"Channel '{channel_or_slug}' → Persona '{persona.slug}'"
+                )
+                return persona.slug, channel_config.system_prompt_override
+            else:
+                api_logger.warning(
+                    f"Channel '{channel_or_slug}' maps to missing "
+                    f"persona_id '{channel_config.persona_id}'"
+                )
 
-            break
+        # 2. Try Persona slug direct match
+        persona = snap.by_slug.get(channel_or_slug)
+        if persona:
+            return persona.slug, None
     except Exception as e:
         api_logger.error(f"Error resolving persona: {e}")
 
@@ -0,0 +1,203 @@
+"""
+In-process Persona / ChannelConfig cache.
+
+The chat hot path used to hit the DB 4–6 times per message (channel lookup,
+slug lookup, allowed_urns check, prompt registry by slug then by id). Both
+tables are tiny and only change on admin writes, so we load them whole into
+an immutable snapshot and serve every lookup from memory.
+
+Invalidation is versioned: writers call ``invalidate()`` (safe from sync
+tool threads and async routes alike), which bumps a counter. The next
+reader sees a stale version and reloads the snapshot in a single session.
+A TTL acts as a safety net for writes made by other processes (e.g. the
+seed_personas.py script).
+
+Writers that must invalidate:
+  - macro_persona / macro_channel (app/graph/tools/config.py)
+  - /v1/personas CRUD routes (app/api/personas.py)
+  - seed_personas() on startup (app/seed.py)
+"""
+
+import asyncio
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Optional
+
+from sqlmodel import select
+
+from app.db import async_session
+from app.models import ChannelConfig, Persona
+from app.logger import logger
+
+cache_logger = logger.bind(name="PersonaCache")
+
+_TTL = float(os.getenv("PERSONA_CACHE_TTL", "300"))  # seconds
+
+
+def _parse_json_list(value) -> list:
+    """JSON columns may come back as strings on SQLite — normalize to list."""
+    if not value:
+        return []
+    if isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except Exception:
+            return []
+    return list(value) if isinstance(value, (list, tuple)) else []
+
+
+@dataclass(frozen=True)
+class CachedPersona:
+    """Immutable copy of a Persona row with pre-parsed JSON columns."""
+    id: str
+    slug: str
+    name: str
+    personality: str
+    style: str
+    language: str
+    system_prompt: Optional[str]
+    allowed_tools: tuple[str, ...]
+    allowed_urns: frozenset[str]
+
+    @classmethod
+    def from_row(cls, p: Persona) -> "CachedPersona":
+        return cls(
+            id=p.id,
+            slug=p.slug,
+            name=p.name,
+            personality=p.personality,
+            style=p.style,
+            language=p.language,
+            system_prompt=p.system_prompt,
+            allowed_tools=tuple(_parse_json_list(p.allowed_tools)),
+            allowed_urns=frozenset(_parse_json_list(p.allowed_urns)),
+        )
+
+    def prompt_vars(self) -> dict:
+        """Dict format expected by PersonaPromptRegistry / _build_system_prompt."""
+        return {
+            "persona_name": self.name,
+            "persona_personality": self.personality,
+            "persona_style": self.style,
+            "allowed_tools": list(self.allowed_tools),
+            "allowed_urns": sorted(self.allowed_urns),
+        }
+
+    def allows(self, urn: str) -> bool:
+        """Access check — empty allowed_urns means public."""
+        return not self.allowed_urns or urn in self.allowed_urns
+
+
+@dataclass(frozen=True)
+class CachedChannel:
+    """Immutable copy of a ChannelConfig row."""
+    channel_phone: str
+    persona_id: str
+    system_prompt_override: Optional[str]
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    """Point-in-time view of both tables, indexed for O(1) lookups."""
+    version: int
+    loaded_at: float
+    by_slug: dict[str, CachedPersona] = field(default_factory=dict)
+    by_id: dict[str, CachedPersona] = field(default_factory=dict)
+    channels: dict[str, CachedChannel] = field(default_factory=dict)
+
+    def persona(self, slug_or_id: str) -> Optional[CachedPersona]:
+        """Lookup by slug first, then by id (UUID refs from ChannelConfig)."""
+        return self.by_slug.get(slug_or_id) or self.by_id.get(slug_or_id)
+
+
+# ── Module state ─────────────────────────────────────────────────────────────
+
+_version = 0
+_version_lock = threading.Lock()
+_snapshot: Optional[Snapshot] = None
+_reload_lock: Optional[asyncio.Lock] = None
+
+
+def invalidate() -> None:
+    """Mark the cache stale. Call after any Persona/ChannelConfig write."""
+    global _version
+    with _version_lock:
+        _version += 1
+
+
+def _is_fresh(snap: Optional[Snapshot]) -> bool:
+    return (
+        snap is not None
+        and snap.version == _version
+        and time.monotonic() - snap.loaded_at < _TTL
+    )
+
+
+async def _load(version: int) -> Snapshot:
+    """Read both tables in one session."""
+    async with async_session() as session:
+        personas = (await session.execute(select(Persona))).scalars().all()
+        channels = (await session.execute(select(ChannelConfig))).scalars().all()
+
+    cached = [CachedPersona.from_row(p) for p in personas]
+    return Snapshot(
+        version=version,
+        loaded_at=time.monotonic(),
+        by_slug={p.slug: p for p in cached if p.slug},
+        by_id={p.id: p for p in cached},
+        channels={
+            c.channel_phone: CachedChannel(
+                channel_phone=c.channel_phone,
+                persona_id=c.persona_id,
+                system_prompt_override=c.system_prompt_override,
+            )
+            for c in channels
+        },
+    )
+
+
+async def get_snapshot() -> Snapshot:
+    """Return a fresh snapshot, reloading from the DB only when stale.
+
+    Raises whatever the DB layer raises on reload — callers keep their
+    existing fallbacks (default persona / static prompt registry).
+    """
+    global _snapshot, _reload_lock
+    snap = _snapshot
+    if _is_fresh(snap):
+        return snap
+
+    if _reload_lock is None:
+        _reload_lock = asyncio.Lock()
+    async with _reload_lock:
+        # Another coroutine may have reloaded while we waited
+        if _is_fresh(_snapshot):
+            return _snapshot
+        version = _version  # capture before reading — a concurrent write re-stales us
+        _snapshot = await _load(version)
+        cache_logger.info(
+            f"Loaded v{version}: {len(_snapshot.by_id)} personas, "
+            f"{len(_snapshot.channels)} channels"
+        )
+        return _snapshot
+
+
+async def get_persona(slug_or_id: str) -> Optional[CachedPersona]:
+    """Convenience wrapper: cached persona by slug or id, or None."""
+    return (await get_snapshot()).persona(slug_or_id)
+
+
+def stats() -> dict:
+    """Cache state for admin/debug endpoints."""
+    snap = _snapshot
+    return {
+        "version": _version,
+        "snapshot_version": snap.version if snap else None,
+        "fresh": _is_fresh(snap),
+        "personas": len(snap.by_id) if snap else 0,
+        "channels": len(snap.channels) if snap else 0,
+        "age_seconds": round(time.monotonic() - snap.loaded_at, 1) if snap else None,
+    }
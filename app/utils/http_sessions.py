@@ -0,0 +1,116 @@
+"""
+Shared keep-alive ``requests`` sessions for the sync tool backends.
+
+CRM commands (app/graph/tools/rapidpro.py) and Organized queries
+(app/graph/tools/organized.py) run in tool executor threads and used the
+module-level ``requests.get/post``: every call paid a fresh TCP + TLS
+handshake to RAPIDPRO_HOST or ORGANIZED_URL. Each backend now gets one
+``requests.Session`` with a bounded connection pool and a retry policy,
+shared by all threads (the async counterpart is
+app/api/middleware/http_clients.py).
+
+Retry policy per backend:
+  - connection failures are retried for every method (nothing was sent)
+  - 502/503/504 (and RapidPro's 429, honouring Retry-After) are retried
+    with exponential backoff only for methods that are safe to repeat:
+    GET for RapidPro (POST creates groups), GET and POST for Organized,
+    whose webhook query endpoint is read-only
+  - no single wait (backoff or Retry-After) exceeds HTTP_SESSION_MAX_WAIT,
+    so retries fit inside the caller's tool deadline (TOOL_TIMEOUT)
+    instead of sleeping on in a thread whose caller already got a 504
+
+Sessions are created lazily and closed from the FastAPI lifespan.
+
+Tunables (env):
+  HTTP_SESSION_POOL_SIZE  — connections kept per backend (default 10)
+  HTTP_SESSION_RETRIES    — retries per request (default 2)
+  HTTP_SESSION_BACKOFF    — backoff factor in seconds (default 0.3 → 0.3s, 0.6s, …)
+  HTTP_SESSION_MAX_WAIT   — cap on any one retry wait in seconds (default 5)
+"""
+
+import os
+import threading
+from typing import Dict
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+_POOL_SIZE = int(os.getenv("HTTP_SESSION_POOL_SIZE", "10"))
+_RETRIES = int(os.getenv("HTTP_SESSION_RETRIES", "2"))
+_BACKOFF = float(os.getenv("HTTP_SESSION_BACKOFF", "0.3"))
+_MAX_WAIT = float(os.getenv("HTTP_SESSION_MAX_WAIT", "5"))
+
+RAPIDPRO = "rapidpro"
+ORGANIZED = "organized"
+
+# backend → (methods retried on a bad status / read error, statuses retried)
+_POLICIES = {
+    RAPIDPRO: (frozenset({"GET", "HEAD"}), (429, 502, 503, 504)),
+    ORGANIZED: (frozenset({"GET", "HEAD", "POST"}), (502, 503, 504)),
+}
+
+_lock = threading.Lock()
+_sessions: Dict[str, requests.Session] = {}
+
+
+class _CappedRetry(Retry):
+    """Retry whose Retry-After waits are capped like its backoff."""
+
+    def get_retry_after(self, response):
+        seconds = super().get_retry_after(response)
+        return None if seconds is None else min(seconds, self.backoff_max)
+
+
+def _build_session(name: str) -> requests.Session:
+    methods, statuses = _POLICIES[name]
+    retry = _CappedRetry(
+        total=_RETRIES,
+        connect=_RETRIES,
+        read=_RETRIES,
+        status=_RETRIES,
+        backoff_factor=_BACKOFF,
+        backoff_max=_MAX_WAIT,
+        status_forcelist=statuses,
+        allowed_methods=methods,
+        respect_retry_after_header=True,
+        raise_on_status=False,  # hand the last response back to the caller
+    )
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=_POOL_SIZE, max_retries=retry)
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def session(name: str) -> requests.Session:
+    """Return the shared session for a backend (RAPIDPRO or ORGANIZED)."""
+    s = _sessions.get(name)
+    if s is None:
+        with _lock:
+            s = _sessions.get(name)
+            if s is None:
+                s = _sessions[name] = _build_session(name)
+    return s
+
+
+def close_all() -> None:
+    """Close every session and its pooled connections (lifespan shutdown)."""
+    with _lock:
+        sessions = list(_sessions.values())
+        _sessions.clear()
+    for s in sessions:
+        s.close()
+
+
+def stats() -> Dict[str, dict]:
+    """Pool configuration per open backend session (/health/state)."""
+    return {
+        name: {
+            "pool_size": _POOL_SIZE,
+            "retries": _RETRIES,
+            "max_wait": _MAX_WAIT,
+            "retry_methods": sorted(_POLICIES[name][0]),
+        }
+        for name in _sessions
+    }
@@ -0,0 +1,230 @@
+"""
+Minimal Prometheus-style metrics — counters, histograms and callback gauges
+rendered in the text exposition format (version 0.0.4) by ``GET /metrics``.
+
+Kept in-process and dependency-free: the gateway runs on edge boxes where
+adding prometheus_client (and its multiprocess machinery) buys nothing for
+a single uvicorn worker. All metric types are thread-safe — Hermes workers
+and tool threads record alongside the event loop.
+
+Usage:
+    from app.utils import metrics
+
+    with metrics.CHAT_STAGE_SECONDS.time(stage="parse"):
+        ...
+    metrics.HERMES_RATE_LIMITED.inc(scope="urn")
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Sequence, Tuple
+
+_registry: List["_Metric"] = []
+_registry_lock = threading.Lock()
+
+# Latency buckets in seconds: sub-ms cache hits up to multi-minute agent loops
+DEFAULT_BUCKETS = (
+    0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+    1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0,
+)
+
+
+def _label_key(labelnames: Sequence[str], labels: dict) -> Tuple[str, ...]:
+    if set(labels) != set(labelnames):
+        raise ValueError(f"expected labels {tuple(labelnames)}, got {tuple(labels)}")
+    return tuple(str(labels[name]) for name in labelnames)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(pairs: Sequence[Tuple[str, str]]) -> str:
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        with _registry_lock:
+            _registry.append(self)
+
+    def _samples(self) -> Iterator[Tuple[str, Sequence[Tuple[str, str]], float]]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.kind}",
+        ]
+        for name, labels, value in self._samples():
+            lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines)
+
+
+class Counter(_Metric):
+    """Monotonically increasing count, optionally labelled."""
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = _label_key(self.labelnames, labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(_label_key(self.labelnames, labels), 0)
+
+    def _samples(self):
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            yield f"{self.name}_total", list(zip(self.labelnames, key)), value
+
+
+class Histogram(_Metric):
+    """Cumulative-bucket latency histogram, optionally labelled."""
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+        # key → [bucket counts..., sum, count]
+        self._values: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        key = _label_key(self.labelnames, labels)
+        with self._lock:
+            series = self._values.get(key)
+            if series is None:
+                series = self._values[key] = [0] * len(self.buckets) + [0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+                    break
+            series[-2] += value
+            series[-1] += 1
+
+    @contextmanager
+    def time(self, **labels) -> Iterator[None]:
+        """Observe the wall time of a ``with`` block (including early returns)."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def count(self, **labels) -> int:
+        with self._lock:
+            series = self._values.get(_label_key(self.labelnames, labels))
+            return series[-1] if series else 0
+
+    def _samples(self):
+        with self._lock:
+            items = sorted((k, list(v)) for k, v in self._values.items())
+        for key, series in items:
+            base = list(zip(self.labelnames, key))
+            cumulative = 0
+            for bound, n in zip(self.buckets, series):
+                cumulative += n
+                yield f"{self.name}_bucket", base + [("le", _format_value(bound))], cumulative
+            yield f"{self.name}_sum", base, series[-2]
+            yield f"{self.name}_count", base, series[-1]
+
+
+class Gauge(_Metric):
+    """Point-in-time value read from a callback at scrape time.
+
+    The callback returns either a number or a ``{label_value: number}``
+    dict for a single-label gauge.
+    """
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, fn: Callable[[], object], labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._fn = fn
+
+    def _samples(self):
+        try:
+            value = self._fn()
+        except Exception:
+            return
+        if isinstance(value, dict):
+            for label, v in sorted(value.items()):
+                yield self.name, [(self.labelnames[0], str(label))], v
+        else:
+            yield self.name, [], value
+
+
+def render() -> str:
+    """All registered metrics in Prometheus text format."""
+    with _registry_lock:
+        metrics = list(_registry)
+    return "\n".join(m.render() for m in metrics) + "\n"
+
+
+# ── Gateway metrics ──────────────────────────────────────────────────────────
+# Declared here so every layer (adapter, engine, breaker) shares one set.
+
+CHAT_REQUEST_SECONDS = Histogram(
+    "gateway_chat_request_seconds",
+    "End-to-end /v1/chat/completions latency.",
+)
+CHAT_STAGE_SECONDS = Histogram(
+    "gateway_chat_stage_seconds",
+    "Latency of each chat pipeline stage.",
+    labelnames=("stage",),
+)
+CHAT_RESPONSES = Counter(
+    "gateway_chat_responses",
+    "Chat responses by pipeline exit (id prefix of the completion).",
+    labelnames=("route",),
+)
+HERMES_DEDUP_HITS = Counter(
+    "gateway_hermes_dedup_hits",
+    "Messages answered from an identical in-flight invocation.",
+)
+HERMES_RATE_LIMITED = Counter(
+    "gateway_hermes_rate_limited",
+    "Messages dropped by the Hermes rate limits.",
+    labelnames=("scope",),
+)
+HERMES_QUEUE_REJECTED = Counter(
+    "gateway_hermes_queue_rejected",
+    "Messages refused a Hermes slot (busy, evicted by a heavier tier, or expired).",
+    labelnames=("tier", "reason"),
+)
+HERMES_ADMISSION_WAIT = Histogram(
+    "gateway_hermes_admission_wait_seconds",
+    "Time from arrival at the Hermes scheduler to being granted a slot.",
+    labelnames=("tier",),
+)
+BREAKER_TRANSITIONS = Counter(
+    "gateway_breaker_transitions",
+    "Circuit breaker state transitions.",
+    labelnames=("from_state", "to_state"),
+)
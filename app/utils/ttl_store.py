@@ -0,0 +1,250 @@
+"""
+Bounded, TTL-evicting in-process state.
+
+Several hot-path maps (per-URN rate limits, persona preferences, the sim
+state fallback) used to be plain dicts that only ever grew — a slow leak
+under the 800MB MemoryMax. They now share two structures:
+
+  TTLStore              — dict-like map with a fixed TTL and a size cap.
+                          Entries live in an OrderedDict in expiry order:
+                          every store has one TTL, so a write (or a
+                          sliding read) moves the key to the back and the
+                          front is always the next to expire. Expiry pops
+                          from the front — amortized O(1), no scans, no heap.
+                          With lru=True reads reorder by recency instead
+                          (read caches): the cap then evicts the least
+                          recently used entry and expiry is checked lazily.
+  SlidingWindowCounter  — fixed ring of time buckets for "N events per
+                          window" limits. Constant memory, O(1) amortized.
+
+Every instance registers itself by name; ``stats()`` reports sizes,
+evictions and approximate memory for health/metrics endpoints.
+"""
+
+import sys
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from typing import Any, Dict, Hashable
+
+_MISSING = object()
+
+# name → store, for stats(); weak so short-lived stores (tests) don't linger
+_registry: "weakref.WeakValueDictionary[str, Any]" = weakref.WeakValueDictionary()
+
+
+class _Entry:
+    __slots__ = ("value", "expires")
+
+    def __init__(self, value: Any, expires: float):
+        self.value = value
+        self.expires = expires
+
+
+_ENTRY_BYTES = sys.getsizeof(_Entry(None, 0.0))
+
+
+class TTLStore:
+    """Thread-safe map whose entries expire ``ttl`` seconds after their last write.
+
+    Args:
+        name: Registry name reported by ``stats()``.
+        ttl: Seconds an entry stays valid.
+        maxsize: Hard cap; the entry closest to expiry is evicted first.
+        sliding: If True, reads also refresh the TTL (idle timeout rather
+            than absolute lifetime).
+        lru: If True, reads move an entry to the back without extending
+            its lifetime, so the cap evicts the least recently used entry.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        ttl: float,
+        maxsize: int = 10_000,
+        sliding: bool = False,
+        lru: bool = False,
+    ):
+        self.name = name
+        self.ttl = float(ttl)
+        self.maxsize = maxsize
+        self.sliding = sliding
+        self.lru = lru
+        self._data: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+        self.expirations = 0
+        self.hits = 0
+        self.misses = 0
+        _registry[name] = self
+
+    # ── internals (call with _lock held) ────────────────────────────────────
+
+    def _expire(self, now: float) -> None:
+        # In LRU order the front is the coldest entry, not the next to
+        # expire — popping expired ones there is only a best-effort sweep
+        data = self._data
+        while data:
+            entry = next(iter(data.values()))
+            if entry.expires > now:
+                break
+            data.popitem(last=False)
+            self.expirations += 1
+
+    # ── public API ─────────────────────────────────────────────────────────
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        now = time.monotonic()
+        with self._lock:
+            self._expire(now)
+            entry = self._data.get(key)
+            if entry is not None and entry.expires <= now:
+                del self._data[key]
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return default
+            self.hits += 1
+            if self.sliding:
+                entry.expires = now + self.ttl
+                self._data.move_to_end(key)
+            elif self.lru:
+                self._data.move_to_end(key)
+            return entry.value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self._expire(now)
+            entry = self._data.pop(key, None)
+            if entry is None:
+                entry = _Entry(value, now + self.ttl)
+            else:
+                entry.value, entry.expires = value, now + self.ttl
+            self._data[key] = entry
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    __setitem__ = set
+
+    def __getitem__(self, key: Hashable) -> Any:
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.pop(key, None)
+        return default if entry is None or entry.expires <= time.monotonic() else entry.value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._expire(time.monotonic())
+            return len(self._data)
+
+    def stats(self) -> dict:
+        with self._lock:
+            self._expire(time.monotonic())
+            entries = len(self._data)
+            approx = sys.getsizeof(self._data) + entries * _ENTRY_BYTES
+            return {
+                "kind": "ttl",
+                "entries": entries,
+                "maxsize": self.maxsize,
+                "ttl_seconds": self.ttl,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hits": self.hits,
+                "misses": self.misses,
+                "approx_bytes": approx,
+            }
+
+
+class SlidingWindowCounter:
+    """Event count over the last ``window`` seconds, in ``buckets`` slots.
+
+    Resolution is ``window / buckets`` seconds — events are forgotten one
+    bucket at a time rather than one timestamp at a time.
+    """
+
+    def __init__(self, name: str, window: float = 60.0, buckets: int = 60):
+        self.name = name
+        self.window = float(window)
+        self._width = self.window / buckets
+        self._counts = [0] * buckets
+        self._total = 0
+        self._head = int(time.monotonic() / self._width)  # absolute index of newest bucket
+        self._lock = threading.Lock()
+        _registry[name] = self
+
+    def _advance(self, now: float) -> None:
+        current = int(now / self._width)
+        steps = current - self._head
+        if steps <= 0:
+            return
+        n = len(self._counts)
+        if steps >= n:
+            self._counts = [0] * n
+            self._total = 0
+        else:
+            for i in range(self._head + 1, current + 1):
+                slot = i % n
+                self._total -= self._counts[slot]
+                self._counts[slot] = 0
+        self._head = current
+
+    def count(self) -> int:
+        with self._lock:
+            self._advance(time.monotonic())
+            return self._total
+
+    def hit(self) -> int:
+        """Record one event; returns the new count."""
+        with self._lock:
+            self._advance(time.monotonic())
+            self._counts[self._head % len(self._counts)] += 1
+            self._total += 1
+            return self._total
+
+    def try_acquire(self, limit: int) -> bool:
+        """Record an event only if the window holds fewer than ``limit``."""
+        with self._lock:
+            self._advance(time.monotonic())
+            if self._total >= limit:
+                return False
+            self._counts[self._head % len(self._counts)] += 1
+            self._total += 1
+            return True
+
+    def stats(self) -> dict:
+        with self._lock:
+            self._advance(time.monotonic())
+            return {
+                "kind": "window",
+                "count": self._total,
+                "window_seconds": self.window,
+                "buckets": len(self._counts),
+                "approx_bytes": sys.getsizeof(self._counts),
+            }
+
+
+def stats() -> Dict[str, dict]:
+    """Per-store size and memory figures, keyed by registry name."""
+    return {name: store.stats() for name, store in sorted(_registry.items())}
+
+
+def total_bytes() -> int:
+    """Approximate bytes held by all registered stores."""
+    return sum(s.get("approx_bytes", 0) for s in stats().values())
+
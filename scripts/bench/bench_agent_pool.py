@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: time-to-first-response, fresh vs pooled AIAgent.
+
+Runs the same short prompt through engine._invoke_sync N times for a set
+of distinct users and compares:
+
+  fresh  — HERMES_AGENT_POOL=0 (construct an AIAgent per message, old behaviour)
+  pooled — warm agents leased from app/hermes/agent_pool.py
+
+Each sample is wall time from call to final response, so it includes
+AIAgent construction (SOUL.md, skills prompt, tool schemas, provider
+client) plus one LLM round trip. Point LITELLM_BASE_URL at a local/mock
+endpoint to isolate the construction cost.
+
+Requires a Hermes install (run_agent importable) and a configured LLM.
+
+Usage:
+    cd /opt/iiab/ai-gateway
+    python scripts/bench/bench_agent_pool.py [--messages 20] [--persona default]
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from app.hermes import agent_pool, engine  # noqa: E402
+
+
+def _run(label: str, messages: int, persona: str, toolsets: list[str]) -> list[float]:
+    samples = []
+    for i in range(messages):
+        urn = f"bench:{label}:{i % 4}"  # a few users — pooled agents are shared across them
+        start = time.perf_counter()
+        engine._invoke_sync(
+            message="Reply with the single word: ok",
+            urn=urn,
+            persona=persona,
+            allowed_tools=toolsets or None,
+            system_prompt="You are a benchmark. Answer tersely.",
+        )
+        samples.append((time.perf_counter() - start) * 1000)
+        engine.session_store.delete_session(engine.get_session_id(urn, persona))
+    return samples
+
+
+def _summary(label: str, samples: list[float]) -> None:
+    ordered = sorted(samples)
+    p95 = ordered[max(0, int(len(ordered) * 0.95) - 1)]
+    print(
+        f"{label:>7}: first={samples[0]:7.1f}ms  median={statistics.median(samples):7.1f}ms  "
+        f"p95={p95:7.1f}ms  n={len(samples)}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--messages", type=int, default=20)
+    parser.add_argument("--persona", default="default")
+    parser.add_argument("--toolsets", default="", help="comma-separated, empty = no tools")
+    args = parser.parse_args()
+    toolsets = [t for t in args.toolsets.split(",") if t]
+
+    agent_pool._ENABLED = False
+    fresh = _run("fresh", args.messages, args.persona, toolsets)
+
+    agent_pool._ENABLED = True
+    agent_pool.clear()
+    pooled = _run("pooled", args.messages, args.persona, toolsets)
+
+    _summary("fresh", fresh)
+    _summary("pooled", pooled)
+    print(f"\npool: {agent_pool.stats()}")
+
+
+if __name__ == "__main__":
+    main()
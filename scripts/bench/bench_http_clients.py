@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: per-message upstream latency, fresh vs pooled httpx clients.
+
+Simulates the RiveBot/WuzAPI calls one WhatsApp message makes on the
+chat path (match + set-vars + set-topic + 2 reactions) against a local
+keep-alive HTTP/1.1 server, and compares:
+
+  fresh  — new httpx.AsyncClient per call (old behaviour)
+  pooled — one shared client per upstream (app/api/middleware/http_clients.py)
+
+The local server answers instantly, so the numbers isolate client-side
+connection setup cost. Over a real network (TLS, WAN RTT) the gap widens.
+
+Usage:
+    cd /opt/iiab/ai-gateway
+    python scripts/bench/bench_http_clients.py [--messages 200]
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+CALLS_PER_MESSAGE = ["/match", "/set-vars", "/set-topic", "/chat/react", "/chat/react"]
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    disable_nagle_algorithm = True  # headers + body are separate writes
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        self.rfile.read(length)
+        body = json.dumps({"matched": False, "context": {}}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+async def _message_fresh(base: str) -> float:
+    start = time.perf_counter()
+    for path in CALLS_PER_MESSAGE:
+        async with httpx.AsyncClient(timeout=5.0) as client:
+            await client.post(f"{base}{path}", json={"user": "bench"})
+    return time.perf_counter() - start
+
+
+async def _message_pooled(base: str) -> float:
+    from app.api.middleware.http_clients import get_client, RIVEBOT, WUZAPI
+
+    start = time.perf_counter()
+    for path in CALLS_PER_MESSAGE:
+        name = WUZAPI if path.startswith("/chat") else RIVEBOT
+        await get_client(name).post(f"{base}{path}", json={"user": "bench"}, timeout=5.0)
+    return time.perf_counter() - start
+
+
+def _report(label: str, samples: list[float]) -> None:
+    ms = sorted(s * 1000 for s in samples)
+    p95 = ms[int(len(ms) * 0.95) - 1]
+    print(f"  {label:<7} mean={statistics.mean(ms):6.2f}ms  p50={statistics.median(ms):6.2f}ms  p95={p95:6.2f}ms")
+
+
+async def main(messages: int) -> None:
+    from app.api.middleware import http_clients
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+
+    await http_clients.startup()
+    try:
+        # Warm-up both paths
+        await _message_fresh(base)
+        await _message_pooled(base)
+
+        fresh = [await _message_fresh(base) for _ in range(messages)]
+        pooled = [await _message_pooled(base) for _ in range(messages)]
+    finally:
+        await http_clients.shutdown()
+        server.shutdown()
+
+    print(f"📊 {messages} messages × {len(CALLS_PER_MESSAGE)} upstream calls each")
+    _report("fresh", fresh)
+    _report("pooled", pooled)
+    speedup = statistics.mean(fresh) / statistics.mean(pooled)
+    print(f"  → pooled is {speedup:.1f}× faster per message")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--messages", type=int, default=200)
+    asyncio.run(main(parser.parse_args().messages))
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: FSRS drill grades per second, connect-per-call vs pooled.
+
+Calls mastery.record_drill (followed by get_session_stats, as the drill
+scorecard does) from --threads threads against the configured Postgres
+and compares:
+
+  connect — a fresh psycopg2.connect() per call (old behaviour)
+  pooled  — connections leased from the shared pool in
+            app/plugins/social/mastery.py
+
+record_drill now does one read plus one combined write (history insert +
+schedule upsert in a single CTE); the old code ran four statements and a
+COMMIT over a new connection.
+
+Rows are written under bench:* URNs and deleted afterwards.
+Requires psycopg2, fsrs and a reachable DATABASE_URL.
+
+Usage:
+    cd /opt/iiab/ai-gateway
+    python scripts/bench/bench_mastery.py [--grades 500] [--threads 8]
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from app.plugins.social import mastery  # noqa: E402
+
+
+@contextmanager
+def _fresh_connection():
+    import psycopg2
+
+    conn = psycopg2.connect(mastery._dsn())
+    conn.autocommit = True
+    try:
+        yield conn
+    finally:
+        conn.close()
+
+
+def _grade(i: int) -> float:
+    urn = f"bench:user:{i % 20}"
+    start = time.perf_counter()
+    mastery.record_drill(urn, f"bench_scenario_{i % 7}", "bench", 1, 60 + i % 40, 70, "en")
+    mastery.get_session_stats(urn, since_minutes=5)
+    return time.perf_counter() - start
+
+
+def _run(label: str, grades: int, threads: int) -> None:
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        samples = list(pool.map(_grade, range(grades)))
+    elapsed = time.perf_counter() - start
+    ms = sorted(s * 1000 for s in samples)
+    p95 = ms[max(0, int(len(ms) * 0.95) - 1)]
+    print(
+        f"  {label:<8} {grades / elapsed:8.1f} grades/s  "
+        f"p50={statistics.median(ms):6.2f}ms  p95={p95:6.2f}ms"
+    )
+
+
+def _cleanup() -> None:
+    with mastery._connection() as conn, conn.cursor() as cur:
+        cur.execute("DELETE FROM social_drill_history WHERE user_urn LIKE 'bench:%'")
+        cur.execute("DELETE FROM social_card_schedule WHERE user_urn LIKE 'bench:%'")
+
+
+def main(grades: int, threads: int) -> None:
+    mastery.ensure_tables()
+    pooled_connection = mastery._connection
+    print(f"📊 {grades} grades from {threads} threads")
+    try:
+        mastery._connection = _fresh_connection
+        _run("connect", grades, threads)
+        mastery._connection = pooled_connection
+        _run("pooled", grades, threads)
+    finally:
+        mastery._connection = pooled_connection
+        _cleanup()
+        mastery.close_pool()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--grades", type=int, default=500)
+    parser.add_argument("--threads", type=int, default=8)
+    args = parser.parse_args()
+    main(args.grades, args.threads)
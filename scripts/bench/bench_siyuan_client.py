@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: crm_lookup_contact enrichment latency, serial vs fan-out.
+
+Runs _handle_crm_lookup_enriched against a local keep-alive server that
+plays both RapidPro (GET /api/v2/contacts.json) and SiYuan (POST /api/...),
+each answering after --latency-ms to stand in for real upstream time.
+Two cases are measured:
+
+  serial  — siyuan_gather forced to run calls one after another (old behaviour:
+            RapidPro lookup, then wiki search, then page read)
+  fan-out — RapidPro lookup and the wiki phone search overlap on the
+            pooled SiYuan client (app/hooks/siyuan_tools.py)
+
+It also hammers _siyuan_request from --threads threads to check the
+pooled client under contention (every response must parse).
+
+The local mirror is disabled so every wiki read goes over HTTP.
+Requires a Hermes install (app.hermes.tools imports tools.registry).
+
+Usage:
+    cd /opt/iiab/ai-gateway
+    python scripts/bench/bench_siyuan_client.py [--lookups 50] [--latency-ms 20]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+PHONE = "50937000001"
+LATENCY = 0.02
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    disable_nagle_algorithm = True
+
+    def _reply(self, payload: dict) -> None:
+        time.sleep(LATENCY)
+        body = json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):  # RapidPro
+        self._reply({"results": [{
+            "name": "Marie Pierre", "uuid": "0123456789", "language": "hat",
+            "groups": [{"name": "Pioneers"}], "fields": {},
+        }]})
+
+    def do_POST(self):  # SiYuan
+        length = int(self.headers.get("Content-Length", 0))
+        self.rfile.read(length)
+        if self.path.endswith("/search/fullTextSearchBlock"):
+            data = {"blocks": [{
+                "id": "20260101000000-person", "box": "nb1",
+                "content": f"whatsapp:{PHONE}", "hPath": "/people/marie-pierre",
+            }]}
+        elif self.path.endswith("/export/exportMdContent"):
+            data = {"content": "# Marie Pierre\n\nBirthday: 03-14\n"}
+        else:
+            data = {}
+        self._reply({"code": 0, "msg": "", "data": data})
+
+    def log_message(self, *args):
+        pass
+
+
+def _lookup() -> float:
+    from app.hermes.tools import _handle_crm_lookup_enriched
+
+    start = time.perf_counter()
+    result = _handle_crm_lookup_enriched({"phone": PHONE})
+    assert "Wiki Page" in result, result
+    return time.perf_counter() - start
+
+
+def _report(label: str, samples: list[float]) -> None:
+    ms = sorted(s * 1000 for s in samples)
+    p95 = ms[max(0, int(len(ms) * 0.95) - 1)]
+    print(f"  {label:<8} mean={statistics.mean(ms):7.2f}ms  p50={statistics.median(ms):7.2f}ms  p95={p95:7.2f}ms")
+
+
+def main(lookups: int, threads: int) -> None:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    os.environ["RAPIDPRO_HOST"] = base
+    os.environ["SIYUAN_API_URL"] = base
+    os.environ["SIYUAN_MIRROR_DB"] = ""
+
+    from app.hooks import siyuan_tools
+
+    real_gather = siyuan_tools.siyuan_gather
+    serial_gather = lambda *calls: [call() for call in calls]  # noqa: E731
+
+    try:
+        _lookup()  # warm-up: connections, imports
+        siyuan_tools.siyuan_gather = serial_gather
+        serial = [_lookup() for _ in range(lookups)]
+        siyuan_tools.siyuan_gather = real_gather
+        fanout = [_lookup() for _ in range(lookups)]
+
+        # Contention: many tool threads sharing the pooled client at once
+        calls = threads * 10
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            results = list(pool.map(
+                lambda _: siyuan_tools._siyuan_request("query/sql", {"stmt": "SELECT 1"}),
+                range(calls),
+            ))
+        elapsed = time.perf_counter() - start
+    finally:
+        siyuan_tools.siyuan_gather = real_gather
+        server.shutdown()
+
+    print(f"📊 {lookups} enriched lookups, {LATENCY * 1000:.0f}ms per upstream call")
+    _report("serial", serial)
+    _report("fan-out", fanout)
+    print(f"  → fan-out is {statistics.mean(serial) / statistics.mean(fanout):.2f}× faster per lookup")
+    ok = sum(1 for r in results if r.get("code") == 0)
+    print(f"📊 {calls} requests from {threads} threads: {ok}/{calls} ok in {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--lookups", type=int, default=50)
+    parser.add_argument("--latency-ms", type=float, default=20)
+    parser.add_argument("--threads", type=int, default=16)
+    args = parser.parse_args()
+    LATENCY = args.latency_ms / 1000
+    main(args.lookups, args.threads)
@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+Session Journal Migration
+
+Converts every legacy Hermes ``session_<id>.json`` file into an append-only
+``session_<id>.jsonl`` journal (see app/memory/session_store.py). Sessions
+are also migrated lazily on first access, so running this is optional —
+it just front-loads the work during a maintenance window instead of on
+the first message after deploy.
+
+Safe to re-run: sessions that already have a journal are skipped. Legacy
+files are left in place (Hermes keeps writing them).
+
+Usage:
+    cd /opt/iiab/ai-gateway
+    source .env
+    python scripts/tools/migrate_sessions.py
+"""
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from app.memory import session_store  # noqa: E402
+
+
+def main() -> int:
+    print(f"📂 Sessions dir: {session_store._sessions_dir}")
+    start = time.perf_counter()
+    count = session_store.migrate_all()
+    elapsed = time.perf_counter() - start
+    print(f"✅ Migrated {count} session(s) in {elapsed:.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,81 @@
+"""
+Agent pool — warm reuse per key, per-call state applied on reuse, and
+agents that raised or can't rebind to a new session never going back
+into the pool.
+"""
+
+import pytest
+
+from app.hermes import agent_pool
+
+
+class _PlainAgent:
+    """A Hermes build without reset_session_state()."""
+
+    def __init__(self, session_id):
+        self.session_id = session_id
+        self.user_id = session_id
+        self.ephemeral_system_prompt = None
+        self.log_path = f"session_{session_id}.json"
+
+
+class _Agent(_PlainAgent):
+    resets = 0
+
+    def reset_session_state(self):
+        self.resets += 1
+        self.log_path = f"session_{self.session_id}.json"
+
+
+@pytest.fixture(autouse=True)
+def _pool(monkeypatch):
+    monkeypatch.setattr(agent_pool, "_ENABLED", True)
+    agent_pool.clear()
+    yield
+    agent_pool.clear()
+
+
+def _call(key, session_id, built, cls=_Agent):
+    def factory():
+        built.append(session_id)
+        return cls(session_id)
+
+    per_call = {"session_id": session_id, "user_id": session_id, "ephemeral_system_prompt": None}
+    with agent_pool.lease(key, factory, per_call) as agent:
+        return agent
+
+
+def test_reused_agent_gets_the_new_calls_identity():
+    built = []
+    first = _call("persona-a", "a", built)
+    second = _call("persona-a", "b", built)
+    assert built == ["a"]
+    assert first is second
+    assert (second.session_id, second.user_id, second.resets) == ("b", "b", 1)
+    assert second.log_path == "session_b.json"  # rebuilt for the new session
+    assert _call("persona-b", "c", built) is not first  # keys don't share agents
+
+
+def test_agent_that_raised_is_not_pooled():
+    built = []
+
+    def factory():
+        built.append(1)
+        return _Agent("a")
+
+    per_call = {"session_id": "a", "user_id": "a", "ephemeral_system_prompt": None}
+    with pytest.raises(RuntimeError):
+        with agent_pool.lease("persona-a", factory, per_call):
+            raise RuntimeError("provider error")
+    with agent_pool.lease("persona-a", factory, per_call):
+        pass
+    assert len(built) == 2
+
+
+def test_agent_without_reset_is_built_fresh_every_call():
+    built = []
+    first = _call("plain", "a", built, cls=_PlainAgent)
+    second = _call("plain", "b", built, cls=_PlainAgent)
+    assert built == ["a", "b"]
+    assert first is not second
+    assert second.log_path == "session_b.json"
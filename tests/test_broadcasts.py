@@ -0,0 +1,112 @@
+"""
+Broadcast engine tests — chunking under the RapidPro cap, bounded
+concurrency, which errors are retried, and resuming after a crash.
+RapidPro is an httpx MockTransport.
+"""
+
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from app.hooks import broadcasts
+
+
+@pytest.fixture
+def rapidpro(monkeypatch, tmp_path):
+    state = {"starts": [], "active": 0, "peak": 0, "responses": []}
+
+    async def handler(request):
+        state["active"] += 1
+        state["peak"] = max(state["peak"], state["active"])
+        await asyncio.sleep(0.01)
+        state["active"] -= 1
+        state["starts"].append(json.loads(request.content)["urns"])
+        if state["responses"]:
+            return state["responses"].pop(0)
+        return httpx.Response(201, json={"uuid": "start"})
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(broadcasts, "_client", lambda: client)
+    monkeypatch.setattr(broadcasts, "_DB_PATH", str(tmp_path / "broadcasts.sqlite"))
+    monkeypatch.setattr(broadcasts, "_conn", None)
+    monkeypatch.setattr(broadcasts, "_loop", None)
+    monkeypatch.setattr(broadcasts, "RAPIDPRO_TOKEN", "token")
+    monkeypatch.setattr(broadcasts, "BROADCAST_FLOW_UUID", "flow-1")
+    monkeypatch.setattr(broadcasts, "_CHUNK_SIZE", 100)
+    monkeypatch.setattr(broadcasts, "_CONCURRENCY", 2)
+    monkeypatch.setattr(broadcasts, "_RATE", 0)
+    monkeypatch.setattr(broadcasts, "_notify", lambda admin, text: asyncio.sleep(0))
+    yield state
+
+
+def test_chunks_respect_cap_concurrency_and_retry(rapidpro, monkeypatch):
+    monkeypatch.setattr(broadcasts, "_RETRIES", 2)
+    urns = [f"whatsapp:509{i:05d}" for i in range(450)] + ["whatsapp:50900000"]
+    rapidpro["responses"] = [httpx.Response(429, headers={"Retry-After": "0"})]
+
+    async def scenario():
+        broadcast_id = broadcasts.submit("whatsapp:509admin", "Meeting moved", urns)
+        assert await broadcasts.wait(broadcast_id, 5)
+        return broadcasts.progress(broadcast_id)
+
+    p = asyncio.run(scenario())
+    assert p["status"] == "done"
+    assert (p["total"], p["sent"], p["chunks"]) == (450, 450, 5)
+    assert max(len(chunk) for chunk in rapidpro["starts"]) == 100
+    assert len(rapidpro["starts"]) == 6  # one throttled start retried
+    assert rapidpro["peak"] == 2
+
+
+def test_possibly_delivered_chunks_are_not_resent(rapidpro, monkeypatch):
+    monkeypatch.setattr(broadcasts, "_CONCURRENCY", 1)
+    urns = [f"whatsapp:509{i:05d}" for i in range(300)]
+    rapidpro["responses"] = [httpx.Response(502), httpx.Response(400, json={"urns": "invalid"})]
+
+    async def scenario():
+        broadcast_id = broadcasts.submit("whatsapp:509admin", "Meeting moved", urns)
+        assert await broadcasts.wait(broadcast_id, 5)
+        first = broadcasts.progress(broadcast_id)
+        assert broadcasts.retry(broadcast_id) == 2
+        assert await broadcasts.wait(broadcast_id, 5)
+        return first, broadcasts.progress(broadcast_id)
+
+    first, second = asyncio.run(scenario())
+    assert (first["status"], first["sent"], first["unknown"], first["failed"]) == ("partial", 100, 100, 100)
+    assert len(rapidpro["starts"]) == 5  # 3 chunks, no automatic resend; then 2 re-queued by retry()
+    assert (second["status"], second["sent"]) == ("done", 300)
+
+
+def test_restart_resumes_pending_chunks_only(rapidpro):
+    conn = broadcasts._db()
+    with conn:
+        conn.execute(
+            "INSERT INTO broadcasts (id, admin, message, flow, status, total, created_at) "
+            "VALUES ('b1', 'whatsapp:509admin', 'hi', 'flow-1', 'running', 3, 0)"
+        )
+        conn.executemany(
+            "INSERT INTO broadcast_chunks (broadcast_id, seq, urns, size, status) VALUES ('b1', ?, ?, 1, ?)",
+            [(0, '["whatsapp:1"]', "sent"), (1, '["whatsapp:2"]', "sending"), (2, '["whatsapp:3"]', "pending")],
+        )
+
+    async def scenario():
+        broadcasts.start()
+        assert await broadcasts.wait("b1", 5)
+
+    asyncio.run(scenario())
+    assert rapidpro["starts"] == [["whatsapp:3"]]  # the interrupted chunk may have gone out
+    p = broadcasts.progress("b1")
+    assert (p["status"], p["sent"], p["unknown"], p["remaining"]) == ("partial", 2, 1, 0)
+
+
+def test_submit_from_tool_thread_runs_on_server_loop(rapidpro):
+    async def scenario():
+        broadcasts.start()
+        broadcast_id = await asyncio.to_thread(broadcasts.submit, "whatsapp:509admin", "hi", ["whatsapp:1"])
+        await asyncio.sleep(0)  # let the handed-over launch run
+        assert await broadcasts.wait(broadcast_id, 5)
+        return broadcasts.progress(broadcast_id)
+
+    assert asyncio.run(scenario())["status"] == "done"
+    assert rapidpro["starts"] == [["whatsapp:1"]]
@@ -0,0 +1,87 @@
+"""
+Shared backend sessions — keep-alive reuse and the per-backend retry
+policy, against a local HTTP server.
+"""
+
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from app.utils import http_sessions
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    failures = 0
+    throttled = 0  # 429s with an hour-long Retry-After
+    seen = []
+
+    def _reply(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        self.rfile.read(length)
+        _Handler.seen.append((self.command, self.client_address[1]))
+        status = 503 if _Handler.failures > 0 else 200
+        _Handler.failures -= 1
+        if _Handler.throttled > 0:
+            status = 429
+            _Handler.throttled -= 1
+        body = b'{"ok": true}'
+        self.send_response(status)
+        if status == 429:
+            self.send_header("Retry-After", "3600")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = do_POST = _reply
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server(monkeypatch):
+    monkeypatch.setattr(http_sessions, "_BACKOFF", 0)
+    _Handler.failures, _Handler.throttled, _Handler.seen = 0, 0, []
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{httpd.server_port}"
+    http_sessions.close_all()
+    httpd.shutdown()
+
+
+def test_requests_reuse_one_connection(server):
+    session = http_sessions.session(http_sessions.RAPIDPRO)
+    assert http_sessions.session(http_sessions.RAPIDPRO) is session
+    for _ in range(3):
+        assert session.get(f"{server}/api/v2/groups.json", timeout=5).status_code == 200
+    ports = {port for _, port in _Handler.seen}
+    assert len(ports) == 1
+
+
+def test_retry_policy_depends_on_backend_and_method(server):
+    rapidpro = http_sessions.session(http_sessions.RAPIDPRO)
+    organized = http_sessions.session(http_sessions.ORGANIZED)
+
+    _Handler.failures = 1
+    assert rapidpro.get(f"{server}/contacts.json", timeout=5).status_code == 200
+
+    # Creating a group is not repeated on a 503
+    _Handler.failures = 1
+    assert rapidpro.post(f"{server}/groups.json", json={}, timeout=5).status_code == 503
+
+    # Organized's webhook query is read-only, so POST is retried
+    _Handler.failures = 2
+    assert organized.post(f"{server}/api/v3/webhooks/query", json={}, timeout=5).status_code == 200
+
+
+def test_retry_after_is_capped(server, monkeypatch):
+    monkeypatch.setattr(http_sessions, "_MAX_WAIT", 0.05)
+    rapidpro = http_sessions.session(http_sessions.RAPIDPRO)
+    _Handler.throttled = 1
+    start = time.monotonic()
+    assert rapidpro.get(f"{server}/contacts.json", timeout=5).status_code == 200
+    assert time.monotonic() - start < 2
+    assert http_sessions.stats()[http_sessions.RAPIDPRO]["max_wait"] == 0.05
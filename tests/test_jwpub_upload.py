@@ -0,0 +1,150 @@
+"""
+.jwpub download tests — streaming to disk with a size cap, the early ZIP
+magic check, and the SHA-256 lookup of already-ingested files.
+"""
+
+import hashlib
+import sqlite3
+
+import httpx
+import pytest
+
+from app.graph.tools import upload
+
+JWPUB = b"PK\x03\x04" + b"x" * 200_000
+_Client = httpx.Client
+
+
+@pytest.fixture
+def serve(monkeypatch):
+    """Answer every download with the given body."""
+    def install(body: bytes, headers=None):
+        sent = {"chunks": 0}
+
+        def stream():
+            for i in range(0, len(body), 4096):
+                sent["chunks"] += 1
+                yield body[i:i + 4096]
+
+        transport = httpx.MockTransport(
+            lambda request: httpx.Response(200, headers=headers or {}, content=stream())
+        )
+        monkeypatch.setattr(
+            upload.httpx, "Client", lambda **kw: _Client(transport=transport, **kw)
+        )
+        return sent
+    return install
+
+
+def test_download_streams_and_hashes(serve, tmp_path):
+    serve(JWPUB)
+    dest = tmp_path / "a.jwpub"
+    assert upload._download("http://media/a.jwpub", dest) == hashlib.sha256(JWPUB).hexdigest()
+    assert dest.read_bytes() == JWPUB
+
+
+def test_download_rejects_non_zip_at_first_chunk(serve, tmp_path):
+    sent = serve(b"<html>" + b"x" * 200_000)
+    with pytest.raises(upload._RejectedDownload, match="Not a .jwpub"):
+        upload._download("http://media/a.jwpub", tmp_path / "a.jwpub")
+    # Rejected within the first read buffer, not after the whole body
+    assert sent["chunks"] * 4096 <= upload._CHUNK + 4096
+
+
+def test_download_enforces_size_cap(serve, tmp_path, monkeypatch):
+    monkeypatch.setattr(upload, "_MAX_BYTES", 50_000)
+    serve(JWPUB)
+    with pytest.raises(upload._RejectedDownload, match="too large"):
+        upload._download("http://media/a.jwpub", tmp_path / "a.jwpub")
+    # A declared Content-Length over the cap is refused before reading
+    sent = serve(JWPUB, headers={"Content-Length": str(len(JWPUB))})
+    with pytest.raises(upload._RejectedDownload, match="too large"):
+        upload._download("http://media/a.jwpub", tmp_path / "b.jwpub")
+    assert sent["chunks"] == 0
+
+
+def test_already_ingested_lookup():
+    conn = sqlite3.connect(":memory:")
+    cur = conn.cursor()
+    cur.execute("CREATE TABLE Publications (id INTEGER PRIMARY KEY, code TEXT, language TEXT)")
+    cur.execute(upload._INGESTED_SCHEMA)
+    cur.execute("INSERT INTO Publications (id, code, language) VALUES (7, 's34', '0')")
+    cur.execute(
+        "INSERT INTO IngestedFiles (sha256, publication_id, symbol, topics_saved) "
+        "VALUES ('abc', 7, 'S-34', 42)"
+    )
+    assert upload._already_ingested(cur, "abc", None) == {
+        "code": "s34", "language_id": "0", "symbol": "S-34", "topics_saved": 42,
+    }
+    assert upload._already_ingested(cur, "abc", "S-34") is not None
+    assert upload._already_ingested(cur, "abc", "other") is None
+    assert upload._already_ingested(cur, "def", None) is None
+
+
+# ── Tree import ──────────────────────────────────────────────────────────────
+
+VIEW_ITEMS = [  # (id, parent, title, document)
+    (1, -1, "root", None),
+    (2, 1, "Part 1", None),
+    (3, 2, "Lesson 1", 101),
+    (4, 2, "Lesson 2", 102),
+    (5, 4, "Lesson 2 — box", 103),
+    (6, 1, "Appendix", 104),
+    (7, 1, "  ", None),
+    (8, 7, "Loose", 105),
+]
+
+
+class FakeReader:
+    def __init__(self):
+        self.db = sqlite3.connect(":memory:")
+        self.db.execute(
+            "CREATE TABLE PublicationViewItem (PublicationViewItemId, "
+            "ParentPublicationViewItemId, Title, DefaultDocumentId)"
+        )
+        self.db.executemany("INSERT INTO PublicationViewItem VALUES (?, ?, ?, ?)", VIEW_ITEMS)
+        self.queries = 0
+
+    def execute(self, sql, params=()):
+        self.queries += 1
+        return self.db.execute(sql, params).fetchall()
+
+    def get_document_content(self, doc_id):
+        return f"doc {doc_id}"
+
+
+def test_plan_import_reads_the_tree_once():
+    reader = FakeReader()
+    categories, topics = upload._plan_import(reader)
+    assert reader.queries == 1
+    assert categories == ["General", "Part 1", "Lesson 2"]
+    assert topics == [
+        ("Part 1", "Lesson 1", 101),
+        ("Lesson 2", "Lesson 2", 102),
+        ("Lesson 2", "Lesson 2 — box", 103),
+        ("General", "Appendix", 104),
+        ("General", "Loose", 105),
+    ]
+
+
+def test_write_import_batches_categories_and_topics():
+    conn = sqlite3.connect(":memory:")
+    cur = conn.cursor()
+    cur.executescript("""
+        CREATE TABLE Publications (id INTEGER PRIMARY KEY, code TEXT, language TEXT, UNIQUE(code, language));
+        CREATE TABLE Categories (id INTEGER PRIMARY KEY, publication_id INTEGER, name TEXT,
+                                 UNIQUE(publication_id, name));
+        CREATE TABLE Topics (id INTEGER PRIMARY KEY, category_id INTEGER, name TEXT, content TEXT,
+                             UNIQUE(category_id, name));
+    """)
+    categories, nodes = upload._plan_import(FakeReader())
+    topics = [(c, t, f"doc {d}") for c, t, d in nodes]
+    pub_id = upload._write_import(cur, "s34", "0", categories, topics)
+    # Re-importing is an upsert, not a duplicate
+    assert upload._write_import(cur, "s34", "0", categories, topics) == pub_id
+    rows = cur.execute(
+        "SELECT c.name, t.name, t.content FROM Topics t JOIN Categories c ON c.id = t.category_id "
+        "ORDER BY t.id"
+    ).fetchall()
+    assert rows == [(c, t, content) for c, t, content in topics]
+    assert cur.execute("SELECT COUNT(*) FROM Categories").fetchone()[0] == 3
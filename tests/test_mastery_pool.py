@@ -0,0 +1,81 @@
+"""
+Mastery DB leasing — a connection that failed at the connection level is
+closed rather than returned, the slot is released on every exit, and a
+caller that can't get a slot in time gets TimeoutError. The psycopg2 pool
+is replaced with a stub, so no Postgres is needed.
+"""
+
+import threading
+
+import pytest
+
+pytest.importorskip("fsrs")
+psycopg2 = pytest.importorskip("psycopg2")
+
+from app.plugins.social import mastery  # noqa: E402
+
+
+class _Conn:
+    autocommit = False
+    closed = 0
+
+
+class _Pool:
+    def __init__(self):
+        self.returned = []
+
+    def getconn(self):
+        return _Conn()
+
+    def putconn(self, conn, close=False):
+        self.returned.append((conn, close))
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    stub = _Pool()
+    monkeypatch.setattr(mastery, "_get_pool", lambda: stub)
+    monkeypatch.setattr(mastery, "_slots", threading.BoundedSemaphore(2))
+    return stub
+
+
+def _free_slots():
+    taken = 0
+    while mastery._slots.acquire(blocking=False):
+        taken += 1
+    for _ in range(taken):
+        mastery._slots.release()
+    return taken
+
+
+def test_healthy_connection_goes_back_in_autocommit(pool):
+    with mastery._connection() as conn:
+        assert conn.autocommit is True
+    assert pool.returned == [(conn, False)]
+    assert _free_slots() == 2
+
+
+def test_broken_connection_is_closed_not_returned(pool):
+    with pytest.raises(psycopg2.OperationalError):
+        with mastery._connection():
+            raise psycopg2.OperationalError("server closed the connection")
+    assert pool.returned[0][1] is True
+    assert _free_slots() == 2
+
+
+def test_slot_is_released_when_the_query_raises(pool):
+    with pytest.raises(ValueError):
+        with mastery._connection():
+            raise ValueError("bad row")
+    assert pool.returned[0][1] is False  # not a connection fault — reuse it
+    assert _free_slots() == 2
+
+
+def test_waiting_for_a_slot_times_out(pool, monkeypatch):
+    monkeypatch.setattr(mastery, "_POOL_TIMEOUT", 0.01)
+    with mastery._connection(), mastery._connection():
+        with pytest.raises(TimeoutError):
+            with mastery._connection():
+                pass
+    assert len(pool.returned) == 2
+    assert _free_slots() == 2
@@ -0,0 +1,52 @@
+"""
+Metrics tests — Prometheus text rendering of counters, histograms and gauges.
+"""
+
+import pytest
+
+from app.utils import metrics
+
+
+def test_counter_renders_labelled_totals():
+    c = metrics.Counter("t_drops", "Drops.", labelnames=("scope",))
+    c.inc(scope="urn")
+    c.inc(2, scope="global")
+    text = c.render()
+    assert "# TYPE t_drops counter" in text
+    assert 't_drops_total{scope="global"} 2' in text
+    assert 't_drops_total{scope="urn"} 1' in text
+
+
+def test_histogram_buckets_are_cumulative():
+    h = metrics.Histogram("t_latency", "Latency.", labelnames=("stage",), buckets=(0.1, 1.0))
+    for v in (0.05, 0.5, 5.0):
+        h.observe(v, stage="parse")
+    text = h.render()
+    assert 't_latency_bucket{stage="parse",le="0.1"} 1' in text
+    assert 't_latency_bucket{stage="parse",le="1.0"} 2' in text
+    assert 't_latency_bucket{stage="parse",le="+Inf"} 3' in text
+    assert 't_latency_count{stage="parse"} 3' in text
+
+
+def test_histogram_timer_records_early_exit():
+    h = metrics.Histogram("t_timer", "Timer.")
+
+    def early():
+        with h.time():
+            return "done"
+
+    assert early() == "done"
+    assert h.count() == 1
+
+
+def test_wrong_labels_rejected():
+    c = metrics.Counter("t_labels", "Labels.", labelnames=("scope",))
+    with pytest.raises(ValueError):
+        c.inc(route="x")
+
+
+def test_gauge_callback_and_registry_render():
+    metrics.Gauge("t_gauge", "Gauge.", lambda: {"open": 1, "closed": 0}, labelnames=("state",))
+    text = metrics.render()
+    assert 't_gauge{state="open"} 1' in text
+    assert "gateway_chat_stage_seconds" in text
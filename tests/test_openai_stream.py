@@ -0,0 +1,78 @@
+"""
+Streaming /v1/chat/completions — chunk sequence and the terminal [DONE],
+and a Hermes failure after deltas went out ending in an error event rather
+than finish_reason "stop". _chat_completion is replaced so no pipeline runs.
+"""
+
+import asyncio
+import json
+
+import pytest
+
+pytest.importorskip("run_agent")
+
+from app.api.adapters import openai  # noqa: E402
+
+
+def _stream(monkeypatch, fake):
+    monkeypatch.setattr(openai, "_chat_completion", fake)
+    request = openai.OpenAIChatRequest(
+        model="mentor", messages=[{"role": "user", "content": "hi"}], stream=True, user="u",
+    )
+
+    async def collect():
+        return [e async for e in openai._stream_completion(request, None, None)]
+
+    events = asyncio.run(collect())
+    assert all(e.startswith("data: ") and e.endswith("\n\n") for e in events)
+    assert events[-1] == "data: [DONE]\n\n"
+    return [json.loads(e[6:]) for e in events[:-1]]
+
+
+def _deltas(chunks):
+    return [c["choices"][0]["delta"] for c in chunks if "choices" in c]
+
+
+def test_deltas_are_forwarded_then_stop(monkeypatch):
+    async def fake(request, raw_request, background_tasks, on_delta=None):
+        for part in ("Bon", "jou"):
+            on_delta(part)
+            await asyncio.sleep(0)
+        return openai._openai_response("mentor", "Bonjou")
+
+    chunks = _stream(monkeypatch, fake)
+    assert _deltas(chunks) == [{"role": "assistant"}, {"content": "Bon"}, {"content": "jou"}, {}]
+    assert chunks[-1]["choices"][0]["finish_reason"] == "stop"
+    assert len({c["id"] for c in chunks}) == 1
+
+
+def test_whole_reply_is_sent_as_one_chunk(monkeypatch):
+    async def fake(request, raw_request, background_tasks, on_delta=None):
+        return openai._openai_response("mentor", "From RiveBot", id_prefix="chatcmpl-rivebot")
+
+    chunks = _stream(monkeypatch, fake)
+    assert _deltas(chunks) == [{"role": "assistant"}, {"content": "From RiveBot"}, {}]
+
+
+def test_hermes_failure_mid_stream_is_an_error_not_stop(monkeypatch):
+    async def fake(request, raw_request, background_tasks, on_delta=None):
+        on_delta("Partial")
+        await asyncio.sleep(0)
+        return openai._openai_response("mentor", "⚠️ unavailable", id_prefix="chatcmpl-noai")
+
+    chunks = _stream(monkeypatch, fake)
+    assert {"content": "⚠️ unavailable"} not in _deltas(chunks)
+    assert chunks[-2]["error"]["code"] == 502
+    assert chunks[-1]["choices"][0]["finish_reason"] == "error"
+    assert "stop" not in [c["choices"][0]["finish_reason"] for c in chunks if "choices" in c]
+
+
+def test_pipeline_exception_ends_with_error_event(monkeypatch):
+    async def fake(request, raw_request, background_tasks, on_delta=None):
+        raise RuntimeError("boom")
+
+    chunks = _stream(monkeypatch, fake)
+    assert chunks[-2]["error"] == {
+        "message": "Internal error while generating the reply", "type": "server_error", "code": 500,
+    }
+    assert chunks[-1]["choices"][0]["finish_reason"] == "error"
@@ -0,0 +1,85 @@
+"""
+Palace writer queue tests — exact-hash dedup, drop policy and batched drain.
+MemPalace itself is replaced by a recorder on _write_turn.
+"""
+
+import queue
+
+import pytest
+
+from app.hooks import palace_writer
+
+
+@pytest.fixture
+def writer(monkeypatch):
+    """Enabled writer with a small queue and a recording (no-op) store."""
+    written = []
+    monkeypatch.setattr(palace_writer, "_PALACE_ENABLED", "/tmp/palace")
+    monkeypatch.setattr(palace_writer, "_queue", queue.Queue(maxsize=2))
+    monkeypatch.setattr(palace_writer, "_QUEUE_MAX", 2)
+    monkeypatch.setattr(palace_writer, "_FLUSH_INTERVAL", 0.01)
+    monkeypatch.setattr(palace_writer, "_write_turn", written.append)
+    monkeypatch.setattr(palace_writer, "_ensure_worker", lambda: None)
+    palace_writer._recent_hashes.clear()
+    yield written
+    palace_writer._recent_hashes.clear()
+
+
+def _enqueue(i: int, user: str = "u") -> bool:
+    return palace_writer.enqueue_turn(f"whatsapp:+{i}", "assistant", user, f"reply {i}")
+
+
+def test_exact_duplicate_is_not_queued(writer):
+    assert _enqueue(1)
+    assert not _enqueue(1)
+    assert palace_writer._queue.qsize() == 1
+
+
+def test_drop_oldest_keeps_newest_turns(writer, monkeypatch):
+    monkeypatch.setattr(palace_writer, "_POLICY", "drop_oldest")
+    for i in range(3):
+        assert _enqueue(i)
+    queued = [palace_writer._queue.get_nowait().urn for _ in range(2)]
+    assert queued == ["whatsapp:+1", "whatsapp:+2"]
+    # The dropped turn's hash is forgotten so a retry can still be stored
+    assert _enqueue(0)
+
+
+def test_drop_newest_rejects_incoming(writer, monkeypatch):
+    monkeypatch.setattr(palace_writer, "_POLICY", "drop_newest")
+    assert _enqueue(0) and _enqueue(1)
+    assert not _enqueue(2)
+    assert palace_writer._queue.qsize() == 2
+
+
+def test_worker_drains_in_batches_until_stop(writer, monkeypatch):
+    monkeypatch.setattr(palace_writer, "_queue", queue.Queue(maxsize=8))
+    _enqueue(0)
+    _enqueue(1)
+    palace_writer._queue.put(palace_writer._STOP)
+    palace_writer._run_worker()
+    assert [t.urn for t in writer] == ["whatsapp:+0", "whatsapp:+1"]
+
+
+def test_stop_is_never_shed(writer, monkeypatch):
+    monkeypatch.setattr(palace_writer, "_POLICY", "drop_oldest")
+
+    class _Busy:
+        def is_alive(self):
+            return True
+
+        def join(self, timeout):
+            pass
+
+    # Shutdown on a full queue still gets the sentinel in, without waiting
+    assert _enqueue(0) and _enqueue(1)
+    monkeypatch.setattr(palace_writer, "_worker", _Busy())
+    palace_writer.shutdown(timeout=0.01)
+    assert palace_writer._queue.qsize() == 3
+
+    # With the sentinel at the head, overflow drops the incoming turn instead
+    palace_writer._queue.get_nowait()
+    palace_writer._queue.get_nowait()
+    assert _enqueue(2) and not _enqueue(3)
+    palace_writer._run_worker()
+    assert [t.urn for t in writer] == ["whatsapp:+2"]
@@ -0,0 +1,100 @@
+"""
+Persona cache tests — one DB load serves repeated lookups, a persona edit
+is only picked up after invalidate() bumps the version, and the TTL safety
+net. Runs against a throwaway aiosqlite database.
+"""
+
+import asyncio
+
+import pytest
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.models import ChannelConfig, Persona
+from app.services import persona_cache
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    """Run `scenario(session_factory, loads)` against a fresh database."""
+    def run(scenario):
+        async def main():
+            engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'personas.sqlite'}")
+            async with engine.begin() as conn:
+                await conn.run_sync(
+                    SQLModel.metadata.create_all,
+                    tables=[Persona.__table__, ChannelConfig.__table__],
+                )
+            session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+            async with session() as s:
+                s.add(Persona(id="p1", slug="mentor", name="Mentor", personality="kind",
+                              style="short", allowed_urns=["whatsapp:509"]))
+                s.add(ChannelConfig(channel_phone="50900000000", persona_id="p1"))
+                await s.commit()
+
+            loads = []
+            real_load = persona_cache._load
+
+            async def counted_load(version):
+                loads.append(version)
+                return await real_load(version)
+
+            monkeypatch.setattr(persona_cache, "async_session", session)
+            monkeypatch.setattr(persona_cache, "_load", counted_load)
+            try:
+                await scenario(session, loads)
+            finally:
+                await engine.dispose()
+
+        monkeypatch.setattr(persona_cache, "_snapshot", None)
+        monkeypatch.setattr(persona_cache, "_reload_lock", None)
+        asyncio.run(main())
+    return run
+
+
+def test_snapshot_is_reused_across_lookups(db):
+    async def scenario(session, loads):
+        first = await persona_cache.get_snapshot()
+        mentor = await persona_cache.get_persona("mentor")
+        assert await persona_cache.get_persona("p1") is mentor
+        assert await persona_cache.get_snapshot() is first
+        assert len(loads) == 1
+
+        assert mentor.allows("whatsapp:509") and not mentor.allows("whatsapp:1")
+        assert first.channels["50900000000"].persona_id == "p1"
+        assert persona_cache.stats()["fresh"] is True
+    db(scenario)
+
+
+def test_persona_edit_shows_up_after_invalidate(db):
+    async def scenario(session, loads):
+        assert (await persona_cache.get_persona("mentor")).style == "short"
+        async with session() as s:
+            row = await s.get(Persona, "p1")
+            row.style = "detailed"
+            s.add(row)
+            await s.commit()
+
+        # Without invalidate() the snapshot is still served from memory
+        assert (await persona_cache.get_persona("mentor")).style == "short"
+
+        before = persona_cache.stats()["version"]
+        persona_cache.invalidate()
+        assert persona_cache.stats()["version"] == before + 1
+        assert persona_cache.stats()["fresh"] is False
+
+        assert (await persona_cache.get_persona("mentor")).style == "detailed"
+        assert loads == [before, before + 1]
+        assert persona_cache.stats()["snapshot_version"] == before + 1
+    db(scenario)
+
+
+def test_ttl_expiry_reloads(db, monkeypatch):
+    async def scenario(session, loads):
+        await persona_cache.get_snapshot()
+        monkeypatch.setattr(persona_cache, "_TTL", 0)
+        await persona_cache.get_snapshot()
+        assert len(loads) == 2
+    db(scenario)
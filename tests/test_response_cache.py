@@ -0,0 +1,98 @@
+"""
+Response cache tests — normalization, eligibility, hits and coalescing.
+"""
+
+import asyncio
+
+import pytest
+
+from app.hermes import response_cache
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache(monkeypatch):
+    monkeypatch.setattr(response_cache, "_PERSONAS", frozenset({"faq"}))
+    monkeypatch.setattr(response_cache, "_SAFE_TOOLSETS", frozenset({"siyuan"}))
+    response_cache.clear()
+    yield
+    response_cache.clear()
+
+
+def test_normalize_ignores_case_punctuation_and_spacing():
+    assert response_cache.normalize("  How do I   PREPARE my talk?! ") == "how do i prepare my talk"
+
+
+def test_eligibility_requires_persona_and_safe_toolsets():
+    assert response_cache.eligible("faq", ["siyuan"])
+    assert not response_cache.eligible("faq", ["siyuan", "memory"])
+    assert not response_cache.eligible("assistant", ["siyuan"])
+
+
+def test_second_identical_question_is_a_hit():
+    calls = []
+
+    async def run():
+        calls.append(1)
+        return {"final_response": "answer", "messages": []}
+
+    async def main():
+        fp = response_cache.fingerprint("prompt", {"lang": "en"})
+        k1 = response_cache.make_key("faq", "Help?", fp)
+        k2 = response_cache.make_key("faq", "help", fp)
+        first, shared1 = await response_cache.get_or_run(k1, run)
+        second, shared2 = await response_cache.get_or_run(k2, run)
+        return first, shared1, second, shared2
+
+    first, shared1, second, shared2 = asyncio.run(main())
+    assert (shared1, shared2) == (False, True)
+    assert second["final_response"] == "answer"
+    assert len(calls) == 1
+
+
+def test_concurrent_misses_coalesce_onto_one_run():
+    calls = []
+
+    async def run():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {"final_response": "answer", "messages": []}
+
+    async def main():
+        key = response_cache.make_key("faq", "topic", response_cache.fingerprint("p", None))
+        return await asyncio.gather(*(response_cache.get_or_run(key, run) for _ in range(5)))
+
+    results = asyncio.run(main())
+    assert len(calls) == 1
+    assert [shared for _, shared in results].count(False) == 1
+
+
+def test_failed_leader_lets_followers_run_and_caches_nothing():
+    attempts = []
+
+    async def run():
+        attempts.append(1)
+        await asyncio.sleep(0.01)
+        if len(attempts) == 1:
+            raise RuntimeError("llm down")
+        return {"final_response": "ok", "messages": []}
+
+    async def main():
+        key = response_cache.make_key("faq", "q", response_cache.fingerprint("p", None))
+        return await asyncio.gather(
+            response_cache.get_or_run(key, run),
+            response_cache.get_or_run(key, run),
+            return_exceptions=True,
+        )
+
+    leader, follower = asyncio.run(main())
+    assert isinstance(leader, RuntimeError)
+    assert follower[0]["final_response"] == "ok"
+
+
+def test_fingerprint_separates_conversations():
+    first_turn = response_cache.fingerprint("prompt", {"lang": "en"})
+    assert response_cache.fingerprint("prompt", {"lang": "en"}, []) == first_turn
+    talk = [{"role": "user", "content": "Can you help with my talk?"}, {"role": "assistant", "content": "Which one?"}]
+    flow = [{"role": "user", "content": "Start the survey"}, {"role": "assistant", "content": "Ready?"}]
+    assert response_cache.fingerprint("prompt", {"lang": "en"}, talk) != first_turn
+    assert response_cache.fingerprint("prompt", {"lang": "en"}, talk) != response_cache.fingerprint("prompt", {"lang": "en"}, flow)
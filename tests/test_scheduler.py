@@ -0,0 +1,115 @@
+"""
+Admission scheduler tests — weighted fair ordering, bounded waiting room,
+eviction of lighter tiers and deadline drops.
+"""
+
+import asyncio
+
+import pytest
+
+from app.hermes import scheduler
+from app.hermes.scheduler import AdmissionRejected, AdmissionScheduler
+
+WEIGHTS = {"admin": 8.0, "grading": 4.0, "priority": 4.0, "standard": 1.0}
+
+
+def _run(coro):
+    return asyncio.run(coro)
+
+
+async def _queue_up(sched, requests, order):
+    """Start waiters in order (letting each enqueue) and record grant order."""
+
+    async def one(tier, persona, tag):
+        await sched.acquire(tier, persona)
+        order.append(tag)
+
+    tasks = []
+    for tier, persona, tag in requests:
+        tasks.append(asyncio.create_task(one(tier, persona, tag)))
+        await asyncio.sleep(0)
+    return tasks
+
+
+def test_heavier_tier_is_served_first():
+    async def main():
+        sched = AdmissionScheduler(slots=1, waiting_room=10, deadline=5, weights=WEIGHTS)
+        await sched.acquire("standard", "p")  # occupy the only slot
+        order = []
+        tasks = await _queue_up(sched, [
+            ("standard", "p", "s1"),
+            ("admin", "p", "a1"),
+        ], order)
+        for _ in tasks:
+            sched.release()
+            await asyncio.sleep(0)
+        await asyncio.gather(*tasks)
+        return order
+
+    # Both queues start at the same pass — the tie goes to the heavier tier
+    assert _run(main()) == ["a1", "s1"]
+
+
+def test_weighted_share_without_starvation():
+    async def main():
+        sched = AdmissionScheduler(slots=1, waiting_room=50, deadline=5, weights=WEIGHTS)
+        await sched.acquire("standard", "p")
+        order = []
+        reqs = [("standard", "p", f"s{i}") for i in range(4)]
+        reqs += [("grading", "drill", f"g{i}") for i in range(8)]
+        tasks = await _queue_up(sched, reqs, order)
+        for _ in tasks:
+            sched.release()
+            await asyncio.sleep(0)
+        await asyncio.gather(*tasks)
+        return order
+
+    order = _run(main())
+    first_five = order[:5]
+    assert sum(tag.startswith("g") for tag in first_five) == 4
+    assert sum(tag.startswith("s") for tag in first_five) == 1
+
+
+def test_full_room_rejects_or_evicts_lighter():
+    async def main():
+        sched = AdmissionScheduler(slots=1, waiting_room=1, deadline=5, weights=WEIGHTS)
+        await sched.acquire("standard", "p")
+        waiting = asyncio.create_task(sched.acquire("standard", "p"))
+        await asyncio.sleep(0)
+
+        with pytest.raises(AdmissionRejected) as busy:
+            await sched.acquire("standard", "p")
+        assert busy.value.reason == "busy"
+
+        admin = asyncio.create_task(sched.acquire("admin", "p"))
+        await asyncio.sleep(0)
+        with pytest.raises(AdmissionRejected) as evicted:
+            await waiting
+        assert evicted.value.reason == "evicted"
+
+        sched.release()
+        await admin
+        assert sched.running == 1
+
+    _run(main())
+
+
+def test_waiter_dropped_after_deadline():
+    async def main():
+        sched = AdmissionScheduler(slots=1, waiting_room=5, deadline=0.05, weights=WEIGHTS)
+        await sched.acquire("standard", "p")
+        with pytest.raises(AdmissionRejected) as expired:
+            await sched.acquire("standard", "p")
+        assert expired.value.reason == "deadline"
+        assert sched.stats()["waiting"] == 0
+
+    _run(main())
+
+
+def test_classify_tiers(monkeypatch):
+    monkeypatch.setattr(scheduler, "_ADMIN_DIGITS", frozenset({"50937000000"}))
+    monkeypatch.setattr(scheduler, "_PRIORITY_PERSONAS", frozenset({"konex-support"}))
+    assert scheduler.classify("whatsapp:+50937000000", "assistant") == "admin"
+    assert scheduler.classify("whatsapp:+1", "social-code", {"current_drill": "d1"}) == "grading"
+    assert scheduler.classify("whatsapp:+1", "konex-support") == "priority"
+    assert scheduler.classify("whatsapp:+1", "assistant") == "standard"
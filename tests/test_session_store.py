@@ -0,0 +1,97 @@
+"""
+Session journal tests — append-only writes, tail reads, compaction
+and lazy migration from legacy session_<id>.json files.
+"""
+
+import json
+
+import pytest
+
+from app.memory import session_store
+
+
+@pytest.fixture(autouse=True)
+def sessions_dir(tmp_path, monkeypatch):
+    """Point the store at an isolated sessions directory."""
+    monkeypatch.setattr(session_store, "_sessions_dir", tmp_path)
+    return tmp_path
+
+
+def _turn(i: int) -> list[dict]:
+    return [
+        {"role": "user", "content": f"q{i}"},
+        {"role": "assistant", "content": f"a{i}"},
+    ]
+
+
+def test_append_then_tail_returns_last_messages():
+    for i in range(50):
+        session_store.append_messages("s1", _turn(i))
+
+    tail = session_store.tail_messages("s1", 4)
+    assert [m["content"] for m in tail] == ["q48", "a48", "q49", "a49"]
+
+
+def test_tail_spans_multiple_read_blocks(monkeypatch):
+    monkeypatch.setattr(session_store, "_BLOCK_SIZE", 16)
+    for i in range(20):
+        session_store.append_messages("s1", _turn(i))
+
+    tail = session_store.tail_messages("s1", 10)
+    assert len(tail) == 10
+    assert tail[-1]["content"] == "a19"
+    assert tail[0]["content"] == "q15"
+
+
+def test_tail_cold_start_is_empty():
+    assert session_store.tail_messages("missing", 20) == []
+
+
+def test_torn_line_is_skipped(sessions_dir):
+    session_store.append_messages("s1", _turn(0))
+    with open(session_store.journal_path("s1"), "a") as f:
+        f.write('{"role": "user", "cont')  # crash mid-write
+
+    tail = session_store.tail_messages("s1", 5)
+    assert [m["content"] for m in tail] == ["q0", "a0"]
+
+
+def test_compaction_bounds_journal(monkeypatch):
+    monkeypatch.setattr(session_store, "_MAX_BYTES", 1024)
+    monkeypatch.setattr(session_store, "_COMPACT_KEEP", 6)
+    for i in range(100):
+        session_store.append_messages("s1", _turn(i))
+
+    journal = session_store.journal_path("s1")
+    assert journal.stat().st_size <= 1024 + 200
+    assert session_store.tail_messages("s1", 2)[-1]["content"] == "a99"
+
+
+def test_legacy_session_is_migrated_once(sessions_dir):
+    legacy = session_store.legacy_path("s1")
+    legacy.write_text(json.dumps({"messages": _turn(0) + _turn(1)}))
+
+    assert session_store.migrate_all() == 1
+    assert session_store.migrate_all() == 0
+
+    session_store.append_messages("s1", _turn(2))
+    contents = [m["content"] for m in session_store.tail_messages("s1", 10)]
+    assert contents == ["q0", "a0", "q1", "a1", "q2", "a2"]
+
+
+def test_append_without_migrate_ignores_fresh_legacy(sessions_dir):
+    # Hermes rewrote the legacy file with the very turn we're journaling
+    session_store.legacy_path("s1").write_text(json.dumps({"messages": _turn(0)}))
+    session_store.append_messages("s1", _turn(0), migrate=False)
+
+    assert len(session_store.tail_messages("s1", 10)) == 2
+
+
+def test_delete_session_removes_both_files(sessions_dir):
+    session_store.legacy_path("s1").write_text(json.dumps({"messages": []}))
+    session_store.append_messages("s1", _turn(0), migrate=False)
+
+    assert session_store.delete_session("s1") is True
+    assert not session_store.journal_path("s1").exists()
+    assert not session_store.legacy_path("s1").exists()
+    assert session_store.delete_session("s1") is False
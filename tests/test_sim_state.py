@@ -0,0 +1,96 @@
+"""
+Simulation state tests — lazy reads (none for write-only tools), the
+opt-in batched /get-vars with its per-variable fallback, one buffered
+write per tool call, and the local write-back cache.
+RiveBot is an httpx.MockTransport behind the module's pooled client.
+"""
+
+import json
+
+import httpx
+import pytest
+
+from app.plugins.social import tools
+
+
+class FakeRiveBot:
+    def __init__(self, batch=True, down=False):
+        self.vars = {"sim_trust": "30", "sim_mood": "Neutral", "lang": "ht"}
+        self.calls = []
+        self.batch, self.down = batch, down
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.calls.append(request.url.path)
+        if self.down:
+            raise httpx.ConnectError("down", request=request)
+        if request.url.path == "/get-vars":
+            if not self.batch:
+                return httpx.Response(404)
+            names = json.loads(request.content)["vars"]
+            return httpx.Response(200, json={"vars": {n: self.vars[n] for n in names if n in self.vars}})
+        if request.url.path == "/get-var":
+            return httpx.Response(200, json={"value": self.vars.get(request.url.params["var"], "undefined")})
+        if request.url.path == "/set-vars":
+            self.vars.update(json.loads(request.content)["vars"])
+            return httpx.Response(200, json={"ok": True})
+        return httpx.Response(404)
+
+
+@pytest.fixture
+def rivebot(monkeypatch):
+    def install(batch_enabled=False, **kw):
+        fake = FakeRiveBot(**kw)
+        client = httpx.Client(base_url="http://rivebot", transport=httpx.MockTransport(fake))
+        monkeypatch.setattr(tools, "_http", client)
+        monkeypatch.setattr(tools, "_batch_get_supported", batch_enabled)
+        tools._local_state_cache.clear()
+        return fake
+    return install
+
+
+def test_write_only_tool_never_reads(rivebot):
+    fake = rivebot(batch_enabled=True)
+    tools.sim_update_mood({"user_id": "whatsapp:509", "new_mood": "Happy", "internal_thought": "hm"})
+    assert fake.calls == ["/set-vars"]
+    assert fake.vars["sim_mood"] == "Happy"
+
+
+def test_reads_only_what_the_tool_asks_for(rivebot):
+    fake = rivebot()
+    tools.sim_update_trust({"user_id": "whatsapp:509", "trust_change": 5})
+    assert fake.calls == ["/get-var", "/set-vars"]
+    assert fake.vars["sim_trust"] == "35"
+
+    fake.calls.clear()
+    with tools._SimState("whatsapp:509", reads=("mood", "trust"), extra=("lang",)) as state:
+        assert state.raw("lang") == "ht"
+        state.set("boredom", 2)
+        assert state.get("mood") == "Neutral"
+        assert state.get("boredom") == "2"
+    # Declared vars load together once; the default is per-variable GETs
+    assert fake.calls == ["/get-var"] * 3 + ["/set-vars"]
+    assert fake.vars["sim_boredom"] == "2"
+
+
+def test_batched_read_is_opt_in_and_falls_back_once(rivebot):
+    fake = rivebot(batch_enabled=True)
+    state = tools._SimState("whatsapp:509", reads=("mood", "trust"))
+    assert state.get("trust") == "30" and state.get("mood") == "Neutral"
+    assert fake.calls == ["/get-vars"]
+
+    fake = rivebot(batch_enabled=True, batch=False)
+    assert tools._SimState("whatsapp:509", reads=("mood", "trust")).get("trust") == "30"
+    assert fake.calls == ["/get-vars", "/get-var", "/get-var"]
+    fake.calls.clear()
+    tools._SimState("whatsapp:509", reads=("mood", "trust")).get("mood")
+    assert "/get-vars" not in fake.calls
+
+
+def test_local_cache_serves_while_rivebot_is_down(rivebot):
+    fake = rivebot(down=True)
+    tools._local_state_cache[("whatsapp:509", "current_cue")] = "Hi there"
+    with tools._SimState("whatsapp:509") as state:
+        assert state.get("current_cue") == "Hi there"
+        state.set("mood", "Curious")
+    assert tools._local_state_cache.get(("whatsapp:509", "mood")) == "Curious"
+    assert fake.calls == ["/get-var", "/set-vars"]
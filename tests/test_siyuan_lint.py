@@ -0,0 +1,93 @@
+"""
+SiYuan lint tests — in-memory rule evaluation over bulk query results and
+incremental refetch of only the pages whose `updated` timestamp changed.
+SiYuan itself is replaced by a fake SQL backend on _sql_all.
+"""
+
+import pytest
+
+from app.hooks import siyuan_tools
+
+
+DOCS = [
+    {"id": "d-index", "content": "Index", "hpath": "/Index", "updated": "1"},
+    {"id": "d-k8s", "content": "Kubernetes", "hpath": "/entities/kubernetes", "updated": "1"},
+    {"id": "d-lonely", "content": "Lonely", "hpath": "/concepts/lonely", "updated": "1"},
+    {"id": "d-raw", "content": "Paper", "hpath": "/raw/paper", "updated": "1"},
+]
+
+FULL_ATTRS = {
+    "custom-type": "entity", "custom-tags": "infra",
+    "custom-created": "2026-01-01", "custom-updated": "2026-10-01",
+}
+
+
+class FakeSiYuan:
+    def __init__(self):
+        self.docs = [dict(d) for d in DOCS]
+        self.attrs = {
+            "d-k8s": dict(FULL_ATTRS),
+            "d-lonely": {"custom-type": "concept"},
+        }
+        self.fact_queries = []
+
+    def __call__(self, sql):
+        if "FROM blocks WHERE type = 'd' AND box" in sql and "hpath" in sql:
+            return [dict(d) for d in self.docs]
+        if "MAX(CASE" in sql:
+            self.fact_queries.append(sql)
+            ids = [d["id"] for d in self.docs if "box = " in sql or f"'{d['id']}'" in sql]
+            return [{"id": i, **self.attrs.get(i, {})} for i in ids]
+        if "SUM(LENGTH" in sql:
+            return [{"root_id": "d-k8s", "body_len": 400}, {"root_id": "d-raw", "body_len": 900}]
+        if "UNION ALL" in sql:
+            return [{"id": "d-k8s", "inbound": 1, "outbound": 1}]
+        if "SELECT markdown" in sql:
+            return [{"markdown": '((d-k8s "Kubernetes"))'}]
+        return []
+
+
+@pytest.fixture
+def fake(monkeypatch):
+    backend = FakeSiYuan()
+    monkeypatch.setattr(siyuan_tools, "_sql_all", backend)
+    monkeypatch.setattr(siyuan_tools, "get_notebook_id", lambda name: "nb1")
+    siyuan_tools._lint_cache.clear()
+    yield backend
+    siyuan_tools._lint_cache.clear()
+
+
+def _rules(report, block_id):
+    found = report["errors"] + report["warnings"] + report["info"]
+    return sorted(f["rule"] for f in found if f.get("block_id") == block_id)
+
+
+def test_rules_evaluated_from_bulk_results(fake):
+    report = siyuan_tools.siyuan_lint("Life")
+    assert _rules(report, "d-k8s") == []
+    assert _rules(report, "d-lonely") == [
+        "cross-link-minimum", "empty-page", "index-completeness",
+        "missing-attrs", "orphan-page",
+    ]
+    # raw/ sources skip attr and orphan rules but still need an Index entry
+    assert _rules(report, "d-raw") == ["index-completeness"]
+    assert _rules(report, "d-index") == []
+
+
+def test_relint_refetches_only_changed_docs(fake):
+    siyuan_tools.siyuan_lint("Life")
+    assert len(fake.fact_queries) == 1 and "box = 'nb1'" in fake.fact_queries[0]
+
+    report = siyuan_tools.siyuan_lint("Life")
+    assert report["rechecked"] == 0
+    assert len(fake.fact_queries) == 1
+
+    fake.docs[2]["updated"] = "2"
+    fake.attrs["d-lonely"] = dict(FULL_ATTRS, **{"custom-type": "concept"})
+    report = siyuan_tools.siyuan_lint("Life")
+    assert report["rechecked"] == 1
+    assert "'d-lonely'" in fake.fact_queries[-1] and "'d-k8s'" not in fake.fact_queries[-1]
+    assert "missing-attrs" not in _rules(report, "d-lonely")
+
+    report = siyuan_tools.siyuan_lint("Life", full=True)
+    assert report["rechecked"] == len(DOCS)
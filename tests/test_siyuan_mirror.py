@@ -0,0 +1,98 @@
+"""
+SiYuan mirror tests — full and incremental sync, deletions, FTS search and
+the siyuan_search fallback. The SiYuan side is an in-memory SQLite database
+with the same tables, answered through a fake _sql_all.
+"""
+
+import sqlite3
+import threading
+
+import pytest
+
+from app.hooks import siyuan_mirror, siyuan_tools
+
+
+def _block(id, root, box, content, updated, type="p", hpath="/notes/page"):
+    return {
+        "id": id, "parent_id": root, "root_id": root, "box": box,
+        "hpath": hpath, "content": content, "markdown": content,
+        "type": type, "updated": updated,
+    }
+
+
+class FakeSiYuan:
+    def __init__(self):
+        # Sync fans table fetches out to worker threads
+        self.db = sqlite3.connect(":memory:", check_same_thread=False)
+        self.lock = threading.Lock()
+        self.db.row_factory = sqlite3.Row
+        self.db.execute(f"CREATE TABLE blocks ({', '.join(siyuan_mirror._BLOCK_COLS)})")
+        self.db.execute(f"CREATE TABLE attributes ({', '.join(siyuan_mirror._ATTR_COLS)})")
+        self.db.execute(f"CREATE TABLE refs ({', '.join(siyuan_mirror._REF_COLS)})")
+        self.queries = 0
+
+    def add(self, **block):
+        cols = ", ".join(block)
+        self.db.execute(
+            f"INSERT INTO blocks ({cols}) VALUES ({', '.join('?' * len(block))})",
+            tuple(block.values()),
+        )
+
+    def __call__(self, sql):
+        with self.lock:
+            self.queries += 1
+            return [dict(r) for r in self.db.execute(sql)]
+
+
+@pytest.fixture
+def remote(monkeypatch, tmp_path):
+    fake = FakeSiYuan()
+    fake.add(**_block("d1", "d1", "nb1", "Talk preparation", "20261001000000", type="d"))
+    fake.add(**_block("p1", "d1", "nb1", "Practice the talk aloud twice", "20261001000000"))
+    fake.add(**_block("d2", "d2", "nb2", "Groceries", "20261001000000", type="d"))
+    fake.add(**_block("p2", "d2", "nb2", "Buy talk show tickets", "20261001000000"))
+
+    monkeypatch.setattr(siyuan_tools, "_sql_all", fake)
+    monkeypatch.setattr(siyuan_tools, "_siyuan_request", lambda endpoint, payload: {"code": 0})
+    monkeypatch.setattr(siyuan_mirror, "_DB_PATH", str(tmp_path / "mirror.sqlite"))
+    monkeypatch.setattr(siyuan_mirror, "_writer", None)
+    monkeypatch.setattr(siyuan_mirror, "_readers", threading.local())
+    yield fake
+
+
+def test_full_then_incremental_sync(remote):
+    assert not siyuan_mirror.ready()
+    assert siyuan_mirror.sync_now() == {"refreshed": 2, "removed": 0}
+    assert siyuan_mirror.ready()
+    assert siyuan_mirror.stats()["blocks"] == 4
+
+    # Nothing changed — only the cheap doc/watermark probes run
+    assert siyuan_mirror.sync_now() == {"refreshed": 0, "removed": 0}
+
+    # A child edit without a doc timestamp bump is caught by the watermark
+    remote.db.execute("UPDATE blocks SET content = 'Rehearse slowly', updated = '20261002000000' WHERE id = 'p1'")
+    remote.db.execute("DELETE FROM blocks WHERE root_id = 'd2'")
+    assert siyuan_mirror.sync_now() == {"refreshed": 1, "removed": 1}
+    assert [r["id"] for r in siyuan_mirror.search("rehearse")] == ["p1"]
+    assert siyuan_mirror.search("groceries") == []
+
+
+def test_write_through_resyncs_one_document(remote):
+    siyuan_mirror.sync_now()
+    remote.db.execute("DELETE FROM blocks WHERE id = 'p1'")
+    roots = siyuan_mirror._root_of(["p1"])  # resolved locally after deletion
+    assert roots == ["d1"]
+    assert siyuan_mirror.sync_now(roots)["refreshed"] == 1
+    assert siyuan_mirror.search("practice") == []
+
+
+def test_siyuan_search_answers_from_mirror(remote, monkeypatch):
+    siyuan_mirror.sync_now()
+    monkeypatch.setattr(siyuan_tools, "get_notebook_id", lambda name: {"Life": "nb1"}.get(name))
+    before = remote.queries
+
+    results = siyuan_tools.siyuan_search("talk", notebook="Life")
+    assert sorted(r["id"] for r in results) == ["d1", "p1"]
+    assert {(r["path"], r["notebook"]) for r in results} == {("/notes/page", "nb1")}
+    assert len(siyuan_tools.siyuan_search("talk", limit=10)) == 3
+    assert remote.queries == before
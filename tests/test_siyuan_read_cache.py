@@ -0,0 +1,63 @@
+"""
+SiYuan read cache tests — repeated reads hit the cache, writes invalidate
+what they touched. SiYuan is replaced by a recorder on _siyuan_request.
+"""
+
+import pytest
+
+from app.hooks import siyuan_tools
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    seen = []
+
+    def fake_request(endpoint, payload):
+        seen.append(endpoint)
+        if endpoint == "export/exportMdContent":
+            return {"code": 0, "data": {"content": f"# page {len(seen)}"}}
+        if endpoint == "attr/getBlockAttrs":
+            return {"code": 0, "data": {"custom-type": "person"}}
+        if endpoint == "filetree/getHPathByID":
+            return {"code": 0, "data": "/people/marie"}
+        return {"code": 0, "data": None}
+
+    monkeypatch.setattr(siyuan_tools, "_siyuan_request", fake_request)
+    monkeypatch.setattr(siyuan_tools.siyuan_mirror, "root_id", lambda block_id: None)
+    siyuan_tools.siyuan_cache_clear()
+    yield seen
+    siyuan_tools.siyuan_cache_clear()
+
+
+def test_repeated_reads_are_served_from_cache(calls):
+    first = siyuan_tools.siyuan_read_doc("doc1")
+    assert siyuan_tools.siyuan_read_doc("doc1") == first
+    siyuan_tools.siyuan_get_attrs("doc1")
+    siyuan_tools.siyuan_get_attrs("doc1")["custom-type"] = "mutated by caller"
+    assert siyuan_tools.siyuan_get_attrs("doc1") == {"custom-type": "person"}
+    assert calls.count("export/exportMdContent") == 1
+    assert calls.count("attr/getBlockAttrs") == 1
+    assert siyuan_tools.siyuan_cache_stats()["siyuan.docs"]["hits"] == 1
+
+
+def test_writes_invalidate_affected_reads(calls):
+    siyuan_tools.siyuan_read_doc("doc1")
+    siyuan_tools.siyuan_get_attrs("doc1")
+
+    siyuan_tools.siyuan_set_attrs("doc1", {"tags": "x"})
+    siyuan_tools.siyuan_read_doc("doc1")
+    siyuan_tools.siyuan_get_attrs("doc1")
+    assert calls.count("export/exportMdContent") == 1  # attrs don't touch the export
+    assert calls.count("attr/getBlockAttrs") == 2
+
+    # A child block edit with no mirror to resolve its root drops all exports
+    siyuan_tools.siyuan_update_block("child1", "new text")
+    siyuan_tools.siyuan_read_doc("doc1")
+    assert calls.count("export/exportMdContent") == 2
+
+
+def test_rename_drops_hpaths(calls):
+    siyuan_tools.siyuan_get_hpath("child1")
+    siyuan_tools.siyuan_rename_doc("doc1", "Marie P.")
+    siyuan_tools.siyuan_get_hpath("child1")
+    assert calls.count("filetree/getHPathByID") == 2
@@ -0,0 +1,92 @@
+"""
+TalkPrep job runner tests — bounded parallel steps, duplicate submits,
+completion notices and resuming unfinished steps after a restart.
+Step handlers are plain functions registered under test-only kinds.
+"""
+
+import threading
+import time
+
+import pytest
+
+from app.hooks import talkprep_jobs
+
+
+def _wait(job_id, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = talkprep_jobs.get(job_id)
+        if job["status"] not in ("queued", "running"):
+            return job
+        time.sleep(0.01)
+    raise AssertionError(f"job {job_id} did not finish")
+
+
+def _summary(job, steps):
+    return ", ".join(f"{s['step']}={s['status']}" for s in steps)
+
+
+@pytest.fixture
+def runner(monkeypatch, tmp_path):
+    notices = []
+    monkeypatch.setattr(talkprep_jobs, "_DB_PATH", str(tmp_path / "jobs.sqlite"))
+    monkeypatch.setattr(talkprep_jobs, "_WORKERS", 2)
+    monkeypatch.setattr(talkprep_jobs, "_conn", None)
+    monkeypatch.setattr(talkprep_jobs, "_executor", None)
+    monkeypatch.setattr(talkprep_jobs, "_notify", lambda user_id, text: notices.append((user_id, text)))
+    yield notices
+    talkprep_jobs.stop()
+
+
+def test_steps_run_in_parallel_within_the_worker_limit(runner):
+    active, peak, lock = [0], [0], threading.Lock()
+
+    def step(params, title):
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.05)
+        with lock:
+            active[0] -= 1
+        if title == "Conclusion":
+            raise ValueError("not found")
+        return f"{params['revision']}:{title}"
+
+    talkprep_jobs.register("test_develop", step, _summary)
+    titles = ["Intro", "Point 1", "Point 2", "Conclusion"]
+    job_id, created = talkprep_jobs.submit("test_develop", "whatsapp:509", "v1", titles, {"revision": "v1"})
+    assert created
+    # Same request while it runs → same job, no second chain
+    assert talkprep_jobs.submit("test_develop", "whatsapp:509", "v1", titles) == (job_id, False)
+
+    job = _wait(job_id)
+    assert peak[0] == 2
+    assert job["status"] == "done"
+    assert [s["result"] for s in job["steps"][:3]] == ["v1:Intro", "v1:Point 1", "v1:Point 2"]
+    assert job["steps"][3]["status"] == "failed"
+    assert runner == [("whatsapp:509", job["summary"])]
+    assert [j["id"] for j in talkprep_jobs.recent("whatsapp:509")] == [job_id]
+
+
+def test_restart_resumes_only_unfinished_steps(runner, monkeypatch):
+    ran = []
+    talkprep_jobs.register("test_resume", lambda params, title: ran.append(title) or "ok", _summary)
+
+    # Left behind by a crash: one step done, one mid-run, one never started
+    conn = talkprep_jobs._db()
+    with conn:
+        conn.execute(
+            "INSERT INTO jobs (id, kind, user_id, revision, params, status, created_at, updated_at) "
+            "VALUES ('j1', 'test_resume', 'rivebot', 'v2', '{}', 'running', 0, 0)"
+        )
+        conn.executemany(
+            "INSERT INTO job_steps (job_id, seq, step, status, result) VALUES ('j1', ?, ?, ?, ?)",
+            [(0, "A", "done", "ok"), (1, "B", "running", None), (2, "C", "pending", None)],
+        )
+
+    # A fresh process: new connection, new executor
+    monkeypatch.setattr(talkprep_jobs, "_conn", None)
+    talkprep_jobs.start()
+    job = _wait("j1")
+    assert sorted(ran) == ["B", "C"]
+    assert job["summary"] == "A=done, B=done, C=done"
@@ -0,0 +1,116 @@
+"""
+TalkPrep shared engine and stage-gate state — one engine per process with
+WAL on, and _revision_state's developed/evaluation/rehearsal counts in one
+query. talkmaster isn't installed here, so a minimal stand-in package with
+the same model and column names is put in sys.modules over a temp SQLite.
+"""
+
+import sys
+import types
+
+import pytest
+from sqlalchemy import Boolean, Column, ForeignKey, Integer, String, create_engine, text
+from sqlalchemy.orm import declarative_base
+
+from app.graph.tools import talkprep
+
+Base = declarative_base()
+
+
+class Talk(Base):
+    __tablename__ = "talks"
+    id = Column(Integer, primary_key=True)
+
+
+class Revision(Base):
+    __tablename__ = "revisions"
+    id = Column(Integer, primary_key=True)
+    version_name = Column(String, unique=True)
+
+
+class StructureNode(Base):
+    __tablename__ = "structure_nodes"
+    id = Column(Integer, primary_key=True)
+    revision_id = Column(Integer, ForeignKey("revisions.id"))
+    content_is_developed = Column(Boolean, default=False)
+
+
+class EvaluationScore(Base):
+    __tablename__ = "evaluation_scores"
+    id = Column(Integer, primary_key=True)
+    revision_id = Column(Integer, ForeignKey("revisions.id"))
+
+
+class RehearsalRecord(Base):
+    __tablename__ = "rehearsal_records"
+    id = Column(Integer, primary_key=True)
+    revision_id = Column(Integer, ForeignKey("revisions.id"))
+
+
+@pytest.fixture
+def talkmaster(tmp_path, monkeypatch):
+    """Install the stand-in talkmaster and reset the shared engine."""
+    built = []
+
+    def get_engine(db_path):
+        engine = create_engine(f"sqlite:///{db_path}")
+        Base.metadata.create_all(engine)
+        built.append(db_path)
+        return engine
+
+    pkg = types.ModuleType("talkmaster")
+    config = types.ModuleType("talkmaster.config")
+    config.get_settings = lambda: types.SimpleNamespace(db_path=str(tmp_path / "talkmaster.db"))
+    database = types.ModuleType("talkmaster.database")
+    database.get_engine = get_engine
+    for model in (Talk, Revision, StructureNode, EvaluationScore, RehearsalRecord):
+        setattr(database, model.__name__, model)
+    monkeypatch.setitem(sys.modules, "talkmaster", pkg)
+    monkeypatch.setitem(sys.modules, "talkmaster.config", config)
+    monkeypatch.setitem(sys.modules, "talkmaster.database", database)
+    monkeypatch.setattr(talkprep, "_engine", None)
+    monkeypatch.setattr(talkprep, "_session_factory", None)
+    yield built
+    if talkprep._engine is not None:
+        talkprep._engine.dispose()
+
+
+def test_engine_is_built_once_with_wal(talkmaster):
+    engine = talkprep._get_talkmaster_engine()
+    assert talkprep._get_talkmaster_engine() is engine
+    assert len(talkmaster) == 1  # talkmaster's factory only bootstraps the URL
+    assert engine.pool.size() == talkprep._POOL_SIZE
+    with engine.connect() as conn:
+        assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+
+
+def test_revision_state_counts_and_gates(talkmaster):
+    with talkprep._talkmaster_session() as session:
+        session.add_all([
+            Revision(id=1, version_name="v1"),
+            Revision(id=2, version_name="v2"),
+            StructureNode(revision_id=1, content_is_developed=True),
+            StructureNode(revision_id=1, content_is_developed=True),
+            StructureNode(revision_id=1, content_is_developed=False),
+            StructureNode(revision_id=2, content_is_developed=False),
+            EvaluationScore(revision_id=1),
+            RehearsalRecord(revision_id=1),
+            RehearsalRecord(revision_id=1),
+        ])
+        session.commit()
+
+        v1 = talkprep._revision_state(session, "v1")
+        v2 = talkprep._revision_state(session, "v2")
+        missing = talkprep._revision_state(session, "nope")
+
+    assert v1 == talkprep._RevisionState(id=1, developed=2, evaluations=1, rehearsals=2)
+    assert v2 == talkprep._RevisionState(id=2, developed=0, evaluations=0, rehearsals=0)
+    assert missing is None
+
+    assert talkprep._gate_section_developed(v1, "v1") is None
+    assert talkprep._gate_evaluation_done(v1, "v1") is None
+    assert talkprep._gate_rehearsal_done(v1, "v1") is None
+    assert "No sections have been developed" in talkprep._gate_section_developed(v2, "v2")
+    assert "No evaluation scores" in talkprep._gate_evaluation_done(v2, "v2")
+    assert "at least one rehearsal" in talkprep._gate_rehearsal_done(v2, "v2")
+    assert "not found" in talkprep._gate_evaluation_done(missing, "nope")
@@ -0,0 +1,110 @@
+"""
+Read-only tool cache — keyed hits, per-user keys, failures not stored,
+and write tools invalidating their group (including a miss in flight).
+"""
+
+import threading
+
+import pytest
+
+from app.hermes import tool_cache
+
+
+@pytest.fixture
+def backend():
+    calls = []
+    yield calls
+    tool_cache.flush()
+
+
+def test_hits_are_keyed_by_declared_fields_and_user(backend):
+    @tool_cache.cacheable(ttl=60, key=("pub_code",), group="test.catalog")
+    def test_list_topics(args, **kw):
+        backend.append(args)
+        return f"topics in {args.get('pub_code')}"
+
+    @tool_cache.cacheable(ttl=60, per_user=True, group="test.catalog")
+    def test_my_assignments(args, **kw):
+        backend.append(args)
+        return f"assignments for {args['user_id']}"
+
+    assert test_list_topics({"pub_code": "s34", "user_id": "a"}) == "topics in s34"
+    assert test_list_topics({"pub_code": " s34 ", "user_id": "b"}) == "topics in s34"
+    assert test_list_topics({"pub_code": "lmd"}) == "topics in lmd"
+    assert test_my_assignments({"user_id": "a"}) == "assignments for a"
+    assert test_my_assignments({"user_id": "b"}) == "assignments for b"
+    assert test_my_assignments({"user_id": "a"}) == "assignments for a"
+    assert len(backend) == 4
+    assert tool_cache.stats()["test_list_topics"]["entries"] == 2
+
+
+def test_failures_are_not_cached(backend):
+    replies = iter(["⚠️ Failed to list segments: timeout", "backend down", "📋 *Segments:*"])
+
+    @tool_cache.cacheable(ttl=60)
+    def test_list_groups(args, **kw):
+        backend.append(1)
+        reply = next(replies)
+        if reply == "backend down":
+            tool_cache.no_store()
+        return reply
+
+    assert test_list_groups({}).startswith("⚠️")
+    assert test_list_groups({}) == "backend down"
+    assert test_list_groups({}) == "📋 *Segments:*"
+    assert test_list_groups({}) == "📋 *Segments:*"
+    assert len(backend) == 3
+
+
+def test_write_tool_invalidates_group_and_in_flight_miss(backend):
+    started, release = threading.Event(), threading.Event()
+    groups = ["old"]
+
+    @tool_cache.cacheable(ttl=60, group="test.groups")
+    def test_groups(args, **kw):
+        snapshot = list(groups)
+        if args.get("slow"):
+            started.set()
+            release.wait(1)
+        return ", ".join(snapshot)
+
+    @tool_cache.invalidates("test.groups")
+    def test_create_group(args, **kw):
+        groups.append(args["name"])
+        return "created"
+
+    assert test_groups({}) == "old"
+    test_create_group({"name": "new"})
+    assert test_groups({}) == "old, new"
+
+    # A read that started before a write must not cache its stale answer
+    tool_cache.flush(group="test.groups")
+    reader = threading.Thread(target=test_groups, args=({"slow": True},))
+    reader.start()
+    started.wait(1)
+    test_create_group({"name": "newer"})
+    release.set()
+    reader.join()
+    assert test_groups({}) == "old, new, newer"
+
+
+def test_next_week_schedule_follows_the_monday_rollover(backend, monkeypatch):
+    from datetime import datetime
+
+    from app.graph.tools import organized
+
+    today = [datetime(2026, 10, 18, 23, 59)]  # Sunday
+
+    class _Clock(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return today[0]
+
+    monkeypatch.setattr("datetime.datetime", _Clock)
+    monkeypatch.setattr(organized, "query_organized_api", lambda q: backend.append(q["week_of"]) or '{"schedules": []}')
+
+    assert organized.macro_get_next_week({}) == "📅 No schedule found for week of 2026/10/19."
+    assert organized.macro_get_next_week({}) == "📅 No schedule found for week of 2026/10/19."
+    today[0] = datetime(2026, 10, 19, 0, 1)  # Monday
+    assert organized.macro_get_next_week({}) == "📅 No schedule found for week of 2026/10/26."
+    assert backend == ["2026/10/19", "2026/10/26"]
@@ -0,0 +1,68 @@
+"""
+Tool executors — per-class isolation, deadlines with cooperative
+cancellation, and saturation counters.
+"""
+
+import asyncio
+import contextvars
+import threading
+import time
+
+import pytest
+
+from app.hermes import executors
+
+_who = contextvars.ContextVar("who", default=None)
+
+
+@pytest.fixture(autouse=True)
+def pools(monkeypatch):
+    monkeypatch.setattr(executors, "_SIZES", {"network": 1, "db": 1, "cpu": 1})
+    monkeypatch.setattr(executors, "_submitted", {"network": 0, "db": 0, "cpu": 0})
+    monkeypatch.setattr(executors, "_running", {"network": 0, "db": 0, "cpu": 0})
+    monkeypatch.setattr(executors, "_executors", {})
+    monkeypatch.setattr(executors, "_specs", {})
+    yield
+    executors.shutdown()
+
+
+def test_hung_network_tool_times_out_without_starving_db_tools():
+    executors.declare("siyuan_read", executors.NETWORK, timeout=0.1)
+    executors.declare("list_topics", executors.DB)
+    stopped = threading.Event()
+
+    def hung(args):
+        while not executors.cancelled():
+            time.sleep(0.01)
+        stopped.set()
+        return "late"
+
+    async def scenario():
+        _who.set("whatsapp:509")
+        slow = asyncio.create_task(executors.run("siyuan_read", hung, {}))
+        await asyncio.sleep(0.02)
+        assert executors.stats()["network"]["busy"] == 1
+        fast = await executors.run("list_topics", lambda args: f"{args['n']}:{_who.get()}", {"n": 3})
+        with pytest.raises(executors.ToolTimeout):
+            await slow
+        return fast
+
+    assert asyncio.run(scenario()) == "3:whatsapp:509"
+    assert stopped.wait(1)
+
+
+def test_call_queued_past_its_deadline_never_runs():
+    executors.declare("slow", executors.CPU, timeout=5)
+    executors.declare("queued", executors.CPU, timeout=0.05)
+    ran = []
+
+    async def scenario():
+        first = asyncio.create_task(executors.run("slow", lambda args: time.sleep(0.2), {}))
+        await asyncio.sleep(0.01)
+        with pytest.raises(executors.ToolTimeout):
+            await executors.run("queued", lambda args: ran.append(1), {})
+        await first
+
+    asyncio.run(scenario())
+    assert ran == []
+    assert executors.stats()["cpu"] == {"workers": 1, "busy": 0, "queued": 0}
@@ -0,0 +1,85 @@
+"""
+POST /v1/tools:batch — results in request order, per-item errors and the
+per-tool concurrency cap. _invoke_tool is replaced so no real tool runs.
+"""
+
+import asyncio
+
+import pytest
+
+pytest.importorskip("run_agent")
+
+from fastapi import FastAPI, HTTPException  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.api.adapters import tools  # noqa: E402
+
+
+@pytest.fixture
+def client(monkeypatch):
+    calls = {"active": {}, "peak": {}, "seen": []}
+
+    async def fake_invoke(tool_name, kwargs, user_id, context):
+        if tool_name == "missing":
+            raise HTTPException(status_code=404, detail="Tool 'missing' not found")
+        active = calls["active"]
+        active[tool_name] = active.get(tool_name, 0) + 1
+        calls["peak"][tool_name] = max(calls["peak"].get(tool_name, 0), active[tool_name])
+        await asyncio.sleep(0.02 if kwargs.get("slow") else 0)
+        active[tool_name] -= 1
+        calls["seen"].append((tool_name, user_id, context))
+        return f"{tool_name}:{kwargs.get('n')}"
+
+    monkeypatch.setattr(tools, "_invoke_tool", fake_invoke)
+    monkeypatch.setattr(tools, "_tool_slots", {})
+    monkeypatch.setattr(tools, "INTERNAL_API_KEY", "")
+    app = FastAPI()
+    app.include_router(tools.router)
+    return TestClient(app), calls
+
+
+def test_batch_returns_results_in_order_with_item_errors(client):
+    http, calls = client
+    resp = http.post(
+        "/v1/tools:batch",
+        headers={"X-User-Id": "whatsapp:509", "X-Active-Pub": "lmd"},
+        json={"calls": [
+            {"tool": "schedule", "args": {"n": 1, "slow": True}},
+            {"tool": "missing"},
+            {"tool": "notes", "args": {"n": 3}, "context": {"active_talk_id": "7"}},
+        ]},
+    )
+    assert resp.status_code == 200
+    results = resp.json()["results"]
+    assert [r["tool"] for r in results] == ["schedule", "missing", "notes"]
+    assert results[0]["ok"] and results[0]["result"] == "schedule:1"
+    assert results[1] == {**results[1], "ok": False, "status": 404}
+    assert all("elapsed_ms" in r for r in results)
+    assert ("notes", "whatsapp:509", {"active_pub": "lmd", "active_talk_id": "7"}) in calls["seen"]
+
+
+def test_batch_caps_concurrency_per_tool_and_size(client, monkeypatch):
+    http, calls = client
+    monkeypatch.setattr(tools, "_PER_TOOL_LIMIT", 2)
+    resp = http.post("/v1/tools:batch", json={
+        "calls": [{"tool": "schedule", "args": {"n": i, "slow": True}} for i in range(6)],
+    })
+    assert [r["result"] for r in resp.json()["results"]] == [f"schedule:{i}" for i in range(6)]
+    assert calls["peak"]["schedule"] == 2
+
+    monkeypatch.setattr(tools, "_BATCH_MAX", 3)
+    resp = http.post("/v1/tools:batch", json={"calls": [{"tool": "schedule"}] * 4})
+    assert resp.status_code == 400
+
+
+def test_item_waiting_on_busy_tool_does_not_hold_a_batch_slot(client, monkeypatch):
+    http, calls = client
+    monkeypatch.setattr(tools, "_PER_TOOL_LIMIT", 1)
+    monkeypatch.setattr(tools, "_BATCH_CONCURRENCY", 2)
+    http.post("/v1/tools:batch", json={"calls": [
+        {"tool": "schedule", "args": {"n": 1, "slow": True}},
+        {"tool": "schedule", "args": {"n": 2, "slow": True}},
+        {"tool": "notes", "args": {"n": 3}},
+    ]})
+    # The second schedule call queues on its tool, leaving the slot to notes
+    assert [seen[0] for seen in calls["seen"]] == ["notes", "schedule", "schedule"]
@@ -0,0 +1,89 @@
+"""
+TTL store tests — expiry, size cap, sliding reads and the windowed counter.
+"""
+
+import pytest
+
+from app.utils import ttl_store
+from app.utils.ttl_store import SlidingWindowCounter, TTLStore
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controllable monotonic clock for the store module."""
+    now = [1000.0]
+    monkeypatch.setattr(ttl_store.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_entries_expire_after_ttl(clock):
+    store = TTLStore("t.expire", ttl=5)
+    store["a"] = 1
+    clock[0] += 4
+    assert store.get("a") == 1
+    clock[0] += 2
+    assert "a" not in store
+    assert store.stats()["expirations"] == 1
+
+
+def test_rewrite_extends_lifetime(clock):
+    store = TTLStore("t.rewrite", ttl=5)
+    store["a"] = 1
+    store["b"] = 2
+    clock[0] += 3
+    store["a"] = 3
+    clock[0] += 3
+    assert store.get("a") == 3
+    assert store.get("b") is None
+
+
+def test_maxsize_evicts_oldest(clock):
+    store = TTLStore("t.cap", ttl=60, maxsize=2)
+    for i, key in enumerate("abc"):
+        clock[0] += 1
+        store[key] = i
+    assert len(store) == 2
+    assert "a" not in store
+    assert store.stats()["evictions"] == 1
+
+
+def test_sliding_read_refreshes_ttl(clock):
+    store = TTLStore("t.sliding", ttl=5, sliding=True)
+    store["a"] = 1
+    for _ in range(3):
+        clock[0] += 4
+        assert store.get("a") == 1
+    clock[0] += 6
+    assert store.get("a") is None
+
+
+def test_window_counter_limits_and_forgets(clock):
+    counter = SlidingWindowCounter("t.window", window=60, buckets=60)
+    assert all(counter.try_acquire(3) for _ in range(3))
+    assert not counter.try_acquire(3)
+    clock[0] += 30
+    assert counter.count() == 3
+    clock[0] += 31
+    assert counter.count() == 0
+    assert counter.try_acquire(3)
+
+
+def test_stats_reports_registered_stores(clock):
+    store = TTLStore("t.stats", ttl=5)
+    store["a"] = 1
+    stats = ttl_store.stats()
+    assert stats["t.stats"]["entries"] == 1
+    assert ttl_store.total_bytes() > 0
+
+
+def test_lru_store_evicts_least_recently_read(clock):
+    store = TTLStore("t.lru", ttl=60, maxsize=2, lru=True)
+    store["a"], store["b"] = 1, 2
+    assert store.get("a") == 1  # a is now the most recent
+    store["c"] = 3
+    assert "b" not in store and store.get("a") == 1
+    # Reads don't extend an LRU entry's lifetime
+    clock[0] += 61
+    assert store.get("a") is None
+    stats = store.stats()
+    assert (stats["hits"], stats["misses"]) == (2, 2)